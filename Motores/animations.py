@@ -2,45 +2,134 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.animation import FuncAnimation
+import argparse
+import concurrent.futures
 import os
+import shutil
+import struct
+import subprocess
 import sys
+import tempfile
+import time
 
-def find_data_file():
-    """Buscar el archivo de datos en diferentes ubicaciones"""
-    possible_paths = [
-        "results/datos_motor_dos_estados_langevin.txt",
-        "../results/datos_motor_dos_estados_langevin.txt", 
-        "./results/datos_motor_dos_estados_langevin.txt",
-        "datos_motor_dos_estados_langevin.txt"
-    ]
-    
-    for path in possible_paths:
-        if os.path.exists(path):
-            print(f"✅ Archivo de datos encontrado: {path}")
-            return path
-    
-    print("❌ No se pudo encontrar el archivo de datos.")
-    return None
-
-def animate_phase_space():
-    """Animación del espacio de fase"""
-    print("🎬 Preparando animación del espacio de fase...")
-    
-    # Cargar datos
+import profiling
+from trajectory_io import find_data_file, load_trajectory
+
+# Presupuesto de cuadros y de puntos de historia por animación.
+# La historia dibujada se decima a HISTORY_POINTS puntos fijos, de modo que el
+# costo por cuadro no crece con el largo de la trayectoria ni con el índice
+# del cuadro: el render total es lineal en el número de cuadros.
+PHASE_SPACE_FRAMES = 500
+POSITION_FRAMES = 300
+HISTORY_POINTS = 2000
+TRAIL_POINTS = 50
+
+# Parámetros del potencial si el archivo de datos no los trae (formato texto)
+DEFAULT_POTENTIAL = {'k0': 0.1, 'k1': 10.0, 'l': 0.5}
+
+
+def frame_indices(n_samples, n_frames):
+    """Índice de muestra de cada cuadro (paso uniforme, como antes: i * n)"""
+    n_frames = max(1, min(n_frames, n_samples))
+    step = max(1, n_samples // n_frames)
+    return np.minimum(np.arange(n_frames) * step, n_samples - 1)
+
+
+def history_indices(n_samples, budget):
+    """Muestras decimadas (a lo sumo `budget`) que forman la línea de historia"""
+    return np.unique(np.linspace(0, n_samples - 1, max(2, budget)).astype(np.int64))
+
+
+def prepare_history(idx, columns, budget):
+    """
+    Precalcula la historia decimada de varias columnas.
+
+    Retorna (historia, fin): historia[k] son las muestras decimadas de
+    columns[k] y fin[i] cuántas de ellas preceden al cuadro i, de modo que el
+    cuadro i dibuja historia[k][:fin[i]] sin recorrer la trayectoria completa.
+    """
+    n_samples = len(columns[0])
+    hist_idx = history_indices(n_samples, budget)
+    history = [np.asarray(col[hist_idx], dtype=float) for col in columns]
+    end = np.searchsorted(hist_idx, idx, side='left')
+    return history, end
+
+
+def trail_window(col, idx, length):
+    """Últimos `length` puntos antes de cada cuadro (relleno con NaN al inicio)"""
+    offsets = np.arange(-length, 0)
+    window = idx[:, None] + offsets[None, :]
+    valid = window >= 0
+    trail = np.asarray(col[np.clip(window, 0, None)], dtype=float)
+    trail[~valid] = np.nan
+    return trail
+
+
+def report_fps(label, n_frames, elapsed):
+    """Imprime el rendimiento del render/exportación"""
+    fps = n_frames / elapsed if elapsed > 0 else float('inf')
+    print(f"⏱️  {label}: {n_frames} cuadros en {elapsed:.2f} s ({fps:.1f} cuadros/s)")
+    return fps
+
+
+def _load(traj):
+    """Usar la trayectoria dada o buscar y cargar el archivo de datos"""
+    if traj is not None:
+        return traj
     data_file = find_data_file()
     if not data_file:
-        return
-    
-    data = np.loadtxt(data_file)
-    t, x, v, s, E_total = data[:, 0], data[:, 1], data[:, 2], data[:, 3], data[:, 4]
-    
+        return None
+    return load_trajectory(data_file)
+
+
+class Scene:
+    """Figura de una animación con sus funciones init/update por cuadro"""
+
+    def __init__(self, fig, init, update, n_frames):
+        self.fig = fig
+        self.init = init
+        self.update = update
+        self.n_frames = n_frames
+
+
+# ---------------------------------------------------------------------------
+# Espacio de fase + posición vs tiempo
+# ---------------------------------------------------------------------------
+def prepare_phase_space_frames(traj, n_frames=PHASE_SPACE_FRAMES, history_points=HISTORY_POINTS):
+    """
+    Precalcula todo lo que necesita cada cuadro: índices, valores actuales,
+    historia decimada, estela y límites. El resultado es pequeño (acotado por
+    cuadros y presupuesto de historia) y se puede enviar a otros procesos.
+    """
+    t, x, v, s = traj.t, traj.x, traj.v, traj.s
+
+    idx = frame_indices(len(x), n_frames)
+    (hist_t, hist_x, hist_v), hist_end = prepare_history(idx, (t, x, v), history_points)
+    frame_t, frame_x, frame_v, frame_s = (np.asarray(c[idx], dtype=float) for c in (t, x, v, s))
+
+    return {
+        'frame_t': frame_t, 'frame_x': frame_x, 'frame_v': frame_v, 'frame_s': frame_s,
+        'hist_t': hist_t, 'hist_x': hist_x, 'hist_v': hist_v, 'hist_end': hist_end,
+        'trail_x': trail_window(x, idx, TRAIL_POINTS),
+        'trail_v': trail_window(v, idx, TRAIL_POINTS),
+        # Límites calculados una sola vez
+        'x_min': float(np.min(x)), 'x_max': float(np.max(x)),
+        'v_min': float(np.min(v)), 'v_max': float(np.max(v)),
+        't_min': float(np.min(t)), 't_max': float(np.max(t)),
+    }
+
+
+def build_phase_space_scene(frames):
+    """Construye la figura del espacio de fase a partir de los cuadros precalculados"""
+    frame_t, frame_x, frame_v, frame_s = (frames[k] for k in ('frame_t', 'frame_x', 'frame_v', 'frame_s'))
+    hist_t, hist_x, hist_v, hist_end = (frames[k] for k in ('hist_t', 'hist_x', 'hist_v', 'hist_end'))
+    trail_x, trail_v = frames['trail_x'], frames['trail_v']
+    x_min, x_max = frames['x_min'], frames['x_max']
+    v_min, v_max = frames['v_min'], frames['v_max']
+
     # Configurar la figura
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-    
-    # Configurar límites
-    x_min, x_max = np.min(x), np.max(x)
-    v_min, v_max = np.min(v), np.max(v)
-    
+
     # Espacio de fase (ax1)
     ax1.set_xlim(x_min - 0.1, x_max + 0.1)
     ax1.set_ylim(v_min - 0.1, v_max + 0.1)
@@ -48,34 +137,34 @@ def animate_phase_space():
     ax1.set_ylabel('Velocidad $v$', fontsize=12)
     ax1.set_title('Espacio de Fase - Animación', fontsize=14, fontweight='bold')
     ax1.grid(True, alpha=0.3)
-    
+
     # Trayectoria vs tiempo (ax2)
-    ax2.set_xlim(np.min(t), np.max(t))
+    ax2.set_xlim(frames['t_min'], frames['t_max'])
     ax2.set_ylim(x_min - 0.1, x_max + 0.1)
     ax2.set_xlabel('Tiempo $t$', fontsize=12)
     ax2.set_ylabel('Posición $x$', fontsize=12)
     ax2.set_title('Posición vs Tiempo - Animación', fontsize=14, fontweight='bold')
     ax2.grid(True, alpha=0.3)
-    
+
     # Elementos de la animación
     # Espacio de fase
     phase_line, = ax1.plot([], [], 'b-', linewidth=1, alpha=0.7, label='Trayectoria')
     phase_point, = ax1.plot([], [], 'ro', markersize=8, label='Posición actual')
     phase_trail, = ax1.plot([], [], 'g-', linewidth=0.5, alpha=0.5, label='Últimos puntos')
-    
+
     # Posición vs tiempo
     time_line, = ax2.plot([], [], 'b-', linewidth=1, alpha=0.7, label='Posición')
     time_point, = ax2.plot([], [], 'ro', markersize=6, label='Posición actual')
     time_vertical, = ax2.plot([], [], 'r--', alpha=0.5, label='Tiempo actual')
-    
+
     # Leyendas
     ax1.legend(loc='upper right')
     ax2.legend(loc='upper right')
-    
+
     # Texto informativo
     info_text = ax1.text(0.02, 0.98, '', transform=ax1.transAxes, fontsize=10,
                         verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
-    
+
     # Función de inicialización
     def init():
         phase_line.set_data([], [])
@@ -86,117 +175,100 @@ def animate_phase_space():
         time_vertical.set_data([], [])
         info_text.set_text('')
         return phase_line, phase_point, phase_trail, time_line, time_point, time_vertical, info_text
-    
-    # Función de animación
+
+    # Función de animación: sólo vistas de arreglos precalculados (costo acotado)
     def animate(i):
-        # Usar cada n puntos para hacer la animación más rápida
-        n = max(1, len(x) // 500)  # Mostrar ~500 frames
-        idx = i * n
-        
-        if idx >= len(x):
-            idx = len(x) - 1
-        
+        end = hist_end[i]
+
         # Espacio de fase
-        phase_line.set_data(x[:idx], v[:idx])
-        phase_point.set_data([x[idx]], [v[idx]])
-        
+        phase_line.set_data(hist_x[:end], hist_v[:end])
+        phase_point.set_data(frame_x[i:i + 1], frame_v[i:i + 1])
+
         # Trail de los últimos 50 puntos
-        trail_start = max(0, idx - 50)
-        phase_trail.set_data(x[trail_start:idx], v[trail_start:idx])
-        
+        phase_trail.set_data(trail_x[i], trail_v[i])
+
         # Posición vs tiempo
-        time_line.set_data(t[:idx], x[:idx])
-        time_point.set_data([t[idx]], [x[idx]])
-        time_vertical.set_data([t[idx], t[idx]], [x_min, x[idx]])
-        
+        time_line.set_data(hist_t[:end], hist_x[:end])
+        time_point.set_data(frame_t[i:i + 1], frame_x[i:i + 1])
+        time_vertical.set_data([frame_t[i], frame_t[i]], [x_min, frame_x[i]])
+
         # Texto informativo
-        info_text.set_text(f'Tiempo: {t[idx]:.2f}\nPosición: {x[idx]:.3f}\nVelocidad: {v[idx]:.3f}\nEstado: {int(s[idx])}')
-        
+        info_text.set_text(f'Tiempo: {frame_t[i]:.2f}\nPosición: {frame_x[i]:.3f}\nVelocidad: {frame_v[i]:.3f}\nEstado: {int(frame_s[i])}')
+
         return phase_line, phase_point, phase_trail, time_line, time_point, time_vertical, info_text
-    
-    # Crear animación
-    frames = min(500, len(x))  # Máximo 500 frames
-    
-    anim = FuncAnimation(fig, animate, init_func=init,
-                        frames=frames, interval=50, blit=True)
-    
-    # Guardar animación
-    os.makedirs("results/animations", exist_ok=True)
-    output_file = "results/animations/animacion_espacio_fase.mp4"
-    
-    print("📹 Guardando animación... (esto puede tomar unos segundos)")
-    
-    # Guardar como MP4
-    try:
-        anim.save(output_file, writer='ffmpeg', fps=20, dpi=100)
-        print(f"✅ Animación guardada: {output_file}")
-    except Exception as e:
-        print(f"❌ Error guardando MP4: {e}")
-        print("💡 Intentando guardar como GIF...")
-        
-        # Intentar guardar como GIF
-        try:
-            output_file_gif = "results/animations/animacion_espacio_fase.gif"
-            anim.save(output_file_gif, writer='pillow', fps=20)
-            print(f"✅ Animación guardada como GIF: {output_file_gif}")
-        except Exception as e2:
-            print(f"❌ Error guardando GIF: {e2}")
-            print("💡 Mostrando animación en pantalla...")
-            plt.show()
-    
-    plt.close()
 
-def animate_position_only():
-    """Animación solo de posición vs tiempo con el potencial"""
-    print("🎬 Preparando animación de posición con potencial...")
-    
-    # Cargar datos
-    data_file = find_data_file()
-    if not data_file:
-        return
-    
-    data = np.loadtxt(data_file)
-    t, x, v, s, E_total = data[:, 0], data[:, 1], data[:, 2], data[:, 3], data[:, 4]
-    
-    # Parámetros del potencial
-    k0, k1 = 0.1, 10.0
-    l = 0.5
-    
+    return Scene(fig, init, animate, len(frame_t))
+
+
+# ---------------------------------------------------------------------------
+# Posición sobre el potencial + evolución temporal
+# ---------------------------------------------------------------------------
+def prepare_position_frames(traj, n_frames=POSITION_FRAMES, history_points=HISTORY_POINTS):
+    """Precalcula los cuadros de la animación de posición con potencial"""
+    t, x, s = traj.t, traj.x, traj.s
+
+    # Parámetros del potencial (de la cabecera binaria si está disponible)
+    k0 = traj.params.get('k0', DEFAULT_POTENTIAL['k0'])
+    k1 = traj.params.get('k1', DEFAULT_POTENTIAL['k1'])
+    l = traj.params.get('l', DEFAULT_POTENTIAL['l'])
+
+    idx = frame_indices(len(x), n_frames)
+    (hist_t, hist_x), hist_end = prepare_history(idx, (t, x), history_points)
+    frame_t, frame_x, frame_s = (np.asarray(c[idx], dtype=float) for c in (t, x, s))
+    frame_U = np.where(frame_s == 0, 0.5 * k0 * frame_x**2, 0.5 * k1 * (frame_x - l)**2)
+
+    return {
+        'k0': k0, 'k1': k1, 'l': l,
+        'frame_t': frame_t, 'frame_x': frame_x, 'frame_s': frame_s, 'frame_U': frame_U,
+        'hist_t': hist_t, 'hist_x': hist_x, 'hist_end': hist_end,
+        # Límites calculados una sola vez
+        'x_min': float(np.min(x)), 'x_max': float(np.max(x)),
+        't_min': float(np.min(t)), 't_max': float(np.max(t)),
+    }
+
+
+def build_position_scene(frames):
+    """Construye la figura de posición con potencial a partir de los cuadros precalculados"""
+    k0, k1, l = frames['k0'], frames['k1'], frames['l']
+    frame_t, frame_x, frame_s, frame_U = (frames[k] for k in ('frame_t', 'frame_x', 'frame_s', 'frame_U'))
+    hist_t, hist_x, hist_end = frames['hist_t'], frames['hist_x'], frames['hist_end']
+    x_lo, x_hi = frames['x_min'], frames['x_max']
+
     # Configurar la figura
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
-    
+
     # Gráfica 1: Posición vs tiempo con potencial
-    x_range = np.linspace(np.min(x) - 0.5, np.max(x) + 0.5, 1000)
+    x_range = np.linspace(x_lo - 0.5, x_hi + 0.5, 1000)
     U0 = 0.5 * k0 * (x_range - 0.0)**2
     U1 = 0.5 * k1 * (x_range - l)**2
-    
-    ax1.plot(x_range, U0, 'b-', alpha=0.3, label='$U_0(x)$')
-    ax1.plot(x_range, U1, 'r-', alpha=0.3, label='$U_1(x)$')
+
+    U0_line, = ax1.plot(x_range, U0, 'b-', alpha=0.3, label='$U_0(x)$')
+    U1_line, = ax1.plot(x_range, U1, 'r-', alpha=0.3, label='$U_1(x)$')
     ax1.set_xlabel('Posición $x$')
     ax1.set_ylabel('Energía Potencial $U(x)$')
     ax1.set_title('Potencial y Posición de la Partícula', fontsize=14, fontweight='bold')
     ax1.legend()
     ax1.grid(True, alpha=0.3)
-    
+
     # Gráfica 2: Posición vs tiempo
-    ax2.set_xlim(np.min(t), np.max(t))
-    ax2.set_ylim(np.min(x) - 0.1, np.max(x) + 0.1)
+    ax2.set_xlim(frames['t_min'], frames['t_max'])
+    ax2.set_ylim(x_lo - 0.1, x_hi + 0.1)
     ax2.set_xlabel('Tiempo $t$')
     ax2.set_ylabel('Posición $x$')
     ax2.set_title('Evolución Temporal', fontsize=14, fontweight='bold')
     ax2.grid(True, alpha=0.3)
-    
+
     # Elementos de la animación
     # Potencial y partícula
     part_point, = ax1.plot([], [], 'ko', markersize=10, label='Partícula')
     state_text = ax1.text(0.02, 0.98, '', transform=ax1.transAxes, fontsize=12,
                          verticalalignment='top', bbox=dict(boxstyle='round', facecolor='yellow', alpha=0.8))
-    
+
     # Línea de tiempo
     time_line, = ax2.plot([], [], 'b-', linewidth=1, alpha=0.7)
     time_point, = ax2.plot([], [], 'ro', markersize=6)
     time_vertical, = ax2.plot([], [], 'r--', alpha=0.5)
-    
+
     # Función de inicialización
     def init():
         part_point.set_data([], [])
@@ -204,73 +276,334 @@ def animate_position_only():
         time_line.set_data([], [])
         time_point.set_data([], [])
         time_vertical.set_data([], [])
-        return part_point, state_text, time_line, time_point, time_vertical
-    
-    # Función de animación
+        return part_point, state_text, time_line, time_point, time_vertical, U0_line, U1_line
+
+    # Función de animación: sólo vistas de arreglos precalculados (costo acotado)
     def animate(i):
-        n = max(1, len(x) // 300)  # Mostrar ~300 frames
-        idx = i * n
-        
-        if idx >= len(x):
-            idx = len(x) - 1
-        
         # Actualizar posición de la partícula en el potencial
-        current_U = 0.5 * k0 * x[idx]**2 if s[idx] == 0 else 0.5 * k1 * (x[idx] - l)**2
-        part_point.set_data([x[idx]], [current_U])
-        
+        current_U = frame_U[i]
+        part_point.set_data(frame_x[i:i + 1], frame_U[i:i + 1])
+
         # Actualizar texto del estado
-        state_color = 'blue' if s[idx] == 0 else 'red'
-        state_name = 'DÉBIL (U₀)' if s[idx] == 0 else 'FUERTE (U₁)'
-        state_text.set_text(f'Estado: {state_name}\nPosición: {x[idx]:.3f}\nEnergía: {current_U:.3f}')
+        weak = frame_s[i] == 0
+        state_color = 'blue' if weak else 'red'
+        state_name = 'DÉBIL (U₀)' if weak else 'FUERTE (U₁)'
+        state_text.set_text(f'Estado: {state_name}\nPosición: {frame_x[i]:.3f}\nEnergía: {current_U:.3f}')
         state_text.set_color(state_color)
-        
+
         # Resaltar el potencial activo
-        if s[idx] == 0:
-            ax1.lines[0].set_alpha(1.0)  # U0 visible
-            ax1.lines[1].set_alpha(0.3)  # U1 tenue
-        else:
-            ax1.lines[0].set_alpha(0.3)  # U0 tenue
-            ax1.lines[1].set_alpha(1.0)  # U1 visible
-        
+        U0_line.set_alpha(1.0 if weak else 0.3)
+        U1_line.set_alpha(0.3 if weak else 1.0)
+
         # Actualizar gráfica de tiempo
-        time_line.set_data(t[:idx], x[:idx])
-        time_point.set_data([t[idx]], [x[idx]])
-        time_vertical.set_data([t[idx], t[idx]], [np.min(x), x[idx]])
-        
-        return part_point, state_text, time_line, time_point, time_vertical
-    
-    # Crear animación
-    frames = min(300, len(x))
-    
-    anim = FuncAnimation(fig, animate, init_func=init,
-                        frames=frames, interval=50, blit=True)
-    
-    # Guardar animación
-    os.makedirs("results/animations", exist_ok=True)
-    output_file = "results/animations/animacion_posicion_potencial.mp4"
-    
-    print("📹 Guardando animación...")
-    
+        end = hist_end[i]
+        time_line.set_data(hist_t[:end], hist_x[:end])
+        time_point.set_data(frame_t[i:i + 1], frame_x[i:i + 1])
+        time_vertical.set_data([frame_t[i], frame_t[i]], [x_lo, frame_x[i]])
+
+        return part_point, state_text, time_line, time_point, time_vertical, U0_line, U1_line
+
+    return Scene(fig, init, animate, len(frame_t))
+
+
+SCENE_BUILDERS = {
+    'phase': build_phase_space_scene,
+    'position': build_position_scene,
+}
+
+
+# ---------------------------------------------------------------------------
+# Exportación (serial o paralela)
+# ---------------------------------------------------------------------------
+def _render_slice(job):
+    """
+    Renderiza los cuadros [start, stop) con Agg y los escribe en `path`.
+
+    Para GIF cada cuadro se cuantiza aquí (la parte más cara de la codificación),
+    para MP4 se escribe RGB crudo. Se ejecuta igual en serie y en los procesos
+    del pool, por eso la salida no depende del número de procesos.
+    """
+    kind, frames, start, stop, dpi, path, quantize = job
+    plt.switch_backend('Agg')
+    scene = SCENE_BUILDERS[kind](frames)
+    scene.fig.set_dpi(dpi)
+    scene.init()
+
+    with open(path, 'wb') as out:
+        for i in range(start, stop):
+            scene.update(i)
+            scene.fig.canvas.draw()
+            rgb = np.asarray(scene.fig.canvas.buffer_rgba())[:, :, :3]
+            if quantize:
+                from PIL import Image
+                image = Image.fromarray(rgb).quantize()
+                palette = bytes(image.getpalette())
+                out.write(struct.pack('<I', len(palette)))
+                out.write(palette)
+                out.write(image.tobytes())
+            else:
+                out.write(np.ascontiguousarray(rgb).tobytes())
+
+    height, width = rgb.shape[:2] if stop > start else (0, 0)
+    plt.close(scene.fig)
+    return width, height
+
+
+def _read_gif_frames(path, size):
+    """Lee los cuadros cuantizados escritos por _render_slice"""
+    from PIL import Image
+    frames = []
+    with open(path, 'rb') as f:
+        while True:
+            header = f.read(4)
+            if not header:
+                break
+            palette = f.read(struct.unpack('<I', header)[0])
+            image = Image.frombytes('P', size, f.read(size[0] * size[1]))
+            image.putpalette(palette)
+            frames.append(image)
+    return frames
+
+
+def available_formats():
+    """Formatos de salida que se pueden generar en este sistema"""
+    formats = []
+    if shutil.which('ffmpeg'):
+        formats.append('mp4')
     try:
-        anim.save(output_file, writer='ffmpeg', fps=20, dpi=100)
-        print(f"✅ Animación guardada: {output_file}")
-    except Exception as e:
-        print(f"❌ Error guardando MP4: {e}")
-        try:
-            output_file_gif = "results/animations/animacion_posicion_potencial.gif"
-            anim.save(output_file_gif, writer='pillow', fps=15)
-            print(f"✅ Animación guardada como GIF: {output_file_gif}")
-        except Exception as e2:
-            print(f"❌ Error guardando GIF: {e2}")
+        import PIL  # noqa: F401
+        formats.append('gif')
+    except ImportError:
+        pass
+    return formats
+
+
+def export_frames(kind, frames, output_base, fps, dpi=100, fmt=None, workers=None):
+    """
+    Renderiza y codifica la animación repartiendo los cuadros entre procesos.
+
+    Cada proceso renderiza un tramo contiguo de cuadros a un archivo temporal;
+    luego los tramos se unen en orden en un MP4 (ffmpeg, RGB crudo por stdin)
+    o un GIF (pillow). workers=None usa todos los núcleos; con workers=1 se
+    sigue exactamente el mismo camino en el proceso actual, así que la salida
+    es idéntica byte a byte sin importar el número de procesos.
+    Retorna la ruta del archivo generado o None si no hay codificador.
+    """
+    formats = available_formats()
+    if fmt is None:
+        fmt = formats[0] if formats else None
+    if fmt not in formats:
+        print(f"❌ Formato de salida no disponible: {fmt}")
+        return None
+
+    n_frames = len(frames['frame_t'])
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(int(workers), n_frames))
+    bounds = np.linspace(0, n_frames, workers + 1).astype(int)
+    output_file = f"{output_base}.{fmt}"
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+
+    start_time = time.perf_counter()
+    profiling.count('cuadros', n_frames)
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = [(kind, frames, bounds[w], bounds[w + 1], dpi,
+                 os.path.join(tmp, f"tramo_{w:04d}.raw"), fmt == 'gif')
+                for w in range(workers)]
+        with profiling.stage('render'):
+            if workers == 1:
+                sizes = [_render_slice(jobs[0])]
+            else:
+                with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                    sizes = list(pool.map(_render_slice, jobs))
+        width, height = next(size for size in sizes if size != (0, 0))
+        report_fps(f"Render ({workers} proceso(s))", n_frames, time.perf_counter() - start_time)
+
+        with profiling.stage('codificacion'):
+            if fmt == 'mp4':
+                cmd = ['ffmpeg', '-y', '-loglevel', 'error',
+                       '-f', 'rawvideo', '-vcodec', 'rawvideo', '-pix_fmt', 'rgb24',
+                       '-s', f'{width}x{height}', '-framerate', str(fps), '-i', '-',
+                       '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
+                       '-vcodec', 'h264', '-pix_fmt', 'yuv420p', output_file]
+                encoder = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+                for job in jobs:
+                    with open(job[5], 'rb') as f:
+                        shutil.copyfileobj(f, encoder.stdin, 1 << 22)
+                encoder.stdin.close()
+                if encoder.wait() != 0:
+                    print("❌ ffmpeg terminó con error")
+                    return None
+            else:
+                images = []
+                for job in jobs:
+                    images.extend(_read_gif_frames(job[5], (width, height)))
+                images[0].save(output_file, save_all=True, append_images=images[1:],
+                               duration=int(1000 / fps), loop=0)
+
+    report_fps(f"Exportación {fmt.upper()}", n_frames, time.perf_counter() - start_time)
+    print(f"✅ Animación guardada: {output_file}")
+    return output_file
+
+
+def show_scene(kind, frames):
+    """Último recurso sin codificadores: mostrar la animación en pantalla"""
+    scene = SCENE_BUILDERS[kind](frames)
+    anim = FuncAnimation(scene.fig, scene.update, init_func=scene.init,
+                         frames=scene.n_frames, interval=50, blit=True)
+    plt.show()
+    return anim
+
+
+ANIMATIONS_DIR = "results/animations"
+
+# tipo -> (preparación de cuadros, nombre de archivo, cuadros por defecto, fps por formato)
+ANIMATIONS = {
+    'phase': (prepare_phase_space_frames, 'animacion_espacio_fase', PHASE_SPACE_FRAMES,
+              {'mp4': 20, 'gif': 20}),
+    'position': (prepare_position_frames, 'animacion_posicion_potencial', POSITION_FRAMES,
+                 {'mp4': 20, 'gif': 15}),
+}
+
+
+class AnimationSession:
+    """
+    Trayectoria cargada una sola vez más los cuadros ya preparados, para
+    generar varias animaciones (o varios formatos) en la misma invocación
+    sin recargar datos ni repetir la preparación.
+    """
+
+    def __init__(self, traj, output_dir=ANIMATIONS_DIR, dpi=100, workers=None,
+                 history_points=HISTORY_POINTS):
+        self.traj = traj
+        self.output_dir = output_dir
+        self.dpi = dpi
+        self.workers = workers
+        self.history_points = history_points
+        self._frames = {}
+
+    def frames(self, kind, n_frames=None):
+        prepare, _, default_frames, _ = ANIMATIONS[kind]
+        key = (kind, n_frames or default_frames)
+        if key not in self._frames:
+            with profiling.stage(f"preparacion/{kind}"):
+                self._frames[key] = prepare(self.traj, key[1], self.history_points)
+        return self._frames[key]
+
+    def export(self, kind, n_frames=None, fmt=None, fps=None):
+        """Genera la animación `kind`; retorna la ruta del archivo o None"""
+        _, basename, _, default_fps = ANIMATIONS[kind]
+        frames = self.frames(kind, n_frames)
+
+        if fmt is None:
+            formats = available_formats()
+            fmt = formats[0] if formats else None
+        if fps is None:
+            fps = default_fps.get(fmt, 20)
+
+        # Perfil: una etapa por animación y formato (con render y codificación dentro)
+        with profiling.stage(f"exportar/{kind}.{fmt}"):
+            output = export_frames(kind, frames, os.path.join(self.output_dir, basename),
+                                   fps, dpi=self.dpi, fmt=fmt, workers=self.workers)
+        if output is None:
             print("💡 Mostrando animación en pantalla...")
-            plt.show()
-    
-    plt.close()
+            show_scene(kind, frames)
+        plt.close('all')
+        return output
+
+
+def animate_phase_space(traj=None, n_frames=PHASE_SPACE_FRAMES, history_points=HISTORY_POINTS,
+                        workers=None, fmt=None, dpi=100, fps=None):
+    """Animación del espacio de fase"""
+    print("🎬 Preparando animación del espacio de fase...")
+
+    # Cargar datos
+    traj = _load(traj)
+    if traj is None:
+        return None
+
+    # Guardar animación
+    print("📹 Guardando animación... (esto puede tomar unos segundos)")
+    session = AnimationSession(traj, dpi=dpi, workers=workers, history_points=history_points)
+    return session.export('phase', n_frames, fmt=fmt, fps=fps)
+
+def animate_position_only(traj=None, n_frames=POSITION_FRAMES, history_points=HISTORY_POINTS,
+                          workers=None, fmt=None, dpi=100, fps=None):
+    """Animación solo de posición vs tiempo con el potencial"""
+    print("🎬 Preparando animación de posición con potencial...")
+
+    # Cargar datos
+    traj = _load(traj)
+    if traj is None:
+        return None
+
+    # Guardar animación
+    print("📹 Guardando animación...")
+    session = AnimationSession(traj, dpi=dpi, workers=workers, history_points=history_points)
+    return session.export('position', n_frames, fmt=fmt, fps=fps)
+
+
+def build_arg_parser():
+    """Argumentos de la línea de comandos (compartidos con run_animation.py)"""
+    parser = argparse.ArgumentParser(description="Animaciones del motor molecular")
+    parser.add_argument('--kind', nargs='+', choices=['phase', 'position', 'all'], default=['all'],
+                        help="Animaciones a generar: espacio de fase, posición con potencial o ambas")
+    parser.add_argument('--data', help="Archivo de datos (.txt, .bin o .mtz); por defecto se busca en results/")
+    parser.add_argument('--t-min', type=float, default=None,
+                        help="Animar sólo desde este tiempo (en .mtz sólo se descomprimen esos bloques)")
+    parser.add_argument('--t-max', type=float, default=None, help="Animar sólo hasta este tiempo")
+    parser.add_argument('--frames', type=int, default=None,
+                        help=f"Cuadros por animación (por defecto {PHASE_SPACE_FRAMES} / {POSITION_FRAMES})")
+    parser.add_argument('--history-points', type=int, default=HISTORY_POINTS,
+                        help="Presupuesto de puntos de la línea de historia")
+    parser.add_argument('--fps', type=int, default=None, help="Cuadros por segundo del archivo")
+    parser.add_argument('--dpi', type=int, default=100, help="Resolución de render")
+    parser.add_argument('--format', nargs='+', choices=['mp4', 'gif'], default=None,
+                        help="Formato(s) de salida (por defecto MP4 si hay ffmpeg, si no GIF)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Procesos de render (por defecto todos los núcleos)")
+    parser.add_argument('--output-dir', default=ANIMATIONS_DIR, help="Directorio de salida")
+    parser.add_argument('--profile-report', default=None, metavar='ARCHIVO',
+                        help="Guardar tiempos por etapa en JSON (o $MOTOR_PROFILE=DIR)")
+    return parser
+
+
+def time_range(args):
+    """Ventana (t_min, t_max) pedida con --t-min/--t-max, o None"""
+    if args.t_min is None and args.t_max is None:
+        return None
+    return (args.t_min, args.t_max)
+
+
+def run_batch(args, traj=None):
+    """Genera las animaciones pedidas reutilizando trayectoria y cuadros preparados"""
+    if traj is None:
+        data_file = args.data or find_data_file()
+        if not data_file or not os.path.exists(data_file):
+            print("❌ No se pudo encontrar el archivo de datos.")
+            return []
+        with profiling.stage('carga'):
+            traj = load_trajectory(data_file, t_range=time_range(args))
+        if len(traj) == 0:
+            print("❌ La ventana de tiempo pedida no contiene datos.")
+            return []
+
+    kinds = list(ANIMATIONS) if 'all' in args.kind else list(dict.fromkeys(args.kind))
+    session = AnimationSession(traj, output_dir=args.output_dir, dpi=args.dpi,
+                               workers=args.workers, history_points=args.history_points)
+    outputs = []
+    for kind in kinds:
+        for fmt in (args.format or [None]):
+            print(f"🎬 Generando animación '{kind}'...")
+            outputs.append(session.export(kind, args.frames, fmt=fmt, fps=args.fps))
+    return outputs
+
 
-def main():
+def interactive_menu(traj=None):
+    """Menú interactivo original (la trayectoria se carga una sola vez)"""
     print("=== ANIMACIONES DEL MOTOR MOLECULAR ===")
     print()
-    
+
     # Verificar dependencias
     try:
         import matplotlib.animation as animation
@@ -278,36 +611,52 @@ def main():
         print("❌ matplotlib no está instalado o no tiene soporte para animaciones")
         print("💡 Instala con: pip install matplotlib")
         return
-    
+
     # Crear directorio de animaciones
-    os.makedirs("results/animations", exist_ok=True)
-    
+    os.makedirs(ANIMATIONS_DIR, exist_ok=True)
+
     while True:
         print("\n🎬 ¿Qué animación quieres generar?")
         print("1. Espacio de fase + Posición vs tiempo")
-        print("2. Posición con potencial + Evolución temporal") 
+        print("2. Posición con potencial + Evolución temporal")
         print("3. Ambas animaciones")
         print("4. Salir")
-        
+
         choice = input("\nSelecciona una opción (1-4): ").strip()
-        
+
+        if choice in ('1', '2', '3'):
+            traj = _load(traj)
+            if traj is None:
+                break
         if choice == '1':
-            animate_phase_space()
+            animate_phase_space(traj)
         elif choice == '2':
-            animate_position_only()
+            animate_position_only(traj)
         elif choice == '3':
-            animate_phase_space()
-            animate_position_only()
+            animate_phase_space(traj)
+            animate_position_only(traj)
         elif choice == '4':
             print("👋 ¡Hasta luego!")
             break
         else:
             print("❌ Opción no válida. Intenta de nuevo.")
-        
+
         continuar = input("\n¿Generar otra animación? (s/n): ").strip().lower()
         if continuar != 's':
             print("👋 ¡Animaciones completadas!")
             break
 
+
+def main(argv=None):
+    """Sin argumentos: menú interactivo. Con argumentos: modo por lotes."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        interactive_menu()
+        return []
+    plt.switch_backend('Agg')
+    args = build_arg_parser().parse_args(argv)
+    profiling.configure('animations', args.profile_report)
+    return run_batch(args)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
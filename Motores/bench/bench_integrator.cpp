@@ -0,0 +1,186 @@
+/**
+ * @file     bench_integrator.cpp
+ * @brief    micro-benchmark del paso de integración (ns/paso)
+ *
+ * Compara tres bucles sobre el mismo modelo (updateChemicalState + step):
+ *   - legado:  reconstrucción del paso original (fmod por paso, exp/sqrt por
+ *              paso, dos fuerzas por llamada virtual a Potential*; el ruido
+ *              ya sale de RandomStream)
+ *   - BAOAB:   StochasticVelocityVerletIntegrator actual
+ *   - rápido:  FastStochasticVelocityVerletIntegrator
+ *   - tabulado: el mismo integrador rápido con U0/U1 como TabulatedPotential
+ *               (los mismos pozos armónicos muestreados en 4096 puntos)
+ *
+ * y el costo por normal de std::mt19937 + normal_distribution (generador
+ * original) frente a RandomStream (Philox, una normal o un bloque por llamada).
+ *
+ * Uso: bench_integrator [n_pasos] [repeticiones]
+ */
+#include "MotorModel.h"
+#include "Integrator.h"
+#include "Potential.h"
+#include "TabulatedPotential.h"
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <cstdlib>
+#include <iostream>
+#include <iomanip>
+#include <memory>
+#include <random>
+#include <string>
+#include <vector>
+
+namespace {
+
+const double M = 1.0, K0 = 10.0, K1 = 10.0, L = 0.5, T_OFF = 2.0, T_ON = 2.0;
+const double GAMMA = 10.0, KBT = 0.01, DT = 0.001;
+
+// Potencial armónico sin `final` ni definiciones en línea visibles al
+// llamador, como antes de la ruta rápida
+class LegacyHarmonic : public Potential {
+    double k, x_min;
+public:
+    LegacyHarmonic(double k_, double x_) : k(k_), x_min(x_) {}
+    __attribute__((noinline)) double U(double x) const override { double dx = x - x_min; return 0.5 * k * dx * dx; }
+    __attribute__((noinline)) double F(double x) const override { return -k * (x - x_min); }
+};
+
+// Paso original: fmod en cada paso, coeficientes recalculados, dos fuerzas
+double runLegacy(std::size_t n_steps, MotorModel& motor) {
+    LegacyHarmonic U0(K0, 0.0), U1(K1, L);
+    const Potential* pot = &U0;
+    Particle& p = motor.getParticle();
+    double t = 0.0;
+    for (std::size_t i = 0; i < n_steps; ++i) {
+        pot = (std::fmod(t, T_OFF + T_ON) < T_OFF) ? static_cast<const Potential*>(&U0) : &U1;
+        double c1 = std::exp(-GAMMA * DT);
+        double sigma = std::sqrt(KBT * (1.0 - c1 * c1));
+        p.v += pot->F(p.x) / p.m * (0.5 * DT);
+        p.v = c1 * p.v + sigma * motor.generateGaussianNoise() / std::sqrt(p.m);
+        p.x += p.v * DT;
+        p.v += pot->F(p.x) / p.m * (0.5 * DT);
+        t += DT;
+    }
+    return p.x;
+}
+
+double runIntegrator(std::size_t n_steps, MotorModel& motor, Integrator& integrator) {
+    integrator.prepare(motor, DT);
+    double t = 0.0;
+    for (std::size_t i = 0; i < n_steps; ++i) {
+        motor.updateChemicalState(t, DT);
+        integrator.step(motor, DT);
+        t += DT;
+    }
+    return motor.getParticle().x;
+}
+
+// Pozos armónicos tabulados sobre un período amplio (el motor nunca llega
+// a los bordes, donde la envoltura periódica deja un pico)
+std::vector<std::shared_ptr<const Potential> > tabulatedWells() {
+    const double period = 8.0;
+    std::vector<std::shared_ptr<const Potential> > wells;
+    for (double x_min : {0.0, L}) {
+        double k = x_min == 0.0 ? K0 : K1;
+        wells.push_back(std::make_shared<TabulatedPotential>(
+            x_min - period / 2.0, period, 4096,
+            [=](double x) { return 0.5 * k * (x - x_min) * (x - x_min); }));
+    }
+    return wells;
+}
+
+template <class F>
+double bestNsPerStep(const std::string& name, std::size_t n_steps, int repeats, F kernel,
+                     bool tabulated = false) {
+    double best = 1e300;
+    volatile double sink = 0.0;
+    ChemicalKinetics kinetics;
+    kinetics.T_off = T_OFF;
+    kinetics.T_on = T_ON;
+    for (int r = 0; r < repeats; ++r) {
+        MotorModel motor = tabulated
+            ? MotorModel(M, tabulatedWells(), kinetics, GAMMA, KBT, L / 2.0, 0.0, false)
+            : MotorModel(M, K0, K1, L, T_OFF, T_ON, GAMMA, KBT, L / 2.0, 0.0, false);
+        motor.seed(12345);
+        auto start = std::chrono::steady_clock::now();
+        sink = sink + kernel(n_steps, motor);
+        auto stop = std::chrono::steady_clock::now();
+        double ns = std::chrono::duration<double, std::nano>(stop - start).count() / n_steps;
+        if (ns < best) best = ns;
+    }
+    std::cout << std::left << std::setw(10) << name << std::right << std::fixed
+              << std::setprecision(2) << std::setw(10) << best << " ns/paso" << std::endl;
+    return best;
+}
+
+// ns por normal de cada generador (mejor de `repeats`)
+void benchGaussian(std::size_t n, int repeats) {
+    volatile double sink = 0.0;
+    double best_mt = 1e300, best_one = 1e300, best_block = 1e300;
+    std::vector<double> block(RandomStream::GAUSSIAN_BLOCK);
+    for (int r = 0; r < repeats; ++r) {
+        std::mt19937 generator(12345);
+        std::normal_distribution<> normal_dist(0.0, 1.0);
+        auto start = std::chrono::steady_clock::now();
+        double acc = 0.0;
+        for (std::size_t i = 0; i < n; ++i) acc += normal_dist(generator);
+        auto stop = std::chrono::steady_clock::now();
+        best_mt = std::min(best_mt, std::chrono::duration<double, std::nano>(stop - start).count() / n);
+
+        RandomStream stream(12345, 0);
+        start = std::chrono::steady_clock::now();
+        for (std::size_t i = 0; i < n; ++i) acc += stream.gaussian();
+        stop = std::chrono::steady_clock::now();
+        best_one = std::min(best_one, std::chrono::duration<double, std::nano>(stop - start).count() / n);
+
+        RandomStream batched(12345, 0);
+        start = std::chrono::steady_clock::now();
+        for (std::size_t i = 0; i < n; i += block.size()) {
+            batched.fillGaussian(block.data(), block.size());
+            acc += block[0];
+        }
+        stop = std::chrono::steady_clock::now();
+        best_block = std::min(best_block, std::chrono::duration<double, std::nano>(stop - start).count() / n);
+        sink = sink + acc;
+    }
+    std::cout << std::fixed << std::setprecision(2)
+              << "Normales: mt19937 " << best_mt << " ns, Philox " << best_one
+              << " ns (una por llamada), " << best_block << " ns (por bloque)" << std::endl;
+}
+
+} // namespace
+
+int main(int argc, char* argv[]) {
+    std::size_t n_steps = argc > 1 ? std::strtoull(argv[1], nullptr, 10) : 10000000;
+    int repeats = argc > 2 ? std::atoi(argv[2]) : 5;
+    if (n_steps == 0 || repeats <= 0) {
+        std::cerr << "Uso: " << argv[0] << " [n_pasos] [repeticiones]" << std::endl;
+        return 1;
+    }
+
+    std::cout << "Benchmark del integrador: " << n_steps << " pasos, mejor de "
+              << repeats << " repeticiones" << std::endl;
+
+    double legacy = bestNsPerStep("legado", n_steps, repeats, runLegacy);
+    double baoab = bestNsPerStep("BAOAB", n_steps, repeats, [](std::size_t n, MotorModel& m) {
+        StochasticVelocityVerletIntegrator integrator;
+        return runIntegrator(n, m, integrator);
+    });
+    double fast = bestNsPerStep("rapido", n_steps, repeats, [](std::size_t n, MotorModel& m) {
+        FastStochasticVelocityVerletIntegrator integrator;
+        return runIntegrator(n, m, integrator);
+    });
+
+    double tabulated = bestNsPerStep("tabulado", n_steps, repeats, [](std::size_t n, MotorModel& m) {
+        FastStochasticVelocityVerletIntegrator integrator;
+        return runIntegrator(n, m, integrator);
+    }, true);
+
+    std::cout << std::setprecision(2) << "Aceleracion: " << legacy / fast << "x vs legado, "
+              << baoab / fast << "x vs BAOAB; tabulado / armonico = " << tabulated / fast
+              << std::endl;
+
+    benchGaussian(n_steps, repeats);
+    return 0;
+}
@@ -0,0 +1,171 @@
+/**
+ * @file     bench_system.cpp
+ * @brief    escalado de MotorSystem con el número de motores (ns/paso-motor)
+ *
+ * Motores sobre una pista periódica de trinquetes tabulados (dos motores por
+ * período), con conmutación de Markov por motor, resortes entre
+ * vecinos de la cadena y volumen excluido. Para N = 10, 10^3 y 10^5 mide:
+ *   - paso:    MotorSystem::run completo (química + BAOAB + fuerzas)
+ *   - lista:   una evaluación de fuerzas de volumen excluido con NeighborList
+ *              (actualización incluida)
+ *   - pares:   la misma fuerza recorriendo todos los pares, O(N^2)
+ *              (sólo hasta 10^3 motores: con 10^5 serían 5e9 pares por paso)
+ *
+ * Con la lista el costo por motor no crece con N; con todos los pares crece
+ * linealmente.
+ *
+ * Uso: bench_system [pasos-motor por tamaño] [repeticiones]
+ */
+#include "MotorSystem.h"
+#include "NeighborList.h"
+#include "Parameters.h"
+#include "TabulatedPotential.h"
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <cstdlib>
+#include <iomanip>
+#include <iostream>
+#include <memory>
+#include <vector>
+
+namespace {
+
+const double TWO_PI = 6.283185307179586476925286766559;
+const double PERIOD = 1.0, SPACING = 0.5, SIGMA = 0.4, REPULSION = 1.0, SPRING_K = 1.0;
+const std::size_t BRUTE_FORCE_LIMIT = 1000;
+
+// Estado 0: trinquete asimétrico; estado 1: pista casi plana
+std::vector<std::shared_ptr<const Potential> > ratchetTrack() {
+    std::vector<std::shared_ptr<const Potential> > track;
+    track.push_back(std::make_shared<TabulatedPotential>(0.0, PERIOD, 256, [](double x) {
+        return 0.5 * (std::sin(TWO_PI * x) + 0.25 * std::sin(2.0 * TWO_PI * x));
+    }));
+    track.push_back(std::make_shared<TabulatedPotential>(0.0, PERIOD, 256, [](double x) {
+        return 0.05 * std::sin(TWO_PI * x);
+    }));
+    return track;
+}
+
+SimulationParameters benchParameters(std::size_t n_steps) {
+    SimulationParameters p;
+    p.switching = SwitchingMode::MARKOV;
+    p.k12 = 1.0;
+    p.k21 = 1.0;
+    p.gamma = 10.0;
+    p.kBT = 0.1;
+    p.dt = 0.001;
+    p.T_total = (n_steps - 0.5) * p.dt;
+    p.initial_x = 0.25;
+    return p;
+}
+
+Coupling benchCoupling(std::size_t n_motors) {
+    Coupling c;
+    c.spring_k = SPRING_K;
+    c.spring_length = SPACING;
+    c.repulsion = REPULSION;
+    c.sigma = SIGMA;
+    c.box = SPACING * n_motors;
+    return c;
+}
+
+template <class F>
+double bestOf(int repeats, F kernel) {
+    double best = 1e300;
+    for (int r = 0; r < repeats; ++r) {
+        auto start = std::chrono::steady_clock::now();
+        kernel();
+        auto stop = std::chrono::steady_clock::now();
+        best = std::min(best, std::chrono::duration<double, std::nano>(stop - start).count());
+    }
+    return best;
+}
+
+// Fuerza de volumen excluido recorriendo todos los pares (referencia O(N^2))
+void bruteForceRepulsion(const std::vector<double>& x, const NeighborList& image, std::vector<double>& f) {
+    const double scale = 2.0 * REPULSION / SIGMA;
+    std::fill(f.begin(), f.end(), 0.0);
+    for (std::size_t i = 0; i < x.size(); ++i) {
+        for (std::size_t j = i + 1; j < x.size(); ++j) {
+            double r = image.separation(x[i], x[j]);
+            double distance = std::fabs(r);
+            if (distance >= SIGMA) continue;
+            double force = std::copysign(scale * (1.0 - distance / SIGMA), r);
+            f[j] += force;
+            f[i] -= force;
+        }
+    }
+}
+
+void listRepulsion(const std::vector<double>& x, NeighborList& list, std::vector<double>& f) {
+    const double scale = 2.0 * REPULSION / SIGMA;
+    std::fill(f.begin(), f.end(), 0.0);
+    list.update(x);
+    const std::vector<NeighborList::Pair>& pairs = list.getPairs();
+    for (std::size_t p = 0; p < pairs.size(); ++p) {
+        double r = list.separation(x[pairs[p].i], x[pairs[p].j]);
+        double distance = std::fabs(r);
+        if (distance >= SIGMA) continue;
+        double force = std::copysign(scale * (1.0 - distance / SIGMA), r);
+        f[pairs[p].j] += force;
+        f[pairs[p].i] -= force;
+    }
+}
+
+} // namespace
+
+int main(int argc, char* argv[]) {
+    double budget = argc > 1 ? std::strtod(argv[1], nullptr) : 2e7;
+    int repeats = argc > 2 ? std::atoi(argv[2]) : 3;
+    if (!(budget >= 1.0) || repeats <= 0) {
+        std::cerr << "Uso: " << argv[0] << " [pasos-motor por tamaño] [repeticiones]" << std::endl;
+        return 1;
+    }
+
+    std::cout << "Benchmark de motores acoplados: " << budget << " pasos-motor por tamaño, mejor de "
+              << repeats << " repeticiones" << std::endl;
+    std::cout << std::setw(8) << "N" << std::setw(16) << "paso (ns/mot)" << std::setw(16)
+              << "lista (ns/mot)" << std::setw(16) << "pares (ns/mot)" << std::setw(12)
+              << "vecinos/mot" << std::endl;
+
+    volatile double sink = 0.0;
+    for (std::size_t n_motors : {std::size_t(10), std::size_t(1000), std::size_t(100000)}) {
+        std::size_t n_steps = std::max<std::size_t>(static_cast<std::size_t>(budget / n_motors), 10);
+        SimulationParameters params = benchParameters(n_steps);
+        Coupling coupling = benchCoupling(n_motors);
+
+        std::vector<double> x;
+        double step_ns = bestOf(repeats, [&]() {
+            MotorSystem system(params, ratchetTrack(), n_motors, coupling, 12345);
+            system.run();
+            x = system.getPositions();
+            sink = sink + system.driftVelocity();
+        }) / (static_cast<double>(n_steps) * n_motors);
+
+        // Fuerzas de pares sobre la configuración final
+        std::vector<double> f(n_motors);
+        NeighborList list(SIGMA, MotorSystem::SKIN * SIGMA, coupling.box);
+        list.build(x);
+        std::size_t evaluations = std::max<std::size_t>(static_cast<std::size_t>(budget / n_motors / 10), 1);
+        double list_ns = bestOf(repeats, [&]() {
+            for (std::size_t e = 0; e < evaluations; ++e) listRepulsion(x, list, f);
+            sink = sink + f[0];
+        }) / (static_cast<double>(evaluations) * n_motors);
+
+        std::cout << std::setw(8) << n_motors << std::fixed << std::setprecision(2)
+                  << std::setw(16) << step_ns << std::setw(16) << list_ns;
+        if (n_motors <= BRUTE_FORCE_LIMIT) {
+            std::size_t brute = std::max<std::size_t>(evaluations / n_motors, 1);
+            double brute_ns = bestOf(repeats, [&]() {
+                for (std::size_t e = 0; e < brute; ++e) bruteForceRepulsion(x, list, f);
+                sink = sink + f[0];
+            }) / (static_cast<double>(brute) * n_motors);
+            std::cout << std::setw(16) << brute_ns;
+        } else {
+            std::cout << std::setw(16) << "-";
+        }
+        std::cout << std::setw(12) << static_cast<double>(list.getPairs().size()) / n_motors << std::endl;
+    }
+    return 0;
+}
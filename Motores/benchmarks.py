@@ -0,0 +1,401 @@
+"""
+Benchmarks del pipeline: compilación, simulación, lectura, gráficas y animación.
+
+Cada etapa se ejecuta en un proceso aparte y se mide con os.wait4, de modo
+que el pico de memoria (RSS) corresponde sólo a esa etapa (ver measure).
+Para cada longitud de trayectoria se registran segundos, pasos/s, MB/s y RSS
+máximo en un JSON:
+
+    python benchmarks.py --sizes 1e4 1e5 1e6
+    python benchmarks.py --sizes 1e4 1e5 1e6 1e7 1e8 --stages sim_none sim_bin load_binary
+    python benchmarks.py --save-baseline                 (guardar como referencia)
+    python benchmarks.py --compare                       (correr y comparar)
+    python benchmarks.py --compare base.json --current nuevo.json   (sólo comparar)
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+
+from build import SIM_EXE, compile_command
+
+BENCH_DIR = "results/benchmarks"
+WORK_DIR = os.path.join(BENCH_DIR, "work")
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+DT = 0.001  # Paso de tiempo por defecto de motor_sim (Parameters.h)
+
+# Etapas por longitud de trayectoria, en orden de ejecución
+SIM_STAGES = ('sim_none', 'sim_bin', 'sim_text')
+LOAD_STAGES = ('load_loadtxt', 'load_binary', 'load_chunks')
+FIGURE_STAGES = ('fig_00', 'fig_01', 'fig_02', 'fig_03', 'fig_04', 'fig_05', 'fig_06')
+ANIMATION_STAGES = ('anim_phase', 'anim_position')
+ALL_STAGES = ('compile',) + SIM_STAGES + LOAD_STAGES + FIGURE_STAGES + ANIMATION_STAGES
+
+# Etapas que necesitan el archivo de texto (muy grande para 10^8 pasos)
+TEXT_STAGES = ('sim_text', 'load_loadtxt')
+# Etapas que no dependen de la trayectoria: se miden una sola vez
+FIXED_STAGES = ('compile', 'fig_00', 'fig_05')
+
+PR_SET_CHILD_SUBREAPER = 36   # prctl de Linux (adoptar descendientes huérfanos)
+
+# Lanzador: sh deja la etapa en segundo plano, informa su pid por stderr y
+# termina; la etapa espera una línea en stdin (para que sh no la recoja) y
+# recién entonces se ejecuta, desde un sh recién cargado
+LAUNCHER = 'exec 3<&0; sh -c \'read _ <&3; exec "$@" 3<&-\' sh "$@" 2>/dev/null & echo $! >&2'
+
+
+def peak_rss_mb(rusage):
+    """ru_maxrss está en KB en Linux y en bytes en macOS"""
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return rusage.ru_maxrss * scale / 2**20
+
+
+_subreaper = None
+
+
+def can_adopt():
+    """Registrar este proceso como subreaper (una vez); False fuera de Linux"""
+    global _subreaper
+    if _subreaper is None:
+        _subreaper = False
+        if sys.platform.startswith('linux') and shutil.which('sh'):
+            try:
+                import ctypes
+                libc = ctypes.CDLL(None, use_errno=True)
+                _subreaper = libc.prctl(PR_SET_CHILD_SUBREAPER, 1, 0, 0, 0) == 0
+            except (OSError, AttributeError):
+                pass
+    return _subreaper
+
+
+def _no_vfork():
+    """Con preexec_fn, subprocess usa fork en vez de vfork"""
+
+
+def measure(cmd):
+    """
+    Ejecuta `cmd` y retorna (segundos, RSS máximo en MB, salida estándar).
+
+    ru_maxrss sobrevive a exec: un hijo lanzado desde este proceso (vfork o
+    fork) hereda como piso el RSS de Python, mayor que el de motor_sim. En
+    Linux la etapa se lanza desde un sh (LAUNCHER) y este proceso, como
+    subreaper, la adopta y la recoge con wait4: el piso es el de sh. El RSS
+    incluye a los descendientes ya recogidos (p. ej. cc1plus al compilar).
+    """
+    if not can_adopt():
+        return _measure_child(cmd)
+    launcher = subprocess.Popen(['sh', '-c', LAUNCHER, 'sh'] + cmd, stdin=subprocess.PIPE,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    pid = int(launcher.stderr.readline())
+    launcher.stderr.close()
+    launcher.wait()
+    start = time.perf_counter()
+    launcher.stdin.write(b"\n")
+    launcher.stdin.close()
+    output = launcher.stdout.read()
+    _, status, rusage = os.wait4(pid, 0)
+    elapsed = time.perf_counter() - start
+    launcher.stdout.close()
+    return _finish(cmd, elapsed, status, rusage, output)
+
+
+def _measure_child(cmd):
+    """measure sin subreaper: hijo directo (fork, con piso del RSS de Python)"""
+    with open(os.devnull, 'wb') as devnull:
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=devnull, preexec_fn=_no_vfork)
+        output = proc.stdout.read()
+        _, status, rusage = os.wait4(proc.pid, 0)
+        elapsed = time.perf_counter() - start
+    proc.stdout.close()
+    return _finish(cmd, elapsed, status, rusage, output)
+
+
+def _finish(cmd, elapsed, status, rusage, output):
+    returncode = os.waitstatus_to_exitcode(status)
+    if returncode != 0:
+        raise RuntimeError(f"{' '.join(cmd)} terminó con código {returncode}")
+    return elapsed, peak_rss_mb(rusage), output.decode(errors='replace')
+
+
+def data_paths(steps):
+    base = os.path.join(WORK_DIR, f"traj_{steps}")
+    return base + ".bin", base + ".txt"
+
+
+def stage_command(stage, steps, args):
+    """Comando del proceso hijo de una etapa"""
+    if stage == 'compile':
+        return compile_command()
+
+    bin_file, text_file = data_paths(steps)
+    if stage in SIM_STAGES:
+        cmd = [SIM_EXE, f"--T_total={steps * DT!r}", f"--dt={DT!r}"]
+        if stage == 'sim_none':
+            return cmd + ["--log=none", f"--summary={os.path.join(WORK_DIR, 'resumen.txt')}"]
+        return cmd + [bin_file if stage == 'sim_bin' else text_file]
+
+    # Etapas de Python: este mismo script con --run-stage
+    data = text_file if stage == 'load_loadtxt' else bin_file
+    return [sys.executable, os.path.abspath(__file__), '--run-stage', stage, '--data', data,
+            '--anim-frames', str(args.anim_frames)]
+
+
+def stage_bytes(stage, steps):
+    """Bytes escritos o leídos por la etapa (para MB/s), o None"""
+    bin_file, text_file = data_paths(steps)
+    if stage in ('sim_bin', 'load_binary', 'load_chunks'):
+        return os.path.getsize(bin_file)
+    if stage in ('sim_text', 'load_loadtxt'):
+        return os.path.getsize(text_file)
+    return None
+
+
+def run_stage_in_child(stage, data, anim_frames):
+    """
+    Cuerpo de una etapa de Python (ejecutado en el hijo). Imprime en la
+    última línea los segundos de la parte medida, sin contar imports.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import numpy as np
+    import plot_results
+    from trajectory_io import iter_chunks, load_binary, load_text
+
+    out_dir = os.path.join(WORK_DIR, 'figuras')
+    os.makedirs(out_dir, exist_ok=True)
+    plot_results.FIGURES_DIR = out_dir
+
+    if stage.startswith('load_'):
+        start = time.perf_counter()
+        if stage == 'load_loadtxt':
+            traj = load_text(data, use_cache=False)   # Medir el parseo, no la caché
+            checksum = float(np.sum(traj.x))
+        elif stage == 'load_binary':
+            # memmap: sumar las columnas obliga a leerlas del disco
+            traj = load_binary(data)
+            checksum = float(np.sum(traj.x) + np.sum(traj.v) + np.sum(traj.E_total) + np.sum(traj.s))
+        else:
+            checksum = sum(float(np.sum(chunk.x)) for chunk in iter_chunks(data))
+        elapsed = time.perf_counter() - start
+        print(json.dumps({'seconds': elapsed, 'checksum': checksum}))
+        return
+
+    traj = load_binary(data) if stage not in FIXED_STAGES else None
+    if stage in FIGURE_STAGES:
+        stats = plot_results.compute_stats([traj]) if traj is not None else None
+        builders = {
+            'fig_01': lambda: plot_results.TrajectoryFigure(stats),
+            'fig_02': lambda: plot_results.VelocityFigure(stats),
+            'fig_03': lambda: plot_results.EnergyFigure(stats),
+            'fig_04': lambda: plot_results.PositionHistogram(stats),
+            'fig_06': lambda: plot_results.PhaseSpaceFigure(stats),
+        }
+        start = time.perf_counter()
+        if stage == 'fig_00':
+            plot_results.plot_schematic_model()
+        elif stage == 'fig_05':
+            plot_results.plot_potential_landscape()
+        else:
+            figure = builders[stage]()
+            figure.add(traj)
+            figure.finish(stats)
+        elapsed = time.perf_counter() - start
+    else:
+        import animations
+        kind = stage[len('anim_'):]
+        session = animations.AnimationSession(traj, output_dir=os.path.join(WORK_DIR, 'animaciones'))
+        start = time.perf_counter()
+        session.export(kind, anim_frames)
+        elapsed = time.perf_counter() - start
+    print(json.dumps({'seconds': elapsed}))
+
+
+def run_benchmark(stage, steps, args):
+    """Mejor tiempo de `args.repeats` corridas y RSS máximo de una etapa"""
+    best, rss = None, 0.0
+    for _ in range(args.repeats):
+        elapsed, peak, output = measure(stage_command(stage, steps, args))
+        if stage != 'compile' and stage not in SIM_STAGES:
+            # El hijo reporta el tiempo de la parte medida (sin arranque ni imports)
+            elapsed = json.loads(output.strip().splitlines()[-1])['seconds']
+        best = elapsed if best is None else min(best, elapsed)
+        rss = max(rss, peak)
+
+    record = {'stage': stage, 'steps': steps, 'seconds': best, 'peak_rss_mb': rss,
+              'steps_per_s': None, 'mb_per_s': None}
+    if steps:
+        record['steps_per_s'] = steps / best
+        n_bytes = stage_bytes(stage, steps)
+        if n_bytes is not None:
+            record['mb_per_s'] = n_bytes / 2**20 / best
+    return record
+
+
+def format_record(record):
+    steps = f"{record['steps']:.0e}" if record['steps'] else '-'
+    rate = f"{record['steps_per_s']:.3g} pasos/s" if record['steps_per_s'] else ''
+    mbs = f"{record['mb_per_s']:.1f} MB/s" if record['mb_per_s'] else ''
+    return (f"   {record['stage']:<14} {steps:>6} {record['seconds']:10.4f} s "
+            f"{record['peak_rss_mb']:8.1f} MB  {rate:>18} {mbs:>12}")
+
+
+def run_suite(args):
+    """Corre todas las etapas pedidas y retorna el reporte (dict)"""
+    os.makedirs(WORK_DIR, exist_ok=True)
+    stages = [s for s in ALL_STAGES if s in args.stages]
+    sizes = sorted(int(float(s)) for s in args.sizes)
+    results = []
+
+    def record(stage, steps):
+        try:
+            result = run_benchmark(stage, steps, args)
+        except Exception as e:
+            print(f"❌ {stage} ({steps} pasos): {e}")
+            return
+        print(format_record(result))
+        results.append(result)
+
+    print("=== BENCHMARKS DEL MOTOR MOLECULAR ===")
+    # La compilación es necesaria para el resto aunque no se mida
+    if 'compile' not in stages and not os.path.exists(SIM_EXE):
+        measure(compile_command())
+    for stage in stages:
+        if stage in FIXED_STAGES:
+            record(stage, None)
+
+    for steps in sizes:
+        print(f"\n📏 {steps:,} pasos")
+        needs_text = steps <= args.max_text_steps
+        # Los archivos de datos se generan aunque no se midan sus etapas
+        if 'sim_bin' not in stages and any(s in stages for s in LOAD_STAGES[1:] + FIGURE_STAGES + ANIMATION_STAGES):
+            measure(stage_command('sim_bin', steps, args))
+        if 'sim_text' not in stages and 'load_loadtxt' in stages and needs_text:
+            measure(stage_command('sim_text', steps, args))
+
+        for stage in stages:
+            if stage in FIXED_STAGES:
+                continue
+            if stage in TEXT_STAGES and not needs_text:
+                print(f"   {stage:<14} omitida (> --max-text-steps)")
+                continue
+            record(stage, steps)
+
+        if not args.keep_data:
+            for path in data_paths(steps):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    return {
+        'meta': {
+            'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'host': platform.node(),
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'repeats': args.repeats,
+            'sizes': sizes,
+        },
+        'results': results,
+    }
+
+
+def compare_reports(baseline, current, tolerance, min_seconds=0.01):
+    """
+    Compara etapa por etapa (mismo nombre y longitud). Una etapa es regresión
+    si su tiempo o su RSS crecen más de `tolerance` (fracción) respecto de la
+    referencia; diferencias de tiempo menores que `min_seconds` se consideran
+    ruido. Retorna el número de regresiones.
+    """
+    reference = {(r['stage'], r['steps']): r for r in baseline['results']}
+    regressions = 0
+    print(f"\n=== COMPARACIÓN CON LA REFERENCIA (tolerancia {tolerance:.0%}) ===")
+    for result in current['results']:
+        key = (result['stage'], result['steps'])
+        if key not in reference:
+            continue
+        ref = reference[key]
+        time_ratio = result['seconds'] / ref['seconds'] if ref['seconds'] > 0 else 1.0
+        rss_ratio = result['peak_rss_mb'] / ref['peak_rss_mb'] if ref['peak_rss_mb'] > 0 else 1.0
+        delta = result['seconds'] - ref['seconds']
+        slower = time_ratio > 1.0 + tolerance and delta > min_seconds
+        bigger = rss_ratio > 1.0 + tolerance
+        if slower or bigger:
+            regressions += 1
+            mark = "❌ REGRESIÓN"
+        elif time_ratio < 1.0 - tolerance and -delta > min_seconds:
+            mark = "✅ mejora"
+        else:
+            mark = "  igual"
+        steps = f"{result['steps']:.0e}" if result['steps'] else '-'
+        print(f"   {result['stage']:<14} {steps:>6}  tiempo x{time_ratio:5.2f}  RSS x{rss_ratio:5.2f}  {mark}")
+
+    if regressions:
+        print(f"\n⚠️  {regressions} etapa(s) con regresión")
+    else:
+        print("\n✅ Sin regresiones")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del pipeline del motor molecular")
+    parser.add_argument('--sizes', nargs='+', default=['1e4', '1e5', '1e6'],
+                        help="Longitudes de trayectoria en pasos (p.ej. 1e4 1e5 1e6 1e7 1e8)")
+    parser.add_argument('--stages', nargs='+', default=list(ALL_STAGES), choices=ALL_STAGES,
+                        metavar='ETAPA', help="Etapas a medir: " + ", ".join(ALL_STAGES))
+    parser.add_argument('--repeats', type=int, default=3,
+                        help="Repeticiones por etapa (se reporta el mejor tiempo)")
+    parser.add_argument('--max-text-steps', type=float, default=1e7,
+                        help="No escribir/leer texto por encima de esta longitud")
+    parser.add_argument('--anim-frames', type=int, default=30,
+                        help="Cuadros por animación en las etapas anim_*")
+    parser.add_argument('--keep-data', action='store_true',
+                        help="Conservar las trayectorias generadas en results/benchmarks/work")
+    parser.add_argument('--output', help="Archivo JSON del reporte (por defecto con fecha y hora)")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help=f"Guardar además el reporte como referencia ({BASELINE_FILE})")
+    parser.add_argument('--compare', nargs='?', const=BASELINE_FILE, metavar='REFERENCIA',
+                        help="Comparar contra un reporte de referencia")
+    parser.add_argument('--current', help="Con --compare: reporte ya existente en lugar de correr la suite")
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help="Aumento relativo de tiempo o RSS considerado regresión")
+    parser.add_argument('--min-seconds', type=float, default=0.01,
+                        help="Diferencias de tiempo menores que esto se consideran ruido")
+    parser.add_argument('--run-stage', help=argparse.SUPPRESS)
+    parser.add_argument('--data', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_stage:
+        run_stage_in_child(args.run_stage, args.data, args.anim_frames)
+        return
+
+    if args.current:
+        with open(args.current) as f:
+            report = json.load(f)
+    else:
+        report = run_suite(args)
+        os.makedirs(BENCH_DIR, exist_ok=True)
+        output = args.output or os.path.join(BENCH_DIR, time.strftime('benchmark_%Y%m%d_%H%M%S.json'))
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📊 Reporte guardado: {output}")
+        if args.save_baseline:
+            shutil.copyfile(output, BASELINE_FILE)
+            print(f"📌 Referencia guardada: {BASELINE_FILE}")
+
+    if args.compare:
+        if not os.path.exists(args.compare):
+            print(f"❌ No existe la referencia: {args.compare}")
+            sys.exit(1)
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare_reports(baseline, report, args.tolerance, args.min_seconds):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
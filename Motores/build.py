@@ -1,6 +1,89 @@
+import argparse
+import concurrent.futures
+import csv
+import hashlib
+import itertools
+import json
 import os
+import re
 import subprocess
 import sys
+import time
+
+import numpy as np
+
+import profiling
+from results_cache import ResultsCache, file_digest, make_key
+from trajectory_io import load_summary
+
+SIM_EXE = "bin/motor_sim.exe"
+BENCH_EXE = "bin/bench_integrator.exe"
+BENCH_SYSTEM_EXE = "bin/bench_system.exe"
+LIB_FILE = "bin/libmotor.so"
+
+# Fuentes comunes al ejecutable y a la biblioteca (todo salvo main.cpp)
+CORE_SOURCES = [
+    "src/Potential.cpp", "src/TabulatedPotential.cpp", "src/ChemicalState.cpp", "src/RandomStream.cpp",
+    "src/MotorModel.cpp", "src/Integrator.cpp", "src/Simulator.cpp",
+    "src/DataWriter.cpp", "src/RunStatistics.cpp", "src/CommandLine.cpp",
+    "src/ThreadPool.cpp", "src/EnsembleSimulator.cpp", "src/Checkpoint.cpp",
+    "src/NeighborList.cpp", "src/MotorSystem.cpp", "src/Profiler.cpp"
+]
+# Bibliotecas del enlace (después de los objetos): zlib para el formato .mtz
+LINK_LIBS = ["-lz"]
+SWEEP_DIR = "results/sweep"
+DATA_FILE = "results/datos_motor_dos_estados_langevin.txt"
+FIGURES_DIR = "results/figures"
+
+# Semilla fija del pipeline y del barrido: sin ella cada corrida sería
+# distinta y no se podría reutilizar desde la caché de resultados
+DEFAULT_SEED = 1
+# Scripts de los que dependen las figuras (parte de su clave en la caché)
+PLOT_SOURCES = ["plot_results.py", "trajectory_io.py"]
+
+# Compilación incremental: un objeto por unidad de traducción en
+# build/<perfil>/, recompilado sólo si cambia el hash de su fuente, de los
+# encabezados locales que incluye o de las banderas
+COMPILER = "g++"
+BUILD_DIR = "build"
+MANIFEST_FILE = os.path.join(BUILD_DIR, "manifest.json")
+BASE_FLAGS = ["-Iinclude", "-std=c++11", "-pthread"]
+INCLUDE_DIRS = ["include"]
+INCLUDE_PATTERN = re.compile(r'^\s*#\s*include\s*"([^"]+)"', re.MULTILINE)
+
+# Banderas de optimización por perfil (con -flto se repiten al enlazar).
+# -ffp-contract=off evita que -march=native fusione multiplicaciones y
+# sumas (FMA): las trayectorias son idénticas bit a bit a las de release
+PROFILES = {
+    'debug': ["-O0", "-g"],
+    'release': ["-O2"],
+    'native': ["-O3", "-march=native", "-flto", "-ffp-contract=off"],
+    'pgo': ["-O3", "-march=native", "-flto", "-ffp-contract=off"],
+}
+DEFAULT_PROFILE = 'release'
+
+# Corridas de entrenamiento del perfil pgo: trayectoria registrada y
+# conmutación de Markov sin registro
+PGO_DIR = os.path.join(BUILD_DIR, "pgo")
+PGO_TRAINING = [
+    ["--seed=1", "--T_total=2000", "--log-every=10", os.path.join(PGO_DIR, "entrenamiento.bin")],
+    ["--seed=2", "--T_total=2000", "--switching=markov", "--log=none",
+     f"--summary={os.path.join(PGO_DIR, 'entrenamiento_resumen.txt')}"],
+]
+
+# Ejecutables y biblioteca: (salida, fuentes, banderas de enlace extra)
+TARGETS = {
+    'sim': (SIM_EXE, ["src/main.cpp"] + CORE_SOURCES, []),
+    'lib': (LIB_FILE, ["src/MotorAPI.cpp"] + CORE_SOURCES, ["-shared"]),
+    'bench': (BENCH_EXE, ["bench/bench_integrator.cpp", "src/Potential.cpp", "src/TabulatedPotential.cpp",
+                          "src/ChemicalState.cpp", "src/RandomStream.cpp", "src/MotorModel.cpp",
+                          "src/Integrator.cpp"], []),
+    'bench-system': (BENCH_SYSTEM_EXE, ["bench/bench_system.cpp"] + CORE_SOURCES, []),
+}
+
+# Parámetros que acepta motor_sim (ver include/Parameters.h)
+SIM_PARAMETERS = ('m', 'k0', 'k1', 'l', 'T_off', 'T_on', 'gamma', 'kBT',
+                  'T_total', 'dt', 'initial_x', 'initial_v')
 
 def run_command(cmd, description):
     print(f"\n📍 {description}...")
@@ -23,7 +106,275 @@ def run_command(cmd, description):
         print(f"❌ Excepción en {description}: {e}")
         return False
 
-def main():
+def compile_command(output=SIM_EXE):
+    """Comando g++ del simulador en una sola invocación, sin caché (lo usa benchmarks.py)"""
+    return [
+        "g++", "-o", output,
+        "-Iinclude", "-std=c++11", "-O2", "-pthread",
+        "src/main.cpp"
+    ] + CORE_SOURCES + LINK_LIBS
+
+def library_command(output=LIB_FILE):
+    """Comando g++ de la biblioteca compartida para motor_binding.py"""
+    return [
+        "g++", "-o", output, "-shared", "-fPIC",
+        "-Iinclude", "-std=c++11", "-O2", "-pthread",
+        "src/MotorAPI.cpp"
+    ] + CORE_SOURCES + LINK_LIBS
+
+def compiler_version():
+    """Versión del compilador (forma parte del hash de cada objeto)"""
+    result = subprocess.run([COMPILER, "-dumpfullversion", "-dumpversion"],
+                            capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+def local_headers(path, cache):
+    """Encabezados locales (#include "...") que incluye `path`, transitivamente"""
+    if path in cache:
+        return cache[path]
+    cache[path] = set()   # Cortar ciclos de inclusión
+    with open(path, encoding='utf-8', errors='replace') as f:
+        names = INCLUDE_PATTERN.findall(f.read())
+    found = set()
+    for name in names:
+        for directory in [os.path.dirname(path)] + INCLUDE_DIRS:
+            candidate = os.path.normpath(os.path.join(directory, name))
+            if os.path.isfile(candidate):
+                found.add(candidate)
+                found |= local_headers(candidate, cache)
+                break
+    cache[path] = found
+    return found
+
+
+def source_hash(source, flags, header_cache, extra_files=()):
+    """Hash del contenido de la fuente, de sus encabezados y de las banderas"""
+    h = hashlib.sha256()
+    h.update("\0".join([COMPILER] + flags).encode())
+    for path in [source] + sorted(local_headers(source, header_cache)) + list(extra_files):
+        h.update(path.encode())
+        h.update(file_digest(path).encode())
+    return h.hexdigest()
+
+
+def load_manifest():
+    """{"objects": {objeto: hash}, "links": {salida: hash}} de la última compilación"""
+    try:
+        with open(MANIFEST_FILE) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    manifest.setdefault('objects', {})
+    manifest.setdefault('links', {})
+    return manifest
+
+
+def save_manifest(manifest):
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    tmp = MANIFEST_FILE + ".tmp"
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, MANIFEST_FILE)
+
+
+def object_path(source, object_dir):
+    """src/Potential.cpp -> build/<perfil>/src_Potential.o"""
+    stem = os.path.splitext(os.path.normpath(source))[0].replace(os.sep, '_')
+    return os.path.join(object_dir, stem + ".o")
+
+
+def compile_objects(sources, flags, object_dir, manifest, jobs, profile_data=False):
+    """
+    Compilar en paralelo las unidades cuyo hash cambió. Con profile_data el
+    hash incluye el .gcda de cada objeto (fase -fprofile-use de pgo).
+    Devuelve (objetos, hashes, recompilados) o None si alguna falla.
+    """
+    os.makedirs(object_dir, exist_ok=True)
+    version = compiler_version()
+    header_cache = {}
+    objects, hashes, pending = [], [], []
+    for source in sources:
+        obj = object_path(source, object_dir)
+        gcda = os.path.splitext(obj)[0] + ".gcda"
+        extra = [gcda] if profile_data and os.path.exists(gcda) else []
+        digest = source_hash(source, flags + [version], header_cache, extra)
+        objects.append(obj)
+        hashes.append(digest)
+        if manifest['objects'].get(obj) != digest or not os.path.exists(obj):
+            pending.append((source, obj, digest))
+
+    def compile_one(job):
+        source, obj, _ = job
+        cmd = [COMPILER, "-c", "-o", obj] + BASE_FLAGS + flags + [source]
+        return subprocess.run(cmd, capture_output=True, text=True)
+
+    failed = False
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+        for job, result in zip(pending, pool.map(compile_one, pending)):
+            source, obj, digest = job
+            if result.returncode != 0:
+                print(f"   ❌ {source}")
+                print(result.stderr)
+                manifest['objects'].pop(obj, None)
+                failed = True
+            else:
+                print(f"   🔨 {source}")
+                manifest['objects'][obj] = digest
+    save_manifest(manifest)
+    if failed:
+        return None
+    return objects, hashes, len(pending)
+
+
+def link(output, objects, hashes, flags, manifest):
+    """Enlazar si cambió algún objeto o banderas (o si falta la salida)"""
+    digest = hashlib.sha256("\0".join(flags + objects + hashes + LINK_LIBS).encode()).hexdigest()
+    if manifest['links'].get(output) == digest and os.path.exists(output):
+        return True, False
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    cmd = [COMPILER, "-o", output] + flags + objects + LINK_LIBS
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"   ❌ Enlace de {output}")
+        print(result.stderr)
+        manifest['links'].pop(output, None)
+        save_manifest(manifest)
+        return False, False
+    manifest['links'][output] = digest
+    save_manifest(manifest)
+    return True, True
+
+
+def build_objects_and_link(output, sources, link_flags, flags, object_dir, manifest, jobs,
+                           profile_data=False):
+    compiled = compile_objects(sources, flags, object_dir, manifest, jobs, profile_data)
+    if compiled is None:
+        return None
+    objects, hashes, rebuilt = compiled
+    ok, linked = link(output, objects, hashes, ["-pthread"] + flags + link_flags, manifest)
+    if not ok:
+        return None
+    return rebuilt, linked
+
+
+def train_pgo(flags, manifest, jobs):
+    """
+    Fase 1 de pgo: motor_sim instrumentado (-fprofile-generate) y corridas
+    de entrenamiento. Los .gcda quedan junto a los objetos de build/pgo/,
+    donde los busca la fase -fprofile-use. Se repite sólo si cambian las
+    fuentes del simulador.
+    """
+    _, sources, _ = TARGETS['sim']
+    instrumented = os.path.join(PGO_DIR, "motor_sim_instrumentado.exe")
+    header_cache = {}
+    training_key = hashlib.sha256("\0".join(
+        [source_hash(s, flags + [compiler_version()], header_cache) for s in sources] +
+        [json.dumps(PGO_TRAINING)]).encode()).hexdigest()
+    gcda_files = [os.path.splitext(object_path(s, PGO_DIR))[0] + ".gcda" for s in sources]
+    if manifest.get('pgo_training') == training_key and all(os.path.exists(g) for g in gcda_files):
+        print("   ✓ Perfil de entrenamiento vigente")
+        return True
+
+    print("   📈 Compilando motor_sim instrumentado")
+    for gcda in gcda_files:
+        if os.path.exists(gcda):
+            os.remove(gcda)
+    if build_objects_and_link(instrumented, sources, [], flags + ["-fprofile-generate"],
+                              PGO_DIR, manifest, jobs) is None:
+        return False
+    for args in PGO_TRAINING:
+        print(f"   🏃 Entrenamiento: motor_sim {' '.join(args)}")
+        result = subprocess.run([instrumented] + args, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(result.stderr)
+            return False
+    manifest['pgo_training'] = training_key
+    save_manifest(manifest)
+    return True
+
+
+def build_target(target, profile=DEFAULT_PROFILE, jobs=0):
+    """
+    Compilación incremental de un destino de TARGETS con el perfil dado.
+    Los objetos de cada perfil se conservan: cambiar de perfil sólo vuelve
+    a enlazar si los objetos ya están al día.
+    """
+    output, sources, link_flags = TARGETS[target]
+    flags = list(PROFILES[profile])
+    object_dir = os.path.join(BUILD_DIR, profile)
+    if target == 'lib':
+        flags.append("-fPIC")
+        object_dir += "-pic"
+    jobs = jobs or os.cpu_count() or 1
+    manifest = load_manifest()
+
+    print(f"\n📍 Compilación incremental de {output} (perfil {profile}, {jobs} procesos)...")
+    start = time.perf_counter()
+    profile_data = False
+    if profile == 'pgo':
+        if target != 'sim':
+            print("❌ El perfil pgo sólo se entrena con motor_sim")
+            return False
+        if not train_pgo(flags, manifest, jobs):
+            print("❌ Falló el entrenamiento de pgo")
+            return False
+        flags += ["-fprofile-use", "-fprofile-correction", "-Wno-missing-profile"]
+        profile_data = True
+
+    built = build_objects_and_link(output, sources, link_flags, flags, object_dir, manifest,
+                                   jobs, profile_data)
+    if built is None:
+        print(f"❌ Error al compilar {output}")
+        return False
+    rebuilt, linked = built
+    elapsed = time.perf_counter() - start
+    if rebuilt == 0 and not linked:
+        print(f"✅ {output} al día ({elapsed:.2f} s)")
+    else:
+        print(f"✅ {output}: {rebuilt}/{len(sources)} unidades recompiladas"
+              f"{', enlazado' if linked else ''} ({elapsed:.2f} s)")
+    return True
+
+
+def compile_library(profile=DEFAULT_PROFILE, jobs=0):
+    """Compila bin/libmotor.so (simulación en el mismo proceso desde Python)"""
+    print("=== BIBLIOTECA COMPARTIDA (ctypes) ===")
+    return build_target('lib', profile, jobs)
+
+def compile_simulator(profile=DEFAULT_PROFILE, jobs=0):
+    """Etapa de compilación C++ (compartida por el pipeline y el barrido)"""
+    print("\n" + "="*50)
+    print("🔧 ETAPA 1: COMPILACIÓN C++")
+    print("="*50)
+    
+    if not build_target('sim', profile, jobs):
+        print("❌ Falla en compilación - deteniendo proceso")
+        return False
+    return True
+
+def cached_stage(cache, key, produce, description):
+    """
+    Etapa reutilizable: si la entrada `key` está en la caché se copian sus
+    archivos a las rutas originales; si no, produce() genera los archivos
+    ({nombre: ruta}, o None si falla) y se guardan bajo `key`.
+    """
+    if cache is not None and cache.get(key) is not None:
+        paths = cache.meta(key)['paths']
+        cache.restore(key, paths)
+        profiling.count('aciertos_cache')
+        print(f"♻️  {description}: {len(paths)} archivo(s) restaurados de la caché ({key[:12]})")
+        return True
+    outputs = produce()
+    if outputs is None:
+        return False
+    if cache is not None:
+        cache.put(key, outputs, meta={'paths': outputs})
+        print(f"💾 {description}: guardado en la caché ({key[:12]})")
+    return True
+
+def run_pipeline(profile=DEFAULT_PROFILE, jobs=0, seed=DEFAULT_SEED, cache=None):
+    """Pipeline original: compilación + simulación + gráficas"""
     print("=== CONSTRUCCIÓN COMPLETA DE MOTOR MOLECULAR ===")
     print("Incluye: Compilación + Simulación + Gráficas\n")
     
@@ -34,23 +385,13 @@ def main():
     # Crear directorios necesarios
     print("\n📁 Creando directorios...")
     os.makedirs("bin", exist_ok=True)
-    os.makedirs("results/figures", exist_ok=True)
+    os.makedirs(FIGURES_DIR, exist_ok=True)
     print("✅ Directorios creados")
     
     # 1. COMPILAR C++
-    print("\n" + "="*50)
-    print("🔧 ETAPA 1: COMPILACIÓN C++")
-    print("="*50)
-    
-    compile_cmd = [
-        "g++", "-o", "bin/motor_sim.exe", 
-        "-Iinclude", "-std=c++11", "-O2",
-        "src/main.cpp", "src/Potential.cpp", "src/ChemicalState.cpp",
-        "src/MotorModel.cpp", "src/Integrator.cpp", "src/Simulator.cpp"
-    ]
-    
-    if not run_command(compile_cmd, "Compilación C++"):
-        print("❌ Falla en compilación - deteniendo proceso")
+    with profiling.stage('compilacion'):
+        compiled = compile_simulator(profile, jobs)
+    if not compiled:
         return
     
     # 2. EJECUTAR SIMULACIÓN
@@ -58,7 +399,18 @@ def main():
     print("🚀 ETAPA 2: SIMULACIÓN C++")
     print("="*50)
     
-    if not run_command(["bin/motor_sim.exe"], "Simulación C++"):
+    # Clave: contenido del ejecutable + argumentos (semilla incluida)
+    sim_cmd = [SIM_EXE, f"--seed={seed}"]
+    sim_key = make_key('pipeline-sim', file_digest(SIM_EXE), sim_cmd[1:])
+
+    def simulate():
+        if not run_command(sim_cmd, "Simulación C++"):
+            return None
+        return {os.path.basename(DATA_FILE): DATA_FILE} if os.path.exists(DATA_FILE) else None
+
+    with profiling.stage('simulacion'):
+        simulated = cached_stage(cache, sim_key, simulate, "Simulación C++")
+    if not simulated:
         print("❌ Falla en simulación - deteniendo proceso")
         return
     
@@ -67,7 +419,7 @@ def main():
     print("📊 ETAPA 3: VERIFICACIÓN DE DATOS")
     print("="*50)
     
-    data_file = "results/datos_motor_dos_estados_langevin.txt"
+    data_file = DATA_FILE
     if not os.path.exists(data_file):
         print(f"❌ No se encontró el archivo de datos: {data_file}")
         print("Buscando archivos en results/:")
@@ -96,9 +448,19 @@ def main():
     
     # Ejecutar tu script de gráficas existente
     plot_cmd = [sys.executable, "plot_results.py"]
-    
-    print(f"🚀 Ejecutando tu script de gráficas...")
-    success = run_command(plot_cmd, "Generación de gráficas")
+    figures_key = make_key('pipeline-figures', sim_key, [file_digest(f) for f in PLOT_SOURCES])
+
+    def plot():
+        start = time.time()
+        print(f"🚀 Ejecutando tu script de gráficas...")
+        if not run_command(plot_cmd, "Generación de gráficas"):
+            return None
+        # Figuras escritas en esta ejecución
+        return {name: os.path.join(FIGURES_DIR, name) for name in os.listdir(FIGURES_DIR)
+                if name.endswith('.png') and os.path.getmtime(os.path.join(FIGURES_DIR, name)) >= start - 1}
+
+    with profiling.stage('graficas'):
+        success = cached_stage(cache, figures_key, plot, "Generación de gráficas")
     
     # 5. RESULTADO FINAL
     print("\n" + "="*50)
@@ -111,10 +473,10 @@ def main():
         print("✅ Simulación: ✓")
         print("✅ Gráficas: ✓")
         print(f"📊 Datos: {data_file}")
-        print(f"🖼️  Figuras: results/figures/")
+        print(f"🖼️  Figuras: {FIGURES_DIR}/")
         
         # Mostrar gráficas generadas
-        figures_dir = "results/figures"
+        figures_dir = FIGURES_DIR
         if os.path.exists(figures_dir):
             figures = [f for f in os.listdir(figures_dir) if f.endswith('.png')]
             if figures:
@@ -132,5 +494,233 @@ def main():
         print("   2. Que matplotlib y numpy estén instalados")
         print("   3. Que plot_results.py esté en el mismo directorio")
 
+def run_benchmark(steps, repeats, profile=DEFAULT_PROFILE, jobs=0):
+    """Compila y ejecuta el micro-benchmark del integrador (ns/paso)"""
+    print("=== BENCHMARK DEL INTEGRADOR ===")
+    if not build_target('bench', profile, jobs):
+        return False
+    return run_command([BENCH_EXE, str(steps), str(repeats)], "Benchmark del integrador")
+
+def run_system_benchmark(motor_steps, repeats, profile=DEFAULT_PROFILE, jobs=0):
+    """Compila y ejecuta el benchmark de escalado de motores acoplados (10, 10^3, 10^5)"""
+    print("=== BENCHMARK DE MOTORES ACOPLADOS ===")
+    if not build_target('bench-system', profile, jobs):
+        return False
+    return run_command([BENCH_SYSTEM_EXE, str(motor_steps), str(repeats)],
+                       "Benchmark de motores acoplados")
+
+def parse_grid_spec(spec):
+    """
+    Interpretar un eje del barrido: "k1=1,5,10" (lista de valores) o
+    "T_on=0.5:4:8" (inicio:fin:número de puntos, como np.linspace).
+    """
+    if '=' not in spec:
+        raise ValueError(f"Eje de barrido inválido '{spec}' (se esperaba clave=valores)")
+    key, values = (part.strip() for part in spec.split('=', 1))
+    if key not in SIM_PARAMETERS:
+        raise ValueError(f"Parámetro desconocido en el barrido: {key}")
+
+    if ':' in values:
+        start, stop, num = values.split(':')
+        grid = np.linspace(float(start), float(stop), int(num)).tolist()
+    else:
+        grid = [float(v) for v in values.split(',') if v.strip()]
+    if not grid:
+        raise ValueError(f"El eje '{key}' no tiene valores")
+    return key, grid
+
+
+def expand_grid(axes):
+    """Producto cartesiano de los ejes -> lista de diccionarios {parámetro: valor}"""
+    keys = [key for key, _ in axes]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(grid for _, grid in axes))]
+
+
+def run_key(point):
+    """
+    Nombre de archivo a partir de los parámetros del punto (k1-10.0_T_on-2.0).
+    repr conserva todas las cifras: puntos distintos no comparten archivos.
+    """
+    return "_".join(f"{key}-{value!r}" for key, value in point.items())
+
+
+def run_sweep_point(point, fixed, out_dir, sim_args, exe_digest=None, cache_mb=None):
+    """
+    Ejecutar un punto del barrido (se llama dentro de un proceso del pool).
+    Con exe_digest el punto se busca primero en la caché de resultados.
+    """
+    key = run_key(point)
+    data_file = os.path.join(out_dir, f"run_{key}.bin")
+    summary_file = os.path.join(out_dir, f"run_{key}_resumen.txt")
+
+    cmd = [SIM_EXE, "--output", data_file, "--summary", summary_file]
+    for name, value in {**fixed, **point}.items():
+        cmd.append(f"--{name}={value!r}")
+    cmd.extend(sim_args)
+
+    # Clave sin las rutas de salida: un punto revisitado desde otro
+    # directorio de barrido también se reutiliza
+    cache = ResultsCache(budget_mb=cache_mb) if exe_digest else None
+    cache_key = make_key('sweep-point', exe_digest, cmd[5:])
+    outputs = {'resumen.txt': summary_file}
+    if "none" not in sim_args:
+        outputs['datos.bin'] = data_file
+
+    cached = cache is not None and cache.get(cache_key) is not None
+    if cached:
+        cache.restore(cache_key, outputs)
+        row = {'point': point, 'key': key, 'ok': True, 'data_file': data_file, 'error': ''}
+    else:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        row = {'point': point, 'key': key, 'ok': result.returncode == 0,
+               'data_file': data_file, 'error': result.stderr.strip()}
+        if row['ok'] and cache is not None:
+            cache.put(cache_key, outputs)
+    row['cached'] = cached
+    if row['ok']:
+        row['summary'] = load_summary(summary_file)
+    if not os.path.exists(data_file):
+        row['data_file'] = ''   # Barrido sólo con resumen (--log none)
+    return row
+
+
+def run_sweep(args):
+    """Barrido de parámetros en paralelo sobre un pool de procesos"""
+    print("\n" + "="*50)
+    print("🧪 BARRIDO DE PARÁMETROS")
+    print("="*50)
+
+    try:
+        axes = [parse_grid_spec(spec) for spec in args.sweep]
+        fixed = dict(parse_grid_spec(spec) for spec in args.param)
+        fixed = {key: grid[0] for key, grid in fixed.items()}
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+
+    points = expand_grid(axes)
+    jobs = args.jobs or os.cpu_count() or 1
+    sim_args = ["--log-every", str(args.log_every)] if args.log_every > 0 else ["--log", "none"]
+    sim_args += ["--seed", str(args.seed)]
+    exe_digest = None if args.no_cache else file_digest(SIM_EXE)
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    print(f"📐 Puntos del barrido: {len(points)}  |  Procesos: {jobs}")
+    rows = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_sweep_point, point, fixed, args.out_dir, sim_args,
+                               exe_digest, args.cache_mb)
+                   for point in points]
+        for future in concurrent.futures.as_completed(futures):
+            row = future.result()
+            rows.append(row)
+            if row['ok']:
+                mark = "♻️ " if row['cached'] else "✅"
+                print(f"   {mark} {row['key']}: <v> = {row['summary']['drift_velocity']:.5f}")
+            else:
+                print(f"   ❌ {row['key']}: {row['error']}")
+
+    # Tabla de resultados en el orden del grid
+    order = {run_key(point): i for i, point in enumerate(points)}
+    rows.sort(key=lambda row: order[row['key']])
+    table_file = os.path.join(args.out_dir, "barrido.csv")
+    columns = [key for key, _ in axes]
+    with open(table_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns + ['T_cycle', 'drift_velocity', 'mean_x', 'var_x',
+                                   'net_displacement', 'data_file'])
+        for row in rows:
+            if not row['ok']:
+                continue
+            params = {**fixed, **row['point']}
+            T_cycle = params.get('T_off', 2.0) + params.get('T_on', 2.0)
+            summary = row['summary']
+            writer.writerow([row['point'][c] for c in columns] +
+                            [T_cycle, summary['drift_velocity'], summary['mean_x'],
+                             summary['var_x'], summary['net_displacement'], row['data_file']])
+
+    failed = sum(not row['ok'] for row in rows)
+    print(f"\n📋 Tabla del barrido: {table_file}")
+    print(f"♻️  Puntos reutilizados de la caché: {sum(row['cached'] for row in rows)}/{len(rows)}")
+    if failed:
+        print(f"⚠️  {failed} punto(s) fallaron")
+    return failed == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compilación + simulación + gráficas del motor molecular")
+    parser.add_argument('--sweep', nargs='+', metavar='PARAM=VALORES',
+                        help="Barrido: ejes como k1=1,5,10 o T_on=0.5:4:8")
+    parser.add_argument('--param', nargs='+', default=[], metavar='PARAM=VALOR',
+                        help="Parámetros fijos para todos los puntos (p.ej. T_total=100)")
+    parser.add_argument('--jobs', type=int, default=0,
+                        help="Procesos en paralelo del barrido y de la compilación "
+                             "(por defecto: todos los núcleos)")
+    parser.add_argument('--profile', choices=sorted(PROFILES), default=DEFAULT_PROFILE,
+                        help="Perfil de compilación: debug (-O0 -g), release (-O2), "
+                             "native (-O3 -march=native -flto) o pgo (native + perfil de "
+                             "una corrida de entrenamiento de motor_sim)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help="Semilla de la simulación del pipeline y de cada punto del barrido")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="No usar la caché de resultados (results/cache)")
+    parser.add_argument('--cache-mb', type=float, default=None,
+                        help="Presupuesto en disco de la caché en MB (por defecto "
+                             "$MOTOR_CACHE_MB o 2048); se desalojan las entradas menos usadas")
+    parser.add_argument('--compile', action='store_true',
+                        help="Sólo compilar motor_sim (incremental) sin simular ni graficar")
+    parser.add_argument('--log-every', type=int, default=0,
+                        help="Guardar la trayectoria cada K pasos (0 = solo resumen)")
+    parser.add_argument('--out-dir', default=SWEEP_DIR,
+                        help="Directorio de salida del barrido")
+    parser.add_argument('--lib', action='store_true',
+                        help="Compilar bin/libmotor.so para motor_binding.py")
+    parser.add_argument('--bench', action='store_true',
+                        help="Compilar y ejecutar el micro-benchmark del integrador")
+    parser.add_argument('--bench-steps', type=int, default=10000000,
+                        help="Pasos por repetición del benchmark")
+    parser.add_argument('--bench-repeats', type=int, default=5,
+                        help="Repeticiones del benchmark (se reporta la mejor)")
+    parser.add_argument('--bench-system', action='store_true',
+                        help="Benchmark de escalado de motores acoplados (10, 10^3, 10^5)")
+    parser.add_argument('--bench-motor-steps', type=int, default=20000000,
+                        help="Pasos-motor por tamaño en --bench-system")
+    parser.add_argument('--profile-dir', default=None, metavar='DIR',
+                        help="Perfil por etapas: build.py, motor_sim y los scripts de gráficas "
+                             "dejan cada uno DIR/<programa>-<pid>.json (como MOTOR_PROFILE=DIR)")
+    args = parser.parse_args()
+
+    if args.profile_dir:
+        os.environ[profiling.ENV_VARIABLE] = os.path.abspath(args.profile_dir)
+    profiler = profiling.configure('build')
+
+    if args.lib:
+        if not compile_library(args.profile, args.jobs):
+            sys.exit(1)
+    elif args.compile:
+        if not build_target('sim', args.profile, args.jobs):
+            sys.exit(1)
+    elif args.bench:
+        if not run_benchmark(args.bench_steps, args.bench_repeats, args.profile, args.jobs):
+            sys.exit(1)
+    elif args.bench_system:
+        if not run_system_benchmark(args.bench_motor_steps, args.bench_repeats, args.profile, args.jobs):
+            sys.exit(1)
+    elif args.sweep:
+        print("=== BARRIDO DE PARÁMETROS DEL MOTOR MOLECULAR ===")
+        if not compile_simulator(args.profile, args.jobs):
+            sys.exit(1)
+        if not run_sweep(args):
+            sys.exit(1)
+    else:
+        cache = None if args.no_cache else ResultsCache(budget_mb=args.cache_mb)
+        run_pipeline(args.profile, args.jobs, args.seed, cache)
+
+    if profiler is not None:
+        print(f"\n⏱️  Reportes de perfil en {os.environ[profiling.ENV_VARIABLE]} "
+              f"(resumen: python profiling.py {os.environ[profiling.ENV_VARIABLE]})")
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
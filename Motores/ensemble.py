@@ -0,0 +1,145 @@
+"""
+Motor de ensamble vectorizado (NumPy) para la ecuación de Langevin.
+
+Reproduce el mismo esquema BAOAB de StochasticVelocityVerletIntegrator::step
+(mismos c1, sigma y medios pasos de fuerza) y la misma conmutación
+determinista de ChemicalState::update (fmod(t, T_cycle) < T_off), pero sobre
+arreglos de N partículas independientes a la vez.
+
+Uso típico desde plot_results.py / animations.py:
+
+    from ensemble import simulate_ensemble
+    res = simulate_ensemble(10000, T_total=10.0, record_every=10, seed=1)
+    res['x']   # arreglo (n_registros, N)
+"""
+import numpy as np
+
+# Parámetros por defecto (deben coincidir con main.cpp)
+PARAMETROS_MAIN = {
+    'm': 1.0,
+    'k0': 10.0,
+    'k1': 10.0,
+    'l': 0.5,
+    'T_off': 2.0,
+    'T_on': 2.0,
+    'gamma': 10.0,
+    'kBT': 0.01,
+    'T_total': 10.0,
+    'dt': 0.001,
+}
+
+
+def count_steps(T_total, dt):
+    """Número de pasos de Simulator::run (mismo acumulado t += dt que en C++)"""
+    n = 0
+    t = 0.0
+    while t < T_total:
+        n += 1
+        t += dt
+    return n
+
+
+def chemical_state(t, T_off, T_on):
+    """Estado químico determinista, igual que ChemicalState::update"""
+    return 0 if np.fmod(t, T_off + T_on) < T_off else 1
+
+
+def simulate_ensemble(n_particles, T_total=None, dt=None, m=None, k0=None, k1=None,
+                      l=None, T_off=None, T_on=None, gamma=None, kBT=None,
+                      initial_x=None, initial_v=0.0, record_every=1, seed=None):
+    """
+    Integra N motores independientes con el esquema BAOAB de Integrator.cpp.
+
+    Los parámetros omitidos toman el valor de PARAMETROS_MAIN. La posición
+    inicial por defecto es l/2, como en main.cpp.
+
+    Se registra el estado cada `record_every` pasos (antes de integrar, igual
+    que Simulator::run registra antes de llamar a step). Con N grande conviene
+    subir `record_every`: la memoria de salida es 3 * n_registros * N * 8 bytes.
+
+    Retorna un diccionario con:
+        t        (n_registros,)      tiempos registrados
+        s        (n_registros,)      estado químico (común a todo el ensamble)
+        x, v     (n_registros, N)    posición y velocidad
+        E_total  (n_registros, N)    energía cinética + potencial
+        x_final, v_final (N,)        estado después del último paso
+    """
+    p = dict(PARAMETROS_MAIN)
+    for name, value in (('T_total', T_total), ('dt', dt), ('m', m), ('k0', k0),
+                        ('k1', k1), ('l', l), ('T_off', T_off), ('T_on', T_on),
+                        ('gamma', gamma), ('kBT', kBT)):
+        if value is not None:
+            p[name] = value
+
+    n_particles = int(n_particles)
+    record_every = max(1, int(record_every))
+    m, dt = p['m'], p['dt']
+
+    # Coeficientes del paso A (fricción y ruido), idénticos a Integrator.cpp
+    c1 = np.exp(-p['gamma'] * dt)
+    sigma = np.sqrt(p['kBT'] * (1.0 - c1 * c1))
+    noise_scale = sigma / np.sqrt(m)
+    half_kick = 0.5 * dt / m
+
+    # Potenciales armónicos: U0(k0, 0.0) y U1(k1, l)
+    springs = (p['k0'], p['k1'])
+    minima = (0.0, p['l'])
+
+    rng = np.random.default_rng(seed)
+
+    x = np.full(n_particles, p['l'] / 2.0 if initial_x is None else initial_x, dtype=float)
+    v = np.full(n_particles, initial_v, dtype=float)
+    force = np.empty(n_particles)
+    noise = np.empty(n_particles)
+
+    n_steps = count_steps(p['T_total'], dt)
+    n_records = (n_steps + record_every - 1) // record_every
+    t_rec = np.empty(n_records)
+    s_rec = np.empty(n_records, dtype=np.int8)
+    x_rec = np.empty((n_records, n_particles))
+    v_rec = np.empty((n_records, n_particles))
+    E_rec = np.empty((n_records, n_particles))
+
+    t = 0.0
+    for step in range(n_steps):
+        # 1. Actualizar el estado químico (U0 o U1)
+        s = chemical_state(t, p['T_off'], p['T_on'])
+        k, x_min = springs[s], minima[s]
+
+        # 2. Registrar el estado actual
+        if step % record_every == 0:
+            r = step // record_every
+            t_rec[r] = t
+            s_rec[r] = s
+            x_rec[r] = x
+            v_rec[r] = v
+            np.multiply(0.5 * m * v, v, out=E_rec[r])
+            E_rec[r] += 0.5 * k * (x - x_min) ** 2
+
+        # 3. Integrar un paso de tiempo (B-A-O-B)
+        np.subtract(x, x_min, out=force)
+        force *= -k
+        v += force * half_kick
+
+        rng.standard_normal(out=noise)
+        v *= c1
+        v += noise_scale * noise
+
+        x += v * dt
+
+        np.subtract(x, x_min, out=force)
+        force *= -k
+        v += force * half_kick
+
+        t += dt
+
+    return {
+        't': t_rec,
+        's': s_rec,
+        'x': x_rec,
+        'v': v_rec,
+        'E_total': E_rec,
+        'x_final': x,
+        'v_final': v,
+        'params': p,
+    }
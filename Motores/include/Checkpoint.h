@@ -0,0 +1,42 @@
+#ifndef CHECKPOINT_H
+#define CHECKPOINT_H
+
+#include "Integrator.h"
+#include "Parameters.h"
+#include <cstddef>
+#include <cstdint>
+#include <string>
+#include <vector>
+
+// Punto de control de Simulator::run: todo lo necesario para continuar la
+// corrida exactamente donde quedó (mismo resultado que sin interrupción).
+struct Checkpoint {
+    SimulationParameters params;      // Parámetros de la corrida que lo escribió
+    IntegratorKind integrator = IntegratorKind::BAOAB;
+
+    // Estado al inicio del próximo paso del bucle principal
+    double t = 0.0;
+    std::uint64_t step = 0;
+    int previous_state = -1;          // Último estado químico registrado
+    double x = 0.0, v = 0.0;
+    int s = 0;                        // Estado químico actual
+    std::vector<double> chemical;     // ChemicalState::saveState (modos Markov)
+
+    // Flujo aleatorio (RandomStream): semilla, flujo y normales consumidas
+    std::uint64_t seed = 0, stream = 0, rng_position = 0;
+
+    // Salida: filas (binario) o bytes (texto) válidos hasta este punto
+    std::string output_file;
+    std::uint64_t writer_offset = 0;
+
+    // Acumuladores de RunStatistics (vacío si no se acumulaba)
+    std::vector<double> stats;
+    std::vector<unsigned long long> stats_hist;
+};
+
+// Escritura atómica: archivo temporal + rename, así un proceso interrumpido
+// nunca deja un punto de control a medio escribir.
+void saveCheckpoint(const Checkpoint& checkpoint, const std::string& filename);
+Checkpoint loadCheckpoint(const std::string& filename);
+
+#endif // CHECKPOINT_H
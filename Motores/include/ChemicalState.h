@@ -1,16 +1,81 @@
 #ifndef CHEMICALSTATE_H
 #define CHEMICALSTATE_H
 
+#include <cstdint>
+#include <vector>
+
+class RandomStream;
+
+// Cómo conmuta el estado químico
+enum class SwitchingMode {
+    PERIODIC,         // Ciclo 0 -> 1 -> ... -> N-1 -> 0 con duraciones fijas
+    MARKOV,           // Tasas constantes (k12, k21 con dos estados; matriz con N)
+    MARKOV_POSITION   // k12, k21 moduladas por dU = U1(x) - U0(x) (sólo dos estados)
+};
+
+struct ChemicalKinetics {
+    SwitchingMode mode = SwitchingMode::PERIODIC;
+    double T_off = 2.0, T_on = 2.0;   // Modo periódico con dos estados
+    double k12 = 0.5, k21 = 0.5;      // Modos Markov con dos estados (tasas en dU = 0)
+
+    // N estados: si no están vacíos reemplazan a T_off/T_on y k12/k21
+    std::vector<double> durations;    // Duración de cada estado del ciclo periódico
+    std::vector<double> rates;        // Matriz N x N por filas: rates[i*N + j] = tasa i -> j
+
+    // Número de estados que describen estos parámetros
+    int states() const;
+};
+
 class ChemicalState {
 private:
-    int s;          // Estado químico actual (0 o 1)
+    int s;          // Estado químico actual (0 .. N-1)
+    int n_states;
+    SwitchingMode mode;
     double T_off;   // Duración del estado 0
-    double T_cycle; // T_off + T_on
+    double T_cycle; // Suma de las duraciones (T_off + T_on con dos estados)
+    std::vector<double> starts;      // Inicio de cada estado en el ciclo (N + 1, último = T_cycle)
+    std::vector<double> rates;       // Tasas i -> j (N x N) de los modos Markov
+    std::vector<double> exit_rate;   // Tasa total de salida de cada estado
+    double half_beta;   // 1 / (2 kBT), modo MARKOV_POSITION
+
+    // Intervalo [valid_from, valid_until) en el que `s` no puede cambiar:
+    // dentro de él update() se reduce a dos comparaciones (sin fmod).
+    // En modo MARKOV valid_until es el instante (exacto) de la próxima conmutación.
+    double valid_from, valid_until;
+    double switch_time;   // Modo periódico: próxima conmutación exacta (sin margen)
+
+    // Modos Markov: eventos sorteados (índice en RandomStream::exponential),
+    // riesgo integrado que falta para conmutar y riesgo del último paso
+    std::uint64_t events;
+    double hazard_left, pending;
+
+    void evaluate(double t);
+    int jumpTarget(const RandomStream& rng) const;
 
 public:
     ChemicalState(double t_off, double t_on);
+    ChemicalState(const ChemicalKinetics& kinetics, double kBT);
+
+    // Modo periódico: sólo depende de t
     void update(double t, double dt);
+    // Modo MARKOV: el tiempo de espera se sortea una vez por conmutación
+    void updateMarkov(double t, const RandomStream& rng);
+    // Modo MARKOV_POSITION: `dU` = U1(x) - U0(x) en la posición actual
+    void updateMarkov(double t, double dt, double dU, const RandomStream& rng);
+
+    // Próxima conmutación estrictamente posterior a t (estado ya actualizado en t).
+    // Infinito si no hay conmutaciones o si dependen de x (MARKOV_POSITION).
+    double nextSwitch(double t) const;
+    // Conmutar en t_switch = nextSwitch(t) (integradores que cortan el paso ahí)
+    void crossSwitch(double t_switch, const RandomStream& rng);
+
     int getState() const { return s; }
+    int getStateCount() const { return n_states; }
+    SwitchingMode getMode() const { return mode; }
+
+    // Estado de los modos Markov para puntos de control
+    std::vector<double> saveState() const;
+    void restoreState(const std::vector<double>& state);
 };
 
-#endif // CHEMICALSTATE_H
\ No newline at end of file
+#endif // CHEMICALSTATE_H
@@ -0,0 +1,58 @@
+#ifndef COMMANDLINE_H
+#define COMMANDLINE_H
+
+#include "DataWriter.h"
+#include "Integrator.h"
+#include "MotorSystem.h"
+#include "Parameters.h"
+#include "RunStatistics.h"
+#include <cstddef>
+#include <cstdint>
+#include <string>
+
+// Configuración completa de una ejecución de motor_sim
+struct RunConfig {
+    SimulationParameters params;
+    LoggingPolicy logging;
+    std::string output_file = "results/datos_motor_dos_estados_langevin.txt";
+    double quantum = CompressedDataWriter::DEFAULT_QUANTUM;   // Salida .mtz
+    bool initial_x_given = false;   // Si no se da, initial_x = l / 2
+    bool T_total_given = false;     // Al reanudar, extiende la corrida
+    IntegratorKind integrator = IntegratorKind::BAOAB;
+    // Flujo aleatorio (RandomStream): sin --seed la semilla sale de random_device
+    bool seed_given = false;
+    std::uint64_t seed = 0;
+    std::uint64_t stream = 0;
+    // Modo ensamble (EnsembleSimulator): motors > 1
+    std::size_t motors = 1;
+    std::size_t threads = 0;        // 0 = todos los núcleos
+    std::string ensemble_file = "results/ensamble_motor_dos_estados_langevin.txt";
+    // Motores acoplados (MotorSystem): system_motors > 0
+    std::size_t system_motors = 0;
+    Coupling coupling;
+    std::string system_file = "results/sistema_motor_dos_estados_langevin.txt";
+    // Puntos de control (Checkpoint.h): vacío = desactivados
+    std::string checkpoint_file;
+    std::size_t checkpoint_every = 0;
+    bool resume = false;
+    // Perfil (Profiler.h): vacío = $MOTOR_PROFILE o desactivado
+    std::string profile_file;
+    bool show_help = false;
+};
+
+// Interpreta argv: "--clave=valor" o "--clave valor".
+// Los parámetros físicos usan el mismo nombre que en Parameters.h
+// (--k1=5 --T_on=1.5 ...). "--config=ARCHIVO" carga líneas "clave = valor";
+// las opciones posteriores en la línea de comandos tienen prioridad.
+// Lanza std::invalid_argument ante opciones desconocidas o valores inválidos.
+RunConfig parseCommandLine(int argc, char* argv[]);
+
+// Carga un archivo de configuración "clave = valor" (comentarios con '#')
+void loadConfigFile(RunConfig& config, const std::string& filename);
+
+// Verifica que los parámetros tengan sentido físico
+void validateParameters(const SimulationParameters& params);
+
+void printUsage(const char* program);
+
+#endif // COMMANDLINE_H
@@ -0,0 +1,245 @@
+#ifndef DATAWRITER_H
+#define DATAWRITER_H
+
+#include "Parameters.h"
+#include <chrono>
+#include <cstddef>
+#include <cstdint>
+#include <fstream>
+#include <memory>
+#include <string>
+#include <vector>
+
+class Profiler;
+
+// Destino de los datos registrados por Simulator::logData
+class DataWriter {
+public:
+    virtual void write(double t, double x, double v, int s, double E_total) = 0;
+    // Número esperado de filas (permite reservar espacio de antemano)
+    virtual void reserve(std::size_t rows) {}
+    virtual void flush() = 0;
+    virtual void close() = 0;
+    // Posición de reanudación tras flush(): bytes (texto) o filas (binario)
+    virtual std::uint64_t offset() = 0;
+    virtual ~DataWriter() {}
+    // Medir las descargas (flush) en la sección "escritura" de `p`
+    void setProfiler(Profiler* p);
+
+protected:
+    Profiler* profiler = nullptr;
+    std::size_t flush_section = 0;
+};
+
+// Formato original: columnas separadas por tabulador
+class TextDataWriter : public DataWriter {
+private:
+    std::ofstream data_file;
+
+public:
+    explicit TextDataWriter(const std::string& filename);
+    // Reanudar: recorta el archivo a `resume_offset` bytes y sigue escribiendo al final
+    TextDataWriter(const std::string& filename, std::uint64_t resume_offset);
+    void write(double t, double x, double v, int s, double E_total) override;
+    void flush() override;
+    void close() override;
+    std::uint64_t offset() override;
+};
+
+// Formato binario columnar:
+//   cabecera fija de 256 bytes (magic "MOTORBIN", versión, n_rows, capacidad,
+//   parámetros de la corrida) seguida de las columnas t, x, v, E_total
+//   (float64) y s (uint8), cada una con `capacity` filas reservadas.
+class BinaryDataWriter : public DataWriter {
+public:
+    static const char MAGIC[8];
+    static const std::uint32_t VERSION = 1;
+    static const std::uint32_t HEADER_SIZE = 256;
+    static const std::size_t BLOCK_ROWS = 1 << 14;
+
+    BinaryDataWriter(const std::string& filename, const SimulationParameters& params);
+    // Reanudar: conserva las primeras `resume_rows` filas del archivo existente
+    BinaryDataWriter(const std::string& filename, const SimulationParameters& params,
+                     std::uint64_t resume_rows);
+    ~BinaryDataWriter();
+    void write(double t, double x, double v, int s, double E_total) override;
+    void reserve(std::size_t rows) override;
+    void flush() override;
+    void close() override;
+    std::uint64_t offset() override { return n_rows + buf_t.size(); }
+
+private:
+    std::fstream data_file;
+    SimulationParameters params;
+    std::uint64_t n_rows;      // Filas ya escritas en disco
+    std::uint64_t capacity;    // Filas reservadas por columna
+    std::vector<double> buf_t, buf_x, buf_v, buf_E;
+    std::vector<std::uint8_t> buf_s;
+
+    std::uint64_t columnOffset(int column, std::uint64_t cap) const;
+    void grow(std::uint64_t new_capacity);
+    void writeHeader();
+};
+
+// Formato comprimido por bloques (.mtz), con acceso aleatorio por bloque:
+//   cabecera de 256 bytes con el formato de la binaria (magic "MOTORZIP";
+//   n_rows; en el campo de capacidad, la posición del índice o 0 si la
+//   corrida no terminó), más el cuántum (float64, byte 128) y las filas por
+//   bloque (uint32, byte 136). Siguen los bloques, cada uno con una cabecera
+//   de 32 bytes ("MTZC", filas, bytes sin comprimir, bytes comprimidos,
+//   primera fila, t de la primera fila) y su contenido comprimido con zlib,
+//   y al final el índice: (posición, primera fila, filas, t0) por bloque.
+// Dentro de un bloque:
+//   - t es implícito: pasos de dt desde la fila anterior (varint). Al leer,
+//     t se reconstruye sumando dt paso a paso como Simulator, así que es
+//     exacto; las filas que no coinciden, o a más de MAX_REPLAY_STEPS pasos
+//     de la anterior, se guardan aparte (fila, t).
+//   - x, v, E_total se cuantizan a múltiplos de `quantum` (error máximo
+//     quantum / 2) y se guardan como diferencias zigzag-varint.
+//   - s se guarda como corridas (estado uint8, largo uint32).
+// zlib usa la estrategia Z_RLE: las diferencias de x, v, E son casi ruido y
+// la búsqueda de coincidencias de deflate no gana nada (mismo tamaño, ~2.5
+// veces más rápido); lo que más reduce es la codificación varint.
+// Cada bloque se descomprime por sí solo: trajectory_io.py lee una ventana
+// de tiempo decodificando sólo los bloques que la cubren. Sin índice (corrida
+// interrumpida) los bloques se recorren por sus cabeceras.
+class CompressedDataWriter : public DataWriter {
+public:
+    static const char MAGIC[8];
+    static const char CHUNK_TAG[4];
+    static const std::uint32_t VERSION = 1;
+    static const std::uint32_t HEADER_SIZE = 256;
+    static const std::uint32_t CHUNK_HEADER_SIZE = 32;
+    static const std::uint32_t INDEX_ENTRY_SIZE = 32;
+    static const std::size_t CHUNK_ROWS = 1 << 16;
+    static const std::uint64_t MAX_REPLAY_STEPS = 1 << 20;
+    static constexpr double DEFAULT_QUANTUM = 1e-9;
+    static const int COMPRESSION_LEVEL = 6;
+
+    CompressedDataWriter(const std::string& filename, const SimulationParameters& params,
+                         double quantum = DEFAULT_QUANTUM);
+    // Reanudar: conserva los bloques que suman `resume_rows` filas (los
+    // puntos de control cierran el bloque en curso, así que siempre
+    // coinciden); el cuántum es el de la cabecera del archivo
+    CompressedDataWriter(const std::string& filename, const SimulationParameters& params,
+                         std::uint64_t resume_rows);
+    ~CompressedDataWriter();
+    void write(double t, double x, double v, int s, double E_total) override;
+    void flush() override;
+    void close() override;
+    std::uint64_t offset() override { return n_rows + chunk_rows; }
+
+private:
+    struct IndexEntry {
+        std::uint64_t position, first_row, rows;
+        double t0;
+    };
+
+    std::fstream data_file;
+    SimulationParameters params;
+    double quantum, inv_quantum;
+    std::uint64_t n_rows;            // Filas en bloques ya escritos
+    std::uint64_t end_position;      // Fin del último bloque
+    std::vector<IndexEntry> index;
+
+    // Bloque en curso
+    std::size_t chunk_rows;
+    double chunk_t0, last_t;
+    std::int64_t last_q[3];
+    std::vector<std::uint8_t> steps, columns[3], exceptions, runs, raw, packed;
+    int run_state;
+    std::uint32_t run_length;
+
+    void startChunk();
+    void endRun();
+    std::int64_t quantize(double value) const;
+    void writeHeader(std::uint64_t index_position);
+};
+
+// Flujo en vivo hacia stdout ("-") o un FIFO (mkfifo) para monitor.py:
+//   cabecera de 256 bytes con el formato de la binaria (magic "MOTORSTR",
+//   n_rows = capacity = 0) seguida de registros empaquetados de 33 bytes:
+//   t, x, v, E_total (float64) y s (uint8).
+// Los registros se envían por bloques de BLOCK_ROWS y, si llegan pocos, al
+// menos cada FLUSH_INTERVAL segundos (comprobado cada CLOCK_ROWS registros). Si el lector cierra el flujo, write
+// lanza std::runtime_error: así el monitor puede abortar la corrida.
+class StreamDataWriter : public DataWriter {
+public:
+    static const char MAGIC[8];
+    static const std::size_t RECORD_SIZE = 33;
+    static const std::size_t BLOCK_ROWS = 1 << 12;
+    static const std::size_t CLOCK_ROWS = 16;
+    static constexpr double FLUSH_INTERVAL = 0.2;
+
+    StreamDataWriter(const std::string& target, const SimulationParameters& params);
+    ~StreamDataWriter();
+    void write(double t, double x, double v, int s, double E_total) override;
+    void flush() override;
+    void close() override;
+    std::uint64_t offset() override { return rows_sent + buffered_rows; }
+
+private:
+    int fd;
+    std::vector<char> buffer;
+    std::size_t buffered_rows;
+    std::uint64_t rows_sent;
+    std::chrono::steady_clock::time_point last_send;
+
+    void send(const char* data, std::size_t size);
+};
+
+// Columnas en memoria (interfaz de Python, sin archivo intermedio).
+// Sin buffers externos reserva y crece sus propios vectores; con buffers
+// externos escribe directamente en ellos y lanza std::length_error si se
+// supera `capacity`.
+class MemoryDataWriter : public DataWriter {
+public:
+    MemoryDataWriter();
+    MemoryDataWriter(double* t, double* x, double* v, std::uint8_t* s, double* E_total,
+                     std::size_t capacity);
+    void write(double t, double x, double v, int s, double E_total) override;
+    void reserve(std::size_t rows) override;
+    void flush() override {}
+    void close() override {}
+    std::uint64_t offset() override { return n_rows; }
+
+    std::size_t rows() const { return n_rows; }
+    // Columnas: 0=t, 1=x, 2=v, 3=E_total
+    const double* column(int column) const;
+    const std::uint8_t* states() const { return out_s; }
+
+private:
+    bool external;
+    std::size_t n_rows, capacity;
+    std::vector<double> own_t, own_x, own_v, own_E;
+    std::vector<std::uint8_t> own_s;
+    double *out_t, *out_x, *out_v, *out_E;
+    std::uint8_t* out_s;
+
+    void grow(std::size_t new_capacity);
+};
+
+// Crea el directorio que contiene a `filename` si no existe
+void ensureParentDirectory(const std::string& filename);
+
+// True si `filename` es "-" (stdout) o un FIFO existente
+bool isStreamTarget(const std::string& filename);
+
+// Reserva stdout para el flujo binario: devuelve un duplicado del stdout
+// original y redirige el stdout del proceso (mensajes de std::cout) a
+// stderr. Llamarla antes del primer mensaje; las llamadas siguientes
+// devuelven el mismo descriptor.
+int reserveStdoutForStream();
+
+// Crea el escritor según el destino: flujo ("-" o FIFO), ".bin" -> binario,
+// ".mtz" -> comprimido (con cuántum `quantum`), si no, texto
+std::unique_ptr<DataWriter> createDataWriter(const std::string& filename,
+                                             const SimulationParameters& params,
+                                             double quantum = CompressedDataWriter::DEFAULT_QUANTUM);
+
+// Reabre una salida existente para continuar en `offset` (ver DataWriter::offset)
+std::unique_ptr<DataWriter> resumeDataWriter(const std::string& filename,
+                                             const SimulationParameters& params,
+                                             std::uint64_t offset);
+
+#endif // DATAWRITER_H
@@ -0,0 +1,65 @@
+#ifndef ENSEMBLESIMULATOR_H
+#define ENSEMBLESIMULATOR_H
+
+#include "Parameters.h"
+#include <cstddef>
+#include <cstdint>
+#include <string>
+#include <vector>
+
+// Estadísticas del ensamble en un instante registrado
+struct EnsembleRecord {
+    double t;
+    int s;
+    double mean_x, var_x;   // Varianza poblacional sobre los motores
+    double mean_v;
+};
+
+// M motores independientes con el mismo esquema BAOAB que
+// FastStochasticVelocityVerletIntegrator, repartidos en bloques entre hilos.
+//
+//   - Estado como estructura de arreglos (x[], v[]): la actualización de un
+//     bloque es un bucle simple sobre doubles contiguos que el compilador
+//     vectoriza.
+//   - El motor i usa el flujo RandomStream(seed, i): su trayectoria es la
+//     misma que la de `motor_sim --seed=seed --stream=i`.
+//   - Cada bloque de BLOCK_MOTORS motores acumula media y M2 propios y los
+//     bloques se combinan (Chan) siempre en el mismo orden: el resultado no
+//     depende del número de hilos.
+class EnsembleSimulator {
+public:
+    static const std::size_t BLOCK_MOTORS = 256;
+    static const std::size_t SEGMENT_STEPS = 64;   // Pasos entre sincronizaciones
+
+    EnsembleSimulator(const SimulationParameters& params, std::size_t n_motors,
+                      std::uint64_t seed, std::size_t n_threads = 0);
+
+    // Registrar estadísticas cada `stride` pasos (antes de integrar, como Simulator)
+    void setRecordStride(std::size_t stride) { record_stride = stride > 0 ? stride : 1; }
+    void run();
+
+    const std::vector<EnsembleRecord>& getRecords() const { return records; }
+    // Estado final de los motores (sin el relleno del último bloque)
+    std::vector<double> getPositions() const { return std::vector<double>(x.begin(), x.begin() + n_motors); }
+    std::vector<double> getVelocities() const { return std::vector<double>(v.begin(), v.begin() + n_motors); }
+    std::size_t getThreadCount() const { return n_threads; }
+
+    // Promedio temporal de <v> y velocidad de deriva (<x>(T) - <x>(0)) / T
+    double meanVelocity() const;
+    double driftVelocity() const;
+
+    // Columnas t, s, mean_x, var_x, mean_v separadas por tabulador
+    void writeRecords(const std::string& filename) const;
+
+private:
+    SimulationParameters params;
+    std::size_t n_motors, n_threads, record_stride;
+    std::uint64_t seed;
+    std::vector<double> x, v;   // Rellenados hasta un múltiplo de BLOCK_MOTORS
+    std::vector<EnsembleRecord> records;
+    double sum_mean_v;          // Suma de <v> sobre todos los pasos
+    std::size_t mean_steps;
+    double final_mean_x, final_time;
+};
+
+#endif // ENSEMBLESIMULATOR_H
@@ -1,11 +1,19 @@
 #ifndef INTEGRATOR_H
 #define INTEGRATOR_H
 
+#include <memory>
+#include <vector>
+
 class MotorModel; // Declaración adelantada
 
 class Integrator {
 public:
+    // Llamado por Simulator::run antes del primer paso (precálculos por corrida)
+    virtual void prepare(const MotorModel& motor, double dt) {}
     virtual void step(MotorModel& motor, double dt) = 0;
+    // Avanza de t a t + dt (Simulator::run). Por defecto es un paso; los
+    // integradores exactos cortan el intervalo en las conmutaciones químicas.
+    virtual void advance(MotorModel& motor, double t, double dt) { step(motor, dt); }
     virtual ~Integrator() {}
 };
 
@@ -15,4 +23,64 @@ public:
     void step(MotorModel& motor, double dt) override;
 };
 
-#endif // INTEGRATOR_H
\ No newline at end of file
+// Mismo esquema BAOAB con la ruta rápida del bucle principal:
+//   - c1, sigma/sqrt(m) y dt/(2m) se calculan una vez por corrida (prepare)
+//   - la fuerza al final de un paso se reutiliza como F_old del siguiente
+//     mientras no cambien la posición ni el estado químico
+class FastStochasticVelocityVerletIntegrator : public Integrator {
+private:
+    double prepared_dt;
+    double c1;            // exp(-gamma * dt)
+    double noise_scale;   // sqrt(kBT * (1 - c1^2)) / sqrt(m)
+    double half_dt_m;     // 0.5 * dt / m
+
+    // Fuerza evaluada al final del paso anterior
+    bool force_valid;
+    double cached_force, cached_x;
+    int cached_state;
+
+public:
+    FastStochasticVelocityVerletIntegrator();
+    void prepare(const MotorModel& motor, double dt) override;
+    void step(MotorModel& motor, double dt) override;
+};
+
+// Propagación exacta (Ornstein-Uhlenbeck) dentro del pozo armónico activo.
+// Entre conmutaciones la ecuación de Langevin es lineal:
+//   y = (x - x_min, v),  dy = A y dt + ruido,  A = [[0, 1], [-k/m, -gamma]]
+// y su transición en un tiempo h es gaussiana con media exp(A h) y y
+// covarianza Sigma_inf - exp(A h) Sigma_inf exp(A h)^T, donde
+// Sigma_inf = diag(kBT/k, kBT/m). No hay error de discretización: dt sólo
+// fija la frecuencia de registro, y advance() corta el paso en cada
+// conmutación (periódica o de Markov) para cambiar de pozo en el instante
+// exacto. Requiere estados armónicos con k > 0.
+class ExactHarmonicIntegrator : public Integrator {
+private:
+    struct Transition {
+        double e11, e12, e21, e22;   // exp(A h)
+        double lxx, lvx, lvv;        // Cholesky de la covarianza
+    };
+
+    double prepared_dt;
+    std::vector<Transition> full;    // Paso completo dt en cada estado
+
+    static Transition transition(double k, double m, double gamma, double kBT, double h);
+    Transition partial(const MotorModel& motor, int state, double h) const;
+    void propagate(MotorModel& motor, const Transition& tr);
+
+public:
+    ExactHarmonicIntegrator();
+    void prepare(const MotorModel& motor, double dt) override;
+    void step(MotorModel& motor, double dt) override;
+    void advance(MotorModel& motor, double t, double dt) override;
+};
+
+// Integrador del bucle principal (--integrator)
+enum class IntegratorKind {
+    BAOAB,   // FastStochasticVelocityVerletIntegrator
+    EXACT    // ExactHarmonicIntegrator
+};
+
+std::unique_ptr<Integrator> createIntegrator(IntegratorKind kind);
+
+#endif // INTEGRATOR_H
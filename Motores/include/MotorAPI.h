@@ -0,0 +1,42 @@
+#ifndef MOTORAPI_H
+#define MOTORAPI_H
+
+// Interfaz C de bin/libmotor.so para Python (ctypes, ver motor_binding.py).
+//
+// `params` son 12 doubles en el orden de la cabecera binaria:
+//   m, k0, k1, l, T_off, T_on, gamma, kBT, T_total, dt, initial_x, initial_v
+// `log_mode`: 0 = cada paso, 1 = cada `stride` pasos, 2 = transiciones.
+// `seeded` = 0 usa una semilla aleatoria; si no, el flujo (seed, stream)
+// de RandomStream hace la corrida reproducible.
+// Los errores se copian en `error` (hasta `error_size` bytes) en español.
+
+#include <cstddef>
+#include <cstdint>
+
+extern "C" {
+
+// Corrida cuyos arreglos pertenecen a la biblioteca (liberar con motor_run_free)
+typedef struct MotorRun MotorRun;
+
+MotorRun* motor_run(const double* params, int log_mode, std::size_t stride,
+                    int seeded, std::uint64_t seed, std::uint64_t stream,
+                    char* error, std::size_t error_size);
+std::size_t motor_run_rows(const MotorRun* run);
+// Columnas: 0=t, 1=x, 2=v, 3=E_total
+const double* motor_run_column(const MotorRun* run, int column);
+const std::uint8_t* motor_run_states(const MotorRun* run);
+void motor_run_free(MotorRun* run);
+
+// Corre escribiendo en arreglos del llamador; retorna las filas escritas o -1
+long long motor_run_into(const double* params, int log_mode, std::size_t stride,
+                         int seeded, std::uint64_t seed, std::uint64_t stream,
+                         double* t, double* x, double* v, std::uint8_t* s, double* E_total,
+                         std::size_t capacity, char* error, std::size_t error_size);
+
+// Filas que registrará una corrida (para dimensionar los arreglos); -1 si error
+long long motor_expected_rows(const double* params, int log_mode, std::size_t stride,
+                              char* error, std::size_t error_size);
+
+}
+
+#endif // MOTORAPI_H
@@ -3,34 +3,82 @@
 
 #include "Particle.h"
 #include "Potential.h"
+#include "TabulatedPotential.h"
 #include "ChemicalState.h"
+#include "RandomStream.h"
+#include <cstdint>
+#include <memory>
+#include <vector>
 
 class MotorModel {
 private:
     Particle p;
-    Potential* currentPotential;
+    // Potencial del estado actual; los tipos concretos conocidos se llaman
+    // sin despacho virtual (armónico en línea, tabulado `final`)
+    const Potential* currentPotential;
+    const HarmonicPotential* currentHarmonic;    // No nulo si el estado actual es armónico
+    const TabulatedPotential* currentTabulated;  // No nulo si es tabulado
     ChemicalState chemicalState;
-    HarmonicPotential U0;  // Potencial para estado 0 (unión débil)
-    HarmonicPotential U1;  // Potencial para estado 1 (unión fuerte)
+    // Un potencial por estado químico: U0 (unión débil), U1 (unión fuerte), ...
+    std::vector<std::shared_ptr<const Potential> > potentials;
+    std::vector<const HarmonicPotential*> harmonic;
+    std::vector<const TabulatedPotential*> tabulated;
     double gamma, kBT;
+    RandomStream rng;      // Flujo propio: sin estado global compartido entre motores
+
+    void selectPotential();
 
 public:
     // Constructor con k0 y k1 separados
     MotorModel(double mass, double k0, double k1, double l, double t_off, double t_on, 
-               double gamma_val, double kBT_val, double initial_x = 0.0, double initial_v = 0.0);
+               double gamma_val, double kBT_val, double initial_x = 0.0, double initial_v = 0.0,
+               bool verbose = true);
+    // Conmutación química a elección: periódica o Markov (ver ChemicalState.h)
+    MotorModel(double mass, double k0, double k1, double l, const ChemicalKinetics& kinetics,
+               double gamma_val, double kBT_val, double initial_x = 0.0, double initial_v = 0.0,
+               bool verbose = true);
+    // N estados químicos con un potencial cualquiera cada uno (armónicos,
+    // TabulatedPotential, ...); kinetics.states() debe coincidir con N
+    MotorModel(double mass, const std::vector<std::shared_ptr<const Potential> >& state_potentials,
+               const ChemicalKinetics& kinetics, double gamma_val, double kBT_val,
+               double initial_x = 0.0, double initial_v = 0.0, bool verbose = true);
     
-    double force(double t = 0.0) const;
+    // Retorna solo la fuerza determinista del potencial (F(x,t)).
+    // La fricción y el ruido se manejan en el Integrador.
+    double force(double t = 0.0) const {
+        if (currentHarmonic) return currentHarmonic->F(p.x);
+        if (currentTabulated) return currentTabulated->F(p.x);
+        return currentPotential->F(p.x);
+    }
     void updateChemicalState(double t, double dt);
     double getPotentialEnergy() const; 
+
+    // Potencial de cada estado; getHarmonic es nulo si no es armónico
+    // (el integrador exacto sólo admite pozos armónicos)
+    int getStateCount() const { return static_cast<int>(potentials.size()); }
+    const Potential& getPotential(int state) const { return *potentials[state]; }
+    const HarmonicPotential* getHarmonic(int state) const { return harmonic[state]; }
+    // Próxima conmutación química después de t (ver ChemicalState::nextSwitch)
+    double nextSwitchTime(double t) const { return chemicalState.nextSwitch(t); }
+    // Conmutar exactamente en t_switch = nextSwitchTime(t) dentro de un paso
+    void crossSwitch(double t_switch);
     
     // Métodos de acceso
     Particle& getParticle() { return p; }
+    const Particle& getParticle() const { return p; }
     int getCurrentState() const { return chemicalState.getState(); }
+    ChemicalState& getChemicalState() { return chemicalState; }
+    const ChemicalState& getChemicalState() const { return chemicalState; }
 
     // Métodos para parámetros de Langevin
     double getGamma() const;
     double getKBT() const;
-    double generateGaussianNoise() const;
+    double generateGaussianNoise() { return rng.gaussian(); }
+
+    // Flujo aleatorio: por defecto semilla no determinista (random_device);
+    // seed(s, k) fija la semilla s y el flujo k (trayectorias reproducibles)
+    void seed(std::uint64_t seed_value, std::uint64_t stream = 0) { rng = RandomStream(seed_value, stream); }
+    RandomStream& getRandomStream() { return rng; }
 };
 
 #endif // MOTORMODEL_H
\ No newline at end of file
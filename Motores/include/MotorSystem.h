@@ -0,0 +1,105 @@
+#ifndef MOTORSYSTEM_H
+#define MOTORSYSTEM_H
+
+#include "ChemicalState.h"
+#include "NeighborList.h"
+#include "Parameters.h"
+#include "Potential.h"
+#include "RandomStream.h"
+#include "TabulatedPotential.h"
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+#include <string>
+#include <vector>
+
+// Interacciones entre los motores de un MotorSystem
+struct Coupling {
+    double spring_k = 0.0;        // Resorte entre motores consecutivos i, i+1 (carga común)
+    double spring_length = 0.0;   // Longitud de reposo del resorte
+    double repulsion = 0.0;       // Volumen excluido: U = repulsion (1 - r/sigma)^2 si r < sigma
+    double sigma = 0.0;           // Diámetro de exclusión (alcance de la lista de vecinos)
+    double box = 0.0;             // Pista periódica de longitud box (0 = abierta)
+};
+
+// Estadísticas del sistema en un instante registrado
+struct SystemRecord {
+    double t;
+    double mean_x, var_x;   // Centro de masa y dispersión de las posiciones
+    double mean_v;
+    double mean_s;          // Estado químico medio
+};
+
+// N motores que interactúan sobre la misma pista.
+//
+//   - Cada motor tiene su ChemicalState (periódico o Markov, ver
+//     ChemicalState.h) y su flujo RandomStream(seed, i); el potencial de la
+//     pista es el del estado del motor, como en MotorModel.
+//   - BAOAB sobre arreglos x[], v[] con los coeficientes de
+//     FastStochasticVelocityVerletIntegrator. La fuerza externa y la de
+//     pares se guardan por separado: al conmutar un motor sólo se recalcula
+//     su fuerza externa.
+//   - Resortes entre vecinos de la cadena (O(N) directo) y volumen excluido
+//     entre cualquier par a distancia < sigma, recorriendo la lista de
+//     vecinos (NeighborList): O(N) por paso en lugar de O(N^2).
+//
+// Sin acoplamiento, el motor i reproduce la trayectoria de
+// `motor_sim --seed=seed --stream=i`.
+class MotorSystem {
+public:
+    static const std::size_t SEGMENT_STEPS = 16;   // Pasos de ruido generados por tanda
+    static constexpr double SKIN = 0.3;            // Margen de la lista, en unidades de sigma
+
+    // Posiciones iniciales: initial_x + i * espaciado (box / N en una pista
+    // periódica; si no, spring_length o sigma)
+    MotorSystem(const SimulationParameters& params,
+                const std::vector<std::shared_ptr<const Potential> >& state_potentials,
+                std::size_t n_motors, const Coupling& coupling, std::uint64_t seed);
+
+    // Registrar estadísticas cada `stride` pasos (antes de integrar, como Simulator)
+    void setRecordStride(std::size_t stride) { record_stride = stride > 0 ? stride : 1; }
+    void run();
+
+    const std::vector<SystemRecord>& getRecords() const { return records; }
+    const std::vector<double>& getPositions() const { return x; }
+    const std::vector<double>& getVelocities() const { return v; }
+    std::size_t size() const { return x.size(); }
+    // Reconstrucciones de la lista de vecinos en la última corrida
+    std::size_t getNeighborBuilds() const { return neighbors.getBuildCount(); }
+
+    // Velocidad de deriva del centro de masa: (<x>(T) - <x>(0)) / T
+    double driftVelocity() const;
+
+    // Columnas t, mean_x, var_x, mean_v, mean_s separadas por tabulador
+    void writeRecords(const std::string& filename) const;
+
+private:
+    SimulationParameters params;
+    Coupling coupling;
+    std::uint64_t seed;
+    std::size_t record_stride;
+
+    std::vector<std::shared_ptr<const Potential> > potentials;
+    std::vector<const HarmonicPotential*> harmonic;
+    std::vector<const TabulatedPotential*> tabulated;
+
+    std::vector<double> x, v;
+    std::vector<double> f_ext, f_pair;   // Fuerza de la pista y de las interacciones
+    std::vector<ChemicalState> chemical;
+    std::vector<RandomStream> streams;
+    NeighborList neighbors;
+
+    std::vector<SystemRecord> records;
+    double initial_mean_x, final_mean_x, final_time;
+
+    double externalForce(int state, double xi) const {
+        if (harmonic[state]) return harmonic[state]->F(xi);
+        if (tabulated[state]) return tabulated[state]->F(xi);
+        return potentials[state]->F(xi);
+    }
+    void updateChemicalStates(double t, double dt);
+    void computePairForces();
+    SystemRecord record(double t) const;
+};
+
+#endif // MOTORSYSTEM_H
@@ -0,0 +1,53 @@
+#ifndef NEIGHBORLIST_H
+#define NEIGHBORLIST_H
+
+#include <cmath>
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+// Lista de vecinos de Verlet sobre la pista (1D, abierta o periódica).
+//
+// Guarda los pares a distancia < cutoff + skin. Se construye repartiendo las
+// posiciones en celdas de ancho >= cutoff + skin (orden por conteo): todo par
+// dentro del alcance está en la misma celda o en celdas contiguas, así que
+// construir es O(N). La lista sirve mientras ningún motor se haya movido más
+// de skin / 2 desde la construcción: ningún par fuera de ella pudo acercarse
+// a menos de cutoff. Entre reconstrucciones las fuerzas de pares recorren
+// sólo la lista (O(N) con densidad acotada).
+class NeighborList {
+public:
+    struct Pair {
+        std::uint32_t i, j;
+    };
+
+    // box > 0: pista periódica de longitud box (imagen mínima); 0 = abierta
+    NeighborList(double cutoff, double skin, double box = 0.0);
+
+    // Reconstruir si algún motor se movió más de skin / 2 (true si reconstruyó)
+    bool update(const std::vector<double>& x);
+    void build(const std::vector<double>& x);
+
+    const std::vector<Pair>& getPairs() const { return pairs; }
+    std::size_t getBuildCount() const { return builds; }
+
+    // Separación x_j - x_i con la convención de imagen mínima si la pista es periódica
+    double separation(double x_i, double x_j) const {
+        double r = x_j - x_i;
+        if (box > 0.0) r -= box * std::floor(r * inv_box + 0.5);
+        return r;
+    }
+
+private:
+    double skin, reach, box, inv_box;   // reach = cutoff + skin
+    std::vector<Pair> pairs;
+    std::vector<double> reference;       // Posiciones en la última construcción
+    std::vector<std::uint32_t> order;    // Índices ordenados por celda
+    std::vector<std::uint32_t> start;    // Primer elemento de cada celda en `order` (n_cells + 1)
+    std::vector<std::uint32_t> cell_of;
+    std::size_t builds;
+
+    void addPairs(const std::vector<double>& x, std::size_t cell_a, std::size_t cell_b);
+};
+
+#endif // NEIGHBORLIST_H
@@ -0,0 +1,53 @@
+#ifndef PARAMETERS_H
+#define PARAMETERS_H
+
+#include "ChemicalState.h"
+#include <string>
+#include <vector>
+
+// Parámetros de una corrida (valores por defecto = los de main.cpp)
+struct SimulationParameters {
+    // --- PARAMETROS FISICOS ---
+    double m = 1.0;         // Masa de la partícula
+    double k0 = 10.0;       // Estado 0: constante elástica
+    double k1 = 10.0;       // Estado 1: constante elástica
+    double l = 0.5;         // Desplazamiento del mínimo para U1
+    double T_off = 2.0;     // Duración del estado 0
+    double T_on = 2.0;      // Duración del estado 1
+
+    // --- CONMUTACION QUIMICA (ver ChemicalState.h) ---
+    SwitchingMode switching = SwitchingMode::PERIODIC;  // PERIODIC usa T_off / T_on
+    double k12 = 0.5;       // Tasa 0 -> 1 (modos Markov)
+    double k21 = 0.5;       // Tasa 1 -> 0 (modos Markov)
+
+    // --- N ESTADOS (opcional; vacío = los dos pozos armónicos de arriba) ---
+    std::vector<std::string> potentials;   // Un potencial tabulado (archivo) por estado
+    std::vector<double> durations;         // Ciclo periódico: duración de cada estado
+    std::vector<double> rates;             // Markov: matriz N x N por filas
+
+    // --- PARAMETROS DE LANGEVIN ---
+    double gamma = 10.0;    // Coeficiente de fricción
+    double kBT = 0.01;      // Energía térmica
+
+    // --- PARAMETROS DE SIMULACION ---
+    double T_total = 10.0;  // Tiempo total
+    double dt = 0.001;      // Paso de tiempo
+
+    // --- CONDICIONES INICIALES ---
+    double initial_x = 0.25;  // l / 2
+    double initial_v = 0.0;
+
+    ChemicalKinetics kinetics() const {
+        ChemicalKinetics c;
+        c.mode = switching;
+        c.T_off = T_off;
+        c.T_on = T_on;
+        c.k12 = k12;
+        c.k21 = k21;
+        c.durations = durations;
+        c.rates = rates;
+        return c;
+    }
+};
+
+#endif // PARAMETERS_H
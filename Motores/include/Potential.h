@@ -0,0 +1,34 @@
+#ifndef POTENTIAL_H
+#define POTENTIAL_H
+
+class Potential {
+public:
+    virtual double U(double x) const = 0;
+    virtual double F(double x) const = 0;
+    virtual ~Potential();
+};
+
+// `final` + definiciones en línea: las llamadas a través de un
+// HarmonicPotential (p. ej. en MotorModel) se resuelven sin despacho virtual.
+class HarmonicPotential final : public Potential {
+private:
+    double k, x_min;
+public:
+    HarmonicPotential(double elastic_k, double minimum_pos) : k(elastic_k), x_min(minimum_pos) {}
+
+    double getK() const { return k; }
+    double getMinimum() const { return x_min; }
+
+    // U(x) = 0.5 * k * (x - x_min)^2
+    double U(double x) const override {
+        double dx = x - x_min;
+        return 0.5 * k * dx * dx;
+    }
+
+    // F(x) = -dU/dx = -k * (x - x_min)
+    double F(double x) const override {
+        return -k * (x - x_min);
+    }
+};
+
+#endif // POTENTIAL_H
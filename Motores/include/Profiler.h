@@ -0,0 +1,93 @@
+#ifndef PROFILER_H
+#define PROFILER_H
+
+#include <chrono>
+#include <cstddef>
+#include <cstdint>
+#include <map>
+#include <string>
+#include <vector>
+
+// Temporizadores y contadores por sección para el reporte de perfil
+// (motor_sim --profile-report=ARCHIVO o la variable MOTOR_PROFILE).
+//
+//   - Las secciones se registran por nombre (section) y se miden con
+//     ScopedTimer. Con un Profiler nulo ScopedTimer no lee el reloj: el
+//     costo con el perfil desactivado es una comparación por sección.
+//   - Las secciones del bucle por paso se miden sólo uno de cada
+//     SAMPLE_EVERY pasos (leer el reloj cuesta casi lo mismo que un paso);
+//     setCalls registra el total de llamadas y el reporte escala el tiempo
+//     medido: segundos = medido * llamadas / llamadas_medidas. SAMPLE_EVERY
+//     es primo para no alinearse con los bloques de potencia de dos (recarga
+//     de normales de RandomStream, bloques del escritor), cuyo costo se
+//     concentraría en los pasos medidos.
+//   - El costo de un ScopedTimer vacío se calibra al construir el Profiler
+//     y se descuenta de cada llamada medida (en el bucle por paso es del
+//     mismo orden que la sección que se mide).
+//   - writeReport escribe un JSON con el mismo esquema que profiling.py.
+class Profiler {
+public:
+    static const std::size_t SAMPLE_EVERY = 61;
+    // Variable de entorno: directorio donde cada proceso deja su reporte
+    static const char* const ENV_VARIABLE;
+
+    explicit Profiler(const std::string& program);
+
+    // Índice de la sección `name` (la crea si no existe)
+    std::size_t section(const std::string& name);
+    // Una llamada medida de `seconds` segundos
+    void add(std::size_t id, double seconds);
+    // Total de llamadas de una sección muestreada (medidas o no)
+    void setCalls(std::size_t id, std::uint64_t calls);
+    void count(const std::string& counter, std::uint64_t n = 1);
+    void setInfo(const std::string& key, double value);
+    void setInfo(const std::string& key, const std::string& value);
+
+    double wallSeconds() const;
+    // Costo estimado de medir una llamada (descontado en el reporte)
+    double timerOverhead() const { return timer_overhead; }
+    void writeReport(const std::string& filename) const;
+
+    // Ruta del reporte: `requested` si no está vacía; si no,
+    // $MOTOR_PROFILE/<programa>-<pid>.json, o "" si el perfil está desactivado
+    static std::string reportPath(const std::string& requested, const std::string& program);
+
+private:
+    void calibrate();
+
+    struct Section {
+        std::string name;
+        double seconds;               // Tiempo medido
+        std::uint64_t timed_calls;    // Llamadas medidas
+        std::uint64_t extra_calls;    // Llamadas no medidas
+    };
+
+    std::string program;
+    std::chrono::steady_clock::time_point start;
+    double timer_overhead;
+    std::vector<Section> sections;
+    std::map<std::string, std::uint64_t> counters;
+    std::map<std::string, std::string> info;   // Valores ya en formato JSON
+};
+
+// Mide el tiempo de su alcance en la sección `id` (nada si profiler es nulo)
+class ScopedTimer {
+public:
+    ScopedTimer(Profiler* p, std::size_t section_id) : profiler(p), id(section_id) {
+        if (profiler) begin = std::chrono::steady_clock::now();
+    }
+    ~ScopedTimer() {
+        if (profiler) {
+            profiler->add(id, std::chrono::duration<double>(std::chrono::steady_clock::now() - begin).count());
+        }
+    }
+    ScopedTimer(const ScopedTimer&) = delete;
+    ScopedTimer& operator=(const ScopedTimer&) = delete;
+
+private:
+    Profiler* profiler;
+    std::size_t id;
+    std::chrono::steady_clock::time_point begin;
+};
+
+#endif // PROFILER_H
@@ -0,0 +1,62 @@
+#ifndef RANDOMSTREAM_H
+#define RANDOMSTREAM_H
+
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+// Generador basado en contador Philox4x32-10 (Salmon et al., SC'11).
+//
+// Cada bloque de 128 bits es una función pura de (semilla, flujo, bloque):
+//   clave    = semilla (64 bits)
+//   contador = [bloque (64 bits), flujo (64 bits)]
+// Flujos distintos con la misma semilla son independientes y no necesitan
+// estado compartido: una trayectoria = un flujo (p. ej. el índice del motor),
+// con el mismo resultado sin importar cuántos hilos se usen.
+class RandomStream {
+public:
+    static const std::size_t GAUSSIAN_BLOCK = 256;   // Normales por recarga
+    static const std::uint64_t EVENT_BLOCK = 1ull << 63;   // Primer bloque de eventos
+
+    RandomStream(std::uint64_t seed = 0, std::uint64_t stream = 0);
+
+    std::uint64_t getSeed() const { return seed; }
+    std::uint64_t getStream() const { return stream; }
+
+    // Llena `out` con n normales estándar (Box-Muller sobre bloques Philox)
+    void fillGaussian(double* out, std::size_t n);
+
+    // Una normal estándar servida desde un búfer de GAUSSIAN_BLOCK valores
+    double gaussian() {
+        if (next == buffer.size()) refill();
+        return buffer[next++];
+    }
+
+    // Exponencial de media 1 indexada por `event` (sorteos de eventos, p. ej.
+    // conmutaciones químicas). Usa bloques Philox propios (desde EVENT_BLOCK),
+    // así no altera la secuencia de normales ni su posición.
+    double exponential(std::uint64_t event) const;
+    // Uniforme en (0, 1] del mismo bloque (la otra mitad): independiente de
+    // exponential(event), p. ej. para elegir el destino de un salto
+    double uniform(std::uint64_t event) const;
+
+    // Normales entregadas desde la creación: permite guardar y restaurar
+    // la posición exacta del flujo (puntos de control)
+    std::uint64_t position() const { return consumed + next; }
+    void seek(std::uint64_t position);
+
+    // Semilla no determinista (std::random_device), para corridas sin --seed
+    static std::uint64_t randomSeed();
+
+private:
+    std::uint64_t seed, stream;
+    std::uint64_t block;        // Próximo bloque Philox a generar
+    std::vector<double> buffer;
+    std::size_t next;           // Próxima normal del búfer
+    std::uint64_t consumed;     // Normales anteriores al búfer actual
+
+    void generate(std::uint64_t counter, std::uint32_t out[4]) const;
+    void refill();
+};
+
+#endif // RANDOMSTREAM_H
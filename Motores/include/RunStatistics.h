@@ -0,0 +1,66 @@
+#ifndef RUNSTATISTICS_H
+#define RUNSTATISTICS_H
+
+#include <cstddef>
+#include <string>
+#include <vector>
+
+// Cuándo llama Simulator::run a logData
+enum class LogMode {
+    EVERY_STEP,   // Cada paso (comportamiento original)
+    STRIDE,       // Cada `stride` pasos
+    TRANSITIONS,  // Sólo cuando cambia el estado químico
+    NONE          // Nunca: sólo acumuladores y resumen final
+};
+
+struct LoggingPolicy {
+    LogMode mode = LogMode::EVERY_STEP;
+    std::size_t stride = 1;
+
+    // Acumuladores en línea (siempre activos con LogMode::NONE)
+    bool accumulate = false;
+    std::string summary_file;   // Archivo del resumen final
+
+    // Histograma de posiciones (fuera de rango -> underflow/overflow)
+    std::size_t hist_bins = 50;
+    double hist_min = -0.5;
+    double hist_max = 1.0;
+};
+
+// Reducciones en línea sobre todos los pasos: <x>, <v>, Var(x), Var(v),
+// desplazamiento neto e histograma de posiciones.
+class RunStatistics {
+private:
+    std::size_t n;
+    double mean_x, m2_x;   // Welford para x
+    double mean_v, m2_v;   // Welford para v
+    double x_min, x_max;
+    double x_first, x_last;
+    double t_first, t_last;
+
+    std::vector<unsigned long long> hist;
+    unsigned long long underflow, overflow;
+    double hist_min, inv_bin_width;
+
+public:
+    RunStatistics(std::size_t bins, double h_min, double h_max);
+
+    void add(double t, double x, double v);
+
+    std::size_t count() const { return n; }
+    double meanX() const { return mean_x; }
+    double meanV() const { return mean_v; }
+    double varianceX() const { return n > 1 ? m2_x / n : 0.0; }
+    double varianceV() const { return n > 1 ? m2_v / n : 0.0; }
+    double netDisplacement() const { return x_last - x_first; }
+    double driftVelocity() const;
+
+    void writeSummary(const std::string& filename) const;
+
+    // Estado completo de los acumuladores (puntos de control)
+    std::vector<double> saveState() const;
+    const std::vector<unsigned long long>& histogram() const { return hist; }
+    void restoreState(const std::vector<double>& state, const std::vector<unsigned long long>& counts);
+};
+
+#endif // RUNSTATISTICS_H
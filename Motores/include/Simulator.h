@@ -1,11 +1,15 @@
 #ifndef SIMULATOR_H
 #define SIMULATOR_H
 
-#include <fstream>
+#include "Checkpoint.h"
+#include "RunStatistics.h"
+#include <memory>
 #include <string>
 
 class MotorModel;
 class Integrator;
+class DataWriter;
+class Profiler;
 
 class Simulator {
 private:
@@ -13,12 +17,53 @@ private:
     Integrator& integrator;
     double T_total;
     double dt;
-    std::ofstream data_file;
+    std::unique_ptr<DataWriter> writer;
+    LoggingPolicy policy;
+    std::unique_ptr<RunStatistics> stats;
+
+    // Puntos de control: cada `checkpoint_every` pasos y al terminar
+    std::string checkpoint_file, output_file;
+    std::size_t checkpoint_every;
+    SimulationParameters run_params;
+    IntegratorKind run_integrator;
+    bool resuming;
+    Checkpoint resume_point;
+    Profiler* profiler;
+
+    void saveCheckpoint(double t, std::size_t step, int previous_state);
+
+    bool shouldLog(std::size_t step, int previous_state) const;
+
+    // Bucle de integración; la variante sin perfil no lleva temporizadores
+    struct LoopProfile;
+    template <bool Profiled>
+    void runLoop(double& t, std::size_t& step, int& previous_state, LoopProfile& prof);
 
 public:
     Simulator(MotorModel& m, Integrator& i, double T_t, double delta_t, const std::string& filename);
+    // `w` puede ser nulo si la política de registro es LogMode::NONE
+    Simulator(MotorModel& m, Integrator& i, double T_t, double delta_t, std::unique_ptr<DataWriter> w);
+    ~Simulator();
+    void setLoggingPolicy(const LoggingPolicy& p);
+    // Guardar puntos de control en `filename` (cada `every` pasos; 0 = sólo al final).
+    // `params`, `output` e `integrator` se guardan para poder reanudar con resumeFrom.
+    void setCheckpointPolicy(const std::string& filename, std::size_t every,
+                             const SimulationParameters& params, const std::string& output,
+                             IntegratorKind integrator = IntegratorKind::BAOAB);
+    // Continuar desde un punto de control (el escritor ya debe estar reabierto
+    // con resumeDataWriter); llamar después de setLoggingPolicy
+    void resumeFrom(const Checkpoint& checkpoint);
+    // Secciones y contadores del bucle en `p` (nulo = sin perfil); también
+    // mide las descargas del escritor
+    void setProfiler(Profiler* p);
+    const RunStatistics* getStatistics() const { return stats.get(); }
+    // Devuelve el escritor al llamador (p. ej. para leer un MemoryDataWriter tras run)
+    std::unique_ptr<DataWriter> releaseWriter() { return std::move(writer); }
     void run();
     void logData(double t);
+
+    // Pasos que da run() (mismo acumulado de t que el bucle principal)
+    static std::size_t countSteps(double T_total, double dt);
 };
 
-#endif // SIMULATOR_H
\ No newline at end of file
+#endif // SIMULATOR_H
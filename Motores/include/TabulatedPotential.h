@@ -0,0 +1,82 @@
+#ifndef TABULATEDPOTENTIAL_H
+#define TABULATEDPOTENTIAL_H
+
+#include "Potential.h"
+#include <cstddef>
+#include <functional>
+#include <string>
+#include <vector>
+
+// Potencial periódico tabulado (trinquetes, dientes de sierra, datos medidos).
+//
+// La tabla cubre un período [x0, x0 + period) con n celdas uniformes; en cada
+// celda U es el polinomio cúbico de Hermite entre los nodos vecinos (U y dU/dx
+// continuas) y F = -dU/dx sale del mismo polinomio. Los coeficientes se
+// calculan una vez en el constructor: cada evaluación es una envoltura
+// periódica, una lectura de tabla y un Horner de grado 3 (O(1), sin ramas
+// por celda).
+class TabulatedPotential final : public Potential {
+public:
+    // n valores U(x0 + i h), h = period / n (sin repetir el extremo);
+    // las derivadas en los nodos salen de diferencias centrales periódicas
+    TabulatedPotential(double x0, double period, const std::vector<double>& U_samples);
+    // Igual, con dU/dx conocida en los nodos
+    TabulatedPotential(double x0, double period, const std::vector<double>& U_samples,
+                       const std::vector<double>& dU_samples);
+    // Muestrear una función en n_points nodos de un período
+    TabulatedPotential(double x0, double period, std::size_t n_points,
+                       const std::function<double(double)>& U_function);
+
+    // Archivo de texto con filas "x U" o "x U F" ('#' = comentario), x
+    // uniforme sobre un período sin repetir el extremo
+    static TabulatedPotential fromFile(const std::string& filename);
+
+    double U(double x) const override {
+        double u;
+        const Cell& c = locate(x, u);
+        return c.a + u * (c.b + u * (c.c + u * c.d));
+    }
+
+    double F(double x) const override {
+        double u;
+        const Cell& c = locate(x, u);
+        return c.fb + u * (c.fc + u * c.fd);
+    }
+
+    double getPeriod() const { return period; }
+    std::size_t size() const { return cells.size(); }
+
+private:
+    // Polinomio de U en u = (x - x_i) / h y el de F = -dU/dx ya escalado
+    // (8 doubles: una línea de caché por celda)
+    struct Cell {
+        double a, b, c, d;
+        double fb, fc, fd, pad;
+    };
+
+    double x0, period;
+    double inv_h, n_cells, inv_n;
+    std::vector<Cell> cells;
+
+    void build(const std::vector<double>& U_samples, const std::vector<double>& dU_samples);
+
+    // floor() por conversión entera: sin llamada a libm con -O2 genérico
+    static double fastFloor(double value) {
+        long long k = static_cast<long long>(value);
+        return static_cast<double>(k - (value < static_cast<double>(k)));
+    }
+
+    // Celda que contiene x y la coordenada local u en [0, 1]
+    const Cell& locate(double x, double& u) const {
+        double s = (x - x0) * inv_h;
+        double w = s - n_cells * fastFloor(s * inv_n);   // Envoltura a [0, n)
+        // Por redondeo w puede quedar apenas fuera de [0, n): truncar hacia 0
+        // y acotar deja u en [-eps, 1], el mismo valor por continuidad
+        long long i = static_cast<long long>(w);
+        if (i >= static_cast<long long>(cells.size())) i = static_cast<long long>(cells.size()) - 1;
+        u = w - static_cast<double>(i);
+        return cells[static_cast<std::size_t>(i)];
+    }
+};
+
+#endif // TABULATEDPOTENTIAL_H
@@ -0,0 +1,43 @@
+#ifndef THREADPOOL_H
+#define THREADPOOL_H
+
+#include <atomic>
+#include <condition_variable>
+#include <cstddef>
+#include <functional>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+// Hilos persistentes que reparten tareas numeradas 0..n-1.
+// run() bloquea hasta que terminan todas; las tareas se toman con un
+// contador atómico, así que el orden de ejecución no es determinista:
+// los resultados deben escribirse en ranuras por tarea y combinarse después.
+class ThreadPool {
+public:
+    typedef std::function<void(std::size_t task, std::size_t thread)> Task;
+
+    // n_threads = 0: std::thread::hardware_concurrency()
+    explicit ThreadPool(std::size_t n_threads = 0);
+    ~ThreadPool();
+
+    std::size_t size() const { return n_threads; }
+    void run(std::size_t n_tasks, const Task& task);
+
+private:
+    std::size_t n_threads;
+    std::vector<std::thread> workers;   // n_threads - 1 (el llamador también trabaja)
+
+    std::mutex mutex;
+    std::condition_variable start_cv, done_cv;
+    const Task* current;
+    std::size_t n_tasks;
+    std::atomic<std::size_t> next_task;
+    std::size_t generation, busy;
+    bool stopping;
+
+    void work(std::size_t thread);
+    void workerLoop(std::size_t thread);
+};
+
+#endif // THREADPOOL_H
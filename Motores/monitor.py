@@ -0,0 +1,252 @@
+"""
+Monitor en vivo de una corrida de motor_sim.
+
+Lee el flujo binario que escribe motor_sim con --output=- (stdout) o sobre
+un FIFO (ver StreamDataWriter en include/DataWriter.h) y, a medida que
+llegan los datos, actualiza <x>, la velocidad de deriva y el histograma de
+posiciones. La figura se redibuja a una tasa fija (--refresh) con x(t)
+reducida a min/max por píxel, como en plot_results.py: el costo de cada
+refresco no crece con el largo de la corrida.
+
+Uso:
+  python monitor.py -- bin/motor_sim.exe --T_total=100000 --log-every=100
+  bin/motor_sim.exe --output=- --T_total=100000 | python monitor.py
+  mkfifo /tmp/motor.fifo
+  python monitor.py --input /tmp/motor.fifo &
+  bin/motor_sim.exe --output=/tmp/motor.fifo --T_total=100000
+
+Con --min-drift / --max-drift la corrida se aborta en cuanto, pasado
+t = --check-after, la deriva queda fuera del rango: el monitor termina el
+proceso que lanzó o cierra el flujo (motor_sim recibe EPIPE y termina).
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from trajectory_io import iter_stream, read_stream_header
+
+DEFAULT_REFRESH = 1.0    # Segundos entre refrescos de la figura
+HIST_BINS_PER_L = 50     # Ancho de celda por defecto: l / 50
+
+
+class LiveHistogram:
+    """Histograma de ancho de celda fijo que se extiende al aparecer x nuevos"""
+
+    def __init__(self, bin_width):
+        self.bin_width = bin_width
+        self.offset = 0                      # Índice de la primera celda
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def add(self, x):
+        if len(x) == 0:
+            return
+        idx = np.floor(np.asarray(x) / self.bin_width).astype(np.int64)
+        lo, hi = int(idx.min()), int(idx.max())
+        if len(self.counts) == 0:
+            self.offset = lo
+            self.counts = np.zeros(hi - lo + 1, dtype=np.int64)
+        elif lo < self.offset or hi >= self.offset + len(self.counts):
+            new_lo = min(lo, self.offset)
+            new_hi = max(hi, self.offset + len(self.counts) - 1)
+            grown = np.zeros(new_hi - new_lo + 1, dtype=np.int64)
+            grown[self.offset - new_lo:self.offset - new_lo + len(self.counts)] = self.counts
+            self.offset, self.counts = new_lo, grown
+        self.counts += np.bincount(idx - self.offset, minlength=len(self.counts))
+
+    def edges(self):
+        return (self.offset + np.arange(len(self.counts) + 1)) * self.bin_width
+
+
+class RunMonitor:
+    """Estadísticas acumuladas del flujo: <x>, Var(x), deriva e histograma"""
+
+    def __init__(self, params, bin_width=None):
+        from plot_results import TrajectoryStats
+        self.params = params
+        self.stats = TrajectoryStats()
+        if bin_width is None:
+            bin_width = params['l'] / HIST_BINS_PER_L if params.get('l', 0.0) > 0 else 0.01
+        self.histogram = LiveHistogram(bin_width)
+        self.t_first = self.t_last = None
+
+    def add(self, chunk):
+        if len(chunk) == 0:
+            return
+        if self.t_first is None:
+            self.t_first = float(chunk.t[0])
+        self.t_last = float(chunk.t[-1])
+        self.stats.update(chunk)
+        self.histogram.add(chunk.x)
+
+    def drift(self):
+        """(x(t) - x(t0)) / (t - t0) con el último dato recibido"""
+        if self.t_first is None or self.t_last <= self.t_first:
+            return 0.0
+        return float((self.stats.last[0] - self.stats.first[0]) / (self.t_last - self.t_first))
+
+    def status(self):
+        if self.stats.n == 0:
+            return "esperando datos..."
+        T_total = self.params.get('T_total', 0.0)
+        progress = f" ({100 * self.t_last / T_total:.1f}%)" if T_total > 0 else ""
+        return (f"t = {self.t_last:.6g}{progress}  filas = {self.stats.n:,}  "
+                f"<x> = {self.stats.mean['x']:.6g}  Var(x) = {self.stats.std('x') ** 2:.4g}  "
+                f"v_deriva = {self.drift():.5g}")
+
+    def abort_reason(self, args):
+        """Motivo para abortar según --min-drift / --max-drift, o None"""
+        if self.t_last is None or self.t_last < args.check_after:
+            return None
+        drift = self.drift()
+        if args.min_drift is not None and drift < args.min_drift:
+            return f"v_deriva = {drift:.5g} < {args.min_drift:g}"
+        if args.max_drift is not None and drift > args.max_drift:
+            return f"v_deriva = {drift:.5g} > {args.max_drift:g}"
+        return None
+
+
+class LiveFigure:
+    """x(t) reducida por píxel e histograma de posiciones, redibujados en el lugar"""
+
+    def __init__(self, params):
+        import matplotlib.pyplot as plt
+        from plot_results import SAVE_DPI, _PixelSeries
+        self.plt = plt
+        self.fig, (self.ax_x, self.ax_hist) = plt.subplots(2, 1, figsize=(12, 7))
+        self.line, = self.ax_x.plot([], [], color='#0077b6', linewidth=0.8)
+        self.ax_x.set_xlabel('Tiempo ($t$)')
+        self.ax_x.set_ylabel('Posición ($x$)')
+        self.ax_x.grid(True, linestyle=':', alpha=0.6)
+        self.ax_hist.set_xlabel('Posición ($x$)')
+        self.ax_hist.set_ylabel('Densidad')
+        self.ax_hist.grid(True, linestyle=':', alpha=0.6)
+        self.stairs = None
+        T_total = params.get('T_total', 0.0)
+        t_range = (0.0, T_total) if T_total > 0 else None
+        self.series = _PixelSeries(1, int(self.fig.get_figwidth() * SAVE_DPI), t_range)
+        if t_range is not None:
+            self.ax_x.set_xlim(*t_range)
+
+    def add(self, chunk):
+        self.series.add(chunk.t, chunk.x)
+
+    def draw(self, monitor, save=None):
+        t, (x,) = self.series.points()
+        self.line.set_data(t, x)
+        if len(x):
+            pad = 0.05 * max(np.ptp(x), 1e-12)
+            self.ax_x.set_ylim(x.min() - pad, x.max() + pad)
+            if self.series.t_range is None or self.series.t_range[1] <= self.series.t_range[0]:
+                self.ax_x.set_xlim(t.min(), max(t.max(), t.min() + 1e-12))
+        counts = monitor.histogram.counts
+        if len(counts):
+            edges = monitor.histogram.edges()
+            density = counts / (counts.sum() * monitor.histogram.bin_width)
+            if self.stairs is not None:
+                self.stairs.remove()
+            self.stairs = self.ax_hist.stairs(density, edges, fill=True, color='#0077b6', alpha=0.6)
+            self.ax_hist.set_xlim(edges[0], edges[-1])
+            self.ax_hist.set_ylim(0, density.max() * 1.05)
+        self.ax_x.set_title(monitor.status(), fontsize=10)
+        if save:
+            self.fig.savefig(save, dpi=100)
+        else:
+            self.fig.canvas.draw_idle()
+            self.plt.pause(0.001)
+
+
+def open_source(args):
+    """(descriptor, proceso) de la entrada: comando lanzado, FIFO o stdin"""
+    if args.command:
+        command = args.command[1:] if args.command[0] == '--' else args.command
+        proc = subprocess.Popen(command + ["--output=-"], stdout=subprocess.PIPE)
+        return proc.stdout.fileno(), proc
+    if args.input == '-':
+        return sys.stdin.buffer.fileno(), None
+    # Abrir un FIFO bloquea hasta que motor_sim lo abre para escribir
+    return os.open(args.input, os.O_RDONLY), None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Monitor en vivo del flujo de motor_sim (--output=- o FIFO)")
+    parser.add_argument('--input', default='-',
+                        help="Flujo a leer: - (stdin, por defecto) o la ruta de un FIFO")
+    parser.add_argument('--refresh', type=float, default=DEFAULT_REFRESH,
+                        help="Segundos entre refrescos de la figura y del estado")
+    parser.add_argument('--bin-width', type=float, default=None,
+                        help="Ancho de celda del histograma (por defecto l / 50)")
+    parser.add_argument('--no-plot', action='store_true',
+                        help="Sólo imprimir el estado (sin figura)")
+    parser.add_argument('--save', default=None, metavar='PNG',
+                        help="Guardar la figura en este archivo en cada refresco (sin ventana)")
+    parser.add_argument('--min-drift', type=float, default=None,
+                        help="Abortar si la velocidad de deriva queda por debajo de este valor")
+    parser.add_argument('--max-drift', type=float, default=None,
+                        help="Abortar si la velocidad de deriva supera este valor")
+    parser.add_argument('--check-after', type=float, default=0.0,
+                        help="Tiempo simulado antes de evaluar los criterios de aborto")
+    parser.add_argument('command', nargs=argparse.REMAINDER,
+                        help="-- motor_sim [argumentos]: lanzar la corrida (se agrega --output=-)")
+    args = parser.parse_args()
+
+    if args.save or args.no_plot:
+        import matplotlib
+        matplotlib.use('Agg')
+
+    fd, proc = open_source(args)
+    try:
+        params = read_stream_header(fd)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"📡 Flujo abierto: T_total = {params['T_total']:g}, dt = {params['dt']:g}")
+
+    monitor = RunMonitor(params, args.bin_width)
+    figure = None if args.no_plot else LiveFigure(params)
+    if figure is not None and not args.save:
+        figure.plt.ion()
+        figure.plt.show()
+
+    aborted = None
+    last_refresh = 0.0
+    for chunk in iter_stream(fd, params):
+        monitor.add(chunk)
+        if figure is not None:
+            figure.add(chunk)
+        now = time.monotonic()
+        if now - last_refresh >= args.refresh:
+            last_refresh = now
+            print(f"   {monitor.status()}")
+            if figure is not None:
+                figure.draw(monitor, args.save)
+            aborted = monitor.abort_reason(args)
+            if aborted:
+                break
+
+    if aborted:
+        print(f"⛔ Corrida abortada: {aborted} (t = {monitor.t_last:.6g})")
+        if proc is not None:
+            proc.terminate()
+            proc.stdout.close()
+        else:
+            os.close(fd)   # motor_sim recibe EPIPE al escribir y termina
+    else:
+        print("✅ Flujo terminado")
+    print(f"   {monitor.status()}")
+    if figure is not None:
+        figure.draw(monitor, args.save)
+    if proc is not None:
+        proc.wait()
+    if figure is not None and not args.save:
+        figure.plt.ioff()
+        figure.plt.show()
+    sys.exit(2 if aborted else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Simulación en el mismo proceso a través de bin/libmotor.so (ctypes).
+
+Evita lanzar motor_sim, escribir el archivo y volver a leerlo: las columnas
+de la trayectoria son arreglos de NumPy sobre la memoria de C++ (sin copia)
+o se escriben directamente en arreglos del llamador.
+
+    from motor_binding import simulate
+    traj = simulate(k1=5.0, T_on=1.5, T_total=100)        # Trajectory
+    traj = simulate(T_total=1000, log_every=100)          # decimado
+
+La biblioteca se compila con: python build.py --lib
+"""
+import ctypes
+import os
+
+import numpy as np
+
+from trajectory_io import PARAM_NAMES, Trajectory
+
+LIBRARY_NAME = "libmotor.so"
+LIBRARY_PATHS = [
+    os.path.join("bin", LIBRARY_NAME),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "bin", LIBRARY_NAME),
+]
+
+# Valores por defecto = include/Parameters.h (initial_x por defecto = l / 2)
+DEFAULT_PARAMETERS = {
+    'm': 1.0, 'k0': 10.0, 'k1': 10.0, 'l': 0.5, 'T_off': 2.0, 'T_on': 2.0,
+    'gamma': 10.0, 'kBT': 0.01, 'T_total': 10.0, 'dt': 0.001,
+    'initial_x': None, 'initial_v': 0.0,
+}
+
+LOG_MODES = {'every': 0, 'stride': 1, 'transitions': 2}
+COLUMNS = ('t', 'x', 'v', 'E_total')   # Orden de motor_run_column
+ERROR_SIZE = 512
+
+_lib = None
+
+
+def load_library(path=None):
+    """Carga libmotor.so una sola vez (OSError si no está compilada)"""
+    global _lib
+    if _lib is not None and path is None:
+        return _lib
+
+    candidates = [path] if path else LIBRARY_PATHS
+    for candidate in candidates:
+        if os.path.exists(candidate):
+            break
+    else:
+        raise OSError(f"No se encontró {LIBRARY_NAME}. Compílala con: python build.py --lib")
+
+    lib = ctypes.CDLL(os.path.abspath(candidate))
+    size_t = ctypes.c_size_t
+    params_p = ctypes.POINTER(ctypes.c_double)
+    double_p = ctypes.POINTER(ctypes.c_double)
+    uint8_p = ctypes.POINTER(ctypes.c_uint8)
+
+    seed_args = [ctypes.c_int, ctypes.c_uint64, ctypes.c_uint64]
+    lib.motor_run.argtypes = [params_p, ctypes.c_int, size_t] + seed_args + [ctypes.c_char_p, size_t]
+    lib.motor_run.restype = ctypes.c_void_p
+    lib.motor_run_rows.argtypes = [ctypes.c_void_p]
+    lib.motor_run_rows.restype = size_t
+    lib.motor_run_column.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    lib.motor_run_column.restype = ctypes.c_void_p
+    lib.motor_run_states.argtypes = [ctypes.c_void_p]
+    lib.motor_run_states.restype = ctypes.c_void_p
+    lib.motor_run_free.argtypes = [ctypes.c_void_p]
+    lib.motor_run_free.restype = None
+    lib.motor_run_into.argtypes = [params_p, ctypes.c_int, size_t] + seed_args + [
+                                   double_p, double_p, double_p, uint8_p, double_p,
+                                   size_t, ctypes.c_char_p, size_t]
+    lib.motor_run_into.restype = ctypes.c_longlong
+    lib.motor_expected_rows.argtypes = [params_p, ctypes.c_int, size_t, ctypes.c_char_p, size_t]
+    lib.motor_expected_rows.restype = ctypes.c_longlong
+
+    if path is None:
+        _lib = lib
+    return lib
+
+
+class _RunHandle:
+    """Dueño de una corrida en C++: se libera cuando ningún arreglo la usa"""
+
+    def __init__(self, lib, handle):
+        self.lib = lib
+        self.handle = handle
+
+    def __del__(self):
+        if self.handle:
+            self.lib.motor_run_free(self.handle)
+            self.handle = None
+
+
+class _ColumnView:
+    """Expone una columna de C++ a NumPy vía __array_interface__ (sin copia)"""
+
+    def __init__(self, owner, address, n_rows, typestr):
+        self.owner = owner   # Mantiene viva la corrida mientras exista el arreglo
+        self.__array_interface__ = {
+            'shape': (n_rows,),
+            'typestr': typestr,
+            'data': (address or 0, True),   # Solo lectura, como np.memmap
+            'version': 3,
+        }
+
+
+def _parameters(overrides):
+    unknown = set(overrides) - set(PARAM_NAMES)
+    if unknown:
+        raise TypeError(f"Parámetros desconocidos: {', '.join(sorted(unknown))}")
+    params = dict(DEFAULT_PARAMETERS, **overrides)
+    if params['initial_x'] is None:
+        params['initial_x'] = params['l'] / 2.0
+    values = (ctypes.c_double * len(PARAM_NAMES))(*(float(params[name]) for name in PARAM_NAMES))
+    return params, values
+
+
+def _log_mode(log, log_every):
+    if log_every and log_every > 1:
+        log = 'stride'
+    if log not in LOG_MODES:
+        raise ValueError(f"log debe ser uno de {', '.join(LOG_MODES)}")
+    return LOG_MODES[log], max(int(log_every or 1), 1)
+
+
+def expected_rows(log='every', log_every=1, **params):
+    """Filas que registrará simulate() con estos parámetros"""
+    lib = load_library()
+    _, values = _parameters(params)
+    mode, stride = _log_mode(log, log_every)
+    error = ctypes.create_string_buffer(ERROR_SIZE)
+    rows = lib.motor_expected_rows(values, mode, stride, error, ERROR_SIZE)
+    if rows < 0:
+        raise ValueError(error.value.decode('utf-8', 'replace'))
+    return rows
+
+
+def simulate(log='every', log_every=1, out=None, seed=None, stream=0, **params):
+    """
+    Corre la simulación en este proceso y retorna una Trajectory.
+
+    Los parámetros son los de include/Parameters.h como argumentos con
+    nombre (m, k0, k1, l, T_off, T_on, gamma, kBT, T_total, dt, initial_x,
+    initial_v). `log` es 'every', 'stride' o 'transitions'; log_every=K
+    equivale a log='stride' con paso K. Con `seed` (y opcionalmente
+    `stream`) el ruido es reproducible; sin él la semilla es aleatoria.
+
+    Sin `out`, las columnas son vistas de solo lectura sobre los buffers de
+    C++. Con `out` (objeto con arreglos contiguos t, x, v, E_total float64 y
+    s uint8, p.ej. una Trajectory preasignada) se escribe en ellos y se
+    retornan vistas [:filas]; ver expected_rows() para dimensionarlos.
+    """
+    lib = load_library()
+    params, values = _parameters(params)
+    mode, stride = _log_mode(log, log_every)
+    error = ctypes.create_string_buffer(ERROR_SIZE)
+    seeding = (int(seed is not None), int(seed or 0), int(stream))
+
+    if out is not None:
+        arrays = {}
+        for name in COLUMNS + ('s',):
+            array = getattr(out, name)
+            dtype = np.uint8 if name == 's' else np.float64
+            if not isinstance(array, np.ndarray) or array.dtype != dtype \
+                    or not array.flags.c_contiguous or not array.flags.writeable:
+                raise TypeError(f"out.{name} debe ser un arreglo contiguo y escribible de {np.dtype(dtype)}")
+            arrays[name] = array
+        capacity = min(len(a) for a in arrays.values())
+        double_p = ctypes.POINTER(ctypes.c_double)
+        rows = lib.motor_run_into(values, mode, stride, *seeding,
+                                  arrays['t'].ctypes.data_as(double_p),
+                                  arrays['x'].ctypes.data_as(double_p),
+                                  arrays['v'].ctypes.data_as(double_p),
+                                  arrays['s'].ctypes.data_as(ctypes.POINTER(ctypes.c_uint8)),
+                                  arrays['E_total'].ctypes.data_as(double_p),
+                                  capacity, error, ERROR_SIZE)
+        if rows < 0:
+            raise RuntimeError(error.value.decode('utf-8', 'replace'))
+        return Trajectory(arrays['t'][:rows], arrays['x'][:rows], arrays['v'][:rows],
+                          arrays['s'][:rows], arrays['E_total'][:rows], params=params)
+
+    handle = lib.motor_run(values, mode, stride, *seeding, error, ERROR_SIZE)
+    if not handle:
+        raise RuntimeError(error.value.decode('utf-8', 'replace'))
+    owner = _RunHandle(lib, handle)
+    rows = lib.motor_run_rows(handle)
+
+    columns = {name: np.asarray(_ColumnView(owner, lib.motor_run_column(handle, i), rows, '<f8'))
+               for i, name in enumerate(COLUMNS)}
+    columns['s'] = np.asarray(_ColumnView(owner, lib.motor_run_states(handle), rows, '|u1'))
+    return Trajectory(columns['t'], columns['x'], columns['v'], columns['s'],
+                      columns['E_total'], params=params)
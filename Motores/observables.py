@@ -0,0 +1,369 @@
+"""
+Observables de transporte del motor: MSD, autocorrelación de velocidad,
+difusión efectiva, deriva por ciclo y x promediada por fase del ciclo.
+
+Todas las funciones aceptan una trayectoria (arreglo 1D) o un ensamble
+(arreglo 2D con el tiempo en el eje 0 y una columna por motor, como los
+que devuelve ensemble.simulate_ensemble) y promedian sobre los motores.
+Los arreglos pueden ser np.memmap (load_binary, np.load(mmap_mode='r')):
+se leen por bloques de filas, así la memoria queda acotada por el bloque.
+
+    - Correlaciones por FFT (Wiener-Khinchin): O(N log N) en lugar de O(N^2).
+      Con max_lag fijo se correlaciona por bloques (overlap-add): O(N log L).
+    - MSD(k) = S1(k) - 2 S2(k) (algoritmo de nMoldyn): S2 es la
+      autocorrelación de x y S1 sale de sumas acumuladas de x^2.
+    - Deriva y fase: plegado del tiempo por T_cycle = T_off + T_on con
+      np.bincount, O(N).
+
+Uso:
+    python observables.py                                  (datos en results/)
+    python observables.py results/datos.bin --max-lag 20000 --bins 100
+    python observables.py --save results/observables.npz
+"""
+import argparse
+import os
+
+import numpy as np
+
+from ensemble import PARAMETROS_MAIN
+from trajectory_io import Trajectory, find_data_file, load_trajectory
+
+DEFAULT_BLOCK_ROWS = 1 << 18   # Filas por bloque al recorrer arreglos largos
+
+
+def _as_columns(a):
+    """Vista 2D (tiempo, motores) sin copiar: una trayectoria 1D es una columna"""
+    a = np.asanyarray(a)
+    if a.ndim == 1:
+        return a.reshape(-1, 1)
+    if a.ndim != 2:
+        raise ValueError("Se esperaba una trayectoria 1D o un ensamble 2D (tiempo, motores)")
+    return a
+
+
+def _lag_count(n, max_lag):
+    """Número de retardos 0..max_lag (por defecto todos: n)"""
+    if n == 0:
+        raise ValueError("La trayectoria está vacía")
+    if max_lag is None:
+        return n
+    return max(1, min(int(max_lag) + 1, n))
+
+
+def _fft_size(n):
+    """Menor 2^k o 3 * 2^k >= n (la FFT es rápida con factores pequeños)"""
+    size = 1
+    while size < n:
+        size *= 2
+    if size % 4 == 0 and 3 * (size // 4) >= n:
+        return 3 * (size // 4)
+    return size
+
+
+def _blocks(n, block_rows):
+    block_rows = max(1, int(block_rows or DEFAULT_BLOCK_ROWS))
+    for start in range(0, n, block_rows):
+        yield start, min(start + block_rows, n)
+
+
+def _column_sums(cols, block_rows=None, power=1, shift=0.0):
+    """Suma por columna de (a - shift)^power, leyendo por bloques"""
+    total = np.zeros(cols.shape[1])
+    for start, stop in _blocks(len(cols), block_rows):
+        total += ((np.asarray(cols[start:stop], dtype=float) - shift) ** power).sum(axis=0)
+    return total
+
+
+def _correlation_sums(a, b, n_lags, block_rows=None, shift=0.0):
+    """
+    C[k] = sum_i (a[i] - shift) (b[i + k] - shift), k < n_lags, por columna.
+
+    Cada bloque de a (B filas) se correlaciona con b[bloque .. bloque + B + L - 1]
+    mediante una FFT de tamaño >= B + L - 1: sin aliasing circular para los
+    retardos pedidos, y la suma de bloques es la correlación exacta.
+    """
+    n = len(a)
+    if block_rows is None:
+        block_rows = max(4 * n_lags, DEFAULT_BLOCK_ROWS)
+    block_rows = min(n, block_rows)
+    n_fft = _fft_size(block_rows + n_lags - 1)
+
+    out = np.zeros((n_lags, a.shape[1]))
+    for start, stop in _blocks(n, block_rows):
+        a_seg = np.asarray(a[start:stop], dtype=float) - shift
+        b_seg = np.asarray(b[start:min(stop + n_lags - 1, n)], dtype=float) - shift
+        spectrum = np.conj(np.fft.rfft(a_seg, n_fft, axis=0)) * np.fft.rfft(b_seg, n_fft, axis=0)
+        out += np.fft.irfft(spectrum, n_fft, axis=0)[:n_lags]
+    return out
+
+
+def autocorrelation(a, max_lag=None, subtract_mean=False, block_rows=None):
+    """
+    Autocorrelación promedio <a(i) a(i + k)> para k = 0..max_lag.
+
+    Estimador sin sesgo (cada retardo se divide por sus n - k pares) y
+    promediado sobre los motores si `a` es un ensamble. Con subtract_mean se
+    usa a - <a> (función de covarianza).
+    """
+    cols = _as_columns(a)
+    n = len(cols)
+    n_lags = _lag_count(n, max_lag)
+    shift = _column_sums(cols, block_rows) / n if subtract_mean else 0.0
+    sums = _correlation_sums(cols, cols, n_lags, block_rows, shift)
+    counts = n - np.arange(n_lags)
+    return (sums / counts[:, None]).mean(axis=1)
+
+
+def velocity_autocorrelation(v, dt=1.0, max_lag=None, normalize=False, block_rows=None):
+    """
+    VACF <v(0) v(t)> por FFT. Retorna (retardos en tiempo, C_v).
+    Con normalize, C_v(t) / C_v(0).
+    """
+    c = autocorrelation(v, max_lag=max_lag, block_rows=block_rows)
+    if normalize and c[0] != 0:
+        c = c / c[0]
+    return np.arange(len(c)) * dt, c
+
+
+def _edge_sums(cols, n_lags, shift, power):
+    """
+    Sumas de (a - shift)^power sobre las primeras y últimas k filas, k < n_lags:
+    head[k] = sum_{i<k}, tail[k] = sum_{i>=n-k}
+    """
+    n = len(cols)
+    zero = np.zeros((1, cols.shape[1]))
+    head = (np.asarray(cols[:n_lags - 1], dtype=float) - shift) ** power
+    tail = (np.asarray(cols[n - (n_lags - 1):], dtype=float) - shift) ** power
+    head = np.concatenate([zero, np.cumsum(head, axis=0)])
+    tail = np.concatenate([zero, np.cumsum(tail[::-1], axis=0)])
+    return head, tail
+
+
+def displacement_moments(x, max_lag=None, block_rows=None):
+    """
+    Momentos del desplazamiento x(i + k) - x(i) para k = 0..max_lag, por
+    columna: (media, MSD), cada uno con forma (n_lags, motores).
+
+    MSD(k) = [sum_{i<n-k} x_i^2 + sum_{i>=k} x_i^2 - 2 sum_i x_i x_{i+k}] / (n - k)
+    con la correlación por FFT y los dos primeros términos por sumas
+    acumuladas de los bordes: O(N log N), sin la doble suma O(N^2).
+    """
+    cols = _as_columns(x)
+    n = len(cols)
+    n_lags = _lag_count(n, max_lag)
+    # Restar la media no cambia los desplazamientos y evita cancelaciones
+    shift = _column_sums(cols, block_rows) / n
+    counts = (n - np.arange(n_lags))[:, None]
+
+    s2 = _correlation_sums(cols, cols, n_lags, block_rows, shift)
+    total_sq = _column_sums(cols, block_rows, power=2, shift=shift)
+    head_sq, tail_sq = _edge_sums(cols, n_lags, shift, 2)
+    s1 = 2.0 * total_sq - head_sq - tail_sq
+    msd = (s1 - 2.0 * s2) / counts
+
+    # <x(i+k) - x(i)> = (sum_{i>=k} x_i - sum_{i<n-k} x_i) / (n - k)
+    head, tail = _edge_sums(cols, n_lags, shift, 1)
+    mean = (tail - head) / counts
+    return mean, np.maximum(msd, 0.0)
+
+
+def mean_square_displacement(x, dt=1.0, max_lag=None, block_rows=None):
+    """MSD promedio sobre los motores. Retorna (retardos en tiempo, MSD)"""
+    _, msd = displacement_moments(x, max_lag=max_lag, block_rows=block_rows)
+    return np.arange(len(msd)) * dt, msd.mean(axis=1)
+
+
+def effective_diffusion(x, dt=1.0, max_lag=None, fit_range=(0.25, 1.0), block_rows=None):
+    """
+    Coeficiente de difusión efectivo D_eff = Var[x(t) - x(0)] / (2 t) a
+    tiempos largos y velocidad de deriva, por ajuste lineal sobre los retardos
+    en `fit_range` (fracciones de max_lag; por defecto max_lag = N / 10).
+
+    La varianza del desplazamiento (MSD menos la deriva al cuadrado) separa la
+    dispersión del transporte dirigido.
+    """
+    cols = _as_columns(x)
+    if max_lag is None:
+        max_lag = max(1, len(cols) // 10)
+    mean, msd = displacement_moments(cols, max_lag=max_lag, block_rows=block_rows)
+    variance = (msd - mean ** 2).mean(axis=1)
+    mean = mean.mean(axis=1)
+    lags = np.arange(len(mean)) * dt
+
+    lo = int(fit_range[0] * (len(lags) - 1))
+    hi = max(int(fit_range[1] * (len(lags) - 1)) + 1, lo + 2)
+    if hi > len(lags):
+        raise ValueError("Se necesitan al menos dos retardos para ajustar D_eff")
+    D_eff = np.polyfit(lags[lo:hi], variance[lo:hi], 1)[0] / 2.0
+    velocity = np.polyfit(lags[lo:hi], mean[lo:hi], 1)[0]
+    return {'D_eff': D_eff, 'velocity': velocity, 'lags': lags,
+            'mean_displacement': mean, 'variance': variance}
+
+
+def _cycle_index(t, T_cycle):
+    return np.floor(np.asarray(t, dtype=float) / T_cycle).astype(np.int64)
+
+
+def cycle_starts(t, x, T_cycle, block_rows=None):
+    """
+    Primera fila de cada ciclo [c T_cycle, (c + 1) T_cycle): retorna
+    (índices de ciclo, x en ese instante con forma (ciclos, motores)).
+    Un recorrido por bloques: sólo se guardan las filas de inicio.
+    """
+    cols = _as_columns(x)
+    cycles, rows = [], []
+    previous = None
+    for start, stop in _blocks(len(cols), block_rows):
+        c = _cycle_index(t[start:stop], T_cycle)
+        new = np.empty(len(c), dtype=bool)
+        new[0] = previous is None or c[0] != previous
+        new[1:] = c[1:] != c[:-1]
+        idx = np.flatnonzero(new)
+        cycles.append(c[idx])
+        rows.append(np.asarray(cols[start + idx], dtype=float))
+        previous = c[-1]
+    if not cycles:
+        return np.empty(0, dtype=np.int64), np.empty((0, cols.shape[1]))
+    return np.concatenate(cycles), np.concatenate(rows)
+
+
+def drift_per_cycle(t, x, T_off, T_on, block_rows=None):
+    """
+    Desplazamiento por ciclo químico completo entre inicios de ciclos
+    consecutivos, promediado sobre los motores.
+
+    Retorna un diccionario con 'per_cycle' (desplazamiento de cada ciclo),
+    'mean', 'std', 'velocity' = mean / T_cycle y 'n_cycles'.
+    """
+    T_cycle = T_off + T_on
+    cycles, starts = cycle_starts(t, x, T_cycle, block_rows)
+    # Sólo ciclos consecutivos (con muestreo grueso puede faltar alguno)
+    consecutive = np.diff(cycles) == 1
+    per_cycle = np.diff(starts, axis=0)[consecutive].mean(axis=1)
+    if len(per_cycle) == 0:
+        return {'per_cycle': per_cycle, 'mean': np.nan, 'std': np.nan,
+                'velocity': np.nan, 'n_cycles': 0}
+    mean = per_cycle.mean()
+    return {'per_cycle': per_cycle, 'mean': mean, 'std': per_cycle.std(),
+            'velocity': mean / T_cycle, 'n_cycles': len(per_cycle)}
+
+
+def phase_average(t, x, T_off, T_on, n_bins=50, relative=True, block_rows=None):
+    """
+    x promediada por fase del ciclo (t mod T_cycle) en n_bins intervalos,
+    sobre todos los ciclos y motores.
+
+    Con relative se usa x - x(inicio del ciclo): la deriva acumulada no
+    borra la forma del ciclo. Como el plegado es lineal, un ensamble se
+    reduce primero a su media por fila. Retorna (centros de fase en [0, 1),
+    x media, muestras por intervalo).
+    """
+    T_cycle = T_off + T_on
+    cols = _as_columns(x)
+    sums = np.zeros(n_bins)
+    counts = np.zeros(n_bins, dtype=np.int64)
+    current_cycle, current_start = None, 0.0
+
+    for start, stop in _blocks(len(cols), block_rows):
+        tb = np.asarray(t[start:stop], dtype=float)
+        xb = np.asarray(cols[start:stop], dtype=float).mean(axis=1)
+        c = _cycle_index(tb, T_cycle)
+        phase = tb / T_cycle - c
+        bins = np.minimum((phase * n_bins).astype(np.int64), n_bins - 1)
+
+        if relative:
+            # x del inicio del ciclo de cada fila (arrastrado entre bloques)
+            new = np.empty(len(c), dtype=bool)
+            new[0] = current_cycle is None or c[0] != current_cycle
+            new[1:] = c[1:] != c[:-1]
+            first = np.maximum.accumulate(np.where(new, np.arange(len(c)), -1))
+            reference = np.where(first >= 0, xb[np.maximum(first, 0)], current_start)
+            xb = xb - reference
+            current_start = reference[-1]
+            current_cycle = c[-1]
+
+        sums += np.bincount(bins, weights=xb, minlength=n_bins)
+        counts += np.bincount(bins, minlength=n_bins)
+
+    centers = (np.arange(n_bins) + 0.5) / n_bins
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = sums / counts
+    return centers, mean, counts
+
+
+def _source_columns(source, T_off, T_on):
+    """(t, x, v, T_off, T_on) de una ruta, una Trajectory o un ensamble (dict)"""
+    if isinstance(source, str):
+        source = load_trajectory(source)
+    if isinstance(source, Trajectory):
+        t, x, v, params = source.t, source.x, source.v, source.params
+    else:
+        t, x, v, params = source['t'], source['x'], source['v'], source.get('params', {})
+    if T_off is None:
+        T_off = params.get('T_off', PARAMETROS_MAIN['T_off'])
+    if T_on is None:
+        T_on = params.get('T_on', PARAMETROS_MAIN['T_on'])
+    return t, x, v, T_off, T_on
+
+
+def analyze(source, max_lag=None, n_bins=50, T_off=None, T_on=None, block_rows=None):
+    """
+    Todos los observables de una trayectoria o un ensamble.
+
+    `source` puede ser la ruta de un archivo de datos, una Trajectory o el
+    diccionario de ensemble.simulate_ensemble. T_off / T_on se toman de la
+    cabecera binaria o del diccionario si no se dan (si no, los de main.cpp).
+    """
+    t, x, v, T_off, T_on = _source_columns(source, T_off, T_on)
+    if len(t) < 2:
+        raise ValueError("Se necesitan al menos dos registros")
+    dt = float(t[1] - t[0])
+    if max_lag is None:
+        max_lag = max(1, len(t) // 10)
+
+    diffusion = effective_diffusion(x, dt=dt, max_lag=max_lag, block_rows=block_rows)
+    _, msd = mean_square_displacement(x, dt=dt, max_lag=max_lag, block_rows=block_rows)
+    lags, vacf = velocity_autocorrelation(v, dt=dt, max_lag=max_lag, block_rows=block_rows)
+    drift = drift_per_cycle(t, x, T_off, T_on, block_rows=block_rows)
+    phase, x_phase, phase_counts = phase_average(t, x, T_off, T_on, n_bins=n_bins,
+                                                 block_rows=block_rows)
+    return {
+        'lags': lags, 'msd': msd, 'vacf': vacf,
+        'variance': diffusion['variance'], 'D_eff': diffusion['D_eff'],
+        'velocity': diffusion['velocity'],
+        'drift_per_cycle': drift['mean'], 'drift_std': drift['std'],
+        'drift_velocity': drift['velocity'], 'n_cycles': drift['n_cycles'],
+        'phase': phase, 'x_phase': x_phase, 'phase_counts': phase_counts,
+        'T_off': T_off, 'T_on': T_on,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Observables de transporte del motor (MSD, VACF, D_eff, deriva)")
+    parser.add_argument('data', nargs='?', help="Archivo de datos (.txt o .bin); por defecto se busca en results/")
+    parser.add_argument('--max-lag', type=int, default=None,
+                        help="Retardo máximo en registros (por defecto N / 10)")
+    parser.add_argument('--bins', type=int, default=50, help="Intervalos de fase del ciclo")
+    parser.add_argument('--T_off', type=float, default=None, help="Duración del estado 0 (si no está en el archivo)")
+    parser.add_argument('--T_on', type=float, default=None, help="Duración del estado 1 (si no está en el archivo)")
+    parser.add_argument('--save', help="Guardar los arreglos en un .npz")
+    args = parser.parse_args()
+
+    path = args.data or find_data_file()
+    if not path:
+        return
+    result = analyze(path, max_lag=args.max_lag, n_bins=args.bins, T_off=args.T_off, T_on=args.T_on)
+
+    print(f"📈 Observables de {path}")
+    print(f"   D_eff = {result['D_eff']:.6g}   velocidad = {result['velocity']:.6g}")
+    print(f"   Deriva por ciclo = {result['drift_per_cycle']:.6g} ± {result['drift_std']:.3g} "
+          f"({result['n_cycles']} ciclos, v = {result['drift_velocity']:.6g})")
+    print(f"   VACF(0) = {result['vacf'][0]:.6g}   MSD(t_max = {result['lags'][-1]:g}) = {result['msd'][-1]:.6g}")
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or '.', exist_ok=True)
+        np.savez(args.save, **result)
+        print(f"💾 Observables guardados en {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,14 @@
+import argparse
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
 import os
 import sys
 
-def find_data_file():
-    """Buscar el archivo de datos en diferentes ubicaciones"""
-    possible_paths = [
-        "results/datos_motor_dos_estados_langevin.txt",
-        "../results/datos_motor_dos_estados_langevin.txt",
-        "./results/datos_motor_dos_estados_langevin.txt",
-        "datos_motor_dos_estados_langevin.txt"
-    ]
-    
-    for path in possible_paths:
-        if os.path.exists(path):
-            print(f"✅ Archivo de datos encontrado: {path}")
-            return path
-    
-    print("❌ No se pudo encontrar el archivo de datos.")
-    return None
+import profiling
+from trajectory_io import DEFAULT_CHUNK_ROWS, find_data_file, iter_chunks, load_trajectory
 
+@profiling.timed()
 def plot_schematic_model():
     """Crear gráfica esquemática del modelo de dos estados"""
     print("Generando gráfica esquemática del modelo...")
@@ -67,6 +56,7 @@ def plot_schematic_model():
                 arrowprops=dict(arrowstyle='->', color='brown', lw=2, alpha=0.7))
     ax.text((x0 + x1)/2, 0.0, '$k_{21}$', fontsize=12, color='brown', ha='center', va='top')
 
+@profiling.timed()
 def plot_potential_landscape():
     """NUEVA: Gráfica del paisaje de energía potencial teórico"""
     print("Generando gráfica del paisaje de energía potencial...")
@@ -150,157 +140,416 @@ def plot_potential_landscape():
     
     print("✅ Gráfica del paisaje potencial generada: 05_paisaje_potencial_teorico.png")
 
-def plot_phase_space(data):
+class TrajectoryStats:
+    """Estadísticas de la trayectoria (conteo, medias, desviaciones, rangos)
+    acumuladas bloque a bloque con la fórmula de combinación de Chan."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = {'x': 0.0, 'v': 0.0}
+        self.m2 = {'x': 0.0, 'v': 0.0}
+        self.min = {}
+        self.max = {}
+        self.first = None
+        self.last = None
+
+    def update(self, chunk):
+        n_b = len(chunk)
+        if n_b == 0:
+            return
+        if self.first is None:
+            self.first = (chunk.x[0], chunk.v[0])
+        self.last = (chunk.x[-1], chunk.v[-1])
+
+        for name in ('x', 'v'):
+            col = getattr(chunk, name)
+            mean_b = np.mean(col)
+            dev = col - mean_b
+            m2_b = np.sum(dev * dev)
+            if self.n == 0:
+                self.mean[name], self.m2[name] = mean_b, m2_b
+            else:
+                n = self.n + n_b
+                delta = mean_b - self.mean[name]
+                self.mean[name] += delta * n_b / n
+                self.m2[name] += m2_b + delta * delta * self.n * n_b / n
+        for name in ('t', 'x', 'v', 'E_total'):
+            col = getattr(chunk, name)
+            lo, hi = np.min(col), np.max(col)
+            self.min[name] = min(self.min.get(name, lo), lo)
+            self.max[name] = max(self.max.get(name, hi), hi)
+        self.n += n_b
+
+    def std(self, name):
+        return np.sqrt(self.m2[name] / self.n)
+
+
+def compute_stats(chunks):
+    """Primera pasada: estadísticas de todos los bloques"""
+    stats = TrajectoryStats()
+    for chunk in chunks:
+        stats.update(chunk)
+    return stats
+
+
+# Resolución de las figuras guardadas y cubetas por píxel de las series
+SAVE_DPI = 150
+PHASE_BINS = 300   # Celdas por eje del mapa de densidad del espacio de fase
+
+
+class _PixelSeries:
+    """
+    Series vs tiempo reducidas a min/max por píxel (variante M4 de LTTB).
+
+    El eje t se divide en tantas cubetas como píxeles tiene la figura y de
+    cada cubeta se guardan el primer y último punto, el mínimo y el máximo
+    de cada columna. Dibujar esos 4 puntos por cubeta da la misma envolvente
+    que la línea completa (picos incluidos), y el costo de dibujo depende
+    sólo de la resolución. Los bloques se acumulan en orden (t creciente),
+    así sirve igual en memoria y en modo streaming.
+    """
+
+    def __init__(self, n_columns, n_buckets, t_range=None):
+        self.n_buckets = int(n_buckets)
+        self.t_range = t_range
+        shape = (self.n_buckets, n_columns)
+        self.has = np.zeros(self.n_buckets, dtype=bool)
+        self.t_first = np.zeros(self.n_buckets)
+        self.t_last = np.zeros(self.n_buckets)
+        self.first = np.zeros(shape)
+        self.last = np.zeros(shape)
+        self.min = np.zeros(shape)
+        self.max = np.zeros(shape)
+
+    def add(self, t, *columns):
+        if len(t) == 0:
+            return
+        t = np.asarray(t, dtype=float)
+        if self.t_range is None:
+            # Sin estadísticas previas: el primer bloque fija el rango
+            self.t_range = (t[0], t[-1])
+        t0, t1 = self.t_range
+        scale = self.n_buckets / (t1 - t0) if t1 > t0 else 0.0
+        idx = np.clip(((t - t0) * scale).astype(np.int64), 0, self.n_buckets - 1)
+
+        # t creciente: cada cubeta es un tramo contiguo del bloque
+        starts = np.flatnonzero(np.concatenate(([True], idx[1:] != idx[:-1])))
+        ends = np.concatenate((starts[1:], [len(t)])) - 1
+        b = idx[starts]
+        new = ~self.has[b]
+        self.t_first[b[new]] = t[starts[new]]
+        self.t_last[b] = t[ends]
+        for j, col in enumerate(columns):
+            col = np.asarray(col, dtype=float)
+            mins = np.minimum.reduceat(col, starts)
+            maxs = np.maximum.reduceat(col, starts)
+            self.first[b[new], j] = col[starts[new]]
+            self.last[b, j] = col[ends]
+            self.min[b, j] = np.where(new, mins, np.minimum(self.min[b, j], mins))
+            self.max[b, j] = np.where(new, maxs, np.maximum(self.max[b, j], maxs))
+        self.has[b] = True
+
+    def points(self):
+        """(t, [columna, ...]) con 4 puntos por cubeta: primero, min, max, último"""
+        used = np.flatnonzero(self.has)
+        middle = 0.5 * (self.t_first[used] + self.t_last[used])
+        t = np.column_stack((self.t_first[used], middle, middle, self.t_last[used])).ravel()
+        columns = [np.column_stack((self.first[used, j], self.min[used, j],
+                                    self.max[used, j], self.last[used, j])).ravel()
+                   for j in range(self.first.shape[1])]
+        return t, columns
+
+
+def _time_range(stats):
+    return (stats.min['t'], stats.max['t']) if stats is not None else None
+
+
+def _pixel_width(fig):
+    return int(fig.get_figwidth() * SAVE_DPI)
+
+
+class TrajectoryFigure:
+    """Gráfica 1: Trayectoria x(t) y Estado s(t)"""
+
+    def __init__(self, stats=None):
+        self.fig = plt.figure(figsize=(12, 7))
+        self.ax1 = self.fig.add_subplot(2, 1, 1)
+        self.ax1.set_ylabel('Posición ($x$)')
+        self.ax1.set_title('Movimiento del Motor Molecular (Langevin)')
+        self.ax1.grid(True, linestyle=':', alpha=0.6)
+
+        plt.setp(self.ax1.get_xticklabels(), visible=False)
+        self.ax2 = self.fig.add_subplot(2, 1, 2, sharex=self.ax1)
+        self.ax2.set_xlabel('Tiempo ($t$)'); self.ax2.set_ylabel('Estado ($s$)'); self.ax2.set_yticks([0, 1])
+        self.ax2.grid(True, linestyle=':', alpha=0.6)
+        self.series = _PixelSeries(2, _pixel_width(self.fig), _time_range(stats))
+
+    def add(self, chunk):
+        self.series.add(chunk.t, chunk.x, chunk.s)
+
+    def finish(self, stats):
+        t, (x, s) = self.series.points()
+        self.ax1.plot(t, x, label='Posición $x(t)$', color='#0077b6', linewidth=0.8)
+        self.ax2.plot(t, s, drawstyle='steps-post', label='Estado Químico $s(t)$',
+                      color='#9b2226', linewidth=2)
+        self.fig.tight_layout()
+        self.fig.savefig(os.path.join(FIGURES_DIR, '01_trayectoria_y_estado_langevin.png'), dpi=SAVE_DPI, bbox_inches='tight')
+        plt.close(self.fig)
+
+
+class VelocityFigure:
+    """Gráfica 2: Velocidad v(t) y Estado s(t)"""
+
+    def __init__(self, stats=None):
+        self.fig, self.ax_v = plt.subplots(figsize=(12, 5))
+        self.ax_v.set_xlabel('Tiempo ($t$)'); self.ax_v.set_ylabel('Velocidad ($v$)', color='#2a9d8f')
+        self.ax_v.tick_params(axis='y', labelcolor='#2a9d8f')
+        self.ax_v.grid(True, linestyle=':', alpha=0.5)
+
+        self.ax_s = self.ax_v.twinx()
+        self.ax_s.set_ylabel('Estado Químico ($s$)', color='#9b2226')
+        self.ax_s.tick_params(axis='y', labelcolor='#9b2226')
+        self.ax_s.set_yticks([0, 1]); self.ax_s.set_ylim(-0.1, 1.1)
+        self.ax_s.set_title('Velocidad y Estado Químico del Motor vs. Tiempo')
+        self.series = _PixelSeries(2, _pixel_width(self.fig), _time_range(stats))
+
+    def add(self, chunk):
+        self.series.add(chunk.t, chunk.v, chunk.s)
+
+    def finish(self, stats):
+        t, (v, s) = self.series.points()
+        self.ax_v.plot(t, v, label='Velocidad $v(t)$', color='#2a9d8f', alpha=0.8, linewidth=1)
+        self.ax_s.plot(t, s, label='Estado Químico $s(t)$', color='#9b2226',
+                       linestyle='-', linewidth=2)
+        self.fig.tight_layout()
+        self.fig.savefig(os.path.join(FIGURES_DIR, '02_velocidad_y_estado_langevin.png'), dpi=SAVE_DPI, bbox_inches='tight')
+        plt.close(self.fig)
+
+
+class EnergyFigure:
+    """Gráfica 3: Energía Total E(t) vs tiempo"""
+
+    def __init__(self, stats=None):
+        self.fig, self.ax = plt.subplots(figsize=(12, 4))
+        self.ax.set_xlabel('Tiempo ($t$)'); self.ax.set_ylabel('Energía Total ($E$)')
+        self.ax.set_title('Energía Total vs. Tiempo (Sistema Disipativo)')
+        self.ax.grid(True, linestyle='--', alpha=0.6)
+        self.series = _PixelSeries(1, _pixel_width(self.fig), _time_range(stats))
+
+    def add(self, chunk):
+        self.series.add(chunk.t, chunk.E_total)
+
+    def finish(self, stats):
+        t, (E_total,) = self.series.points()
+        self.ax.plot(t, E_total, label='Energía Total $E(t)$', color='#e76f51', linewidth=1)
+        self.fig.tight_layout()
+        self.fig.savefig(os.path.join(FIGURES_DIR, '03_energia_total_langevin.png'), dpi=SAVE_DPI, bbox_inches='tight')
+        plt.close(self.fig)
+
+
+class PositionHistogram:
+    """Gráfica 4: Histograma de Posiciones (50 bins entre min(x) y max(x))"""
+
+    BINS = 50
+
+    def __init__(self, stats):
+        self.range = (stats.min['x'], stats.max['x'])
+        self.counts = np.zeros(self.BINS, dtype=np.int64)
+        self.edges = None
+
+    def add(self, chunk):
+        counts, self.edges = np.histogram(chunk.x, bins=self.BINS, range=self.range)
+        self.counts += counts
+
+    def finish(self, stats):
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.hist(self.edges[:-1], bins=self.edges, weights=self.counts, density=True,
+                alpha=0.7, color='#0077b6', edgecolor='black')
+        ax.set_xlabel('Posición ($x$)')
+        ax.set_ylabel('Densidad de Probabilidad')
+        ax.set_title('Distribución de Posiciones del Motor')
+        ax.grid(True, linestyle=':', alpha=0.6)
+        fig.tight_layout()
+        fig.savefig(os.path.join(FIGURES_DIR, '04_histograma_posiciones.png'), dpi=150, bbox_inches='tight')
+        plt.close(fig)
+
+
+class PhaseSpaceFigure:
+    """Gráfica 6: espacio de fase SIMPLIFICADO (posición vs velocidad)
+
+    En lugar de una línea con todos los puntos se dibuja la densidad de
+    visitas: un histograma 2D de PHASE_BINS x PHASE_BINS celdas acumulado
+    por bloques (los rangos salen de las estadísticas previas). El costo de
+    dibujo no depende del largo de la trayectoria.
+    """
+
+    def __init__(self, stats=None):
+        self.fig, self.ax = plt.subplots(figsize=(10, 8))
+        self.range = None
+        if stats is not None:
+            self.range = [(stats.min['x'], stats.max['x']), (stats.min['v'], stats.max['v'])]
+        self.counts = np.zeros((PHASE_BINS, PHASE_BINS), dtype=np.int64)
+
+    def add(self, chunk):
+        if len(chunk) == 0:
+            return
+        if self.range is None:
+            self.range = [(np.min(chunk.x), np.max(chunk.x)), (np.min(chunk.v), np.max(chunk.v))]
+        # Rango degenerado (p. ej. v constante): ensanchar para histogram2d
+        bounds = [(lo, hi) if hi > lo else (lo - 0.5, hi + 0.5) for lo, hi in self.range]
+        counts, self.x_edges, self.v_edges = np.histogram2d(chunk.x, chunk.v, bins=PHASE_BINS, range=bounds)
+        self.counts += counts.astype(np.int64)
+
+    def finish(self, stats):
+        ax = self.ax
+
+        # Densidad de visitas (escala logarítmica: colas visibles)
+        if self.counts.any():
+            density = np.ma.masked_equal(self.counts.T, 0)
+            mesh = ax.pcolormesh(self.x_edges, self.v_edges, density, cmap='Blues',
+                                 norm=LogNorm(vmin=1, vmax=density.max()), shading='flat')
+            self.fig.colorbar(mesh, ax=ax, label='Visitas')
+
+        # Configuración del gráfico
+        ax.set_xlabel('Posición $x$', fontsize=14)
+        ax.set_ylabel('Velocidad $v$', fontsize=14)
+        ax.set_title('Espacio de Fase: Posición vs Velocidad', fontsize=16, fontweight='bold')
+        ax.grid(True, alpha=0.3)
+
+        # Estadísticas básicas (acumuladas por bloques)
+        x_mean, v_mean = stats.mean['x'], stats.mean['v']
+
+        # Líneas en promedios
+        ax.axvline(x=x_mean, color='green', linestyle='--', alpha=0.7,
+                   label=f'$\\langle x \\rangle = {x_mean:.3f}$')
+        ax.axhline(y=v_mean, color='orange', linestyle='--', alpha=0.7,
+                   label=f'$\\langle v \\rangle = {v_mean:.3f}$')
+
+        # Punto inicial y final
+        ax.plot(stats.first[0], stats.first[1], 'go', markersize=8, label='Inicio')
+        ax.plot(stats.last[0], stats.last[1], 'ro', markersize=8, label='Final')
+
+        # Texto informativo simple
+        textstr = '\n'.join([
+            f'Puntos totales: {stats.n:,}',
+            f'Rango x: [{stats.min["x"]:.3f}, {stats.max["x"]:.3f}]',
+            f'Rango v: [{stats.min["v"]:.3f}, {stats.max["v"]:.3f}]'
+        ])
+        props = dict(boxstyle='round', facecolor='lightyellow', alpha=0.8)
+        ax.text(0.02, 0.98, textstr, transform=ax.transAxes, fontsize=10,
+                verticalalignment='top', bbox=props)
+
+        ax.legend(loc='best')
+        self.fig.tight_layout()
+        self.fig.savefig(os.path.join(FIGURES_DIR, '06_espacio_fase.png'), dpi=SAVE_DPI, bbox_inches='tight')
+        plt.close(self.fig)
+
+        print("✅ Gráfica del espacio de fase generada: 06_espacio_fase.png")
+
+
+def plot_phase_space(traj):
     """NUEVA: Gráfica SIMPLIFICADA del espacio de fase (posición vs velocidad)"""
     print("Generando gráfica del espacio de fase...")
-    
-    x, v = data[:, 1], data[:, 2]
-    
-    plt.figure(figsize=(10, 8))
-    
-    # LÍNEA CONTINUA simple - conecta todos los puntos en orden temporal
-    plt.plot(x, v, 'b-', linewidth=0.5, alpha=0.7, label='Trayectoria en espacio de fase')
-    
-    # Configuración del gráfico
-    plt.xlabel('Posición $x$', fontsize=14)
-    plt.ylabel('Velocidad $v$', fontsize=14)
-    plt.title('Espacio de Fase: Posición vs Velocidad', fontsize=16, fontweight='bold')
-    plt.grid(True, alpha=0.3)
-    
-    # Calcular algunas estadísticas básicas
-    x_mean, x_std = np.mean(x), np.std(x)
-    v_mean, v_std = np.mean(v), np.std(v)
-    
-    # Líneas en promedios
-    plt.axvline(x=x_mean, color='green', linestyle='--', alpha=0.7, 
-                label=f'$\\langle x \\rangle = {x_mean:.3f}$')
-    plt.axhline(y=v_mean, color='orange', linestyle='--', alpha=0.7,
-                label=f'$\\langle v \\rangle = {v_mean:.3f}$')
-    
-    # Punto inicial y final
-    plt.plot(x[0], v[0], 'go', markersize=8, label='Inicio')
-    plt.plot(x[-1], v[-1], 'ro', markersize=8, label='Final')
-    
-    # Texto informativo simple
-    textstr = '\n'.join([
-        f'Puntos totales: {len(x):,}',
-        f'Rango x: [{np.min(x):.3f}, {np.max(x):.3f}]',
-        f'Rango v: [{np.min(v):.3f}, {np.max(v):.3f}]'
-    ])
-    props = dict(boxstyle='round', facecolor='lightyellow', alpha=0.8)
-    plt.text(0.02, 0.98, textstr, transform=plt.gca().transAxes, fontsize=10,
-             verticalalignment='top', bbox=props)
-    
-    plt.legend(loc='best')
-    plt.tight_layout()
-    plt.savefig(os.path.join(FIGURES_DIR, '06_espacio_fase.png'), dpi=150, bbox_inches='tight')
-    plt.close()
-    
-    print("✅ Gráfica del espacio de fase generada: 06_espacio_fase.png")
+    stats = compute_stats([traj])
+    figure = PhaseSpaceFigure(stats)
+    figure.add(traj)
+    figure.finish(stats)
+
+
+def plot_data_figures(chunks, stats):
+    """
+    Gráficas 01-04 y 06 a partir de una secuencia de bloques.
+
+    En memoria la secuencia es [trayectoria completa]; en modo streaming es
+    el generador de iter_chunks, recorrido una sola vez. `stats` debe venir
+    de una pasada previa (rangos del histograma, promedios, extremos).
+    """
+    print("Generando gráficas originales vs tiempo...")
+    figures = [TrajectoryFigure(stats), VelocityFigure(stats), EnergyFigure(stats),
+               PositionHistogram(stats), PhaseSpaceFigure(stats)]
+    # Perfil: tiempo de acumulación (add) y de dibujo/guardado (finish) por figura
+    for chunk in chunks:
+        profiling.count('filas', len(chunk))
+        for figure in figures:
+            with profiling.stage(f"{type(figure).__name__}.add"):
+                figure.add(chunk)
+
+    print("Generando gráfica del espacio de fase...")
+    for figure in figures:
+        with profiling.stage(f"{type(figure).__name__}.finish"):
+            figure.finish(stats)
+
 
 # Configuración
-DATA_FILE = find_data_file()
 FIGURES_DIR = "results/figures"
-os.makedirs(FIGURES_DIR, exist_ok=True)
 
-# Configurar matplotlib para evitar problemas de backend
-plt.switch_backend('Agg')
 
-try:
-    # 0. Primero generar la gráfica esquemática
-    plot_schematic_model()
-    
-    # 1. Generar el paisaje potencial teórico (siempre)
-    plot_potential_landscape()
-    
-    if DATA_FILE:
-        # 2. Cargar los Datos (Columnas: t, x, v, s, E_total)
-        print("Cargando datos de simulación...")
-        data = np.loadtxt(DATA_FILE)
-        t = data[:, 0]; x = data[:, 1]; v = data[:, 2]; s = data[:, 3]; E_total = data[:, 4]
+def main():
+    parser = argparse.ArgumentParser(description="Gráficas del motor molecular de dos estados")
+    parser.add_argument('--data', help="Archivo de datos (.txt, .bin o .mtz); por defecto se busca en results/")
+    parser.add_argument('--stream', action='store_true',
+                        help="Procesar la trayectoria por bloques con memoria acotada")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help="Filas por bloque en modo streaming")
+    parser.add_argument('--profile-report', default=None, metavar='ARCHIVO',
+                        help="Guardar tiempos por etapa en JSON (o $MOTOR_PROFILE=DIR)")
+    args = parser.parse_args()
+    profiling.configure('plot_results', args.profile_report)
 
-        print(f"Datos cargados: {len(t)} puntos de tiempo")
+    DATA_FILE = args.data or find_data_file()
+    os.makedirs(FIGURES_DIR, exist_ok=True)
 
-        # --- Gráficas originales vs tiempo ---
-        print("Generando gráficas originales vs tiempo...")
-        
-        # Gráfica 1: Trayectoria x(t) y Estado s(t)
-        plt.figure(figsize=(12, 7))
-        ax1 = plt.subplot(2, 1, 1)
-        ax1.plot(t, x, label='Posición $x(t)$', color='#0077b6', linewidth=0.8)
-        ax1.set_ylabel('Posición ($x$)')
-        ax1.set_title('Movimiento del Motor Molecular (Langevin)')
-        ax1.grid(True, linestyle=':', alpha=0.6)
-        
-        plt.setp(ax1.get_xticklabels(), visible=False)
-        ax2 = plt.subplot(2, 1, 2, sharex=ax1)
-        ax2.plot(t, s, drawstyle='steps-post', label='Estado Químico $s(t)$', color='#9b2226', linewidth=2)
-        ax2.set_xlabel('Tiempo ($t$)'); ax2.set_ylabel('Estado ($s$)'); ax2.set_yticks([0, 1])
-        ax2.grid(True, linestyle=':', alpha=0.6)
+    # Configurar matplotlib para evitar problemas de backend
+    plt.switch_backend('Agg')
+
+    try:
+        # 0. Primero generar la gráfica esquemática
+        plot_schematic_model()
         
-        plt.tight_layout()
-        plt.savefig(os.path.join(FIGURES_DIR, '01_trayectoria_y_estado_langevin.png'), dpi=150, bbox_inches='tight')
-        plt.close()
-
-        # Gráfica 2: Velocidad v(t) y Estado s(t)
-        fig, ax_v = plt.subplots(figsize=(12, 5))
-        ax_v.plot(t, v, label='Velocidad $v(t)$', color='#2a9d8f', alpha=0.8, linewidth=1)
-        ax_v.set_xlabel('Tiempo ($t$)'); ax_v.set_ylabel('Velocidad ($v$)', color='#2a9d8f')
-        ax_v.tick_params(axis='y', labelcolor='#2a9d8f')
-        ax_v.grid(True, linestyle=':', alpha=0.5)
-
-        ax_s = ax_v.twinx()
-        ax_s.plot(t, s, label='Estado Químico $s(t)$', color='#9b2226', linestyle='-', linewidth=2)
-        ax_s.set_ylabel('Estado Químico ($s$)', color='#9b2226')
-        ax_s.tick_params(axis='y', labelcolor='#9b2226')
-        ax_s.set_yticks([0, 1]); ax_s.set_ylim(-0.1, 1.1)
-
-        plt.title('Velocidad y Estado Químico del Motor vs. Tiempo')
-        fig.tight_layout()
-        plt.savefig(os.path.join(FIGURES_DIR, '02_velocidad_y_estado_langevin.png'), dpi=150, bbox_inches='tight')
-        plt.close()
+        # 1. Generar el paisaje potencial teórico (siempre)
+        plot_potential_landscape()
         
-        # Gráfica 3: Energía Total E(t) vs tiempo
-        plt.figure(figsize=(12, 4))
-        plt.plot(t, E_total, label='Energía Total $E(t)$', color='#e76f51', linewidth=1)
-        plt.xlabel('Tiempo ($t$)'); plt.ylabel('Energía Total ($E$)')
-        plt.title('Energía Total vs. Tiempo (Sistema Disipativo)')
-        plt.grid(True, linestyle='--', alpha=0.6)
-        plt.tight_layout()
-        plt.savefig(os.path.join(FIGURES_DIR, '03_energia_total_langevin.png'), dpi=150, bbox_inches='tight')
-        plt.close()
-
-        # Gráfica 4: Histograma de Posiciones
-        plt.figure(figsize=(10, 6))
-        plt.hist(x, bins=50, density=True, alpha=0.7, color='#0077b6', edgecolor='black')
-        plt.xlabel('Posición ($x$)')
-        plt.ylabel('Densidad de Probabilidad')
-        plt.title('Distribución de Posiciones del Motor')
-        plt.grid(True, linestyle=':', alpha=0.6)
-        plt.tight_layout()
-        plt.savefig(os.path.join(FIGURES_DIR, '04_histograma_posiciones.png'), dpi=150, bbox_inches='tight')
-        plt.close()
-
-        # --- NUEVAS GRÁFICAS ---
-        # 6. Espacio de fase SIMPLIFICADO
-        plot_phase_space(data)
-
-        print(f"\n¡Todas las gráficas generadas exitosamente y guardadas en: {FIGURES_DIR}!")
-        print("Gráficas creadas:")
-        print("  - 00_esquema_modelo_dos_estados.png (ESQUEMA)")
-        print("  - 01_trayectoria_y_estado_langevin.png")
-        print("  - 02_velocidad_y_estado_langevin.png") 
-        print("  - 03_energia_total_langevin.png")
-        print("  - 04_histograma_posiciones.png")
-        print("  - 05_paisaje_potencial_teorico.png (Potencial teórico)")
-        print("  - 06_espacio_fase.png (Espacio de fase simplificado)")
-
-    else:
-        print("⚠️  No se encontraron datos de simulación, pero se generaron los esquemas.")
-
-except Exception as e:
-    print(f"\nERROR: Ocurrió un error al procesar los datos: {e}")
-    print(f"Tipo de error: {type(e).__name__}")
-    import traceback
-    traceback.print_exc()
-    sys.exit(1)
\ No newline at end of file
+        if DATA_FILE:
+            # 2. Cargar los Datos (Columnas: t, x, v, s, E_total)
+            if args.stream:
+                print(f"Procesando datos por bloques de {args.chunk_size:,} filas...")
+                with profiling.stage('carga'):
+                    stats = compute_stats(iter_chunks(DATA_FILE, args.chunk_size))
+                chunks = iter_chunks(DATA_FILE, args.chunk_size)
+            else:
+                print("Cargando datos de simulación...")
+                with profiling.stage('carga'):
+                    traj = load_trajectory(DATA_FILE)
+                with profiling.stage('estadisticas'):
+                    stats = compute_stats([traj])
+                chunks = [traj]
+
+            print(f"Datos cargados: {stats.n} puntos de tiempo")
+
+            # --- Gráficas vs tiempo, histograma y espacio de fase ---
+            with profiling.stage('graficas'):
+                plot_data_figures(chunks, stats)
+
+            print(f"\n¡Todas las gráficas generadas exitosamente y guardadas en: {FIGURES_DIR}!")
+            print("Gráficas creadas:")
+            print("  - 00_esquema_modelo_dos_estados.png (ESQUEMA)")
+            print("  - 01_trayectoria_y_estado_langevin.png")
+            print("  - 02_velocidad_y_estado_langevin.png") 
+            print("  - 03_energia_total_langevin.png")
+            print("  - 04_histograma_posiciones.png")
+            print("  - 05_paisaje_potencial_teorico.png (Potencial teórico)")
+            print("  - 06_espacio_fase.png (Espacio de fase simplificado)")
+
+        else:
+            print("⚠️  No se encontraron datos de simulación, pero se generaron los esquemas.")
+
+    except Exception as e:
+        print(f"\nERROR: Ocurrió un error al procesar los datos: {e}")
+        print(f"Tipo de error: {type(e).__name__}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
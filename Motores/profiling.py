@@ -0,0 +1,217 @@
+"""
+Perfil por etapas de los scripts de Python.
+
+Mismo esquema JSON que el reporte de motor_sim (ver include/Profiler.h):
+  {program, pid, wall_seconds, sample_every, timer_overhead_seconds,
+   sections: [{name, seconds, calls, timed_calls}], counters: {}, info: {}}
+
+Se activa con --profile-report=ARCHIVO en cada script, o para todo el
+pipeline con la variable MOTOR_PROFILE=DIR: cada proceso (build.py,
+motor_sim, plot_results.py, animations.py) deja DIR/<programa>-<pid>.json.
+Sin perfil activo, stage() devuelve un contexto vacío compartido y timed()
+sólo agrega una comparación por llamada.
+
+Las etapas anidadas se nombran con su ruta ("graficas/01_trayectoria"):
+el tiempo de una etapa incluye el de sus subetapas.
+
+Uso:
+  python profiling.py [DIR o ARCHIVOS...]   Tabla con los reportes (por defecto $MOTOR_PROFILE)
+"""
+import argparse
+import atexit
+import contextlib
+import functools
+import glob
+import json
+import os
+import sys
+import time
+
+ENV_VARIABLE = "MOTOR_PROFILE"
+
+_NO_STAGE = contextlib.nullcontext()
+_active = None
+
+
+class StageProfiler:
+    """Tiempos por etapa, contadores e información de una ejecución"""
+
+    def __init__(self, program):
+        self.program = program
+        self.start = time.perf_counter()
+        self.sections = {}     # nombre -> [segundos, llamadas], en orden de aparición
+        self.counters = {}
+        self.info = {}
+        self._stack = []
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        self._stack.append(name)
+        path = "/".join(self._stack)
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(path, time.perf_counter() - begin)
+            self._stack.pop()
+
+    def add(self, name, seconds):
+        section = self.sections.setdefault(name, [0.0, 0])
+        section[0] += seconds
+        section[1] += 1
+
+    def count(self, counter, n=1):
+        self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def set_info(self, key, value):
+        self.info[key] = value
+
+    def report(self):
+        return {
+            'program': self.program,
+            'pid': os.getpid(),
+            'wall_seconds': time.perf_counter() - self.start,
+            'sample_every': 1,
+            'timer_overhead_seconds': 0.0,
+            'sections': [{'name': name, 'seconds': seconds, 'calls': calls, 'timed_calls': calls}
+                         for name, (seconds, calls) in self.sections.items()],
+            'counters': dict(self.counters),
+            'info': dict(self.info),
+        }
+
+    def write(self, path):
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+
+def report_path(program, requested=None):
+    """`requested`, $MOTOR_PROFILE/<programa>-<pid>.json, o None (perfil desactivado)"""
+    if requested:
+        return requested
+    directory = os.environ.get(ENV_VARIABLE)
+    if not directory:
+        return None
+    return os.path.join(directory, f"{program}-{os.getpid()}.json")
+
+
+def configure(program, report=None):
+    """
+    Activar el perfil de este proceso si se pidió un reporte (argumento o
+    variable de entorno). El reporte se escribe al terminar el proceso.
+    Retorna el StageProfiler activo o None.
+    """
+    global _active
+    path = report_path(program, report)
+    if path is None:
+        return None
+    _active = StageProfiler(program)
+
+    def write_report():
+        try:
+            _active.write(path)
+            print(f"⏱️  Perfil guardado en {path}")
+        except OSError as e:
+            print(f"⚠️  No se pudo guardar el perfil: {e}")
+
+    atexit.register(write_report)
+    return _active
+
+
+def active():
+    return _active
+
+
+def stage(name):
+    """Contexto que mide una etapa (vacío si el perfil está desactivado)"""
+    return _NO_STAGE if _active is None else _active.stage(name)
+
+
+def timed(name=None):
+    """Decorador: medir cada llamada de la función como la etapa `name`"""
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with _active.stage(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(counter, n=1):
+    if _active is not None:
+        _active.count(counter, n)
+
+
+def set_info(key, value):
+    if _active is not None:
+        _active.set_info(key, value)
+
+
+def load_reports(paths):
+    """Reportes JSON de una lista de archivos o directorios"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.json"))))
+        else:
+            files.append(path)
+    reports = []
+    for path in files:
+        try:
+            with open(path) as f:
+                report = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  {path}: {e}")
+            continue
+        report['path'] = path
+        reports.append(report)
+    return reports
+
+
+def print_report(report):
+    wall = report.get('wall_seconds', 0.0)
+    print(f"\n⏱️  {report.get('program', '?')} (pid {report.get('pid', '?')}): "
+          f"{wall:.3f} s  [{report['path']}]")
+    sections = sorted(report.get('sections', []), key=lambda s: s['seconds'], reverse=True)
+    if sections:
+        width = max(len(s['name']) for s in sections)
+        print(f"   {'sección':<{width}}  {'segundos':>10}  {'% total':>7}  {'llamadas':>12}")
+        for s in sections:
+            share = 100 * s['seconds'] / wall if wall > 0 else 0.0
+            sampled = "*" if s.get('timed_calls', s['calls']) < s['calls'] else " "
+            print(f"   {s['name']:<{width}}  {s['seconds']:>10.4f}  {share:>6.1f}%  {s['calls']:>12,}{sampled}")
+    for name, value in report.get('counters', {}).items():
+        print(f"   # {name} = {value:,}")
+    info = report.get('info', {})
+    if info:
+        print("   " + ", ".join(f"{k} = {v}" for k, v in info.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumen de los reportes de perfil")
+    parser.add_argument('paths', nargs='*',
+                        help="Reportes JSON o directorios (por defecto $MOTOR_PROFILE)")
+    args = parser.parse_args()
+
+    paths = args.paths or ([os.environ[ENV_VARIABLE]] if os.environ.get(ENV_VARIABLE) else [])
+    if not paths:
+        parser.error("indicar reportes o un directorio (o definir MOTOR_PROFILE)")
+    reports = load_reports(paths)
+    if not reports:
+        print("❌ No se encontraron reportes de perfil.")
+        sys.exit(1)
+    for report in sorted(reports, key=lambda r: r['path']):
+        print_report(report)
+    if any(s.get('timed_calls', s['calls']) < s['calls'] for r in reports for s in r.get('sections', [])):
+        print("\n* sección muestreada: tiempo estimado a partir de una de cada `sample_every` llamadas")
+
+
+if __name__ == "__main__":
+    main()
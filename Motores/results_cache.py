@@ -0,0 +1,155 @@
+"""
+Caché de resultados direccionada por contenido.
+
+Cada entrada es un directorio results/cache/<clave>/ con los archivos
+guardados y un meta.json. La clave es un hash de todo lo que determina el
+resultado: el contenido del ejecutable (o de los scripts), los argumentos y
+la semilla. Si nada cambió, build.py restaura la trayectoria y las figuras
+en lugar de volver a simular y graficar.
+
+El tamaño total se acota con un presupuesto en disco: al guardar una
+entrada se eliminan las menos usadas recientemente (LRU, según la fecha de
+modificación de su meta.json, que se actualiza en cada acierto).
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+CACHE_DIR = os.path.join("results", "cache")
+DEFAULT_BUDGET_MB = 2048
+BUDGET_ENV = "MOTOR_CACHE_MB"   # Presupuesto alternativo por variable de entorno
+META_FILE = "meta.json"
+
+
+def file_digest(path, block_size=1 << 20):
+    """SHA-256 del contenido de un archivo, leído por bloques"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def make_key(*parts):
+    """Clave de una entrada a partir de partes serializables en JSON"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+def default_budget_mb():
+    try:
+        return float(os.environ.get(BUDGET_ENV, DEFAULT_BUDGET_MB))
+    except ValueError:
+        return DEFAULT_BUDGET_MB
+
+
+class ResultsCache:
+    """Entradas {nombre: archivo} direccionadas por clave, con desalojo LRU"""
+
+    def __init__(self, root=CACHE_DIR, budget_mb=None):
+        self.root = root
+        self.budget_bytes = int((default_budget_mb() if budget_mb is None else budget_mb) * 1024 * 1024)
+
+    def entry_dir(self, key):
+        return os.path.join(self.root, key)
+
+    def get(self, key):
+        """Directorio de la entrada (y marcarla como usada) o None si no existe"""
+        meta = os.path.join(self.entry_dir(key), META_FILE)
+        try:
+            os.utime(meta)
+        except OSError:
+            return None
+        return self.entry_dir(key)
+
+    def meta(self, key):
+        """Contenido de meta.json de una entrada existente"""
+        with open(os.path.join(self.entry_dir(key), META_FILE)) as f:
+            return json.load(f)
+
+    def files(self, key):
+        """{nombre: ruta} de los archivos de una entrada existente"""
+        entry = self.entry_dir(key)
+        return {name: os.path.join(entry, name) for name in self.meta(key)['files']}
+
+    def put(self, key, files, move=False, meta=None):
+        """
+        Guardar {nombre: ruta} como entrada `key`. La entrada se arma en un
+        directorio temporal y se publica con un rename atómico, de modo que
+        procesos concurrentes (barridos) nunca ven entradas a medias.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=".tmp-", dir=self.root)
+        try:
+            size = 0
+            for name, path in files.items():
+                target = os.path.join(tmp, name)
+                if move:
+                    os.replace(path, target)
+                else:
+                    shutil.copyfile(path, target)
+                size += os.path.getsize(target)
+            record = {'files': sorted(files), 'size': size, 'created': time.time()}
+            record.update(meta or {})
+            with open(os.path.join(tmp, META_FILE), 'w') as f:
+                json.dump(record, f, indent=1)
+            try:
+                os.rename(tmp, self.entry_dir(key))
+            except OSError:
+                shutil.rmtree(tmp)   # Otro proceso ya guardó la misma clave
+                self.get(key)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self.evict(keep=key)
+        return self.entry_dir(key)
+
+    def restore(self, key, destinations):
+        """
+        Copiar los archivos de la entrada a {nombre: destino}. Se copian (no
+        se enlazan): motor_sim reescribe sus salidas en el lugar y dañaría
+        la entrada.
+        """
+        stored = self.files(key)
+        for name, dest in destinations.items():
+            parent = os.path.dirname(dest)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            shutil.copyfile(stored[name], dest)
+
+    def entries(self):
+        """[(última vez usada, bytes, clave)] de las entradas completas"""
+        found = []
+        try:
+            names = os.listdir(self.root)
+        except OSError:
+            return found
+        for key in names:
+            meta = os.path.join(self.root, key, META_FILE)
+            try:
+                with open(meta) as f:
+                    size = json.load(f)['size']
+                found.append((os.path.getmtime(meta), size, key))
+            except (OSError, ValueError, KeyError):
+                continue   # Entrada temporal o dañada
+        return found
+
+    def usage(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep=None):
+        """Eliminar las entradas menos usadas hasta quedar dentro del presupuesto"""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, key in entries:
+            if total <= self.budget_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
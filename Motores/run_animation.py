@@ -1,27 +1,37 @@
 import os
 import sys
 
-def main():
+import animations
+import profiling
+from trajectory_io import find_data_file, load_trajectory
+
+def main(argv=None):
     print("=== EJECUTOR RÁPIDO DE ANIMACIONES ===")
-    
-    # Verificar que existe el script de animaciones
-    if not os.path.exists("animations.py"):
-        print("❌ No se encuentra animations.py")
-        print("💡 Asegúrate de que esté en el mismo directorio")
-        return
+    argv = sys.argv[1:] if argv is None else argv
+    args = animations.build_arg_parser().parse_args(argv)
+    profiling.configure('run_animation', args.profile_report)
     
     # Verificar que existen datos
-    data_file = "results/datos_motor_dos_estados_langevin.txt"
-    if not os.path.exists(data_file):
-        print(f"❌ No se encuentran datos: {data_file}")
+    data_file = args.data or find_data_file()
+    if not data_file or not os.path.exists(data_file):
+        print(f"❌ No se encuentran datos: {data_file or 'results/datos_motor_dos_estados_langevin.*'}")
         print("💡 Primero ejecuta la simulación C++ con: python build.py")
         return
     
     print("✅ Datos encontrados")
     print("🚀 Ejecutando animaciones...")
     
-    # Ejecutar el script de animaciones
-    os.system(f'"{sys.executable}" animations.py')
+    # Cargar una sola vez y generar en el mismo proceso (sin os.system)
+    with profiling.stage('carga'):
+        traj = load_trajectory(data_file, t_range=animations.time_range(args))
+    if len(traj) == 0:
+        print("❌ La ventana de tiempo pedida no contiene datos.")
+        return
+    if not argv:
+        animations.interactive_menu(traj)
+    else:
+        animations.plt.switch_backend('Agg')
+        animations.run_batch(args, traj)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,163 @@
+#include "Checkpoint.h"
+#include "DataWriter.h"
+#include <cstdio>
+#include <cstdlib>
+#include <fstream>
+#include <iomanip>
+#include <map>
+#include <sstream>
+#include <stdexcept>
+
+static const int CHECKPOINT_VERSION = 1;
+
+template <class T>
+static std::string join(const std::vector<T>& values) {
+    std::ostringstream out;
+    out << std::setprecision(17);
+    for (std::size_t i = 0; i < values.size(); ++i) out << (i ? " " : "") << values[i];
+    return out.str();
+}
+
+static std::string joinNames(const std::vector<std::string>& names) {
+    std::string text;
+    for (std::size_t i = 0; i < names.size(); ++i) text += (i ? "," : "") + names[i];
+    return text;
+}
+
+static std::vector<std::string> splitNames(const std::string& text) {
+    std::vector<std::string> names;
+    std::istringstream in(text);
+    std::string name;
+    while (std::getline(in, name, ',')) {
+        if (!name.empty()) names.push_back(name);
+    }
+    return names;
+}
+
+// strtod también lee "inf" (p. ej. el próximo evento con tasa 0)
+static void parse(const std::string& token, double& value) { value = std::strtod(token.c_str(), nullptr); }
+static void parse(const std::string& token, unsigned long long& value) { value = std::stoull(token); }
+
+template <class T>
+static std::vector<T> split(const std::string& text) {
+    std::istringstream in(text);
+    std::vector<T> values;
+    std::string token;
+    while (in >> token) {
+        T value;
+        parse(token, value);
+        values.push_back(value);
+    }
+    return values;
+}
+
+void saveCheckpoint(const Checkpoint& c, const std::string& filename) {
+    ensureParentDirectory(filename);
+    std::string tmp = filename + ".tmp";
+    {
+        std::ofstream out(tmp);
+        if (!out.is_open()) {
+            throw std::runtime_error("No se pudo escribir el punto de control: " + tmp);
+        }
+        const SimulationParameters& p = c.params;
+        out << std::setprecision(17);
+        out << "# Punto de control de motor_sim (continuar con --resume)\n";
+        out << "version = " << CHECKPOINT_VERSION << "\n";
+        out << "m = " << p.m << "\nk0 = " << p.k0 << "\nk1 = " << p.k1 << "\nl = " << p.l << "\n";
+        out << "T_off = " << p.T_off << "\nT_on = " << p.T_on << "\n";
+        out << "switching = " << static_cast<int>(p.switching) << "\n";
+        out << "k12 = " << p.k12 << "\nk21 = " << p.k21 << "\n";
+        out << "potentials = " << joinNames(p.potentials) << "\n";
+        out << "durations = " << join(p.durations) << "\n";
+        out << "rates = " << join(p.rates) << "\n";
+        out << "gamma = " << p.gamma << "\nkBT = " << p.kBT << "\n";
+        out << "T_total = " << p.T_total << "\ndt = " << p.dt << "\n";
+        out << "initial_x = " << p.initial_x << "\ninitial_v = " << p.initial_v << "\n";
+        out << "integrator = " << static_cast<int>(c.integrator) << "\n";
+        out << "t = " << c.t << "\n";
+        out << "step = " << c.step << "\n";
+        out << "previous_state = " << c.previous_state << "\n";
+        out << "x = " << c.x << "\nv = " << c.v << "\ns = " << c.s << "\n";
+        out << "seed = " << c.seed << "\nstream = " << c.stream << "\n";
+        out << "rng_position = " << c.rng_position << "\n";
+        out << "output_file = " << c.output_file << "\n";
+        out << "writer_offset = " << c.writer_offset << "\n";
+        out << "chemical = " << join(c.chemical) << "\n";
+        out << "stats = " << join(c.stats) << "\n";
+        out << "stats_hist = " << join(c.stats_hist) << "\n";
+        out.flush();
+        if (!out) {
+            throw std::runtime_error("Error escribiendo el punto de control: " + tmp);
+        }
+    }
+    if (std::rename(tmp.c_str(), filename.c_str()) != 0) {
+        throw std::runtime_error("No se pudo reemplazar el punto de control: " + filename);
+    }
+}
+
+Checkpoint loadCheckpoint(const std::string& filename) {
+    std::ifstream in(filename);
+    if (!in.is_open()) {
+        throw std::runtime_error("No se encontró el punto de control: " + filename);
+    }
+    std::map<std::string, std::string> values;
+    std::string line;
+    while (std::getline(in, line)) {
+        if (line.empty() || line[0] == '#') continue;
+        std::string::size_type eq = line.find(" = ");
+        if (eq == std::string::npos) {
+            values[line.substr(0, line.find(" ="))] = "";
+            continue;
+        }
+        values[line.substr(0, eq)] = line.substr(eq + 3);
+    }
+
+    auto get = [&](const std::string& key) -> const std::string& {
+        std::map<std::string, std::string>::const_iterator it = values.find(key);
+        if (it == values.end()) {
+            throw std::runtime_error("Punto de control incompleto (falta '" + key + "'): " + filename);
+        }
+        return it->second;
+    };
+    auto number = [&](const std::string& key) { return std::stod(get(key)); };
+    auto count = [&](const std::string& key) {
+        return static_cast<std::uint64_t>(std::stoull(get(key)));
+    };
+
+    if (std::stoi(get("version")) != CHECKPOINT_VERSION) {
+        throw std::runtime_error("Versión de punto de control no soportada: " + filename);
+    }
+    Checkpoint c;
+    SimulationParameters& p = c.params;
+    p.m = number("m"); p.k0 = number("k0"); p.k1 = number("k1"); p.l = number("l");
+    p.T_off = number("T_off"); p.T_on = number("T_on");
+    // Puntos de control anteriores a la conmutación de Markov: modo periódico
+    if (values.count("switching")) {
+        p.switching = static_cast<SwitchingMode>(std::stoi(get("switching")));
+        p.k12 = number("k12"); p.k21 = number("k21");
+        c.chemical = split<double>(get("chemical"));
+    }
+    if (values.count("potentials")) {
+        p.potentials = splitNames(get("potentials"));
+        p.durations = split<double>(get("durations"));
+        p.rates = split<double>(get("rates"));
+    }
+    p.gamma = number("gamma"); p.kBT = number("kBT");
+    p.T_total = number("T_total"); p.dt = number("dt");
+    p.initial_x = number("initial_x"); p.initial_v = number("initial_v");
+    if (values.count("integrator")) {
+        c.integrator = static_cast<IntegratorKind>(std::stoi(get("integrator")));
+    }
+    c.t = number("t");
+    c.step = count("step");
+    c.previous_state = std::stoi(get("previous_state"));
+    c.x = number("x"); c.v = number("v");
+    c.s = std::stoi(get("s"));
+    c.seed = count("seed"); c.stream = count("stream");
+    c.rng_position = count("rng_position");
+    c.output_file = get("output_file");
+    c.writer_offset = count("writer_offset");
+    c.stats = split<double>(get("stats"));
+    c.stats_hist = split<unsigned long long>(get("stats_hist"));
+    return c;
+}
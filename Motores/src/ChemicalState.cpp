@@ -1,15 +1,183 @@
 #include "ChemicalState.h"
+#include "RandomStream.h"
 #include <cmath>
+#include <limits>
+#include <stdexcept>
+
+int ChemicalKinetics::states() const {
+    if (mode == SwitchingMode::PERIODIC) {
+        return durations.empty() ? 2 : static_cast<int>(durations.size());
+    }
+    if (mode == SwitchingMode::MARKOV && !rates.empty()) {
+        return static_cast<int>(std::lround(std::sqrt(static_cast<double>(rates.size()))));
+    }
+    return 2;
+}
 
 ChemicalState::ChemicalState(double t_off, double t_on)
-    : s(0), T_off(t_off), T_cycle(t_on + t_off) {}
+    : s(0), n_states(2), mode(SwitchingMode::PERIODIC), T_off(t_off), T_cycle(t_on + t_off),
+      starts{0.0, t_off, t_on + t_off}, half_beta(0.0),
+      valid_from(std::numeric_limits<double>::infinity()),
+      valid_until(-std::numeric_limits<double>::infinity()),
+      switch_time(std::numeric_limits<double>::infinity()),
+      events(0), hazard_left(0.0), pending(0.0) {}
+
+ChemicalState::ChemicalState(const ChemicalKinetics& kinetics, double kBT)
+    : ChemicalState(kinetics.T_off, kinetics.T_on)
+{
+    mode = kinetics.mode;
+    n_states = kinetics.states();
+
+    if (mode == SwitchingMode::PERIODIC && !kinetics.durations.empty()) {
+        starts.assign(1, 0.0);
+        for (double d : kinetics.durations) {
+            if (!(d >= 0.0)) throw std::invalid_argument("Las duraciones no pueden ser negativas");
+            starts.push_back(starts.back() + d);
+        }
+        T_off = starts[1];
+        T_cycle = starts.back();
+        if (!(T_cycle > 0.0)) throw std::invalid_argument("La suma de las duraciones debe ser positiva");
+    }
+
+    if (mode != SwitchingMode::PERIODIC) {
+        if (kinetics.rates.empty() || mode == SwitchingMode::MARKOV_POSITION) {
+            rates = {0.0, kinetics.k12, kinetics.k21, 0.0};
+        } else {
+            rates = kinetics.rates;
+            if (static_cast<std::size_t>(n_states) * n_states != rates.size()) {
+                throw std::invalid_argument("La matriz de tasas debe ser cuadrada (N x N)");
+            }
+        }
+        exit_rate.assign(n_states, 0.0);
+        for (int i = 0; i < n_states; ++i) {
+            for (int j = 0; j < n_states; ++j) {
+                double k = rates[i * n_states + j];
+                if (!(k >= 0.0)) throw std::invalid_argument("Las tasas no pueden ser negativas");
+                if (i != j) exit_rate[i] += k;
+            }
+        }
+    }
+    if (mode == SwitchingMode::MARKOV_POSITION) {
+        if (!(kBT > 0.0)) {
+            throw std::invalid_argument("Las tasas dependientes de x requieren kBT > 0");
+        }
+        half_beta = 0.5 / kBT;
+    }
+}
 
 // Implementación determinista de conmutación de estado
 void ChemicalState::update(double t, double dt) {
-    // Si el tiempo dentro del ciclo es menor a T_off, estamos en estado 0.
-    if (std::fmod(t, T_cycle) < T_off) {
-        s = 0; // U0 activo
-    } else {
-        s = 1; // U1 activo
+    // Entre conmutaciones el estado no cambia: basta comparar con el
+    // instante de la próxima conmutación en lugar de llamar a fmod.
+    if (t >= valid_from && t < valid_until) {
+        return;
+    }
+    evaluate(t);
+}
+
+void ChemicalState::evaluate(double t) {
+    // El estado es el tramo del ciclo que contiene la fase (con dos estados:
+    // fase < T_off -> estado 0, U0 activo; si no, estado 1, U1 activo)
+    double phase = std::fmod(t, T_cycle);
+    int i = 0;
+    while (i + 1 < n_states && phase >= starts[i + 1]) ++i;
+    s = i;
+    double remaining = starts[i + 1] - phase;
+
+    // Margen para el redondeo de t + remaining: cerca de la conmutación se
+    // vuelve a evaluar fmod, así el resultado es idéntico al de la versión
+    // que evaluaba fmod en cada paso.
+    double margin = 1e-9 * (std::fabs(t) + T_cycle);
+    valid_from = t;
+    valid_until = t + remaining - margin;
+    switch_time = t - phase + starts[i + 1];
+}
+
+// Destino del salto desde `s`, proporcional a las tasas de la fila, con la
+// uniforme del mismo evento que fijó el tiempo de espera
+int ChemicalState::jumpTarget(const RandomStream& rng) const {
+    const double* row = &rates[s * n_states];
+    double threshold = rng.uniform(events - 1) * exit_rate[s];
+    int target = s;
+    double cumulative = 0.0;
+    for (int j = 0; j < n_states; ++j) {
+        if (j == s || !(row[j] > 0.0)) continue;
+        target = j;
+        cumulative += row[j];
+        if (threshold < cumulative) break;
+    }
+    return target;
+}
+
+// Proceso de Markov con tasas constantes: los tiempos de espera son
+// exponenciales y se sortean sólo al conmutar (no hay una moneda por paso).
+// El siguiente tiempo de espera se cuenta desde el instante exacto de la
+// conmutación, no desde el paso en que se detecta.
+void ChemicalState::updateMarkov(double t, const RandomStream& rng) {
+    if (events == 0) {
+        valid_until = t + rng.exponential(events++) / exit_rate[s];
+    }
+    // Con tasas altas frente a 1/dt puede haber varias conmutaciones por paso
+    while (t >= valid_until) {
+        s = n_states == 2 ? 1 - s : jumpTarget(rng);
+        valid_until += rng.exponential(events++) / exit_rate[s];
+    }
+}
+
+// Tasas dependientes de la posición: k12 exp(-dU / 2kBT) y k21 exp(dU / 2kBT).
+// Se sortea un umbral E ~ Exp(1) por conmutación y se resta el riesgo
+// integrado rate(x) dt de cada paso; se conmuta cuando se agota el umbral.
+void ChemicalState::updateMarkov(double t, double dt, double dU, const RandomStream& rng) {
+    if (events == 0) {
+        hazard_left = rng.exponential(events++);
+    }
+    // Riesgo del paso anterior [t - dt, t), evaluado en x(t - dt)
+    hazard_left -= pending;
+    if (hazard_left <= 0.0) {
+        s = 1 - s;
+        hazard_left = rng.exponential(events++);
+    }
+    double rate = s == 0 ? rates[1] * std::exp(-dU * half_beta) : rates[2] * std::exp(dU * half_beta);
+    pending = rate * dt;
+}
+
+double ChemicalState::nextSwitch(double t) const {
+    switch (mode) {
+        case SwitchingMode::PERIODIC:
+            return switch_time;
+        case SwitchingMode::MARKOV:
+            return valid_until;
+        case SwitchingMode::MARKOV_POSITION:
+            break;
+    }
+    return std::numeric_limits<double>::infinity();
+}
+
+void ChemicalState::crossSwitch(double t_switch, const RandomStream& rng) {
+    if (mode == SwitchingMode::MARKOV) {
+        updateMarkov(t_switch, rng);
+        return;
+    }
+    // Periódico: siguiente estado del ciclo. La próxima conmutación se suma
+    // a la exacta (fmod en t_switch podría caer del lado anterior por
+    // redondeo); la próxima llamada a update() vuelve a evaluar fmod.
+    s = (s + 1) % n_states;
+    switch_time += starts[s + 1] - starts[s];
+    valid_from = std::numeric_limits<double>::infinity();
+    valid_until = -std::numeric_limits<double>::infinity();
+}
+
+std::vector<double> ChemicalState::saveState() const {
+    return {static_cast<double>(s), static_cast<double>(events), valid_until, hazard_left, pending};
+}
+
+void ChemicalState::restoreState(const std::vector<double>& state) {
+    if (state.size() != 5) {
+        throw std::invalid_argument("Estado químico inválido en el punto de control");
     }
-}
\ No newline at end of file
+    s = static_cast<int>(state[0]);
+    events = static_cast<std::uint64_t>(state[1]);
+    valid_until = state[2];
+    hazard_left = state[3];
+    pending = state[4];
+}
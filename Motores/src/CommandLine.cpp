@@ -0,0 +1,351 @@
+#include "CommandLine.h"
+#include <cstdlib>
+#include <fstream>
+#include <iostream>
+#include <sstream>
+#include <stdexcept>
+
+static double toDouble(const std::string& key, const std::string& value) {
+    char* end = nullptr;
+    double result = std::strtod(value.c_str(), &end);
+    if (value.empty() || *end != '\0') {
+        throw std::invalid_argument("Valor numérico inválido para --" + key + ": '" + value + "'");
+    }
+    return result;
+}
+
+static std::size_t toCount(const std::string& key, const std::string& value) {
+    double result = toDouble(key, value);
+    if (result < 1.0 || result != static_cast<double>(static_cast<std::size_t>(result))) {
+        throw std::invalid_argument("--" + key + " requiere un entero positivo");
+    }
+    return static_cast<std::size_t>(result);
+}
+
+static std::uint64_t toUnsigned(const std::string& key, const std::string& value) {
+    char* end = nullptr;
+    unsigned long long result = std::strtoull(value.c_str(), &end, 10);
+    if (value.empty() || value[0] == '-' || *end != '\0') {
+        throw std::invalid_argument("--" + key + " requiere un entero no negativo");
+    }
+    return static_cast<std::uint64_t>(result);
+}
+
+static LogMode toLogMode(const std::string& value) {
+    if (value == "every") return LogMode::EVERY_STEP;
+    if (value == "stride") return LogMode::STRIDE;
+    if (value == "transitions") return LogMode::TRANSITIONS;
+    if (value == "none") return LogMode::NONE;
+    throw std::invalid_argument("--log debe ser every, stride, transitions o none");
+}
+
+static SwitchingMode toSwitchingMode(const std::string& value) {
+    if (value == "periodic") return SwitchingMode::PERIODIC;
+    if (value == "markov") return SwitchingMode::MARKOV;
+    if (value == "markov-x") return SwitchingMode::MARKOV_POSITION;
+    throw std::invalid_argument("--switching debe ser periodic, markov o markov-x");
+}
+
+static IntegratorKind toIntegrator(const std::string& value) {
+    if (value == "baoab") return IntegratorKind::BAOAB;
+    if (value == "exact") return IntegratorKind::EXACT;
+    throw std::invalid_argument("--integrator debe ser baoab o exact");
+}
+
+static std::string trim(const std::string& s) {
+    const char* blanks = " \t\r\n";
+    std::string::size_type first = s.find_first_not_of(blanks);
+    if (first == std::string::npos) return "";
+    return s.substr(first, s.find_last_not_of(blanks) - first + 1);
+}
+
+// "a,b,c" -> {"a", "b", "c"}
+static std::vector<std::string> splitList(const std::string& value) {
+    std::vector<std::string> items;
+    std::string::size_type start = 0;
+    while (start <= value.size()) {
+        std::string::size_type comma = value.find(',', start);
+        if (comma == std::string::npos) comma = value.size();
+        std::string item = trim(value.substr(start, comma - start));
+        if (!item.empty()) items.push_back(item);
+        start = comma + 1;
+    }
+    return items;
+}
+
+static std::vector<double> toDoubleList(const std::string& key, const std::string& value) {
+    std::vector<double> values;
+    for (const std::string& item : splitList(value)) values.push_back(toDouble(key, item));
+    return values;
+}
+
+// Matriz de tasas: N filas de N números (tasa i -> j), '#' = comentario
+static std::vector<double> loadRatesFile(const std::string& filename) {
+    std::ifstream in(filename);
+    if (!in.is_open()) {
+        throw std::invalid_argument("No se pudo abrir la matriz de tasas: " + filename);
+    }
+    std::vector<double> rates;
+    std::size_t rows = 0;
+    std::string line;
+    while (std::getline(in, line)) {
+        std::string::size_type hash = line.find('#');
+        if (hash != std::string::npos) line = line.substr(0, hash);
+        std::istringstream row(line);
+        double rate;
+        std::size_t columns = 0;
+        while (row >> rate) {
+            rates.push_back(rate);
+            ++columns;
+        }
+        if (columns > 0) ++rows;
+    }
+    if (rows < 2 || rates.size() != rows * rows) {
+        throw std::invalid_argument(filename + ": se esperaba una matriz cuadrada de tasas (N >= 2)");
+    }
+    return rates;
+}
+
+// Parámetro físico por nombre (nullptr si la clave no es un parámetro)
+static double* findParameter(SimulationParameters& p, const std::string& key) {
+    if (key == "m")         return &p.m;
+    if (key == "k0")        return &p.k0;
+    if (key == "k1")        return &p.k1;
+    if (key == "l")         return &p.l;
+    if (key == "T_off")     return &p.T_off;
+    if (key == "T_on")      return &p.T_on;
+    if (key == "k12")       return &p.k12;
+    if (key == "k21")       return &p.k21;
+    if (key == "gamma")     return &p.gamma;
+    if (key == "kBT")       return &p.kBT;
+    if (key == "T_total")   return &p.T_total;
+    if (key == "dt")        return &p.dt;
+    if (key == "initial_x") return &p.initial_x;
+    if (key == "initial_v") return &p.initial_v;
+    return nullptr;
+}
+
+// Aplica una opción "clave = valor" a la configuración
+static void applyOption(RunConfig& config, const std::string& key, const std::string& value) {
+    LoggingPolicy& log = config.logging;
+
+    if (double* parameter = findParameter(config.params, key)) {
+        *parameter = toDouble(key, value);
+        if (key == "initial_x") config.initial_x_given = true;
+        if (key == "T_total") config.T_total_given = true;
+    }
+    else if (key == "config")     loadConfigFile(config, value);
+    else if (key == "output")     config.output_file = value;
+    else if (key == "quantum")    config.quantum = toDouble(key, value);
+    else if (key == "switching")  config.params.switching = toSwitchingMode(value);
+    else if (key == "integrator") config.integrator = toIntegrator(value);
+    else if (key == "potentials") config.params.potentials = splitList(value);
+    else if (key == "durations")  config.params.durations = toDoubleList(key, value);
+    else if (key == "rates")      config.params.rates = loadRatesFile(value);
+    else if (key == "log")        log.mode = toLogMode(value);
+    else if (key == "log-every") {
+        log.stride = toCount(key, value);
+        log.mode = LogMode::STRIDE;
+    }
+    else if (key == "summary") {
+        log.summary_file = value;
+        log.accumulate = true;
+    }
+    else if (key == "seed") {
+        config.seed = toUnsigned(key, value);
+        config.seed_given = true;
+    }
+    else if (key == "stream")     config.stream = toUnsigned(key, value);
+    else if (key == "checkpoint") config.checkpoint_file = value;
+    else if (key == "checkpoint-every") config.checkpoint_every = toCount(key, value);
+    else if (key == "resume") {
+        config.resume = true;
+        config.checkpoint_file = value;
+    }
+    else if (key == "motors")     config.motors = toCount(key, value);
+    else if (key == "threads")    config.threads = static_cast<std::size_t>(toUnsigned(key, value));
+    else if (key == "ensemble-output") config.ensemble_file = value;
+    else if (key == "system")     config.system_motors = toCount(key, value);
+    else if (key == "spring-k")   config.coupling.spring_k = toDouble(key, value);
+    else if (key == "spring-length") config.coupling.spring_length = toDouble(key, value);
+    else if (key == "repulsion")  config.coupling.repulsion = toDouble(key, value);
+    else if (key == "sigma")      config.coupling.sigma = toDouble(key, value);
+    else if (key == "box")        config.coupling.box = toDouble(key, value);
+    else if (key == "system-output") config.system_file = value;
+    else if (key == "hist-bins")  log.hist_bins = toCount(key, value);
+    else if (key == "hist-min")   log.hist_min = toDouble(key, value);
+    else if (key == "hist-max")   log.hist_max = toDouble(key, value);
+    else if (key == "profile-report") config.profile_file = value;
+    else throw std::invalid_argument("Opción desconocida: --" + key);
+}
+
+void loadConfigFile(RunConfig& config, const std::string& filename) {
+    std::ifstream in(filename);
+    if (!in.is_open()) {
+        throw std::invalid_argument("No se pudo abrir el archivo de configuración: " + filename);
+    }
+    std::string line;
+    int line_number = 0;
+    while (std::getline(in, line)) {
+        ++line_number;
+        std::string::size_type hash = line.find('#');
+        if (hash != std::string::npos) line = line.substr(0, hash);
+        line = trim(line);
+        if (line.empty()) continue;
+
+        std::string::size_type eq = line.find('=');
+        if (eq == std::string::npos) {
+            throw std::invalid_argument(filename + ":" + std::to_string(line_number) +
+                                        ": se esperaba 'clave = valor'");
+        }
+        applyOption(config, trim(line.substr(0, eq)), trim(line.substr(eq + 1)));
+    }
+}
+
+void validateParameters(const SimulationParameters& p) {
+    if (!(p.m > 0.0))       throw std::invalid_argument("m debe ser positiva");
+    if (!(p.dt > 0.0))      throw std::invalid_argument("dt debe ser positivo");
+    if (!(p.T_total >= 0.0)) throw std::invalid_argument("T_total no puede ser negativo");
+    if (!(p.T_off >= 0.0) || !(p.T_on >= 0.0) || !(p.T_off + p.T_on > 0.0)) {
+        throw std::invalid_argument("T_off y T_on deben ser >= 0 con T_off + T_on > 0");
+    }
+    if (!(p.k12 >= 0.0) || !(p.k21 >= 0.0)) {
+        throw std::invalid_argument("k12 y k21 no pueden ser negativas");
+    }
+    if (p.switching == SwitchingMode::MARKOV_POSITION && !(p.kBT > 0.0)) {
+        throw std::invalid_argument("--switching=markov-x requiere kBT > 0");
+    }
+    if (p.switching == SwitchingMode::MARKOV_POSITION && !p.potentials.empty() &&
+        p.potentials.size() != 2) {
+        throw std::invalid_argument("--switching=markov-x sólo admite dos estados");
+    }
+    std::size_t n_states = p.kinetics().states();
+    if (p.potentials.empty() && n_states != 2) {
+        throw std::invalid_argument("Con " + std::to_string(n_states) +
+                                    " estados hace falta --potentials (un archivo por estado)");
+    }
+    if (!p.potentials.empty() && p.potentials.size() != n_states) {
+        throw std::invalid_argument("--potentials necesita un archivo por estado (" +
+                                    std::to_string(n_states) + "); ver --durations y --rates");
+    }
+    if (!(p.gamma >= 0.0))  throw std::invalid_argument("gamma no puede ser negativo");
+    if (!(p.kBT >= 0.0))    throw std::invalid_argument("kBT no puede ser negativo");
+}
+
+RunConfig parseCommandLine(int argc, char* argv[]) {
+    RunConfig config;
+    bool positional_output = false;
+
+    for (int i = 1; i < argc; ++i) {
+        std::string arg = argv[i];
+
+        if (arg == "-h" || arg == "--help") {
+            config.show_help = true;
+            continue;
+        }
+        if (arg == "--resume") {
+            config.resume = true;
+            continue;
+        }
+        if (arg.compare(0, 2, "--") != 0) {
+            // Compatibilidad: primer argumento posicional = archivo de salida
+            if (positional_output) {
+                throw std::invalid_argument("Argumento inesperado: " + arg);
+            }
+            config.output_file = arg;
+            positional_output = true;
+            continue;
+        }
+
+        std::string key = arg.substr(2);
+        std::string value;
+        std::string::size_type eq = key.find('=');
+        if (eq != std::string::npos) {
+            value = key.substr(eq + 1);
+            key = key.substr(0, eq);
+        } else if (i + 1 < argc) {
+            value = argv[++i];
+        } else {
+            throw std::invalid_argument("Falta el valor de --" + key);
+        }
+        applyOption(config, key, value);
+    }
+
+    if (!config.initial_x_given) {
+        config.params.initial_x = config.params.l / 2.0;
+    }
+    validateParameters(config.params);
+
+    if (config.motors > 1 && config.integrator != IntegratorKind::BAOAB) {
+        throw std::invalid_argument("El ensamble sólo usa el integrador baoab");
+    }
+    if (config.system_motors > 0) {
+        if (config.motors > 1) {
+            throw std::invalid_argument("--system y --motors no se pueden combinar");
+        }
+        if (config.integrator != IntegratorKind::BAOAB) {
+            throw std::invalid_argument("Los motores acoplados sólo usan el integrador baoab");
+        }
+        if (config.checkpoint_every > 0 || config.resume) {
+            throw std::invalid_argument("Los motores acoplados no admiten puntos de control");
+        }
+    }
+    if (config.integrator == IntegratorKind::EXACT && !config.params.potentials.empty()) {
+        throw std::invalid_argument("El integrador exacto sólo admite los pozos armónicos");
+    }
+    if (!(config.quantum > 0.0)) {
+        throw std::invalid_argument("--quantum debe ser positivo");
+    }
+
+    if ((config.checkpoint_every > 0 || config.resume) && config.checkpoint_file.empty()) {
+        config.checkpoint_file = "results/checkpoint_motor_dos_estados_langevin.txt";
+    }
+
+    LoggingPolicy& log = config.logging;
+    if (log.mode == LogMode::NONE) log.accumulate = true;
+    if (log.accumulate && log.summary_file.empty()) {
+        log.summary_file = "results/resumen_motor_dos_estados_langevin.txt";
+    }
+    return config;
+}
+
+void printUsage(const char* program) {
+    std::cout << "Uso: " << program << " [salida] [opciones]\n"
+              << "  --config=ARCHIVO       Cargar parámetros 'clave = valor'\n"
+              << "  --m, --k0, --k1, --l, --T_off, --T_on, --gamma, --kBT,\n"
+              << "  --T_total, --dt, --initial_x (l/2), --initial_v\n"
+              << "                         Parámetros de la corrida (ver Parameters.h)\n"
+              << "  --switching=MODO       periodic (T_off/T_on) | markov | markov-x\n"
+              << "  --k12, --k21           Tasas 0 -> 1 y 1 -> 0 de los modos markov (0.5)\n"
+              << "  --potentials=A,B,...   Un potencial tabulado por estado (filas 'x U [F]')\n"
+              << "  --durations=d0,d1,...  Ciclo periódico de N estados\n"
+              << "  --rates=ARCHIVO        Matriz N x N de tasas i -> j (modo markov)\n"
+              << "  --integrator=TIPO      baoab | exact (Ornstein-Uhlenbeck exacto en\n"
+              << "                         cada pozo: admite dt grandes)\n"
+              << "  --output=ARCHIVO       Archivo de datos (.bin -> formato binario;\n"
+              << "                         .mtz -> comprimido por bloques;\n"
+              << "                         - o un FIFO -> flujo en vivo para monitor.py)\n"
+              << "  --quantum=Q            Resolución de x, v, E en .mtz (1e-9)\n"
+              << "  --log=MODO             every | stride | transitions | none\n"
+              << "  --log-every=K          Registrar cada K pasos\n"
+              << "  --summary=ARCHIVO      Activar acumuladores y escribir el resumen\n"
+              << "  --seed=S               Semilla del ruido (por defecto aleatoria)\n"
+              << "  --stream=K             Flujo aleatorio independiente K (0)\n"
+              << "  --checkpoint=ARCHIVO   Guardar punto de control (al terminar)\n"
+              << "  --checkpoint-every=N   Punto de control cada N pasos\n"
+              << "  --resume[=ARCHIVO]     Continuar desde el punto de control\n"
+              << "                         (--T_total mayor extiende la corrida)\n"
+              << "  --motors=M             Ensamble de M motores independientes (1)\n"
+              << "  --threads=N            Hilos del ensamble (0 = todos los núcleos)\n"
+              << "  --ensemble-output=ARCHIVO  <x>, Var(x), <v> del ensamble vs t\n"
+              << "  --system=N             N motores acoplados sobre la misma pista\n"
+              << "  --spring-k, --spring-length  Resorte entre motores consecutivos (0)\n"
+              << "  --repulsion, --sigma   Volumen excluido U = rep (1 - r/sigma)^2 (0)\n"
+              << "  --box=L                Pista periódica de longitud L (0 = abierta)\n"
+              << "  --system-output=ARCHIVO    Centro de masa, Var(x), <v>, <s> vs t\n"
+              << "  --hist-bins=N          Bins del histograma de posiciones (50)\n"
+              << "  --hist-min=X           Borde inferior del histograma (-0.5)\n"
+              << "  --hist-max=X           Borde superior del histograma (1.0)\n"
+              << "  --profile-report=ARCHIVO   Tiempos por sección y contadores en JSON\n"
+              << "                         (o $MOTOR_PROFILE=DIR -> DIR/motor_sim-<pid>.json)\n";
+}
@@ -0,0 +1,669 @@
+#include "DataWriter.h"
+#include "Profiler.h"
+#include <algorithm>
+#include <cerrno>
+#include <cmath>
+#include <csignal>
+#include <cstdlib>
+#include <cstring>
+#include <fcntl.h>
+#include <iostream>
+#include <stdexcept>
+#include <sys/stat.h>
+#include <sys/types.h>
+#include <unistd.h>
+#include <zlib.h>
+
+// Crear el directorio que contiene al archivo si no existe
+void ensureParentDirectory(const std::string& filename) {
+    std::string::size_type slash = filename.find_last_of('/');
+    if (slash == std::string::npos || slash == 0) return;
+    std::string command = "mkdir -p \"" + filename.substr(0, slash) + "\"";
+    std::system(command.c_str());
+}
+
+// Cabecera común de los formatos binario y de flujo (ver DataWriter.h)
+static void packHeader(char* header, const char* magic, std::uint32_t version,
+                       std::uint32_t header_size, std::uint64_t n_rows, std::uint64_t capacity,
+                       const SimulationParameters& params) {
+    const double values[] = {params.m, params.k0, params.k1, params.l, params.T_off,
+                             params.T_on, params.gamma, params.kBT, params.T_total,
+                             params.dt, params.initial_x, params.initial_v};
+    std::memset(header, 0, header_size);
+    std::memcpy(header, magic, 8);
+    std::memcpy(header + 8, &version, 4);
+    std::memcpy(header + 12, &header_size, 4);
+    std::memcpy(header + 16, &n_rows, 8);
+    std::memcpy(header + 24, &capacity, 8);
+    std::memcpy(header + 32, values, sizeof(values));
+}
+
+static bool endsWith(const std::string& s, const std::string& suffix) {
+    return s.size() >= suffix.size() &&
+           s.compare(s.size() - suffix.size(), suffix.size(), suffix) == 0;
+}
+
+void DataWriter::setProfiler(Profiler* p) {
+    profiler = p;
+    if (profiler) flush_section = profiler->section("escritura");
+}
+
+// ---------------------------------------------------------------------------
+// TextDataWriter
+// ---------------------------------------------------------------------------
+TextDataWriter::TextDataWriter(const std::string& filename) {
+    ensureParentDirectory(filename);
+
+    data_file.open(filename);
+    if (!data_file.is_open()) {
+        throw std::runtime_error("No se pudo abrir el archivo de salida para la simulación.");
+    }
+    // Encabezado para el archivo de datos
+    data_file << "# t\tx\tv\ts\tE_total\n";
+}
+
+TextDataWriter::TextDataWriter(const std::string& filename, std::uint64_t resume_offset) {
+    // Descartar lo escrito después del punto de control (POSIX truncate)
+    if (::truncate(filename.c_str(), static_cast<off_t>(resume_offset)) != 0) {
+        throw std::runtime_error("No se pudo reanudar el archivo de salida: " + filename);
+    }
+    data_file.open(filename, std::ios::app);
+    if (!data_file.is_open()) {
+        throw std::runtime_error("No se pudo abrir el archivo de salida para la simulación.");
+    }
+}
+
+void TextDataWriter::write(double t, double x, double v, int s, double E_total) {
+    // Escribe las columnas: t, x, v, s, E_total
+    data_file << t << "\t" << x << "\t" << v << "\t" << s << "\t" << E_total << "\n";
+}
+
+void TextDataWriter::flush() {
+    ScopedTimer timer(profiler, flush_section);
+    data_file.flush();
+}
+
+std::uint64_t TextDataWriter::offset() {
+    data_file.flush();
+    return static_cast<std::uint64_t>(data_file.tellp());
+}
+
+void TextDataWriter::close() {
+    if (!data_file.is_open()) return;
+    flush();
+    data_file.close();
+}
+
+// ---------------------------------------------------------------------------
+// BinaryDataWriter
+// ---------------------------------------------------------------------------
+const char BinaryDataWriter::MAGIC[8] = {'M', 'O', 'T', 'O', 'R', 'B', 'I', 'N'};
+const std::uint32_t BinaryDataWriter::VERSION;
+const std::uint32_t BinaryDataWriter::HEADER_SIZE;
+const std::size_t BinaryDataWriter::BLOCK_ROWS;
+
+BinaryDataWriter::BinaryDataWriter(const std::string& filename, const SimulationParameters& p)
+    : params(p), n_rows(0), capacity(0)
+{
+    ensureParentDirectory(filename);
+
+    data_file.open(filename, std::ios::in | std::ios::out | std::ios::binary | std::ios::trunc);
+    if (!data_file.is_open()) {
+        throw std::runtime_error("No se pudo abrir el archivo binario de salida para la simulación.");
+    }
+    buf_t.reserve(BLOCK_ROWS); buf_x.reserve(BLOCK_ROWS); buf_v.reserve(BLOCK_ROWS);
+    buf_E.reserve(BLOCK_ROWS); buf_s.reserve(BLOCK_ROWS);
+    writeHeader();
+}
+
+BinaryDataWriter::BinaryDataWriter(const std::string& filename, const SimulationParameters& p,
+                                   std::uint64_t resume_rows)
+    : params(p), n_rows(0), capacity(0)
+{
+    data_file.open(filename, std::ios::in | std::ios::out | std::ios::binary);
+    if (!data_file.is_open()) {
+        throw std::runtime_error("No se pudo reanudar el archivo binario: " + filename);
+    }
+    char header[HEADER_SIZE];
+    data_file.read(header, HEADER_SIZE);
+    if (!data_file || std::memcmp(header, MAGIC, 8) != 0) {
+        throw std::runtime_error("El archivo no es una salida binaria de motor_sim: " + filename);
+    }
+    std::uint64_t stored_rows;
+    std::memcpy(&stored_rows, header + 16, 8);
+    std::memcpy(&capacity, header + 24, 8);
+    if (resume_rows > stored_rows) {
+        throw std::runtime_error("El archivo binario tiene menos filas que el punto de control: " + filename);
+    }
+    // Las filas posteriores al punto de control se sobrescriben
+    n_rows = resume_rows;
+    buf_t.reserve(BLOCK_ROWS); buf_x.reserve(BLOCK_ROWS); buf_v.reserve(BLOCK_ROWS);
+    buf_E.reserve(BLOCK_ROWS); buf_s.reserve(BLOCK_ROWS);
+    writeHeader();
+}
+
+BinaryDataWriter::~BinaryDataWriter() {
+    if (data_file.is_open()) close();
+}
+
+// Columnas: 0=t, 1=x, 2=v, 3=E_total (float64), 4=s (uint8)
+std::uint64_t BinaryDataWriter::columnOffset(int column, std::uint64_t cap) const {
+    return HEADER_SIZE + static_cast<std::uint64_t>(column) * sizeof(double) * cap;
+}
+
+void BinaryDataWriter::writeHeader() {
+    char header[HEADER_SIZE];
+    packHeader(header, MAGIC, VERSION, HEADER_SIZE, n_rows, capacity, params);
+    data_file.seekp(0);
+    data_file.write(header, HEADER_SIZE);
+}
+
+void BinaryDataWriter::reserve(std::size_t rows) {
+    if (rows > capacity) grow(rows);
+}
+
+// Aumenta la capacidad reubicando las columnas ya escritas.
+// Se mueven de la última a la primera: la nueva zona de cada columna sólo
+// pisa zonas antiguas de columnas que ya fueron reubicadas. Dentro de una
+// columna se copia de atrás hacia adelante: con un aumento menor que la
+// capacidad actual (reserve al extender una corrida) el destino se solapa
+// con el origen aún no leído.
+void BinaryDataWriter::grow(std::uint64_t new_capacity) {
+    std::vector<char> chunk(1 << 20);
+    for (int column = 4; column >= 1; --column) {
+        std::uint64_t item = (column == 4) ? 1 : sizeof(double);
+        std::uint64_t remaining = n_rows * item;
+        std::uint64_t src = columnOffset(column, capacity) + remaining;
+        std::uint64_t dst = columnOffset(column, new_capacity) + remaining;
+        while (remaining > 0) {
+            std::uint64_t n = std::min<std::uint64_t>(remaining, chunk.size());
+            src -= n; dst -= n; remaining -= n;
+            data_file.seekg(src);
+            data_file.read(&chunk[0], n);
+            data_file.seekp(dst);
+            data_file.write(&chunk[0], n);
+        }
+    }
+    capacity = new_capacity;
+}
+
+void BinaryDataWriter::write(double t, double x, double v, int s, double E_total) {
+    buf_t.push_back(t);
+    buf_x.push_back(x);
+    buf_v.push_back(v);
+    buf_E.push_back(E_total);
+    buf_s.push_back(static_cast<std::uint8_t>(s));
+    if (buf_t.size() >= BLOCK_ROWS) flush();
+}
+
+void BinaryDataWriter::flush() {
+    ScopedTimer timer(profiler, flush_section);
+    std::uint64_t pending = buf_t.size();
+    if (n_rows + pending > capacity) {
+        grow(std::max<std::uint64_t>(2 * capacity, n_rows + pending));
+    }
+    if (pending > 0) {
+        const std::vector<double>* columns[] = {&buf_t, &buf_x, &buf_v, &buf_E};
+        for (int c = 0; c < 4; ++c) {
+            data_file.seekp(columnOffset(c, capacity) + n_rows * sizeof(double));
+            data_file.write(reinterpret_cast<const char*>(columns[c]->data()),
+                            pending * sizeof(double));
+        }
+        data_file.seekp(columnOffset(4, capacity) + n_rows);
+        data_file.write(reinterpret_cast<const char*>(buf_s.data()), pending);
+
+        n_rows += pending;
+        buf_t.clear(); buf_x.clear(); buf_v.clear(); buf_E.clear(); buf_s.clear();
+    }
+    writeHeader();
+    data_file.flush();
+    if (!data_file) {
+        throw std::runtime_error("Error escribiendo el archivo binario de salida.");
+    }
+}
+
+void BinaryDataWriter::close() {
+    if (!data_file.is_open()) return;
+    flush();
+    data_file.close();
+}
+
+// ---------------------------------------------------------------------------
+// CompressedDataWriter
+// ---------------------------------------------------------------------------
+const char CompressedDataWriter::MAGIC[8] = {'M', 'O', 'T', 'O', 'R', 'Z', 'I', 'P'};
+const char CompressedDataWriter::CHUNK_TAG[4] = {'M', 'T', 'Z', 'C'};
+const std::uint32_t CompressedDataWriter::VERSION;
+const std::uint32_t CompressedDataWriter::HEADER_SIZE;
+const std::uint32_t CompressedDataWriter::CHUNK_HEADER_SIZE;
+const std::uint32_t CompressedDataWriter::INDEX_ENTRY_SIZE;
+const std::size_t CompressedDataWriter::CHUNK_ROWS;
+const std::uint64_t CompressedDataWriter::MAX_REPLAY_STEPS;
+constexpr double CompressedDataWriter::DEFAULT_QUANTUM;
+const int CompressedDataWriter::COMPRESSION_LEVEL;
+
+// Entero sin signo en grupos de 7 bits, el menos significativo primero
+static void putVarint(std::vector<std::uint8_t>& out, std::uint64_t value) {
+    while (value >= 0x80) {
+        out.push_back(static_cast<std::uint8_t>(value | 0x80));
+        value >>= 7;
+    }
+    out.push_back(static_cast<std::uint8_t>(value));
+}
+
+static void putBytes(std::vector<std::uint8_t>& out, const void* data, std::size_t size) {
+    const std::uint8_t* bytes = static_cast<const std::uint8_t*>(data);
+    out.insert(out.end(), bytes, bytes + size);
+}
+
+CompressedDataWriter::CompressedDataWriter(const std::string& filename, const SimulationParameters& p,
+                                           double q)
+    : params(p), quantum(q), inv_quantum(0.0), n_rows(0), end_position(HEADER_SIZE)
+{
+    if (!(quantum > 0.0)) {
+        throw std::invalid_argument("El cuántum del formato comprimido debe ser positivo.");
+    }
+    inv_quantum = 1.0 / quantum;
+    ensureParentDirectory(filename);
+
+    data_file.open(filename, std::ios::in | std::ios::out | std::ios::binary | std::ios::trunc);
+    if (!data_file.is_open()) {
+        throw std::runtime_error("No se pudo abrir el archivo comprimido de salida para la simulación.");
+    }
+    writeHeader(0);
+    startChunk();
+}
+
+CompressedDataWriter::CompressedDataWriter(const std::string& filename, const SimulationParameters& p,
+                                           std::uint64_t resume_rows)
+    : params(p), quantum(0.0), inv_quantum(0.0), n_rows(0), end_position(HEADER_SIZE)
+{
+    data_file.open(filename, std::ios::in | std::ios::binary);
+    if (!data_file.is_open()) {
+        throw std::runtime_error("No se pudo reanudar el archivo comprimido: " + filename);
+    }
+    char header[HEADER_SIZE];
+    data_file.read(header, HEADER_SIZE);
+    if (!data_file || std::memcmp(header, MAGIC, 8) != 0) {
+        throw std::runtime_error("El archivo no es una salida comprimida de motor_sim: " + filename);
+    }
+    std::memcpy(&quantum, header + 128, 8);
+    inv_quantum = 1.0 / quantum;
+
+    // Recorrer los bloques por sus cabeceras hasta sumar las filas del punto de control
+    while (n_rows < resume_rows) {
+        char chunk[CHUNK_HEADER_SIZE];
+        data_file.seekg(end_position);
+        data_file.read(chunk, CHUNK_HEADER_SIZE);
+        if (!data_file || std::memcmp(chunk, CHUNK_TAG, 4) != 0) break;
+        std::uint32_t rows, packed_size;
+        IndexEntry entry;
+        std::memcpy(&rows, chunk + 4, 4);
+        std::memcpy(&packed_size, chunk + 12, 4);
+        std::memcpy(&entry.t0, chunk + 24, 8);
+        entry.position = end_position;
+        entry.first_row = n_rows;
+        entry.rows = rows;
+        index.push_back(entry);
+        n_rows += rows;
+        end_position += CHUNK_HEADER_SIZE + packed_size;
+    }
+    if (n_rows != resume_rows) {
+        throw std::runtime_error("El archivo comprimido no tiene un bloque que termine en la fila "
+                                 "del punto de control: " + filename);
+    }
+    // Los bloques posteriores al punto de control y el índice se descartan
+    data_file.close();
+    if (::truncate(filename.c_str(), static_cast<off_t>(end_position)) != 0) {
+        throw std::runtime_error("No se pudo recortar el archivo comprimido: " + filename);
+    }
+    data_file.open(filename, std::ios::in | std::ios::out | std::ios::binary);
+    if (!data_file.is_open()) {
+        throw std::runtime_error("No se pudo reanudar el archivo comprimido: " + filename);
+    }
+    writeHeader(0);
+    startChunk();
+}
+
+CompressedDataWriter::~CompressedDataWriter() {
+    if (data_file.is_open()) close();
+}
+
+void CompressedDataWriter::writeHeader(std::uint64_t index_position) {
+    char header[HEADER_SIZE];
+    packHeader(header, MAGIC, VERSION, HEADER_SIZE, n_rows, index_position, params);
+    const std::uint32_t chunk_capacity = CHUNK_ROWS;
+    std::memcpy(header + 128, &quantum, 8);
+    std::memcpy(header + 136, &chunk_capacity, 4);
+    data_file.seekp(0);
+    data_file.write(header, HEADER_SIZE);
+}
+
+void CompressedDataWriter::startChunk() {
+    chunk_rows = 0;
+    chunk_t0 = last_t = 0.0;
+    last_q[0] = last_q[1] = last_q[2] = 0;
+    steps.clear();
+    exceptions.clear();
+    runs.clear();
+    for (std::vector<std::uint8_t>& column : columns) column.clear();
+    run_state = -1;
+    run_length = 0;
+}
+
+void CompressedDataWriter::endRun() {
+    if (run_length == 0) return;
+    const std::uint8_t state = static_cast<std::uint8_t>(run_state);
+    putBytes(runs, &state, 1);
+    putBytes(runs, &run_length, 4);
+    run_length = 0;
+}
+
+std::int64_t CompressedDataWriter::quantize(double value) const {
+    double scaled = value * inv_quantum;
+    // |q| < 2^62: las diferencias entre filas caben en int64
+    if (!(std::fabs(scaled) < 4.0e18)) {
+        throw std::runtime_error("Valor no representable con el cuántum del formato comprimido: " +
+                                 std::to_string(value));
+    }
+    return std::llround(scaled);
+}
+
+void CompressedDataWriter::write(double t, double x, double v, int s, double E_total) {
+    if (chunk_rows == 0) {
+        chunk_t0 = t;
+        putVarint(steps, 0);
+    } else {
+        // Pasos de dt desde la fila anterior: al leer, t se reconstruye
+        // sumando dt uno a uno como Simulator (t += dt), bit a bit
+        double gap = (t - last_t) / params.dt;
+        std::uint64_t n = (gap > 0.0 && gap <= MAX_REPLAY_STEPS) ? static_cast<std::uint64_t>(std::llround(gap)) : 0;
+        double replay = last_t;
+        for (std::uint64_t k = 0; k < n; ++k) replay += params.dt;
+        putVarint(steps, n);
+        if (n == 0 || replay != t) {
+            const std::uint32_t row = static_cast<std::uint32_t>(chunk_rows);
+            putBytes(exceptions, &row, 4);
+            putBytes(exceptions, &t, 8);
+        }
+    }
+    last_t = t;
+
+    const double values[3] = {x, v, E_total};
+    for (int c = 0; c < 3; ++c) {
+        std::int64_t q = quantize(values[c]);
+        std::int64_t delta = q - last_q[c];
+        putVarint(columns[c], (static_cast<std::uint64_t>(delta) << 1) ^ static_cast<std::uint64_t>(delta >> 63));
+        last_q[c] = q;
+    }
+
+    if (s != run_state) {
+        endRun();
+        run_state = s;
+    }
+    ++run_length;
+    if (++chunk_rows == CHUNK_ROWS) flush();
+}
+
+void CompressedDataWriter::flush() {
+    ScopedTimer timer(profiler, flush_section);
+    if (chunk_rows > 0) {
+        endRun();
+        // Contenido del bloque: tamaño de cada sección (uint32) y las secciones
+        const std::vector<std::uint8_t>* sections[] = {&steps, &exceptions, &columns[0],
+                                                       &columns[1], &columns[2], &runs};
+        raw.clear();
+        for (const std::vector<std::uint8_t>* section : sections) {
+            const std::uint32_t size = static_cast<std::uint32_t>(section->size());
+            putBytes(raw, &size, 4);
+        }
+        for (const std::vector<std::uint8_t>* section : sections) {
+            raw.insert(raw.end(), section->begin(), section->end());
+        }
+        z_stream zs;
+        std::memset(&zs, 0, sizeof(zs));
+        if (deflateInit2(&zs, COMPRESSION_LEVEL, Z_DEFLATED, 15, 8, Z_RLE) != Z_OK) {
+            throw std::runtime_error("Error de zlib al comprimir un bloque de la trayectoria.");
+        }
+        packed.resize(deflateBound(&zs, raw.size()));
+        zs.next_in = raw.data();
+        zs.avail_in = static_cast<uInt>(raw.size());
+        zs.next_out = packed.data();
+        zs.avail_out = static_cast<uInt>(packed.size());
+        int status = deflate(&zs, Z_FINISH);
+        const uLong packed_size = zs.total_out;
+        deflateEnd(&zs);
+        if (status != Z_STREAM_END) {
+            throw std::runtime_error("Error de zlib al comprimir un bloque de la trayectoria.");
+        }
+
+        char header[CHUNK_HEADER_SIZE];
+        const std::uint32_t rows = static_cast<std::uint32_t>(chunk_rows);
+        const std::uint32_t raw_size = static_cast<std::uint32_t>(raw.size());
+        const std::uint32_t stored_size = static_cast<std::uint32_t>(packed_size);
+        std::memcpy(header, CHUNK_TAG, 4);
+        std::memcpy(header + 4, &rows, 4);
+        std::memcpy(header + 8, &raw_size, 4);
+        std::memcpy(header + 12, &stored_size, 4);
+        std::memcpy(header + 16, &n_rows, 8);
+        std::memcpy(header + 24, &chunk_t0, 8);
+        data_file.seekp(end_position);
+        data_file.write(header, CHUNK_HEADER_SIZE);
+        data_file.write(reinterpret_cast<const char*>(packed.data()), stored_size);
+
+        IndexEntry entry = {end_position, n_rows, rows, chunk_t0};
+        index.push_back(entry);
+        end_position += CHUNK_HEADER_SIZE + stored_size;
+        n_rows += rows;
+        startChunk();
+    }
+    writeHeader(0);
+    data_file.flush();
+    if (!data_file) {
+        throw std::runtime_error("Error escribiendo el archivo comprimido de salida.");
+    }
+}
+
+void CompressedDataWriter::close() {
+    if (!data_file.is_open()) return;
+    flush();
+    // Índice al final; su posición en la cabecera marca la corrida como completa
+    data_file.seekp(end_position);
+    for (const IndexEntry& e : index) {
+        char entry[INDEX_ENTRY_SIZE];
+        std::memcpy(entry, &e.position, 8);
+        std::memcpy(entry + 8, &e.first_row, 8);
+        std::memcpy(entry + 16, &e.rows, 8);
+        std::memcpy(entry + 24, &e.t0, 8);
+        data_file.write(entry, INDEX_ENTRY_SIZE);
+    }
+    writeHeader(end_position);
+    data_file.flush();
+    bool ok = static_cast<bool>(data_file);
+    data_file.close();
+    if (!ok) {
+        throw std::runtime_error("Error escribiendo el índice del archivo comprimido.");
+    }
+}
+
+// ---------------------------------------------------------------------------
+// StreamDataWriter
+// ---------------------------------------------------------------------------
+const char StreamDataWriter::MAGIC[8] = {'M', 'O', 'T', 'O', 'R', 'S', 'T', 'R'};
+const std::size_t StreamDataWriter::RECORD_SIZE;
+const std::size_t StreamDataWriter::BLOCK_ROWS;
+const std::size_t StreamDataWriter::CLOCK_ROWS;
+constexpr double StreamDataWriter::FLUSH_INTERVAL;
+
+bool isStreamTarget(const std::string& filename) {
+    struct stat info;
+    return filename == "-" || (::stat(filename.c_str(), &info) == 0 && S_ISFIFO(info.st_mode));
+}
+
+int reserveStdoutForStream() {
+    static int stream_fd = -1;
+    if (stream_fd < 0) {
+        std::cout.flush();
+        stream_fd = ::dup(STDOUT_FILENO);
+        if (stream_fd < 0 || ::dup2(STDERR_FILENO, STDOUT_FILENO) < 0) {
+            throw std::runtime_error("No se pudo reservar stdout para el flujo de datos");
+        }
+    }
+    return stream_fd;
+}
+
+StreamDataWriter::StreamDataWriter(const std::string& target, const SimulationParameters& params)
+    : fd(-1), buffered_rows(0), rows_sent(0), last_send(std::chrono::steady_clock::now())
+{
+    // Un lector que cierra el flujo da EPIPE en write (no SIGPIPE)
+    std::signal(SIGPIPE, SIG_IGN);
+    // Abrir un FIFO bloquea hasta que aparece el lector
+    fd = target == "-" ? reserveStdoutForStream() : ::open(target.c_str(), O_WRONLY);
+    if (fd < 0) {
+        throw std::runtime_error("No se pudo abrir el flujo de salida: " + target);
+    }
+    char header[BinaryDataWriter::HEADER_SIZE];
+    packHeader(header, MAGIC, BinaryDataWriter::VERSION, BinaryDataWriter::HEADER_SIZE, 0, 0, params);
+    send(header, sizeof(header));
+    buffer.resize(BLOCK_ROWS * RECORD_SIZE);
+}
+
+StreamDataWriter::~StreamDataWriter() {
+    try {
+        close();
+    } catch (...) {
+        // El lector ya cerró el flujo: no hay nada más que enviar
+    }
+}
+
+void StreamDataWriter::send(const char* data, std::size_t size) {
+    while (size > 0) {
+        ssize_t sent = ::write(fd, data, size);
+        if (sent < 0) {
+            if (errno == EINTR) continue;
+            throw std::runtime_error(errno == EPIPE ? "El lector cerró el flujo: corrida abortada"
+                                                    : "Error al escribir el flujo de datos");
+        }
+        data += sent;
+        size -= static_cast<std::size_t>(sent);
+    }
+    last_send = std::chrono::steady_clock::now();
+}
+
+void StreamDataWriter::write(double t, double x, double v, int s, double E_total) {
+    const double values[] = {t, x, v, E_total};
+    const std::uint8_t state = static_cast<std::uint8_t>(s);
+    char* record = &buffer[buffered_rows * RECORD_SIZE];
+    std::memcpy(record, values, sizeof(values));
+    std::memcpy(record + sizeof(values), &state, 1);
+    ++buffered_rows;
+
+    // El reloj se consulta cada CLOCK_ROWS registros
+    if (buffered_rows == BLOCK_ROWS ||
+        (buffered_rows % CLOCK_ROWS == 0 &&
+         std::chrono::duration<double>(std::chrono::steady_clock::now() - last_send).count() >= FLUSH_INTERVAL)) {
+        flush();
+    }
+}
+
+void StreamDataWriter::flush() {
+    if (fd < 0 || buffered_rows == 0) return;
+    ScopedTimer timer(profiler, flush_section);
+    send(buffer.data(), buffered_rows * RECORD_SIZE);
+    rows_sent += buffered_rows;
+    buffered_rows = 0;
+}
+
+void StreamDataWriter::close() {
+    if (fd < 0) return;
+    int closing = fd;
+    try {
+        flush();
+    } catch (...) {
+        ::close(closing);
+        fd = -1;
+        throw;
+    }
+    ::close(closing);
+    fd = -1;
+}
+
+// ---------------------------------------------------------------------------
+// MemoryDataWriter
+// ---------------------------------------------------------------------------
+MemoryDataWriter::MemoryDataWriter()
+    : external(false), n_rows(0), capacity(0),
+      out_t(nullptr), out_x(nullptr), out_v(nullptr), out_E(nullptr), out_s(nullptr) {}
+
+MemoryDataWriter::MemoryDataWriter(double* t, double* x, double* v, std::uint8_t* s,
+                                   double* E_total, std::size_t cap)
+    : external(true), n_rows(0), capacity(cap),
+      out_t(t), out_x(x), out_v(v), out_E(E_total), out_s(s) {}
+
+const double* MemoryDataWriter::column(int column) const {
+    switch (column) {
+        case 0: return out_t;
+        case 1: return out_x;
+        case 2: return out_v;
+        case 3: return out_E;
+    }
+    throw std::out_of_range("Columna inválida");
+}
+
+void MemoryDataWriter::grow(std::size_t new_capacity) {
+    own_t.resize(new_capacity); own_x.resize(new_capacity); own_v.resize(new_capacity);
+    own_E.resize(new_capacity); own_s.resize(new_capacity);
+    out_t = own_t.data(); out_x = own_x.data(); out_v = own_v.data();
+    out_E = own_E.data(); out_s = own_s.data();
+    capacity = new_capacity;
+}
+
+void MemoryDataWriter::reserve(std::size_t rows) {
+    if (!external && rows > capacity) grow(rows);
+}
+
+void MemoryDataWriter::write(double t, double x, double v, int s, double E_total) {
+    if (n_rows == capacity) {
+        if (external) {
+            throw std::length_error("Los arreglos de salida no tienen capacidad para más filas.");
+        }
+        grow(std::max<std::size_t>(2 * capacity, BinaryDataWriter::BLOCK_ROWS));
+    }
+    out_t[n_rows] = t;
+    out_x[n_rows] = x;
+    out_v[n_rows] = v;
+    out_E[n_rows] = E_total;
+    out_s[n_rows] = static_cast<std::uint8_t>(s);
+    ++n_rows;
+}
+
+// ---------------------------------------------------------------------------
+std::unique_ptr<DataWriter> createDataWriter(const std::string& filename,
+                                             const SimulationParameters& params,
+                                             double quantum) {
+    if (isStreamTarget(filename)) {
+        return std::unique_ptr<DataWriter>(new StreamDataWriter(filename, params));
+    }
+    if (endsWith(filename, ".bin")) {
+        return std::unique_ptr<DataWriter>(new BinaryDataWriter(filename, params));
+    }
+    if (endsWith(filename, ".mtz")) {
+        return std::unique_ptr<DataWriter>(new CompressedDataWriter(filename, params, quantum));
+    }
+    return std::unique_ptr<DataWriter>(new TextDataWriter(filename));
+}
+
+std::unique_ptr<DataWriter> resumeDataWriter(const std::string& filename,
+                                             const SimulationParameters& params,
+                                             std::uint64_t offset) {
+    if (isStreamTarget(filename)) {
+        throw std::runtime_error("Un flujo en vivo no se puede reanudar: " + filename);
+    }
+    if (endsWith(filename, ".bin")) {
+        return std::unique_ptr<DataWriter>(new BinaryDataWriter(filename, params, offset));
+    }
+    if (endsWith(filename, ".mtz")) {
+        return std::unique_ptr<DataWriter>(new CompressedDataWriter(filename, params, offset));
+    }
+    return std::unique_ptr<DataWriter>(new TextDataWriter(filename, offset));
+}
@@ -0,0 +1,210 @@
+#include "EnsembleSimulator.h"
+#include "ChemicalState.h"
+#include "DataWriter.h"
+#include "RandomStream.h"
+#include "Simulator.h"
+#include "ThreadPool.h"
+#include <algorithm>
+#include <cmath>
+#include <fstream>
+#include <iomanip>
+#include <stdexcept>
+
+namespace {
+
+// Media y M2 de un bloque (o de varios ya combinados)
+struct Moments {
+    double n, mean_x, m2_x, mean_v;
+};
+
+// Combinación de Chan et al.: exacta para medias y M2 parciales
+void merge(Moments& a, const Moments& b) {
+    if (b.n == 0) return;
+    double n = a.n + b.n;
+    double delta = b.mean_x - a.mean_x;
+    a.m2_x += b.m2_x + delta * delta * a.n * b.n / n;
+    a.mean_x += delta * b.n / n;
+    a.mean_v += (b.mean_v - a.mean_v) * b.n / n;
+    a.n = n;
+}
+
+struct StepCoefficients {
+    double c1, noise_scale, half_dt_m, dt;
+};
+
+// B-A-O-B de un bloque completo: trip count fijo y punteros sin alias,
+// así -O2 lo vectoriza sin versiones de respaldo
+void stepBlock(double* __restrict__ x, double* __restrict__ v, const double* __restrict__ r,
+               double k, double x_min, const StepCoefficients& c) {
+    const double c1 = c.c1, noise_scale = c.noise_scale, half_dt_m = c.half_dt_m, dt = c.dt;
+    for (std::size_t i = 0; i < EnsembleSimulator::BLOCK_MOTORS; ++i) {
+        double vi = v[i] + (-k * (x[i] - x_min)) * half_dt_m;
+        vi = c1 * vi + noise_scale * r[i];
+        double xi = x[i] + vi * dt;
+        v[i] = vi + (-k * (xi - x_min)) * half_dt_m;
+        x[i] = xi;
+    }
+}
+
+Moments blockMoments(const double* x, const double* v, std::size_t n) {
+    double sum_x = 0.0, sum_v = 0.0;
+    for (std::size_t i = 0; i < n; ++i) {
+        sum_x += x[i];
+        sum_v += v[i];
+    }
+    Moments m = {static_cast<double>(n), sum_x / n, 0.0, sum_v / n};
+    for (std::size_t i = 0; i < n; ++i) {
+        double d = x[i] - m.mean_x;
+        m.m2_x += d * d;
+    }
+    return m;
+}
+
+} // namespace
+
+const std::size_t EnsembleSimulator::BLOCK_MOTORS;
+const std::size_t EnsembleSimulator::SEGMENT_STEPS;
+
+EnsembleSimulator::EnsembleSimulator(const SimulationParameters& p, std::size_t motors,
+                                     std::uint64_t seed_value, std::size_t threads)
+    : params(p), n_motors(motors), n_threads(threads), record_stride(1), seed(seed_value),
+      x(((motors + BLOCK_MOTORS - 1) / BLOCK_MOTORS) * BLOCK_MOTORS, p.initial_x),
+      v(x.size(), p.initial_v),
+      sum_mean_v(0.0), mean_steps(0), final_mean_x(p.initial_x), final_time(0.0)
+{
+    if (n_motors == 0) {
+        throw std::invalid_argument("El ensamble necesita al menos un motor.");
+    }
+    // La secuencia química se comparte entre todos los motores del bloque
+    if (params.switching != SwitchingMode::PERIODIC) {
+        throw std::invalid_argument("El ensamble sólo admite la conmutación periódica (--switching=periodic).");
+    }
+    if (!params.potentials.empty() || !params.durations.empty()) {
+        throw std::invalid_argument("El ensamble sólo admite los dos pozos armónicos (sin --potentials).");
+    }
+}
+
+void EnsembleSimulator::run() {
+    const double dt = params.dt;
+    const double c1 = std::exp(-params.gamma * dt);
+    const double noise_scale = std::sqrt(params.kBT * (1.0 - c1 * c1)) / std::sqrt(params.m);
+    const double half_dt_m = 0.5 * dt / params.m;
+    const StepCoefficients coef = {c1, noise_scale, half_dt_m, dt};
+    const double springs[2] = {params.k0, params.k1};
+    const double minima[2] = {0.0, params.l};
+
+    const std::size_t n_steps = Simulator::countSteps(params.T_total, dt);
+    const std::size_t n_blocks = (n_motors + BLOCK_MOTORS - 1) / BLOCK_MOTORS;
+
+    ThreadPool pool(n_threads);
+    n_threads = pool.size();
+
+    // Un flujo por motor; ruido de un segmento en disposición [paso][motor]
+    std::vector<RandomStream> streams;
+    streams.reserve(n_motors);
+    for (std::size_t i = 0; i < n_motors; ++i) streams.emplace_back(seed, i);
+    // (los motores de relleno del último bloque reciben ruido 0)
+    std::vector<std::vector<double> > noise(n_threads,
+                                            std::vector<double>(SEGMENT_STEPS * BLOCK_MOTORS, 0.0));
+    std::vector<std::vector<double> > draws(n_threads, std::vector<double>(SEGMENT_STEPS));
+
+    // Tiempos, estados químicos y ranuras de momentos por bloque del segmento
+    std::vector<double> seg_t(SEGMENT_STEPS);
+    std::vector<int> seg_s(SEGMENT_STEPS);
+    std::vector<Moments> partial(n_blocks * SEGMENT_STEPS);
+    std::vector<double> block_sum_v(n_blocks * SEGMENT_STEPS);
+
+    records.clear();
+    sum_mean_v = 0.0;
+    ChemicalState chemical(params.T_off, params.T_on);
+    double t = 0.0;
+
+    for (std::size_t first = 0; first < n_steps; first += SEGMENT_STEPS) {
+        const std::size_t seg_steps = std::min(SEGMENT_STEPS, n_steps - first);
+
+        // La secuencia química es común a todos los motores (mismo t)
+        for (std::size_t j = 0; j < seg_steps; ++j) {
+            chemical.update(t, dt);
+            seg_t[j] = t;
+            seg_s[j] = chemical.getState();
+            t += dt;
+        }
+
+        pool.run(n_blocks, [&](std::size_t block, std::size_t thread) {
+            const std::size_t begin = block * BLOCK_MOTORS;
+            const std::size_t count = std::min(BLOCK_MOTORS, n_motors - begin);
+            double* xb = &x[begin];
+            double* vb = &v[begin];
+            double* nb = noise[thread].data();
+
+            // Ruido del segmento: un bloque de normales por motor
+            double* d = draws[thread].data();
+            for (std::size_t i = 0; i < count; ++i) {
+                streams[begin + i].fillGaussian(d, seg_steps);
+                for (std::size_t j = 0; j < seg_steps; ++j) nb[j * BLOCK_MOTORS + i] = d[j];
+            }
+            for (std::size_t j = 0; count < BLOCK_MOTORS && j < seg_steps; ++j) {
+                std::fill(nb + j * BLOCK_MOTORS + count, nb + (j + 1) * BLOCK_MOTORS, 0.0);
+            }
+
+            for (std::size_t j = 0; j < seg_steps; ++j) {
+                const std::size_t slot = block * SEGMENT_STEPS + j;
+                if ((first + j) % record_stride == 0) {
+                    partial[slot] = blockMoments(xb, vb, count);
+                    block_sum_v[slot] = partial[slot].mean_v * count;
+                } else {
+                    double sum_v = 0.0;
+                    for (std::size_t i = 0; i < count; ++i) sum_v += vb[i];
+                    block_sum_v[slot] = sum_v;
+                }
+
+                stepBlock(xb, vb, nb + j * BLOCK_MOTORS, springs[seg_s[j]], minima[seg_s[j]], coef);
+            }
+        });
+
+        // Combinación en orden de bloque: independiente del número de hilos
+        for (std::size_t j = 0; j < seg_steps; ++j) {
+            double sum_v = 0.0;
+            for (std::size_t b = 0; b < n_blocks; ++b) sum_v += block_sum_v[b * SEGMENT_STEPS + j];
+            sum_mean_v += sum_v / n_motors;
+
+            if ((first + j) % record_stride != 0) continue;
+            Moments total = {0.0, 0.0, 0.0, 0.0};
+            for (std::size_t b = 0; b < n_blocks; ++b) merge(total, partial[b * SEGMENT_STEPS + j]);
+            EnsembleRecord rec = {seg_t[j], seg_s[j], total.mean_x, total.m2_x / total.n, total.mean_v};
+            records.push_back(rec);
+        }
+    }
+
+    Moments final_moments = {0.0, 0.0, 0.0, 0.0};
+    for (std::size_t b = 0; b < n_blocks; ++b) {
+        std::size_t begin = b * BLOCK_MOTORS;
+        merge(final_moments, blockMoments(&x[begin], &v[begin], std::min(BLOCK_MOTORS, n_motors - begin)));
+    }
+    final_mean_x = final_moments.mean_x;
+    final_time = t;
+    mean_steps = n_steps;
+}
+
+double EnsembleSimulator::meanVelocity() const {
+    return mean_steps > 0 ? sum_mean_v / mean_steps : 0.0;
+}
+
+double EnsembleSimulator::driftVelocity() const {
+    return final_time > 0.0 ? (final_mean_x - params.initial_x) / final_time : 0.0;
+}
+
+void EnsembleSimulator::writeRecords(const std::string& filename) const {
+    ensureParentDirectory(filename);
+    std::ofstream out(filename);
+    if (!out.is_open()) {
+        throw std::runtime_error("No se pudo abrir el archivo del ensamble: " + filename);
+    }
+    out << std::setprecision(17);
+    out << "# Ensamble de " << n_motors << " motores, semilla " << seed << "\n";
+    out << "# t\ts\tmean_x\tvar_x\tmean_v\n";
+    for (std::size_t i = 0; i < records.size(); ++i) {
+        const EnsembleRecord& r = records[i];
+        out << r.t << "\t" << r.s << "\t" << r.mean_x << "\t" << r.var_x << "\t" << r.mean_v << "\n";
+    }
+}
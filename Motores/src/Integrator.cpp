@@ -1,6 +1,8 @@
 #include "Integrator.h"
 #include "MotorModel.h"
+#include <algorithm>
 #include <cmath> // Necesario para exp y sqrt
+#include <stdexcept>
 
 // Implementación de Stochastic Velocity Verlet (tipo BAOAB)
 // Este método integra la Ecuación de Langevin correctamente.
@@ -36,4 +38,169 @@ void StochasticVelocityVerletIntegrator::step(MotorModel& motor, double dt) {
     // Nota: El potencial ya fue conmutado por updateChemicalState() en Simulator.run()
     double F_new = motor.force(0.0);
     p.v += F_new / m * (0.5 * dt);
-}
\ No newline at end of file
+}
+
+FastStochasticVelocityVerletIntegrator::FastStochasticVelocityVerletIntegrator()
+    : prepared_dt(0.0), c1(0.0), noise_scale(0.0), half_dt_m(0.0),
+      force_valid(false), cached_force(0.0), cached_x(0.0), cached_state(-1) {}
+
+void FastStochasticVelocityVerletIntegrator::prepare(const MotorModel& motor, double dt) {
+    double m = motor.getParticle().m;
+    c1 = std::exp(-motor.getGamma() * dt);
+    noise_scale = std::sqrt(motor.getKBT() * (1.0 - c1 * c1)) / std::sqrt(m);
+    half_dt_m = 0.5 * dt / m;
+    prepared_dt = dt;
+    force_valid = false;
+}
+
+void FastStochasticVelocityVerletIntegrator::step(MotorModel& motor, double dt) {
+    if (dt != prepared_dt) {
+        prepare(motor, dt);
+    }
+    Particle& p = motor.getParticle();
+    int state = motor.getCurrentState();
+
+    // --- 1. Paso B: reutilizar F(x) del paso anterior si sigue siendo válida
+    // (el potencial pudo conmutar en updateChemicalState entre pasos)
+    double F_old;
+    if (force_valid && cached_state == state && cached_x == p.x) {
+        F_old = cached_force;
+    } else {
+        F_old = motor.force();
+    }
+    p.v += F_old * half_dt_m;
+
+    // --- 2. Paso A: fricción y ruido
+    p.v = c1 * p.v + noise_scale * motor.generateGaussianNoise();
+
+    // --- 3. Paso O: posición
+    p.x += p.v * dt;
+
+    // --- 4. Paso B: nueva fuerza, que queda como F_old del siguiente paso
+    double F_new = motor.force();
+    p.v += F_new * half_dt_m;
+
+    cached_force = F_new;
+    cached_x = p.x;
+    cached_state = state;
+    force_valid = true;
+}
+
+ExactHarmonicIntegrator::ExactHarmonicIntegrator() : prepared_dt(0.0) {}
+
+// exp(A h) con A = [[0, 1], [-w2, -gamma]]. Con mu = gamma/2 y B = A + mu I
+// se cumple B^2 = (mu^2 - w2) I, así exp(A h) = exp(-mu h) (C I + S B) con
+// C, S trigonométricas (subamortiguado) o hiperbólicas (sobreamortiguado).
+ExactHarmonicIntegrator::Transition
+ExactHarmonicIntegrator::transition(double k, double m, double gamma, double kBT, double h) {
+    double w2 = k / m;
+    double mu = 0.5 * gamma;
+    double omega2 = w2 - mu * mu;
+    double z = omega2 * h * h;
+
+    double ec, es;   // exp(-mu h) C y exp(-mu h) S
+    if (std::fabs(z) < 1e-4) {
+        // Serie de Taylor cerca del amortiguamiento crítico
+        double decay = std::exp(-mu * h);
+        ec = decay * (1.0 - z / 2.0 + z * z / 24.0);
+        es = decay * h * (1.0 - z / 6.0 + z * z / 120.0);
+    } else if (omega2 > 0.0) {
+        double omega = std::sqrt(omega2);
+        double decay = std::exp(-mu * h);
+        ec = decay * std::cos(omega * h);
+        es = decay * std::sin(omega * h) / omega;
+    } else {
+        // Exponenciales por separado: cosh(q h) no desborda con h grande
+        double q = std::sqrt(-omega2);
+        double slow = std::exp((q - mu) * h);
+        double fast = std::exp(-(q + mu) * h);
+        ec = 0.5 * (slow + fast);
+        es = 0.5 * (slow - fast) / q;
+    }
+
+    Transition tr;
+    tr.e11 = ec + mu * es;
+    tr.e12 = es;
+    tr.e21 = -w2 * es;
+    tr.e22 = ec - mu * es;
+
+    // Sigma(h) = Sigma_inf - E Sigma_inf E^T
+    double sx = kBT / k, sv = kBT / m;
+    double cxx = sx - (tr.e11 * tr.e11 * sx + tr.e12 * tr.e12 * sv);
+    double cxv = -(tr.e11 * tr.e21 * sx + tr.e12 * tr.e22 * sv);
+    double cvv = sv - (tr.e21 * tr.e21 * sx + tr.e22 * tr.e22 * sv);
+
+    // Cholesky 2x2 (los max() absorben el redondeo con h muy pequeño)
+    tr.lxx = std::sqrt(std::max(cxx, 0.0));
+    tr.lvx = tr.lxx > 0.0 ? cxv / tr.lxx : 0.0;
+    tr.lvv = std::sqrt(std::max(cvv - tr.lvx * tr.lvx, 0.0));
+    return tr;
+}
+
+void ExactHarmonicIntegrator::prepare(const MotorModel& motor, double dt) {
+    full.clear();
+    for (int state = 0; state < motor.getStateCount(); ++state) {
+        const HarmonicPotential* well = motor.getHarmonic(state);
+        if (!well) {
+            throw std::invalid_argument("El integrador exacto sólo admite potenciales armónicos.");
+        }
+        if (!(well->getK() > 0.0)) {
+            throw std::invalid_argument("El integrador exacto requiere constantes elásticas positivas.");
+        }
+        full.push_back(partial(motor, state, dt));
+    }
+    prepared_dt = dt;
+}
+
+ExactHarmonicIntegrator::Transition
+ExactHarmonicIntegrator::partial(const MotorModel& motor, int state, double h) const {
+    return transition(motor.getHarmonic(state)->getK(), motor.getParticle().m,
+                      motor.getGamma(), motor.getKBT(), h);
+}
+
+void ExactHarmonicIntegrator::propagate(MotorModel& motor, const Transition& tr) {
+    Particle& p = motor.getParticle();
+    double x_min = motor.getHarmonic(motor.getCurrentState())->getMinimum();
+    double y = p.x - x_min;
+    double xi1 = motor.generateGaussianNoise();
+    double xi2 = motor.generateGaussianNoise();
+    p.x = x_min + tr.e11 * y + tr.e12 * p.v + tr.lxx * xi1;
+    p.v = tr.e21 * y + tr.e22 * p.v + tr.lvx * xi1 + tr.lvv * xi2;
+}
+
+void ExactHarmonicIntegrator::step(MotorModel& motor, double dt) {
+    if (dt != prepared_dt) {
+        prepare(motor, dt);
+    }
+    propagate(motor, full[motor.getCurrentState()]);
+}
+
+void ExactHarmonicIntegrator::advance(MotorModel& motor, double t, double dt) {
+    const double end = t + dt;
+    double t_switch = motor.nextSwitchTime(t);
+    if (!(t_switch < end)) {
+        step(motor, dt);   // Caso común: sin conmutación en el paso
+        return;
+    }
+
+    // Tramos [t, t_switch) en el pozo de cada estado
+    while (t_switch < end) {
+        double h = t_switch - t;
+        if (h > 0.0) {
+            propagate(motor, partial(motor, motor.getCurrentState(), h));
+        }
+        motor.crossSwitch(t_switch);
+        t = t_switch;
+        t_switch = motor.nextSwitchTime(t);
+    }
+    if (end > t) {
+        propagate(motor, partial(motor, motor.getCurrentState(), end - t));
+    }
+}
+
+std::unique_ptr<Integrator> createIntegrator(IntegratorKind kind) {
+    if (kind == IntegratorKind::EXACT) {
+        return std::unique_ptr<Integrator>(new ExactHarmonicIntegrator());
+    }
+    return std::unique_ptr<Integrator>(new FastStochasticVelocityVerletIntegrator());
+}
@@ -0,0 +1,148 @@
+#include "MotorAPI.h"
+#include "ChemicalState.h"
+#include "CommandLine.h"
+#include "DataWriter.h"
+#include "Integrator.h"
+#include "MotorModel.h"
+#include "RandomStream.h"
+#include "Simulator.h"
+#include <cstring>
+#include <exception>
+#include <memory>
+#include <stdexcept>
+
+struct MotorRun {
+    std::unique_ptr<DataWriter> writer;   // Siempre un MemoryDataWriter
+
+    const MemoryDataWriter& data() const { return static_cast<const MemoryDataWriter&>(*writer); }
+};
+
+static SimulationParameters toParameters(const double* v) {
+    SimulationParameters p;
+    p.m = v[0]; p.k0 = v[1]; p.k1 = v[2]; p.l = v[3]; p.T_off = v[4]; p.T_on = v[5];
+    p.gamma = v[6]; p.kBT = v[7]; p.T_total = v[8]; p.dt = v[9];
+    p.initial_x = v[10]; p.initial_v = v[11];
+    validateParameters(p);
+    return p;
+}
+
+static LoggingPolicy toPolicy(int log_mode, std::size_t stride) {
+    LoggingPolicy policy;
+    switch (log_mode) {
+        case 0: policy.mode = LogMode::EVERY_STEP; break;
+        case 1: policy.mode = LogMode::STRIDE; break;
+        case 2: policy.mode = LogMode::TRANSITIONS; break;
+        default: throw std::invalid_argument("log_mode debe ser 0 (cada paso), 1 (stride) o 2 (transiciones)");
+    }
+    if (policy.mode == LogMode::STRIDE && stride == 0) {
+        throw std::invalid_argument("stride debe ser un entero positivo");
+    }
+    policy.stride = stride > 0 ? stride : 1;
+    return policy;
+}
+
+static void setError(char* error, std::size_t error_size, const char* message) {
+    if (error && error_size > 0) {
+        std::strncpy(error, message, error_size - 1);
+        error[error_size - 1] = '\0';
+    }
+}
+
+// Misma construcción que main.cpp; el escritor vuelve al llamador tras run()
+static std::unique_ptr<DataWriter> simulate(const SimulationParameters& p, const LoggingPolicy& policy,
+                                            int seeded, std::uint64_t seed, std::uint64_t stream,
+                                            std::unique_ptr<DataWriter> writer) {
+    MotorModel motor(p.m, p.k0, p.k1, p.l, p.T_off, p.T_on,
+                     p.gamma, p.kBT, p.initial_x, p.initial_v, false);
+    motor.seed(seeded ? seed : RandomStream::randomSeed(), stream);
+    FastStochasticVelocityVerletIntegrator integrator;
+    Simulator simulator(motor, integrator, p.T_total, p.dt, std::move(writer));
+    simulator.setLoggingPolicy(policy);
+    simulator.run();
+    return simulator.releaseWriter();
+}
+
+extern "C" {
+
+MotorRun* motor_run(const double* params, int log_mode, std::size_t stride,
+                    int seeded, std::uint64_t seed, std::uint64_t stream,
+                    char* error, std::size_t error_size) {
+    try {
+        SimulationParameters p = toParameters(params);
+        LoggingPolicy policy = toPolicy(log_mode, stride);
+        std::unique_ptr<MotorRun> run(new MotorRun);
+        run->writer = simulate(p, policy, seeded, seed, stream,
+                               std::unique_ptr<DataWriter>(new MemoryDataWriter()));
+        return run.release();
+    } catch (const std::exception& e) {
+        setError(error, error_size, e.what());
+    } catch (...) {
+        setError(error, error_size, "Error desconocido durante la simulación.");
+    }
+    return nullptr;
+}
+
+std::size_t motor_run_rows(const MotorRun* run) {
+    return run->data().rows();
+}
+
+const double* motor_run_column(const MotorRun* run, int column) {
+    return (column >= 0 && column < 4) ? run->data().column(column) : nullptr;
+}
+
+const std::uint8_t* motor_run_states(const MotorRun* run) {
+    return run->data().states();
+}
+
+void motor_run_free(MotorRun* run) {
+    delete run;
+}
+
+long long motor_run_into(const double* params, int log_mode, std::size_t stride,
+                         int seeded, std::uint64_t seed, std::uint64_t stream,
+                         double* t, double* x, double* v, std::uint8_t* s, double* E_total,
+                         std::size_t capacity, char* error, std::size_t error_size) {
+    try {
+        SimulationParameters p = toParameters(params);
+        LoggingPolicy policy = toPolicy(log_mode, stride);
+        std::unique_ptr<DataWriter> writer(new MemoryDataWriter(t, x, v, s, E_total, capacity));
+        writer = simulate(p, policy, seeded, seed, stream, std::move(writer));
+        return static_cast<long long>(static_cast<const MemoryDataWriter&>(*writer).rows());
+    } catch (const std::exception& e) {
+        setError(error, error_size, e.what());
+    } catch (...) {
+        setError(error, error_size, "Error desconocido durante la simulación.");
+    }
+    return -1;
+}
+
+long long motor_expected_rows(const double* params, int log_mode, std::size_t stride,
+                              char* error, std::size_t error_size) {
+    try {
+        SimulationParameters p = toParameters(params);
+        LoggingPolicy policy = toPolicy(log_mode, stride);
+        std::size_t n_steps = Simulator::countSteps(p.T_total, p.dt);
+        if (policy.mode == LogMode::EVERY_STEP) return static_cast<long long>(n_steps);
+        if (policy.mode == LogMode::STRIDE) {
+            return static_cast<long long>((n_steps + policy.stride - 1) / policy.stride);
+        }
+        // Transiciones: la secuencia química es determinista, se recorre sin integrar
+        ChemicalState chemical(p.T_off, p.T_on);
+        long long rows = 0;
+        int previous = -1;
+        double time = 0.0;
+        for (std::size_t i = 0; i < n_steps; ++i, time += p.dt) {
+            chemical.update(time, p.dt);
+            if (chemical.getState() != previous) ++rows;
+            previous = chemical.getState();
+        }
+        return rows;
+    } catch (const std::exception& e) {
+        setError(error, error_size, e.what());
+    } catch (...) {
+        setError(error, error_size, "Error desconocido.");
+    }
+    return -1;
+}
+
+}
@@ -1,53 +1,116 @@
 #include "MotorModel.h"
-#include <random>
 #include <iostream>
+#include <stdexcept>
+#include <string>
 
-// Inicializar el generador de números aleatorios para la simulación
-static std::random_device rd;
-static std::mt19937 generator(rd());
-// Distribución Gaussiana estándar (media 0, desviación estándar 1)
-static std::normal_distribution<> normal_dist(0.0, 1.0); 
+static ChemicalKinetics periodicKinetics(double t_off, double t_on) {
+    ChemicalKinetics kinetics;
+    kinetics.T_off = t_off;
+    kinetics.T_on = t_on;
+    return kinetics;
+}
 
 // CONSTRUCTOR MODIFICADO - k0 y k1 separados
 MotorModel::MotorModel(double mass, double k0, double k1, double l, double t_off, double t_on, 
-                       double gamma_val, double kBT_val, double initial_x, double initial_v)
+                       double gamma_val, double kBT_val, double initial_x, double initial_v,
+                       bool verbose)
+    : MotorModel(mass, k0, k1, l, periodicKinetics(t_off, t_on), gamma_val, kBT_val,
+                 initial_x, initial_v, verbose)
+{
+}
+
+static std::vector<std::shared_ptr<const Potential> > harmonicPair(double k0, double k1, double l) {
+    std::vector<std::shared_ptr<const Potential> > pair;
+    pair.push_back(std::make_shared<HarmonicPotential>(k0, 0.0));   // Estado 0: mínimo en x=0, constante k0
+    pair.push_back(std::make_shared<HarmonicPotential>(k1, l));     // Estado 1: mínimo en x=l, constante k1
+    return pair;
+}
+
+MotorModel::MotorModel(double mass, double k0, double k1, double l, const ChemicalKinetics& kinetics,
+                       double gamma_val, double kBT_val, double initial_x, double initial_v,
+                       bool verbose)
+    : MotorModel(mass, harmonicPair(k0, k1, l), kinetics, gamma_val, kBT_val,
+                 initial_x, initial_v, verbose)
+{
+}
+
+MotorModel::MotorModel(double mass, const std::vector<std::shared_ptr<const Potential> >& state_potentials,
+                       const ChemicalKinetics& kinetics, double gamma_val, double kBT_val,
+                       double initial_x, double initial_v, bool verbose)
     // Inicialización de miembros
-    : p(mass, initial_x, initial_v), 
-      chemicalState(t_off, t_on),
-      U0(k0, 0.0),   // Estado 0: potencial en x=0 con constante k0
-      U1(k1, l),     // Estado 1: potencial en x=l con constante k1
+    : p(mass, initial_x, initial_v),
+      currentPotential(nullptr), currentHarmonic(nullptr), currentTabulated(nullptr),
+      chemicalState(kinetics, kBT_val),
+      potentials(state_potentials),
       gamma(gamma_val), 
-      kBT(kBT_val)
+      kBT(kBT_val),
+      rng(RandomStream::randomSeed())
 {
-    currentPotential = &U0;
+    if (static_cast<int>(potentials.size()) != chemicalState.getStateCount()) {
+        throw std::invalid_argument("Se necesita un potencial por estado químico (" +
+                                    std::to_string(chemicalState.getStateCount()) + ")");
+    }
+    for (std::size_t i = 0; i < potentials.size(); ++i) {
+        if (!potentials[i]) throw std::invalid_argument("Potencial nulo para el estado " + std::to_string(i));
+        harmonic.push_back(dynamic_cast<const HarmonicPotential*>(potentials[i].get()));
+        tabulated.push_back(dynamic_cast<const TabulatedPotential*>(potentials[i].get()));
+    }
+    selectPotential();
+    if (!verbose) return;
+
     std::cout << "Motor creado:" << std::endl;
-    std::cout << "  - Estado 0: U0(k=" << k0 << ", x_min=0.0)" << std::endl;
-    std::cout << "  - Estado 1: U1(k=" << k1 << ", x_min=" << l << ")" << std::endl;
+    for (std::size_t i = 0; i < potentials.size(); ++i) {
+        std::cout << "  - Estado " << i << ": U" << i;
+        if (harmonic[i]) {
+            std::cout << "(k=" << harmonic[i]->getK() << ", x_min=" << harmonic[i]->getMinimum() << ")";
+        } else if (tabulated[i]) {
+            std::cout << " tabulado (" << tabulated[i]->size() << " celdas, periodo "
+                      << tabulated[i]->getPeriod() << ")";
+        }
+        std::cout << std::endl;
+    }
+    if (kinetics.mode == SwitchingMode::MARKOV && !kinetics.rates.empty()) {
+        std::cout << "  - Conmutacion de Markov: matriz de tasas " << potentials.size()
+                  << "x" << potentials.size() << std::endl;
+    } else if (kinetics.mode == SwitchingMode::MARKOV) {
+        std::cout << "  - Conmutacion de Markov: k12=" << kinetics.k12
+                  << ", k21=" << kinetics.k21 << std::endl;
+    } else if (kinetics.mode == SwitchingMode::MARKOV_POSITION) {
+        std::cout << "  - Conmutacion de Markov dependiente de x: k12=" << kinetics.k12
+                  << ", k21=" << kinetics.k21 << " (en U0 = U1)" << std::endl;
+    }
 }
 
-void MotorModel::updateChemicalState(double t, double dt) {
-    chemicalState.update(t, dt);
-
-    if (chemicalState.getState() == 0) {
-        currentPotential = &U0;
-    } else {
-        currentPotential = &U1;
-    }
+void MotorModel::selectPotential() {
+    int s = chemicalState.getState();
+    currentPotential = potentials[s].get();
+    currentHarmonic = harmonic[s];
+    currentTabulated = tabulated[s];
 }
 
-// Retorna solo la fuerza determinista del potencial (F(x,t)).
-// La fricción y el ruido se manejan en el Integrador.
-double MotorModel::force(double t) const {
-    return currentPotential->F(p.x); 
+void MotorModel::updateChemicalState(double t, double dt) {
+    switch (chemicalState.getMode()) {
+        case SwitchingMode::PERIODIC:
+            chemicalState.update(t, dt);
+            break;
+        case SwitchingMode::MARKOV:
+            chemicalState.updateMarkov(t, rng);
+            break;
+        case SwitchingMode::MARKOV_POSITION:
+            chemicalState.updateMarkov(t, dt, potentials[1]->U(p.x) - potentials[0]->U(p.x), rng);
+            break;
+    }
+    selectPotential();
 }
 
-// Nueva función para generar el ruido estocástico
-double MotorModel::generateGaussianNoise() const {
-    return normal_dist(generator);
+void MotorModel::crossSwitch(double t_switch) {
+    chemicalState.crossSwitch(t_switch, rng);
+    selectPotential();
 }
 
 // DEFINICIÓN de la función getPotentialEnergy()
 double MotorModel::getPotentialEnergy() const {
+    if (currentHarmonic) return currentHarmonic->U(p.x);
     return currentPotential->U(p.x);
 }
 
@@ -0,0 +1,205 @@
+#include "MotorSystem.h"
+#include "DataWriter.h"
+#include "Simulator.h"
+#include <algorithm>
+#include <cmath>
+#include <fstream>
+#include <iomanip>
+#include <stdexcept>
+
+const std::size_t MotorSystem::SEGMENT_STEPS;
+constexpr double MotorSystem::SKIN;
+
+// Sin volumen excluido la lista de vecinos no se usa (alcance nominal 1)
+static double listCutoff(const Coupling& c) {
+    return c.repulsion > 0.0 && c.sigma > 0.0 ? c.sigma : 1.0;
+}
+
+MotorSystem::MotorSystem(const SimulationParameters& p,
+                         const std::vector<std::shared_ptr<const Potential> >& state_potentials,
+                         std::size_t n_motors, const Coupling& c, std::uint64_t seed_value)
+    : params(p), coupling(c), seed(seed_value), record_stride(1), potentials(state_potentials),
+      neighbors(listCutoff(c), SKIN * listCutoff(c), c.box),
+      initial_mean_x(p.initial_x), final_mean_x(p.initial_x), final_time(0.0)
+{
+    if (n_motors == 0) {
+        throw std::invalid_argument("El sistema necesita al menos un motor.");
+    }
+    if (n_motors > 0xFFFFFFFFull) {
+        throw std::invalid_argument("El sistema admite a lo sumo 2^32 - 1 motores.");
+    }
+    const ChemicalKinetics kinetics = params.kinetics();
+    if (static_cast<int>(potentials.size()) != kinetics.states()) {
+        throw std::invalid_argument("Se necesita un potencial por estado químico");
+    }
+    if (!(c.spring_k >= 0.0) || !(c.repulsion >= 0.0) || !(c.sigma >= 0.0) || !(c.box >= 0.0)) {
+        throw std::invalid_argument("spring_k, repulsion, sigma y box no pueden ser negativos");
+    }
+    if (c.repulsion > 0.0 && !(c.sigma > 0.0)) {
+        throw std::invalid_argument("El volumen excluido necesita sigma > 0");
+    }
+    if (c.box > 0.0 && c.repulsion > 0.0 && !(c.box > 2.0 * c.sigma)) {
+        throw std::invalid_argument("La pista periódica debe medir más de 2 sigma");
+    }
+
+    for (std::size_t i = 0; i < potentials.size(); ++i) {
+        harmonic.push_back(dynamic_cast<const HarmonicPotential*>(potentials[i].get()));
+        tabulated.push_back(dynamic_cast<const TabulatedPotential*>(potentials[i].get()));
+    }
+
+    double spacing = c.box > 0.0 ? c.box / n_motors
+                   : c.spring_length > 0.0 ? c.spring_length : c.sigma;
+    x.resize(n_motors);
+    for (std::size_t i = 0; i < n_motors; ++i) x[i] = p.initial_x + spacing * i;
+    v.assign(n_motors, p.initial_v);
+    f_ext.assign(n_motors, 0.0);
+    f_pair.assign(n_motors, 0.0);
+
+    chemical.assign(n_motors, ChemicalState(kinetics, params.kBT));
+    streams.reserve(n_motors);
+    for (std::size_t i = 0; i < n_motors; ++i) streams.emplace_back(seed, i);
+}
+
+void MotorSystem::updateChemicalStates(double t, double dt) {
+    const std::size_t n = x.size();
+    for (std::size_t i = 0; i < n; ++i) {
+        ChemicalState& chem = chemical[i];
+        int before = chem.getState();
+        switch (chem.getMode()) {
+            case SwitchingMode::PERIODIC:
+                chem.update(t, dt);
+                break;
+            case SwitchingMode::MARKOV:
+                chem.updateMarkov(t, streams[i]);
+                break;
+            case SwitchingMode::MARKOV_POSITION:
+                chem.updateMarkov(t, dt, potentials[1]->U(x[i]) - potentials[0]->U(x[i]), streams[i]);
+                break;
+        }
+        // Al conmutar cambia el potencial de la pista: sólo su fuerza externa
+        if (chem.getState() != before) f_ext[i] = externalForce(chem.getState(), x[i]);
+    }
+}
+
+// Resortes de la cadena y volumen excluido (pares de la lista de vecinos)
+void MotorSystem::computePairForces() {
+    const std::size_t n = x.size();
+    std::fill(f_pair.begin(), f_pair.end(), 0.0);
+
+    if (coupling.spring_k > 0.0) {
+        const double k = coupling.spring_k, rest = coupling.spring_length;
+        for (std::size_t i = 0; i + 1 < n; ++i) {
+            double f = k * (neighbors.separation(x[i], x[i + 1]) - rest);
+            f_pair[i] += f;
+            f_pair[i + 1] -= f;
+        }
+    }
+
+    if (coupling.repulsion > 0.0) {
+        neighbors.update(x);
+        const double sigma = coupling.sigma, inv_sigma = 1.0 / coupling.sigma;
+        const double scale = 2.0 * coupling.repulsion * inv_sigma;
+        const std::vector<NeighborList::Pair>& pairs = neighbors.getPairs();
+        for (std::size_t p = 0; p < pairs.size(); ++p) {
+            const std::uint32_t i = pairs[p].i, j = pairs[p].j;
+            double r = neighbors.separation(x[i], x[j]);
+            double distance = std::fabs(r);
+            if (distance >= sigma) continue;
+            double f = std::copysign(scale * (1.0 - distance * inv_sigma), r);
+            f_pair[j] += f;
+            f_pair[i] -= f;
+        }
+    }
+}
+
+SystemRecord MotorSystem::record(double t) const {
+    const std::size_t n = x.size();
+    double sum_x = 0.0, sum_v = 0.0, sum_s = 0.0;
+    for (std::size_t i = 0; i < n; ++i) {
+        sum_x += x[i];
+        sum_v += v[i];
+        sum_s += chemical[i].getState();
+    }
+    SystemRecord r = {t, sum_x / n, 0.0, sum_v / n, sum_s / n};
+    for (std::size_t i = 0; i < n; ++i) {
+        double d = x[i] - r.mean_x;
+        r.var_x += d * d;
+    }
+    r.var_x /= n;
+    return r;
+}
+
+void MotorSystem::run() {
+    const std::size_t n = x.size();
+    const double dt = params.dt;
+    const double c1 = std::exp(-params.gamma * dt);
+    const double noise_scale = std::sqrt(params.kBT * (1.0 - c1 * c1)) / std::sqrt(params.m);
+    const double half_dt_m = 0.5 * dt / params.m;
+    const bool interacting = coupling.spring_k > 0.0 || coupling.repulsion > 0.0;
+    const std::size_t n_steps = Simulator::countSteps(params.T_total, dt);
+
+    // Ruido de una tanda en disposición [paso][motor]; cada motor sortea
+    // un bloque de su propio flujo
+    std::vector<double> noise(SEGMENT_STEPS * n);
+    std::vector<double> draws(SEGMENT_STEPS);
+
+    records.clear();
+    initial_mean_x = record(0.0).mean_x;
+    for (std::size_t i = 0; i < n; ++i) f_ext[i] = externalForce(chemical[i].getState(), x[i]);
+    if (interacting) computePairForces();
+
+    double t = 0.0;
+    for (std::size_t first = 0; first < n_steps; first += SEGMENT_STEPS) {
+        const std::size_t seg_steps = std::min(SEGMENT_STEPS, n_steps - first);
+        for (std::size_t i = 0; i < n; ++i) {
+            streams[i].fillGaussian(draws.data(), seg_steps);
+            for (std::size_t j = 0; j < seg_steps; ++j) noise[j * n + i] = draws[j];
+        }
+
+        for (std::size_t j = 0; j < seg_steps; ++j) {
+            updateChemicalStates(t, dt);
+            if ((first + j) % record_stride == 0) records.push_back(record(t));
+
+            // B-A-O con la fuerza del final del paso anterior
+            const double* r = &noise[j * n];
+            for (std::size_t i = 0; i < n; ++i) {
+                double vi = v[i] + (f_ext[i] + f_pair[i]) * half_dt_m;
+                vi = c1 * vi + noise_scale * r[i];
+                x[i] += vi * dt;
+                v[i] = vi;
+            }
+
+            // B con la fuerza en las posiciones nuevas
+            for (std::size_t i = 0; i < n; ++i) f_ext[i] = externalForce(chemical[i].getState(), x[i]);
+            if (interacting) computePairForces();
+            for (std::size_t i = 0; i < n; ++i) v[i] += (f_ext[i] + f_pair[i]) * half_dt_m;
+
+            t += dt;
+        }
+    }
+
+    final_mean_x = record(t).mean_x;
+    final_time = t;
+}
+
+double MotorSystem::driftVelocity() const {
+    return final_time > 0.0 ? (final_mean_x - initial_mean_x) / final_time : 0.0;
+}
+
+void MotorSystem::writeRecords(const std::string& filename) const {
+    ensureParentDirectory(filename);
+    std::ofstream out(filename);
+    if (!out.is_open()) {
+        throw std::runtime_error("No se pudo abrir el archivo del sistema: " + filename);
+    }
+    out << std::setprecision(17);
+    out << "# Sistema de " << x.size() << " motores acoplados, semilla " << seed << "\n";
+    out << "# spring_k = " << coupling.spring_k << ", spring_length = " << coupling.spring_length
+        << ", repulsion = " << coupling.repulsion << ", sigma = " << coupling.sigma
+        << ", box = " << coupling.box << "\n";
+    out << "# t\tmean_x\tvar_x\tmean_v\tmean_s\n";
+    for (std::size_t i = 0; i < records.size(); ++i) {
+        const SystemRecord& r = records[i];
+        out << r.t << "\t" << r.mean_x << "\t" << r.var_x << "\t" << r.mean_v << "\t" << r.mean_s << "\n";
+    }
+}
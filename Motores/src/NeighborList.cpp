@@ -0,0 +1,101 @@
+#include "NeighborList.h"
+#include <algorithm>
+#include <stdexcept>
+
+NeighborList::NeighborList(double cutoff, double skin_value, double box_length)
+    : skin(skin_value), reach(cutoff + skin_value), box(box_length),
+      inv_box(box_length > 0.0 ? 1.0 / box_length : 0.0), builds(0)
+{
+    if (!(cutoff > 0.0) || !(skin >= 0.0)) {
+        throw std::invalid_argument("La lista de vecinos necesita cutoff > 0 y skin >= 0");
+    }
+    if (!(box >= 0.0)) {
+        throw std::invalid_argument("La longitud de la pista no puede ser negativa");
+    }
+}
+
+bool NeighborList::update(const std::vector<double>& x) {
+    if (builds > 0 && reference.size() == x.size()) {
+        const double limit = 0.5 * skin;
+        bool moved = false;
+        for (std::size_t i = 0; i < x.size(); ++i) {
+            moved |= std::fabs(x[i] - reference[i]) > limit;
+        }
+        if (!moved) return false;
+    }
+    build(x);
+    return true;
+}
+
+void NeighborList::build(const std::vector<double>& x) {
+    const std::size_t n = x.size();
+    pairs.clear();
+    reference = x;
+    ++builds;
+    if (n < 2) return;
+
+    // Celdas de ancho >= reach sobre [lo, lo + length)
+    double lo = 0.0, length = box;
+    std::size_t n_cells;
+    double width;
+    if (box > 0.0) {
+        n_cells = static_cast<std::size_t>(box / reach);
+        // Con menos de 3 celdas la celda siguiente de la última sería la
+        // anterior de la primera (pares duplicados): una sola celda
+        if (n_cells < 3) n_cells = 1;
+        width = box / n_cells;
+    } else {
+        auto range = std::minmax_element(x.begin(), x.end());
+        lo = *range.first;
+        length = *range.second - lo;
+        n_cells = static_cast<std::size_t>(length / reach) + 1;
+        width = reach;
+        // Motores muy dispersos: no más celdas que motores (celdas más anchas)
+        if (n_cells > n) {
+            n_cells = n;
+            width = length / n;
+        }
+    }
+
+    // Orden por conteo: `order` agrupa los índices de cada celda
+    cell_of.resize(n);
+    start.assign(n_cells + 1, 0);
+    const double inv_width = 1.0 / width;
+    for (std::size_t i = 0; i < n; ++i) {
+        double u = x[i] - lo;
+        if (box > 0.0) u -= box * std::floor(u * inv_box);
+        std::size_t c = static_cast<std::size_t>(u * inv_width);
+        if (c >= n_cells) c = n_cells - 1;   // Redondeo en el borde superior
+        cell_of[i] = static_cast<std::uint32_t>(c);
+        ++start[c + 1];
+    }
+    for (std::size_t c = 0; c < n_cells; ++c) start[c + 1] += start[c];
+    order.resize(n);
+    std::vector<std::uint32_t> fill(start.begin(), start.end() - 1);
+    for (std::size_t i = 0; i < n; ++i) order[fill[cell_of[i]]++] = static_cast<std::uint32_t>(i);
+
+    // Cada celda consigo misma y con la siguiente (cada par una sola vez)
+    for (std::size_t c = 0; c < n_cells; ++c) {
+        addPairs(x, c, c);
+        std::size_t next = c + 1;
+        if (next == n_cells) {
+            if (box <= 0.0 || n_cells == 1) continue;
+            next = 0;
+        }
+        addPairs(x, c, next);
+    }
+}
+
+void NeighborList::addPairs(const std::vector<double>& x, std::size_t cell_a, std::size_t cell_b) {
+    for (std::uint32_t a = start[cell_a]; a < start[cell_a + 1]; ++a) {
+        const std::uint32_t i = order[a];
+        std::uint32_t b = cell_a == cell_b ? a + 1 : start[cell_b];
+        for (; b < start[cell_b + 1]; ++b) {
+            const std::uint32_t j = order[b];
+            if (std::fabs(separation(x[i], x[j])) < reach) {
+                Pair pair = {i, j};
+                pairs.push_back(pair);
+            }
+        }
+    }
+}
@@ -0,0 +1,5 @@
+#include "Potential.h"
+
+// U(x) y F(x) de HarmonicPotential están definidas en línea en Potential.h;
+// aquí sólo queda el destructor virtual (ancla la vtable de Potential).
+Potential::~Potential() {}
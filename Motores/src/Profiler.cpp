@@ -0,0 +1,130 @@
+#include "Profiler.h"
+#include "DataWriter.h"
+#include <algorithm>
+#include <cstdlib>
+#include <fstream>
+#include <iomanip>
+#include <sstream>
+#include <stdexcept>
+#include <unistd.h>
+
+const std::size_t Profiler::SAMPLE_EVERY;
+const char* const Profiler::ENV_VARIABLE = "MOTOR_PROFILE";
+
+// Texto JSON entre comillas (los nombres de sección son ASCII o UTF-8)
+static std::string quoted(const std::string& s) {
+    std::string out = "\"";
+    for (char c : s) {
+        if (c == '"' || c == '\\') out += '\\';
+        out += c;
+    }
+    return out + "\"";
+}
+
+static std::string number(double value) {
+    std::ostringstream out;
+    out << std::setprecision(17) << value;
+    return out.str();
+}
+
+Profiler::Profiler(const std::string& program_name)
+    : program(program_name), start(std::chrono::steady_clock::now()), timer_overhead(0.0)
+{
+    calibrate();
+}
+
+void Profiler::calibrate() {
+    // Intervalo que registra un ScopedTimer vacío: el mínimo entre varias
+    // tandas, sobre una sección auxiliar que luego se descarta
+    const int rounds = 5, timers = 2000;
+    std::size_t id = section("calibracion");
+    double best = 0.0;
+    for (int r = 0; r < rounds; ++r) {
+        sections[id].seconds = 0.0;
+        for (int i = 0; i < timers; ++i) {
+            ScopedTimer timer(this, id);
+        }
+        double per_timer = sections[id].seconds / timers;
+        if (r == 0 || per_timer < best) best = per_timer;
+    }
+    sections.clear();
+    timer_overhead = best;
+}
+
+std::size_t Profiler::section(const std::string& name) {
+    for (std::size_t i = 0; i < sections.size(); ++i) {
+        if (sections[i].name == name) return i;
+    }
+    Section s = {name, 0.0, 0, 0};
+    sections.push_back(s);
+    return sections.size() - 1;
+}
+
+void Profiler::add(std::size_t id, double seconds) {
+    sections[id].seconds += seconds;
+    ++sections[id].timed_calls;
+}
+
+void Profiler::setCalls(std::size_t id, std::uint64_t calls) {
+    Section& s = sections[id];
+    s.extra_calls = calls > s.timed_calls ? calls - s.timed_calls : 0;
+}
+
+void Profiler::count(const std::string& counter, std::uint64_t n) {
+    counters[counter] += n;
+}
+
+void Profiler::setInfo(const std::string& key, double value) {
+    info[key] = number(value);
+}
+
+void Profiler::setInfo(const std::string& key, const std::string& value) {
+    info[key] = quoted(value);
+}
+
+double Profiler::wallSeconds() const {
+    return std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+}
+
+void Profiler::writeReport(const std::string& filename) const {
+    ensureParentDirectory(filename);
+    std::ofstream out(filename);
+    if (!out.is_open()) {
+        throw std::runtime_error("No se pudo abrir el reporte de perfil: " + filename);
+    }
+    out << "{\n  \"program\": " << quoted(program) << ",\n";
+    out << "  \"pid\": " << ::getpid() << ",\n";
+    out << "  \"wall_seconds\": " << number(wallSeconds()) << ",\n";
+    out << "  \"sample_every\": " << SAMPLE_EVERY << ",\n";
+    out << "  \"timer_overhead_seconds\": " << number(timer_overhead) << ",\n";
+    out << "  \"sections\": [";
+    for (std::size_t i = 0; i < sections.size(); ++i) {
+        const Section& s = sections[i];
+        std::uint64_t calls = s.timed_calls + s.extra_calls;
+        double measured = std::max(0.0, s.seconds - s.timed_calls * timer_overhead);
+        double estimated = s.timed_calls > 0 ? measured * calls / s.timed_calls : 0.0;
+        out << (i ? ",\n" : "\n") << "    {\"name\": " << quoted(s.name)
+            << ", \"seconds\": " << number(estimated) << ", \"calls\": " << calls
+            << ", \"timed_calls\": " << s.timed_calls << "}";
+    }
+    out << "\n  ],\n  \"counters\": {";
+    bool first = true;
+    for (const auto& c : counters) {
+        out << (first ? "\n" : ",\n") << "    " << quoted(c.first) << ": " << c.second;
+        first = false;
+    }
+    out << "\n  },\n  \"info\": {";
+    first = true;
+    for (const auto& entry : info) {
+        out << (first ? "\n" : ",\n") << "    " << quoted(entry.first) << ": " << entry.second;
+        first = false;
+    }
+    out << "\n  }\n}\n";
+}
+
+std::string Profiler::reportPath(const std::string& requested, const std::string& program) {
+    if (!requested.empty()) return requested;
+    const char* directory = std::getenv(ENV_VARIABLE);
+    if (!directory || !*directory) return "";
+    return std::string(directory) + "/" + program + "-" + std::to_string(::getpid()) + ".json";
+}
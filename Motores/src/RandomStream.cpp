@@ -0,0 +1,101 @@
+#include "RandomStream.h"
+#include <cmath>
+#include <random>
+
+namespace {
+const std::uint32_t PHILOX_M0 = 0xD2511F53u;
+const std::uint32_t PHILOX_M1 = 0xCD9E8D57u;
+const std::uint32_t PHILOX_W0 = 0x9E3779B9u;
+const std::uint32_t PHILOX_W1 = 0xBB67AE85u;
+const double TWO_PI = 6.283185307179586476925286766559;
+
+inline void mulhilo(std::uint32_t a, std::uint32_t b, std::uint32_t& hi, std::uint32_t& lo) {
+    std::uint64_t product = static_cast<std::uint64_t>(a) * b;
+    hi = static_cast<std::uint32_t>(product >> 32);
+    lo = static_cast<std::uint32_t>(product);
+}
+
+// Uniforme en (0, 1] con 53 bits: nunca 0, así log(u) es finito
+inline double toUniform(std::uint32_t hi, std::uint32_t lo) {
+    std::uint64_t bits = (static_cast<std::uint64_t>(hi) << 32) | lo;
+    return ((bits >> 11) + 1) * (1.0 / 9007199254740992.0);
+}
+} // namespace
+
+const std::size_t RandomStream::GAUSSIAN_BLOCK;
+const std::uint64_t RandomStream::EVENT_BLOCK;
+
+RandomStream::RandomStream(std::uint64_t s, std::uint64_t st)
+    : seed(s), stream(st), block(0), next(0), consumed(0)
+{
+}
+
+void RandomStream::generate(std::uint64_t counter, std::uint32_t out[4]) const {
+    std::uint32_t ctr[4] = {static_cast<std::uint32_t>(counter), static_cast<std::uint32_t>(counter >> 32),
+                            static_cast<std::uint32_t>(stream), static_cast<std::uint32_t>(stream >> 32)};
+    std::uint32_t key[2] = {static_cast<std::uint32_t>(seed), static_cast<std::uint32_t>(seed >> 32)};
+
+    for (int round = 0; round < 10; ++round) {
+        if (round > 0) {
+            key[0] += PHILOX_W0;
+            key[1] += PHILOX_W1;
+        }
+        std::uint32_t hi0, lo0, hi1, lo1;
+        mulhilo(PHILOX_M0, ctr[0], hi0, lo0);
+        mulhilo(PHILOX_M1, ctr[2], hi1, lo1);
+        std::uint32_t next_ctr[4] = {hi1 ^ ctr[1] ^ key[0], lo1, hi0 ^ ctr[3] ^ key[1], lo0};
+        ctr[0] = next_ctr[0]; ctr[1] = next_ctr[1]; ctr[2] = next_ctr[2]; ctr[3] = next_ctr[3];
+    }
+    out[0] = ctr[0]; out[1] = ctr[1]; out[2] = ctr[2]; out[3] = ctr[3];
+}
+
+// Cada bloque Philox (4 x 32 bits) da dos uniformes de 53 bits y, por
+// Box-Muller, dos normales. Un valor impar deja sin usar la segunda normal
+// del último bloque (así la posición en el flujo siempre es par por bloque).
+void RandomStream::fillGaussian(double* out, std::size_t n) {
+    std::uint32_t bits[4];
+    std::size_t i = 0;
+    while (i < n) {
+        generate(block++, bits);
+        double radius = std::sqrt(-2.0 * std::log(toUniform(bits[0], bits[1])));
+        double angle = TWO_PI * toUniform(bits[2], bits[3]);
+        out[i++] = radius * std::cos(angle);
+        if (i < n) out[i++] = radius * std::sin(angle);
+    }
+}
+
+double RandomStream::exponential(std::uint64_t event) const {
+    std::uint32_t bits[4];
+    generate(EVENT_BLOCK + event, bits);
+    return -std::log(toUniform(bits[0], bits[1]));
+}
+
+double RandomStream::uniform(std::uint64_t event) const {
+    std::uint32_t bits[4];
+    generate(EVENT_BLOCK + event, bits);
+    return toUniform(bits[2], bits[3]);
+}
+
+void RandomStream::refill() {
+    consumed += buffer.size();
+    buffer.resize(GAUSSIAN_BLOCK);
+    fillGaussian(buffer.data(), buffer.size());
+    next = 0;
+}
+
+void RandomStream::seek(std::uint64_t position) {
+    // Los búferes se llenan siempre con GAUSSIAN_BLOCK normales (número par),
+    // así el búfer que contiene `position` empieza en un bloque conocido
+    std::uint64_t start = position - position % GAUSSIAN_BLOCK;
+    block = start / 2;
+    consumed = start;
+    buffer.clear();
+    refill();
+    consumed = start;
+    next = static_cast<std::size_t>(position - start);
+}
+
+std::uint64_t RandomStream::randomSeed() {
+    std::random_device rd;
+    return (static_cast<std::uint64_t>(rd()) << 32) ^ rd();
+}
@@ -0,0 +1,115 @@
+#include "RunStatistics.h"
+#include "DataWriter.h"
+#include <cmath>
+#include <fstream>
+#include <iomanip>
+#include <limits>
+#include <stdexcept>
+
+RunStatistics::RunStatistics(std::size_t bins, double h_min, double h_max)
+    : n(0), mean_x(0.0), m2_x(0.0), mean_v(0.0), m2_v(0.0),
+      x_min(std::numeric_limits<double>::infinity()),
+      x_max(-std::numeric_limits<double>::infinity()),
+      x_first(0.0), x_last(0.0), t_first(0.0), t_last(0.0),
+      hist(bins > 0 ? bins : 1, 0), underflow(0), overflow(0), hist_min(h_min)
+{
+    if (!(h_max > h_min)) {
+        throw std::invalid_argument("El rango del histograma requiere hist_max > hist_min.");
+    }
+    inv_bin_width = hist.size() / (h_max - h_min);
+}
+
+// Actualización de Welford: estable numéricamente para 10^9 muestras
+void RunStatistics::add(double t, double x, double v) {
+    if (n == 0) {
+        x_first = x;
+        t_first = t;
+    }
+    ++n;
+    double inv_n = 1.0 / n;
+
+    double dx = x - mean_x;
+    mean_x += dx * inv_n;
+    m2_x += dx * (x - mean_x);
+
+    double dv = v - mean_v;
+    mean_v += dv * inv_n;
+    m2_v += dv * (v - mean_v);
+
+    if (x < x_min) x_min = x;
+    if (x > x_max) x_max = x;
+    x_last = x;
+    t_last = t;
+
+    double pos = (x - hist_min) * inv_bin_width;
+    if (!(pos >= 0.0)) {
+        ++underflow;
+    } else if (pos >= static_cast<double>(hist.size())) {
+        ++overflow;
+    } else {
+        ++hist[static_cast<std::size_t>(pos)];
+    }
+}
+
+double RunStatistics::driftVelocity() const {
+    double elapsed = t_last - t_first;
+    return elapsed > 0.0 ? netDisplacement() / elapsed : 0.0;
+}
+
+void RunStatistics::writeSummary(const std::string& filename) const {
+    ensureParentDirectory(filename);
+    std::ofstream out(filename);
+    if (!out.is_open()) {
+        throw std::runtime_error("No se pudo abrir el archivo de resumen: " + filename);
+    }
+    out << std::setprecision(17);
+    out << "# Resumen de la corrida (acumuladores en linea, varianzas poblacionales)\n";
+    out << "n_samples = " << n << "\n";
+    out << "t_first = " << t_first << "\n";
+    out << "t_last = " << t_last << "\n";
+    out << "mean_x = " << mean_x << "\n";
+    out << "var_x = " << varianceX() << "\n";
+    out << "std_x = " << std::sqrt(varianceX()) << "\n";
+    out << "mean_v = " << mean_v << "\n";
+    out << "var_v = " << varianceV() << "\n";
+    out << "std_v = " << std::sqrt(varianceV()) << "\n";
+    out << "x_min = " << x_min << "\n";
+    out << "x_max = " << x_max << "\n";
+    out << "x_first = " << x_first << "\n";
+    out << "x_last = " << x_last << "\n";
+    out << "net_displacement = " << netDisplacement() << "\n";
+    out << "drift_velocity = " << driftVelocity() << "\n";
+    out << "hist_bins = " << hist.size() << "\n";
+    out << "hist_min = " << hist_min << "\n";
+    out << "hist_max = " << hist_min + hist.size() / inv_bin_width << "\n";
+    out << "hist_underflow = " << underflow << "\n";
+    out << "hist_overflow = " << overflow << "\n";
+    out << "# histograma: borde_izq\tborde_der\tcuentas\n";
+    double width = 1.0 / inv_bin_width;
+    for (std::size_t i = 0; i < hist.size(); ++i) {
+        out << hist_min + i * width << "\t" << hist_min + (i + 1) * width << "\t" << hist[i] << "\n";
+    }
+}
+
+std::vector<double> RunStatistics::saveState() const {
+    std::vector<double> state = {static_cast<double>(n), mean_x, m2_x, mean_v, m2_v,
+                                 x_min, x_max, x_first, x_last, t_first, t_last,
+                                 static_cast<double>(underflow), static_cast<double>(overflow)};
+    return state;
+}
+
+void RunStatistics::restoreState(const std::vector<double>& state,
+                                 const std::vector<unsigned long long>& counts) {
+    if (state.size() != 13 || counts.size() != hist.size()) {
+        throw std::invalid_argument("Estado de RunStatistics incompatible (¿cambió hist-bins?).");
+    }
+    n = static_cast<std::size_t>(state[0]);
+    mean_x = state[1]; m2_x = state[2];
+    mean_v = state[3]; m2_v = state[4];
+    x_min = state[5]; x_max = state[6];
+    x_first = state[7]; x_last = state[8];
+    t_first = state[9]; t_last = state[10];
+    underflow = static_cast<unsigned long long>(state[11]);
+    overflow = static_cast<unsigned long long>(state[12]);
+    hist = counts;
+}
@@ -9,21 +9,105 @@
 #include "Simulator.h"
 #include "MotorModel.h"
 #include "Integrator.h"
+#include "DataWriter.h"
+#include "Profiler.h"
+#include "RandomStream.h"
 #include <stdexcept>
 #include <cmath>
 
 Simulator::Simulator(MotorModel& m, Integrator& i, double T_t, double delta_t, const std::string& filename)
-    : motor(m), integrator(i), T_total(T_t), dt(delta_t)
+    : Simulator(m, i, T_t, delta_t, std::unique_ptr<DataWriter>(new TextDataWriter(filename)))
 {
-    // Crear directorio si no existe
-    system("mkdir -p results");
-    
-    data_file.open(filename);
-    if (!data_file.is_open()) {
-        throw std::runtime_error("No se pudo abrir el archivo de salida para la simulación.");
+}
+
+Simulator::Simulator(MotorModel& m, Integrator& i, double T_t, double delta_t, std::unique_ptr<DataWriter> w)
+    : motor(m), integrator(i), T_total(T_t), dt(delta_t), writer(std::move(w)),
+      checkpoint_every(0), run_integrator(IntegratorKind::BAOAB), resuming(false), profiler(nullptr)
+{
+}
+
+Simulator::~Simulator() {}
+
+std::size_t Simulator::countSteps(double T_total, double dt) {
+    std::size_t n_steps = 0;
+    for (double t = 0.0; t < T_total; t += dt) ++n_steps;
+    return n_steps;
+}
+
+void Simulator::setLoggingPolicy(const LoggingPolicy& p) {
+    policy = p;
+    if (policy.stride == 0) policy.stride = 1;
+    if (policy.mode == LogMode::NONE) policy.accumulate = true;
+}
+
+void Simulator::setProfiler(Profiler* p) {
+    profiler = p;
+    if (writer) writer->setProfiler(p);
+}
+
+void Simulator::setCheckpointPolicy(const std::string& filename, std::size_t every,
+                                    const SimulationParameters& params, const std::string& output,
+                                    IntegratorKind integrator) {
+    checkpoint_file = filename;
+    checkpoint_every = every;
+    run_params = params;
+    output_file = output;
+    run_integrator = integrator;
+}
+
+void Simulator::resumeFrom(const Checkpoint& checkpoint) {
+    if (checkpoint.params.dt != dt) {
+        throw std::invalid_argument("No se puede reanudar con un dt distinto al del punto de control.");
+    }
+    if (checkpoint.params.switching != motor.getChemicalState().getMode()) {
+        throw std::invalid_argument("El modo de conmutación química no coincide con el del punto de control.");
+    }
+    if (T_total < checkpoint.params.T_total) {
+        throw std::invalid_argument("Al reanudar, T_total no puede ser menor que el de la corrida original.");
+    }
+    resume_point = checkpoint;
+    resuming = true;
+}
+
+void Simulator::saveCheckpoint(double t, std::size_t step, int previous_state) {
+    // La salida debe estar en disco hasta el desplazamiento que se guarda
+    if (writer) writer->flush();
+
+    Checkpoint c;
+    c.params = run_params;
+    c.params.T_total = T_total;
+    c.integrator = run_integrator;
+    c.t = t;
+    c.step = step;
+    c.previous_state = previous_state;
+    const Particle& p = motor.getParticle();
+    c.x = p.x;
+    c.v = p.v;
+    c.s = motor.getCurrentState();
+    if (motor.getChemicalState().getMode() != SwitchingMode::PERIODIC) {
+        c.chemical = motor.getChemicalState().saveState();
+    }
+    const RandomStream& rng = motor.getRandomStream();
+    c.seed = rng.getSeed();
+    c.stream = rng.getStream();
+    c.rng_position = rng.position();
+    c.output_file = output_file;
+    c.writer_offset = writer ? writer->offset() : 0;
+    if (stats) {
+        c.stats = stats->saveState();
+        c.stats_hist = stats->histogram();
+    }
+    ::saveCheckpoint(c, checkpoint_file);
+}
+
+bool Simulator::shouldLog(std::size_t step, int previous_state) const {
+    switch (policy.mode) {
+        case LogMode::EVERY_STEP:  return true;
+        case LogMode::STRIDE:      return step % policy.stride == 0;
+        case LogMode::TRANSITIONS: return motor.getCurrentState() != previous_state;
+        case LogMode::NONE:        return false;
     }
-    // Encabezado para el archivo de datos
-    data_file << "# t\tx\tv\ts\tE_total\n";
+    return false;
 }
 
 void Simulator::logData(double t) {
@@ -35,24 +119,140 @@ void Simulator::logData(double t) {
     double E_pot = motor.getPotentialEnergy(); 
     
     // Escribe las columnas: t, x, v, s, E_total
-    data_file << t << "\t" << p.x << "\t" << p.v << "\t" << s << "\t" << (E_kin + E_pot) << "\n";
+    writer->write(t, p.x, p.v, s, E_kin + E_pot);
 }
 
-void Simulator::run() {
-    double t = 0.0;
+// Secciones del perfil y contadores del bucle
+struct Simulator::LoopProfile {
+    std::size_t chem = 0, log = 0, stats = 0, step = 0, checkpoint = 0;
+    std::uint64_t rows_logged = 0, transitions = 0;
+};
+
+template <bool Profiled>
+void Simulator::runLoop(double& t, std::size_t& step, int& previous_state, LoopProfile& prof) {
+    // Con perfil, las secciones por paso se miden uno de cada SAMPLE_EVERY pasos
+    std::size_t until_sample = 1;
+
     while (t < T_total) {
+        Profiler* sample = nullptr;
+        if (Profiled && --until_sample == 0) {
+            until_sample = Profiler::SAMPLE_EVERY;
+            sample = profiler;
+        }
+
         // 1. Actualizar el estado químico (U0 o U1)
-        motor.updateChemicalState(t, dt);
+        {
+            ScopedTimer timer(sample, prof.chem);
+            motor.updateChemicalState(t, dt);
+        }
         
-        // 2. Registrar el estado actual
-        logData(t);
+        // 2. Registrar el estado actual (según la política de registro)
+        if (shouldLog(step, previous_state)) {
+            ScopedTimer timer(sample, prof.log);
+            logData(t);
+            if (Profiled) ++prof.rows_logged;
+        }
+        if (stats) {
+            ScopedTimer timer(sample, prof.stats);
+            const Particle& p = motor.getParticle();
+            stats->add(t, p.x, p.v);
+        }
+        if (Profiled) prof.transitions += previous_state >= 0 && motor.getCurrentState() != previous_state;
+        previous_state = motor.getCurrentState();
         
-        // 3. Integrar un paso de tiempo
-        integrator.step(motor, dt);
+        // 3. Integrar un paso de tiempo (de t a t + dt)
+        {
+            ScopedTimer timer(sample, prof.step);
+            integrator.advance(motor, t, dt);
+        }
         
         t += dt;
+        ++step;
+
+        if (checkpoint_every > 0 && step % checkpoint_every == 0 && !checkpoint_file.empty()) {
+            ScopedTimer timer(Profiled ? profiler : nullptr, prof.checkpoint);
+            saveCheckpoint(t, step, previous_state);
+        }
+    }
+}
+
+void Simulator::run() {
+    if (!writer && policy.mode != LogMode::NONE) {
+        throw std::runtime_error("Simulator requiere un DataWriter válido para registrar datos.");
+    }
+
+    // Reservar las filas esperadas
+    std::size_t n_steps = countSteps(T_total, dt);
+    if (policy.mode == LogMode::EVERY_STEP) {
+        writer->reserve(n_steps);
+    } else if (policy.mode == LogMode::STRIDE) {
+        writer->reserve((n_steps + policy.stride - 1) / policy.stride);
+    }
+
+    if (policy.accumulate) {
+        stats.reset(new RunStatistics(policy.hist_bins, policy.hist_min, policy.hist_max));
+    }
+
+    integrator.prepare(motor, dt);
+
+    double t = 0.0;
+    std::size_t step = 0;
+    int previous_state = -1;
+    if (resuming) {
+        // Mismo t acumulado, misma posición del flujo aleatorio: la corrida
+        // continúa igual que si no se hubiera interrumpido
+        const Checkpoint& c = resume_point;
+        t = c.t;
+        step = static_cast<std::size_t>(c.step);
+        previous_state = c.previous_state;
+        Particle& p = motor.getParticle();
+        p.x = c.x;
+        p.v = c.v;
+        motor.getRandomStream() = RandomStream(c.seed, c.stream);
+        motor.getRandomStream().seek(c.rng_position);
+        if (!c.chemical.empty()) {
+            motor.getChemicalState().restoreState(c.chemical);
+        }
+        if (stats && !c.stats.empty()) {
+            stats->restoreState(c.stats, c.stats_hist);
+        }
+    }
+
+    LoopProfile prof;
+    std::size_t sec_close = 0;
+    const std::size_t first_step = step;
+    if (profiler) {
+        prof.chem = profiler->section("quimica");
+        prof.log = profiler->section("registro");
+        prof.stats = profiler->section("estadisticas");
+        prof.step = profiler->section("integracion");
+        prof.checkpoint = profiler->section("punto_control");
+        sec_close = profiler->section("cierre");
+        runLoop<true>(t, step, previous_state, prof);
+    } else {
+        runLoop<false>(t, step, previous_state, prof);
+    }
+
+    ScopedTimer close_timer(profiler, sec_close);
+    // Punto de control final: permite extender la corrida a un T_total mayor
+    if (!checkpoint_file.empty()) {
+        saveCheckpoint(t, step, previous_state);
     }
     
-    data_file.close();
+    if (writer) writer->close();
+    if (stats && !policy.summary_file.empty()) {
+        stats->writeSummary(policy.summary_file);
+    }
+
+    if (profiler) {
+        const std::uint64_t steps_run = step - first_step;
+        profiler->setCalls(prof.chem, steps_run);
+        profiler->setCalls(prof.log, prof.rows_logged);
+        profiler->setCalls(prof.stats, stats ? steps_run : 0);
+        profiler->setCalls(prof.step, steps_run);
+        profiler->count("pasos", steps_run);
+        profiler->count("filas_registradas", prof.rows_logged);
+        profiler->count("transiciones", prof.transitions);
+    }
 
 }
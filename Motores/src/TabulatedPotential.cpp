@@ -0,0 +1,124 @@
+#include "TabulatedPotential.h"
+#include <cmath>
+#include <fstream>
+#include <sstream>
+#include <stdexcept>
+
+static void checkGrid(double period, std::size_t n) {
+    if (!(period > 0.0)) {
+        throw std::invalid_argument("El período del potencial tabulado debe ser positivo");
+    }
+    if (n < 4) {
+        throw std::invalid_argument("El potencial tabulado necesita al menos 4 puntos");
+    }
+}
+
+TabulatedPotential::TabulatedPotential(double x_start, double L, const std::vector<double>& U_samples)
+    : x0(x_start), period(L)
+{
+    checkGrid(period, U_samples.size());
+    // Diferencias centrales periódicas (Catmull-Rom)
+    const std::size_t n = U_samples.size();
+    const double h = period / n;
+    std::vector<double> dU(n);
+    for (std::size_t i = 0; i < n; ++i) {
+        dU[i] = (U_samples[(i + 1) % n] - U_samples[(i + n - 1) % n]) / (2.0 * h);
+    }
+    build(U_samples, dU);
+}
+
+TabulatedPotential::TabulatedPotential(double x_start, double L, const std::vector<double>& U_samples,
+                                       const std::vector<double>& dU_samples)
+    : x0(x_start), period(L)
+{
+    checkGrid(period, U_samples.size());
+    if (dU_samples.size() != U_samples.size()) {
+        throw std::invalid_argument("U y dU/dx deben tener el mismo número de puntos");
+    }
+    build(U_samples, dU_samples);
+}
+
+static std::vector<double> sample(const std::function<double(double)>& U_function,
+                                  double x0, double period, std::size_t n_points) {
+    checkGrid(period, n_points);
+    std::vector<double> samples(n_points);
+    for (std::size_t i = 0; i < n_points; ++i) {
+        samples[i] = U_function(x0 + period * static_cast<double>(i) / n_points);
+    }
+    return samples;
+}
+
+TabulatedPotential::TabulatedPotential(double x_start, double L, std::size_t n_points,
+                                       const std::function<double(double)>& U_function)
+    : TabulatedPotential(x_start, L, sample(U_function, x_start, L, n_points))
+{
+}
+
+// Hermite cúbico en cada celda, con m = h dU/dx en los extremos:
+//   U(u) = a + b u + c u^2 + d u^3,  F(u) = -(b + 2 c u + 3 d u^2) / h
+void TabulatedPotential::build(const std::vector<double>& U_samples, const std::vector<double>& dU_samples) {
+    const std::size_t n = U_samples.size();
+    const double h = period / n;
+    inv_h = n / period;
+    n_cells = static_cast<double>(n);
+    inv_n = 1.0 / n_cells;
+
+    cells.resize(n);
+    for (std::size_t i = 0; i < n; ++i) {
+        std::size_t j = (i + 1) % n;
+        double y0 = U_samples[i], y1 = U_samples[j];
+        double m0 = h * dU_samples[i], m1 = h * dU_samples[j];
+        Cell& c = cells[i];
+        c.a = y0;
+        c.b = m0;
+        c.c = 3.0 * (y1 - y0) - 2.0 * m0 - m1;
+        c.d = 2.0 * (y0 - y1) + m0 + m1;
+        c.fb = -c.b * inv_h;
+        c.fc = -2.0 * c.c * inv_h;
+        c.fd = -3.0 * c.d * inv_h;
+        c.pad = 0.0;
+    }
+}
+
+TabulatedPotential TabulatedPotential::fromFile(const std::string& filename) {
+    std::ifstream in(filename);
+    if (!in.is_open()) {
+        throw std::invalid_argument("No se pudo abrir el potencial tabulado: " + filename);
+    }
+    std::vector<double> xs, Us, Fs;
+    std::string line;
+    while (std::getline(in, line)) {
+        std::string::size_type hash = line.find('#');
+        if (hash != std::string::npos) line = line.substr(0, hash);
+        std::istringstream row(line);
+        double x, U, F;
+        if (!(row >> x)) continue;
+        if (!(row >> U)) {
+            throw std::invalid_argument(filename + ": cada fila necesita al menos 'x U'");
+        }
+        xs.push_back(x);
+        Us.push_back(U);
+        if (row >> F) Fs.push_back(F);
+    }
+    if (xs.size() < 4) {
+        throw std::invalid_argument(filename + ": se necesitan al menos 4 puntos");
+    }
+
+    // Espaciado uniforme: el período es n * h (el extremo no se repite)
+    const std::size_t n = xs.size();
+    double h = (xs.back() - xs.front()) / (n - 1);
+    for (std::size_t i = 1; i < n; ++i) {
+        if (std::fabs(xs[i] - xs[i - 1] - h) > 1e-4 * std::fabs(h)) {
+            throw std::invalid_argument(filename + ": la grilla x debe ser uniforme");
+        }
+    }
+    if (Fs.empty()) {
+        return TabulatedPotential(xs.front(), n * h, Us);
+    }
+    if (Fs.size() != n) {
+        throw std::invalid_argument(filename + ": la columna F debe estar en todas las filas o en ninguna");
+    }
+    std::vector<double> dU(n);
+    for (std::size_t i = 0; i < n; ++i) dU[i] = -Fs[i];
+    return TabulatedPotential(xs.front(), n * h, Us, dU);
+}
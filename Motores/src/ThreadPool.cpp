@@ -0,0 +1,61 @@
+#include "ThreadPool.h"
+
+ThreadPool::ThreadPool(std::size_t threads)
+    : n_threads(threads), current(nullptr), n_tasks(0), next_task(0),
+      generation(0), busy(0), stopping(false)
+{
+    if (n_threads == 0) n_threads = std::thread::hardware_concurrency();
+    if (n_threads == 0) n_threads = 1;
+    for (std::size_t i = 1; i < n_threads; ++i) {
+        workers.emplace_back(&ThreadPool::workerLoop, this, i);
+    }
+}
+
+ThreadPool::~ThreadPool() {
+    {
+        std::lock_guard<std::mutex> lock(mutex);
+        stopping = true;
+    }
+    start_cv.notify_all();
+    for (std::size_t i = 0; i < workers.size(); ++i) workers[i].join();
+}
+
+void ThreadPool::work(std::size_t thread) {
+    for (std::size_t task = next_task++; task < n_tasks; task = next_task++) {
+        (*current)(task, thread);
+    }
+}
+
+void ThreadPool::workerLoop(std::size_t thread) {
+    std::size_t seen = 0;
+    for (;;) {
+        {
+            std::unique_lock<std::mutex> lock(mutex);
+            start_cv.wait(lock, [&] { return stopping || generation != seen; });
+            if (stopping) return;
+            seen = generation;
+        }
+        work(thread);
+        {
+            std::lock_guard<std::mutex> lock(mutex);
+            if (--busy == 0) done_cv.notify_one();
+        }
+    }
+}
+
+void ThreadPool::run(std::size_t tasks, const Task& task) {
+    {
+        std::lock_guard<std::mutex> lock(mutex);
+        current = &task;
+        n_tasks = tasks;
+        next_task = 0;
+        busy = workers.size();
+        ++generation;
+    }
+    start_cv.notify_all();
+    work(0);   // El hilo llamador es el hilo 0
+
+    std::unique_lock<std::mutex> lock(mutex);
+    done_cv.wait(lock, [&] { return busy == 0; });
+    current = nullptr;
+}
@@ -9,45 +9,198 @@
 #include "MotorModel.h"
 #include "Integrator.h"
 #include "Simulator.h"
+#include "DataWriter.h"
+#include "Parameters.h"
+#include "Checkpoint.h"
+#include "CommandLine.h"
+#include "EnsembleSimulator.h"
+#include "MotorSystem.h"
+#include "Profiler.h"
+#include "RandomStream.h"
+#include "TabulatedPotential.h"
+#include <chrono>
+#include <cstdint>
 #include <iostream>
+#include <memory>
 #include <stdexcept>
+#include <string>
+#include <vector>
 
-int main() {
-    std::cout << "Iniciando simulacion del Motor de Dos Estados (Langevin-Verlet Estocástico)...\n";
+// Pozos armónicos U0 (k0, x=0) y U1 (k1, x=l), o los archivos de --potentials
+static std::vector<std::shared_ptr<const Potential> > statePotentials(const SimulationParameters& params) {
+    std::vector<std::shared_ptr<const Potential> > potentials;
+    if (params.potentials.empty()) {
+        potentials.push_back(std::make_shared<HarmonicPotential>(params.k0, 0.0));
+        potentials.push_back(std::make_shared<HarmonicPotential>(params.k1, params.l));
+    }
+    for (const std::string& file : params.potentials) {
+        potentials.push_back(std::make_shared<TabulatedPotential>(TabulatedPotential::fromFile(file)));
+    }
+    return potentials;
+}
 
-    // --- PARAMETROS FISICOS ---
-    double m = 1.0;         // Masa de la partícula
-    
-    // Constantes elásticas diferentes para cada estado
-    double k0 = 10.0;        // Estado 0: Unión débil (potencial suave)
-    double k1 = 10.0;       // Estado 1: Unión fuerte (potencial rígido)
-    
-    double l = 0.5;         // Desplazamiento del mínimo para U1
-    double T_off = 2;     // Duración del estado 0 (unión débil)
-    double T_on = 2;      // Duración del estado 1 (unión fuerte)
-    
-    // --- PARAMETROS DE LANGEVIN ---
-    double gamma = 10.0;    // Coeficiente de fricción
-    double kBT = 0.01;      // Energía térmica
-    
-    // --- PARAMETROS DE SIMULACION ---
-    double T_total = 10.0;  // Tiempo total
-    double dt = 0.001;      // Paso de tiempo
-
-    // --- CONDICIONES INICIALES ---
-    double initial_x = l / 2.0; 
-    double initial_v = 0.0;     
+// Modo ensamble: M motores en paralelo, sólo estadísticas vs t (sin trayectorias)
+static int runEnsemble(const RunConfig& config, Profiler* profiler) {
+    const SimulationParameters& params = config.params;
+    std::uint64_t seed = config.seed_given ? config.seed : RandomStream::randomSeed();
+    std::size_t stride = config.logging.mode == LogMode::STRIDE ? config.logging.stride : 1;
 
     try {
-        // Crear modelo con constantes diferentes
-        MotorModel motor(m, k0, k1, l, T_off, T_on, gamma, kBT, initial_x, initial_v);
+        EnsembleSimulator ensemble(params, config.motors, seed, config.threads);
+        ensemble.setRecordStride(stride);
+
+        auto start = std::chrono::steady_clock::now();
+        {
+            ScopedTimer timer(profiler, profiler ? profiler->section("ensamble") : 0);
+            ensemble.run();
+        }
+        double seconds = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+
+        {
+            ScopedTimer timer(profiler, profiler ? profiler->section("escritura") : 0);
+            ensemble.writeRecords(config.ensemble_file);
+        }
+        double motor_steps = static_cast<double>(config.motors) *
+                             Simulator::countSteps(params.T_total, params.dt);
+        if (profiler) {
+            profiler->count("pasos_motor", static_cast<std::uint64_t>(motor_steps));
+            profiler->setInfo("motores", static_cast<double>(config.motors));
+            profiler->setInfo("hilos", static_cast<double>(ensemble.getThreadCount()));
+            profiler->setInfo("semilla", static_cast<double>(seed));
+        }
+        std::cout << "Ensamble de " << config.motors << " motores (semilla " << seed
+                  << ", flujos 0.." << config.motors - 1 << ") con "
+                  << ensemble.getThreadCount() << " hilo(s)\n";
+        std::cout << "  " << seconds << " s, " << motor_steps / seconds << " pasos-motor/s\n";
+        std::cout << "  <v> = " << ensemble.meanVelocity()
+                  << ", velocidad de deriva = " << ensemble.driftVelocity() << "\n";
+        std::cout << "Estadisticas guardadas en " << config.ensemble_file << "\n";
+    } catch (const std::exception& e) {
+        std::cerr << "Error en la simulacion del ensamble: " << e.what() << std::endl;
+        return 1;
+    }
+    return 0;
+}
+
+// Modo sistema: N motores acoplados (resortes, volumen excluido) en la misma pista
+static int runSystem(const RunConfig& config, Profiler* profiler) {
+    const SimulationParameters& params = config.params;
+    std::uint64_t seed = config.seed_given ? config.seed : RandomStream::randomSeed();
+    std::size_t stride = config.logging.mode == LogMode::STRIDE ? config.logging.stride : 1;
+
+    try {
+        MotorSystem system(params, statePotentials(params), config.system_motors, config.coupling, seed);
+        system.setRecordStride(stride);
+
+        auto start = std::chrono::steady_clock::now();
+        {
+            ScopedTimer timer(profiler, profiler ? profiler->section("sistema") : 0);
+            system.run();
+        }
+        double seconds = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+
+        {
+            ScopedTimer timer(profiler, profiler ? profiler->section("escritura") : 0);
+            system.writeRecords(config.system_file);
+        }
+        double motor_steps = static_cast<double>(config.system_motors) *
+                             Simulator::countSteps(params.T_total, params.dt);
+        if (profiler) {
+            profiler->count("pasos_motor", static_cast<std::uint64_t>(motor_steps));
+            profiler->count("reconstrucciones_vecinos", system.getNeighborBuilds());
+            profiler->setInfo("motores", static_cast<double>(config.system_motors));
+            profiler->setInfo("semilla", static_cast<double>(seed));
+        }
+        std::cout << "Sistema de " << config.system_motors << " motores acoplados (semilla " << seed
+                  << ", flujos 0.." << config.system_motors - 1 << ")\n";
+        std::cout << "  " << seconds << " s, " << motor_steps / seconds << " pasos-motor/s, "
+                  << system.getNeighborBuilds() << " reconstrucciones de la lista de vecinos\n";
+        std::cout << "  velocidad de deriva del centro de masa = " << system.driftVelocity() << "\n";
+        std::cout << "Estadisticas guardadas en " << config.system_file << "\n";
+    } catch (const std::exception& e) {
+        std::cerr << "Error en la simulacion del sistema: " << e.what() << std::endl;
+        return 1;
+    }
+    return 0;
+}
+
+// Una corrida (con trayectoria registrada, puntos de control y reanudación)
+static int runSingle(const RunConfig& config, Profiler* profiler) {
+    // Parámetros físicos, de Langevin y de simulación (ver Parameters.h);
+    // por defecto initial_x = l / 2 e initial_v = 0
+    SimulationParameters params = config.params;
+
+    // Archivo de salida: ".bin" activa el formato binario columnar
+    std::string output_file = config.output_file;
+    const LoggingPolicy& logging = config.logging;
+
+    try {
+        // Reanudar: parámetros y salida del punto de control; sólo T_total
+        // puede cambiar (extender una corrida terminada)
+        Checkpoint checkpoint;
+        if (config.resume) {
+            checkpoint = loadCheckpoint(config.checkpoint_file);
+            double T_total = config.T_total_given ? params.T_total : checkpoint.params.T_total;
+            params = checkpoint.params;
+            params.T_total = T_total;
+            output_file = checkpoint.output_file;
+            std::cout << "Reanudando desde t = " << checkpoint.t << " (paso " << checkpoint.step
+                      << ") hasta T_total = " << params.T_total << "\n";
+        }
+
+        // Crear modelo con constantes diferentes (o un potencial tabulado por estado)
+        MotorModel motor(params.m, statePotentials(params), params.kinetics(),
+                         params.gamma, params.kBT, params.initial_x, params.initial_v);
+
+        // Ruido reproducible: se informa la semilla para poder repetir la corrida
+        // (al reanudar, el flujo se restaura desde el punto de control)
+        std::uint64_t seed = config.resume ? checkpoint.seed
+                           : config.seed_given ? config.seed : RandomStream::randomSeed();
+        std::uint64_t stream = config.resume ? checkpoint.stream : config.stream;
+        motor.seed(seed, stream);
+        std::cout << "Semilla: " << seed << " (flujo " << stream << ")\n";
+        if (profiler) {
+            profiler->setInfo("semilla", static_cast<double>(seed));
+            profiler->setInfo("flujo", static_cast<double>(stream));
+            profiler->setInfo("T_total", params.T_total);
+            profiler->setInfo("dt", params.dt);
+            profiler->setInfo("salida", logging.mode != LogMode::NONE ? output_file : std::string("(sin registro)"));
+        }
         
-        StochasticVelocityVerletIntegrator pv_integrator; 
+        // BAOAB con coeficientes precalculados y fuerza reutilizada entre pasos,
+        // o propagación exacta en cada pozo (--integrator=exact)
+        IntegratorKind kind = config.resume ? checkpoint.integrator : config.integrator;
+        std::unique_ptr<Integrator> integrator = createIntegrator(kind);
         
-        Simulator simulator(motor, pv_integrator, T_total, dt, "results/datos_motor_dos_estados_langevin.txt");
+        std::unique_ptr<DataWriter> writer;
+        if (logging.mode != LogMode::NONE) {
+            writer = config.resume ? resumeDataWriter(output_file, params, checkpoint.writer_offset)
+                                   : createDataWriter(output_file, params, config.quantum);
+        }
+        Simulator simulator(motor, *integrator, params.T_total, params.dt, std::move(writer));
+        simulator.setLoggingPolicy(logging);
+        simulator.setProfiler(profiler);
+        if (!config.checkpoint_file.empty()) {
+            simulator.setCheckpointPolicy(config.checkpoint_file, config.checkpoint_every,
+                                          params, output_file, kind);
+        }
+        if (config.resume) {
+            simulator.resumeFrom(checkpoint);
+        }
         simulator.run();
         
-        std::cout << "Simulacion completada. Datos guardados en results/datos_motor_dos_estados_langevin.txt\n";
+        if (logging.mode != LogMode::NONE) {
+            std::cout << "Simulacion completada. Datos guardados en " << output_file << "\n";
+        } else {
+            std::cout << "Simulacion completada (sin registro por paso).\n";
+        }
+        if (logging.accumulate) {
+            const RunStatistics* stats = simulator.getStatistics();
+            std::cout << "  <x> = " << stats->meanX() << ", <v> = " << stats->meanV()
+                      << ", Var(x) = " << stats->varianceX()
+                      << ", desplazamiento neto = " << stats->netDisplacement() << "\n";
+            std::cout << "Resumen guardado en " << logging.summary_file << "\n";
+        }
         
     } catch (const std::exception& e) {
         std::cerr << "Error en la simulacion: " << e.what() << std::endl;
@@ -58,5 +211,52 @@ int main() {
     }
 
     return 0;
+}
+
+// Escribir el reporte de perfil (si está activo) y devolver `status`
+static int finishProfile(int status, Profiler* profiler, const std::string& report_file) {
+    if (!profiler) return status;
+    profiler->setInfo("codigo_salida", static_cast<double>(status));
+    try {
+        profiler->writeReport(report_file);
+        std::cout << "Perfil guardado en " << report_file << "\n";
+    } catch (const std::exception& e) {
+        std::cerr << "Error al guardar el perfil: " << e.what() << std::endl;
+    }
+    return status;
+}
+
+int main(int argc, char* argv[]) {
+    RunConfig config;
+    try {
+        config = parseCommandLine(argc, argv);
+    } catch (const std::exception& e) {
+        std::cerr << "Error en los argumentos: " << e.what() << std::endl;
+        printUsage(argv[0]);
+        return 1;
+    }
+    if (config.show_help) {
+        printUsage(argv[0]);
+        return 0;
+    }
 
+    // Flujo en vivo por stdout: los mensajes pasan a stderr
+    if (config.output_file == "-" && config.logging.mode != LogMode::NONE && config.motors <= 1 &&
+        config.system_motors == 0) {
+        reserveStdoutForStream();
+    }
+
+    // Perfil (--profile-report o $MOTOR_PROFILE); sin él el costo es nulo
+    std::string report_file = Profiler::reportPath(config.profile_file, "motor_sim");
+    std::unique_ptr<Profiler> profiler;
+    if (!report_file.empty()) profiler.reset(new Profiler("motor_sim"));
+
+    std::cout << "Iniciando simulacion del Motor de Dos Estados (Langevin-Verlet Estocástico)...\n";
+    if (config.motors > 1) {
+        return finishProfile(runEnsemble(config, profiler.get()), profiler.get(), report_file);
+    }
+    if (config.system_motors > 0) {
+        return finishProfile(runSystem(config, profiler.get()), profiler.get(), report_file);
+    }
+    return finishProfile(runSingle(config, profiler.get()), profiler.get(), report_file);
 }
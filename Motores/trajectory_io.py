@@ -0,0 +1,499 @@
+"""
+Lectura compartida de trayectorias para plot_results.py y animations.py.
+
+Soporta los formatos que escribe Simulator:
+  - texto (.txt): columnas t, x, v, s, E_total separadas por tabulador
+  - binario columnar (.bin): cabecera fija de 256 bytes + columnas float64
+    t, x, v, E_total y uint8 s (ver include/DataWriter.h)
+  - flujo en vivo (--output=- o un FIFO): la misma cabecera con magic
+    "MOTORSTR" y registros empaquetados t, x, v, E_total, s (iter_stream)
+  - comprimido por bloques (.mtz): la misma cabecera con magic "MOTORZIP",
+    bloques zlib independientes (t implícito, x/v/E cuantizados en
+    diferencias varint, s por corridas) y un índice (load_compressed)
+
+El formato binario se abre con np.memmap: las columnas son vistas de solo
+lectura sobre el archivo, sin copias ni tiempo de parseo. El texto se parsea
+una vez y el arreglo se guarda en la caché de resultados (results_cache.py):
+las lecturas siguientes de un archivo con el mismo contenido lo abren con
+np.load(mmap_mode='r').
+
+load_trajectory(path, t_range=(t_min, t_max)) lee sólo una ventana de
+tiempo: en .mtz se descomprimen únicamente los bloques que la cubren.
+"""
+import itertools
+import os
+import struct
+import tempfile
+import zlib
+
+import numpy as np
+
+from results_cache import ResultsCache, file_digest, make_key
+
+DATA_BASENAME = "datos_motor_dos_estados_langevin"
+
+BINARY_MAGIC = b"MOTORBIN"
+STREAM_MAGIC = b"MOTORSTR"
+COMPRESSED_MAGIC = b"MOTORZIP"
+HEADER_SIZE = 256
+PARAM_NAMES = ('m', 'k0', 'k1', 'l', 'T_off', 'T_on', 'gamma', 'kBT',
+               'T_total', 'dt', 'initial_x', 'initial_v')
+
+# magic, version, header_size, n_rows, capacity, parámetros
+_HEADER_STRUCT = struct.Struct('<8sIIQQ%dd' % len(PARAM_NAMES))
+
+# Registro de 33 bytes del flujo en vivo (StreamDataWriter)
+STREAM_RECORD = np.dtype([('t', '<f8'), ('x', '<f8'), ('v', '<f8'), ('E_total', '<f8'), ('s', 'u1')])
+STREAM_READ_BYTES = 1 << 20
+
+# Formato comprimido (CompressedDataWriter): cuántum y filas por bloque tras
+# los parámetros, cabecera de cada bloque y entradas del índice
+CHUNK_TAG = b"MTZC"
+_COMPRESSED_EXTRA = struct.Struct('<dI')
+_COMPRESSED_EXTRA_OFFSET = 128
+_CHUNK_HEADER = struct.Struct('<4sIIIQd')   # tag, filas, bytes sin comprimir, comprimidos, primera fila, t0
+INDEX_ENTRY = np.dtype([('position', '<u8'), ('first_row', '<u8'), ('rows', '<u8'), ('t0', '<f8')])
+_T_EXCEPTION = np.dtype([('row', '<u4'), ('t', '<f8')])
+_STATE_RUN = np.dtype([('state', 'u1'), ('length', '<u4')])
+REPLAY_BATCH = 1 << 20     # Pasos de dt sumados por tanda al reconstruir t
+
+
+class Trajectory:
+    """Columnas de una trayectoria (t, x, v, s, E_total) y sus parámetros"""
+
+    def __init__(self, t, x, v, s, E_total, params=None, path=None):
+        self.t = t
+        self.x = x
+        self.v = v
+        self.s = s
+        self.E_total = E_total
+        self.params = params or {}
+        self.path = path
+
+    def __len__(self):
+        return len(self.t)
+
+
+def slice_trajectory(traj, start, stop):
+    """Filas [start, stop) de una trayectoria (vistas, sin copias)"""
+    return Trajectory(traj.t[start:stop], traj.x[start:stop], traj.v[start:stop],
+                      traj.s[start:stop], traj.E_total[start:stop], params=traj.params, path=traj.path)
+
+
+def concat_trajectories(parts, params=None, path=None):
+    """Una Trajectory con las filas de `parts` en orden"""
+    if len(parts) == 1:
+        return parts[0]
+    if not parts:
+        empty = np.empty(0)
+        return Trajectory(empty, empty, empty, np.empty(0, dtype=np.uint8), empty, params=params, path=path)
+    return Trajectory(*(np.concatenate([getattr(p, name) for p in parts])
+                        for name in ('t', 'x', 'v', 's', 'E_total')),
+                      params=params if params is not None else parts[0].params, path=path)
+
+
+def time_window(traj, t_range):
+    """Filas con t_min <= t <= t_max (t es creciente: búsqueda binaria, vistas)"""
+    if t_range is None:
+        return traj
+    t_min, t_max = t_range
+    start = 0 if t_min is None else int(np.searchsorted(traj.t, t_min, side='left'))
+    stop = len(traj) if t_max is None else int(np.searchsorted(traj.t, t_max, side='right'))
+    return slice_trajectory(traj, start, max(start, stop))
+
+
+def find_data_file():
+    """Buscar el archivo de datos en diferentes ubicaciones"""
+    possible_paths = [
+        "results/datos_motor_dos_estados_langevin",
+        "../results/datos_motor_dos_estados_langevin",
+        "./results/datos_motor_dos_estados_langevin",
+        "datos_motor_dos_estados_langevin"
+    ]
+
+    for base in possible_paths:
+        # Si existen ambos formatos, usar el más reciente
+        candidates = [base + ext for ext in (".bin", ".mtz", ".txt") if os.path.exists(base + ext)]
+        if candidates:
+            path = max(candidates, key=os.path.getmtime)
+            print(f"✅ Archivo de datos encontrado: {path}")
+            return path
+
+    print("❌ No se pudo encontrar el archivo de datos.")
+    return None
+
+
+def _file_magic(path):
+    with open(path, 'rb') as f:
+        return f.read(len(BINARY_MAGIC))
+
+
+def is_binary_file(path):
+    """True si el archivo empieza con la firma del formato binario"""
+    return _file_magic(path) == BINARY_MAGIC
+
+
+def is_compressed_file(path):
+    """True si el archivo empieza con la firma del formato comprimido (.mtz)"""
+    return _file_magic(path) == COMPRESSED_MAGIC
+
+
+def read_binary_header(path):
+    """Leer la cabecera binaria: (n_rows, capacity, params)"""
+    with open(path, 'rb') as f:
+        raw = f.read(_HEADER_STRUCT.size)
+    if len(raw) < _HEADER_STRUCT.size:
+        raise ValueError(f"Cabecera binaria incompleta en {path}")
+
+    return _unpack_header(raw, BINARY_MAGIC, path)
+
+
+def _unpack_header(raw, magic_expected, source):
+    fields = _HEADER_STRUCT.unpack(raw[:_HEADER_STRUCT.size])
+    magic, version, header_size, n_rows, capacity = fields[:5]
+    if magic != magic_expected:
+        raise ValueError(f"{source} no es un archivo binario de trayectoria")
+    if version != 1 or header_size != HEADER_SIZE:
+        raise ValueError(f"Versión de formato binario no soportada: {version}")
+
+    params = dict(zip(PARAM_NAMES, fields[5:]))
+    return n_rows, capacity, params
+
+
+def load_binary(path):
+    """Abrir un archivo .bin como vistas np.memmap (sin copias)"""
+    n_rows, capacity, params = read_binary_header(path)
+
+    def column(index, dtype):
+        offset = HEADER_SIZE + index * 8 * capacity
+        if n_rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(n_rows,))
+
+    return Trajectory(column(0, np.float64), column(1, np.float64),
+                      column(2, np.float64), column(4, np.uint8),
+                      column(3, np.float64), params=params, path=path)
+
+
+PARSED_NAME = "parsed.npy"
+
+
+def parsed_text_key(path):
+    """Clave del texto parseado: hash del contenido (hashear es mucho más barato que parsear)"""
+    return make_key('parsed-text', file_digest(path))
+
+
+def cached_text_array(path, cache=None):
+    """Arreglo (n, 5) ya parseado de `path` como memmap, o None si no está en caché"""
+    cache = cache or ResultsCache()
+    key = parsed_text_key(path)
+    if cache.get(key) is None:
+        return None
+    try:
+        return np.load(cache.files(key)[PARSED_NAME], mmap_mode='r')
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _store_text_array(path, data, cache):
+    tmp = None
+    try:
+        os.makedirs(cache.root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".npy", dir=cache.root)
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, data)
+        cache.put(parsed_text_key(path), {PARSED_NAME: tmp}, move=True, meta={'source': path})
+    except OSError as e:
+        print(f"⚠️  No se pudo guardar el texto parseado en la caché: {e}")
+    finally:
+        if tmp and os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def load_text(path, use_cache=True):
+    """Leer el formato de texto original con np.loadtxt (o desde la caché)"""
+    cache = ResultsCache() if use_cache else None
+    data = cached_text_array(path, cache) if use_cache else None
+    if data is None:
+        data = np.loadtxt(path, ndmin=2)
+        if use_cache:
+            _store_text_array(path, data, cache)
+    return Trajectory(data[:, 0], data[:, 1], data[:, 2], data[:, 3], data[:, 4], path=path)
+
+
+def _scan_chunks(f):
+    """Índice reconstruido desde las cabeceras de los bloques (corrida sin cerrar)"""
+    size = f.seek(0, os.SEEK_END)
+    position, entries = HEADER_SIZE, []
+    while position + _CHUNK_HEADER.size <= size:
+        f.seek(position)
+        tag, rows, _, packed_size, first_row, t0 = _CHUNK_HEADER.unpack(f.read(_CHUNK_HEADER.size))
+        end = position + _CHUNK_HEADER.size + packed_size
+        if tag != CHUNK_TAG or end > size:
+            break   # Bloque a medio escribir
+        entries.append((position, first_row, rows, t0))
+        position = end
+    return np.array(entries, dtype=INDEX_ENTRY)
+
+
+def read_compressed_index(path):
+    """Cabecera e índice de un .mtz: (params, quantum, índice con dtype INDEX_ENTRY)"""
+    with open(path, 'rb') as f:
+        raw = f.read(HEADER_SIZE)
+        if len(raw) < HEADER_SIZE:
+            raise ValueError(f"Cabecera incompleta en {path}")
+        _, index_position, params = _unpack_header(raw, COMPRESSED_MAGIC, path)
+        quantum, _ = _COMPRESSED_EXTRA.unpack_from(raw, _COMPRESSED_EXTRA_OFFSET)
+        if index_position:
+            f.seek(index_position)
+            index = np.frombuffer(f.read(), dtype=INDEX_ENTRY)
+        else:
+            index = _scan_chunks(f)
+    return params, quantum, index
+
+
+def _decode_varints(data):
+    """Enteros varint (7 bits por byte, el menos significativo primero), vectorizado"""
+    b = np.frombuffer(data, dtype=np.uint8)
+    if len(b) == 0:
+        return np.empty(0, dtype=np.uint64)
+    ends = np.flatnonzero(b < 0x80)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    shift = (np.arange(len(b)) - np.repeat(starts, ends - starts + 1)).astype(np.uint64) * np.uint64(7)
+    return np.add.reduceat((b & 0x7f).astype(np.uint64) << shift, starts)
+
+
+def _decode_deltas(data, quantum):
+    """Columna cuantizada: diferencias zigzag-varint -> valores float64"""
+    u = _decode_varints(data)
+    delta = (u >> np.uint64(1)).astype(np.int64) ^ -(u & np.uint64(1)).astype(np.int64)
+    return np.cumsum(delta) * quantum
+
+
+def _replay_times(t_start, steps, dt):
+    """
+    t de las filas siguientes a una de tiempo t_start, a steps[i] pasos de
+    la anterior: dt se suma uno a uno como en Simulator (np.cumsum acumula
+    en orden), por tandas de a lo sumo ~REPLAY_BATCH pasos.
+    """
+    out = np.empty(len(steps))
+    ends = np.cumsum(steps.astype(np.int64))
+    i, base, consumed = 0, t_start, 0
+    while i < len(steps):
+        j = max(i + 1, int(np.searchsorted(ends, consumed + REPLAY_BATCH, side='right')))
+        acc = np.full(int(ends[j - 1] - consumed) + 1, dt)
+        acc[0] = base
+        acc = np.cumsum(acc)
+        out[i:j] = acc[ends[i:j] - consumed]
+        base, consumed, i = out[j - 1], int(ends[j - 1]), j
+    return out
+
+
+def _chunk_times(t0, steps, exceptions, dt):
+    """t de un bloque: tramos reconstruidos desde t0 y desde cada t guardado aparte"""
+    n = len(steps)
+    t = np.empty(n)
+    starts = [0] + exceptions['row'].tolist()
+    values = [t0] + exceptions['t'].tolist()
+    bounds = starts + [n]
+    for k, t_start in enumerate(values):
+        a, b = bounds[k], bounds[k + 1]
+        t[a] = t_start
+        if b - a > 1:
+            t[a + 1:b] = _replay_times(t_start, steps[a + 1:b], dt)
+    return t
+
+
+def _decode_chunk(f, entry, params, quantum, path=None):
+    f.seek(int(entry['position']))
+    tag, rows, raw_size, packed_size, _, t0 = _CHUNK_HEADER.unpack(f.read(_CHUNK_HEADER.size))
+    if tag != CHUNK_TAG:
+        raise ValueError(f"Bloque dañado en {path} (posición {int(entry['position'])})")
+    raw = memoryview(zlib.decompress(f.read(packed_size), bufsize=raw_size))
+    sizes = np.frombuffer(raw[:24], dtype='<u4')
+    sections, position = [], 24
+    for size in sizes:
+        sections.append(raw[position:position + size])
+        position += int(size)
+    steps, exceptions, x, v, E_total, runs = sections
+
+    t = _chunk_times(t0, _decode_varints(steps), np.frombuffer(exceptions, dtype=_T_EXCEPTION), params['dt'])
+    runs = np.frombuffer(runs, dtype=_STATE_RUN)
+    s = np.repeat(runs['state'], runs['length'])
+    if not len(t) == len(s) == rows:
+        raise ValueError(f"Bloque inconsistente en {path} (posición {int(entry['position'])})")
+    return Trajectory(t, _decode_deltas(x, quantum), _decode_deltas(v, quantum), s,
+                      _decode_deltas(E_total, quantum), params=params, path=path)
+
+
+def _select_chunks(index, t_range=None, rows=None):
+    """Rango [lo, hi) de bloques del índice que cubren la ventana pedida"""
+    lo, hi = 0, len(index)
+    if t_range is not None:
+        t_min, t_max = t_range
+        if t_min is not None:
+            lo = max(lo, int(np.searchsorted(index['t0'], t_min, side='right')) - 1)
+        if t_max is not None:
+            hi = min(hi, int(np.searchsorted(index['t0'], t_max, side='right')))
+    if rows is not None:
+        start, stop = rows
+        lo = max(lo, int(np.searchsorted(index['first_row'], start, side='right')) - 1)
+        hi = min(hi, int(np.searchsorted(index['first_row'], stop, side='left')))
+    return max(lo, 0), max(hi, lo, 0)
+
+
+def load_compressed(path, t_range=None, rows=None):
+    """
+    Leer un .mtz completo o sólo una ventana: t_range=(t_min, t_max) en
+    tiempo (extremos None = sin límite) o rows=(inicio, fin) en filas. Con
+    el índice se leen y descomprimen sólo los bloques que cubren la ventana.
+    """
+    params, quantum, index = read_compressed_index(path)
+    lo, hi = _select_chunks(index, t_range, rows)
+    with open(path, 'rb') as f:
+        parts = [_decode_chunk(f, entry, params, quantum, path) for entry in index[lo:hi]]
+    traj = concat_trajectories(parts, params, path)
+    if rows is not None and hi > lo:
+        first = int(index['first_row'][lo])
+        traj = slice_trajectory(traj, max(0, rows[0] - first), max(0, rows[1] - first))
+    return time_window(traj, t_range)
+
+
+def load_trajectory(path, t_range=None):
+    """
+    Cargar una trayectoria detectando el formato por su contenido; con
+    t_range=(t_min, t_max) sólo las filas de esa ventana de tiempo.
+    """
+    if is_compressed_file(path):
+        return load_compressed(path, t_range)
+    if is_binary_file(path):
+        return time_window(load_binary(path), t_range)
+    return time_window(load_text(path), t_range)
+
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+
+def iter_chunks(path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Recorrer la trayectoria en bloques de `chunk_rows` filas.
+
+    Cada bloque es una Trajectory independiente (copias, no vistas), de modo
+    que la memoria usada queda acotada por el tamaño del bloque sin importar
+    el largo del archivo.
+    """
+    chunk_rows = max(1, int(chunk_rows))
+
+    if is_binary_file(path):
+        traj = load_binary(path)
+        for start in range(0, len(traj), chunk_rows):
+            stop = start + chunk_rows
+            yield Trajectory(np.array(traj.t[start:stop]), np.array(traj.x[start:stop]),
+                             np.array(traj.v[start:stop]), np.array(traj.s[start:stop]),
+                             np.array(traj.E_total[start:stop]), params=traj.params, path=path)
+        return
+
+    if is_compressed_file(path):
+        # Bloques de chunk_rows filas armados con los bloques del archivo
+        params, quantum, index = read_compressed_index(path)
+        pending = None
+        with open(path, 'rb') as f:
+            for entry in index:
+                part = _decode_chunk(f, entry, params, quantum, path)
+                pending = part if pending is None else concat_trajectories([pending, part], params, path)
+                while len(pending) >= chunk_rows:
+                    yield slice_trajectory(pending, 0, chunk_rows)
+                    pending = slice_trajectory(pending, chunk_rows, len(pending))
+        if pending is not None and len(pending):
+            yield pending
+        return
+
+    # Texto ya parseado por load_text: bloques del arreglo en caché
+    data = cached_text_array(path)
+    if data is not None:
+        for start in range(0, len(data), chunk_rows):
+            block = np.array(data[start:start + chunk_rows])
+            yield Trajectory(block[:, 0], block[:, 1], block[:, 2], block[:, 3], block[:, 4], path=path)
+        return
+
+    with open(path) as f:
+        rows = (line for line in f if line.strip() and not line.startswith('#'))
+        while True:
+            lines = list(itertools.islice(rows, chunk_rows))
+            if not lines:
+                break
+            data = np.loadtxt(lines, ndmin=2)
+            yield Trajectory(data[:, 0], data[:, 1], data[:, 2], data[:, 3], data[:, 4], path=path)
+
+
+def _read_exact(fd, size):
+    data = bytearray()
+    while len(data) < size:
+        part = os.read(fd, size - len(data))
+        if not part:
+            break
+        data += part
+    return bytes(data)
+
+
+def read_stream_header(fd):
+    """Leer la cabecera de un flujo en vivo (descriptor) y devolver sus parámetros"""
+    raw = _read_exact(fd, HEADER_SIZE)
+    if len(raw) < HEADER_SIZE:
+        raise ValueError("El flujo terminó antes de la cabecera")
+    return _unpack_header(raw, STREAM_MAGIC, "El flujo")[2]
+
+
+def iter_stream(fd, params=None):
+    """
+    Recorrer un flujo en vivo a medida que llegan los datos.
+
+    `fd` es un descriptor (pipe, FIFO o archivo) ya posicionado después de
+    la cabecera (ver read_stream_header). Cada lectura entrega lo que haya
+    disponible: los bloques son Trajectory de tamaño variable, y los bytes
+    de un registro incompleto se guardan para el bloque siguiente. Termina
+    cuando el escritor cierra el flujo.
+    """
+    pending = b''
+    while True:
+        data = os.read(fd, STREAM_READ_BYTES)
+        if not data:
+            break
+        pending += data
+        n_rows = len(pending) // STREAM_RECORD.itemsize
+        if n_rows == 0:
+            continue
+        used = n_rows * STREAM_RECORD.itemsize
+        rows = np.frombuffer(pending[:used], dtype=STREAM_RECORD)
+        pending = pending[used:]
+        yield Trajectory(rows['t'], rows['x'], rows['v'], rows['s'], rows['E_total'], params=params)
+
+
+def load_summary(path):
+    """
+    Leer el resumen de acumuladores que escribe RunStatistics::writeSummary.
+
+    Retorna un diccionario con los valores escalares (mean_x, var_x,
+    drift_velocity, ...) y 'hist_edges' / 'hist_counts' del histograma.
+    """
+    summary = {}
+    edges, counts = [], []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if '=' in line:
+                key, value = (part.strip() for part in line.split('=', 1))
+                summary[key] = float(value)
+            else:
+                left, right, count = line.split()
+                if not edges:
+                    edges.append(float(left))
+                edges.append(float(right))
+                counts.append(int(count))
+    summary['hist_edges'] = np.array(edges)
+    summary['hist_counts'] = np.array(counts, dtype=np.int64)
+    return summary